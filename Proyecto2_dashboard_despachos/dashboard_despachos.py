@@ -1,14 +1,32 @@
 # -*- coding: utf-8 -*-
-import pandas as pd
-import numpy as np
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import warnings
+import sys
+from pathlib import Path
 warnings.filterwarnings('ignore')
 
+# Paquete compartido en la raíz del repositorio
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core import perezoso
+
+# Se importan al primer uso: la pantalla de carga no los necesita
+pd = perezoso.modulo("pandas")
+np = perezoso.modulo("numpy")
+px = perezoso.modulo("plotly.express")
+go = perezoso.modulo("plotly.graph_objects")
+make_subplots = perezoso.funcion("plotly.subplots", "make_subplots")
+
+from ekonomodo_core.compartidos import Compartidos, activar_copia_en_escritura
+from ekonomodo_core.instrumentacion import instrumentar
+from ekonomodo_core.pipelines import despachos
+from ekonomodo_core.vistas.descargas import boton_descarga
+from ekonomodo_core.vistas.diagnostico import mostrar_diagnostico
+from ekonomodo_core.vistas.graficos import ANCHO_COMPLETO, figura, figura_series
+from ekonomodo_core.vistas.grilla import mostrar_grilla
+from ekonomodo_core.vistas.rendimiento import iniciar_rendimiento, mostrar_rendimiento
+from ekonomodo_core.vistas.tablas import configurar_columnas
+
 # ==========================
 # CONFIGURACIÓN GENERAL
 # ==========================
@@ -17,6 +35,10 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
+
+# Panel de rendimiento (se activa desde la barra lateral)
+iniciar_rendimiento("despachos")
+
 st.title("📦 Dashboard Avanzado de Despachos Diarios")
 st.markdown("---")
 
@@ -28,233 +50,27 @@ with top_col2:
 # ==========================
 # FUNCIONES AUXILIARES
 # ==========================
-@st.cache_data
-def load_and_process_data(uploaded_file):
-    """Carga y procesa el archivo Excel"""
-    try:
-        df = pd.read_excel(uploaded_file)
-       
-        # Limpiar y normalizar columnas (eliminar espacios excesivos)
-        df.columns = df.columns.astype(str).str.strip().str.upper()
-        # Reemplazar múltiples espacios por uno solo
-        df.columns = [' '.join(col.split()) for col in df.columns]
-        
-        # Mapeo de nombres de columnas comunes
-        column_mapping = {
-            'FECHA': 'FECHA_FACTURA',
-            'FECHA FACTURA': 'FECHA_FACTURA',
-        }
-        df.rename(columns=column_mapping, inplace=True)
-        
-        # Procesar fechas - formato día/mes/año
-        date_columns = ["FECHA_FACTURA", "FECHA DESPACHO"]
-        for col in date_columns:
-            if col in df.columns:
-                # Intentar múltiples formatos con prioridad en día/mes/año
-                try:
-                    # Primero intentar con dayfirst=True (día/mes/año)
-                    df[col] = pd.to_datetime(df[col], errors="coerce", dayfirst=True, format="%d/%m/%Y")
-                    
-                    # Si hay muchos NaN, intentar otros formatos comunes
-                    if df[col].isna().sum() > len(df) * 0.5:  # Si más del 50% son NaN
-                        df[col] = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
-                    
-                    if df[col].isna().all():
-                        st.warning(f"No se pudieron procesar las fechas en la columna {col}")
-                    else:
-                        fechas_procesadas = df[col].notna().sum()
-                        st.info(f"✅ Procesadas {fechas_procesadas} fechas en columna {col}")
-                        
-                except Exception as e:
-                    st.warning(f"Error procesando fechas en {col}: {str(e)}")
-                    # Fallback: intentar sin formato específico
-                    df[col] = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
-
-        # Limpiar espacios en ALISTAMIENTO
-        if "ALISTAMIENTO" in df.columns:
-            df["ALISTAMIENTO"] = df["ALISTAMIENTO"].astype(str).str.strip()
-
-        # Mapear códigos de ciudad
-        if "COS" in df.columns:
-            def mapear_ciudad(cos):
-                cos = pd.to_numeric(cos, errors='coerce')
-                if pd.isna(cos):
-                    return "Sin ciudad"
-                elif cos == 1:
-                    return "Bogotá"
-                elif cos == 2:
-                    return "Medellín"
-                elif cos == 999:
-                    return "RTA"
-                else:
-                    return f"Ciudad {int(cos)}"
-            
-            df["CIUDAD"] = df["COS"].apply(mapear_ciudad)
-        
-        # Calcular tiempo de despacho
-        if "FECHA_FACTURA" in df.columns and "FECHA DESPACHO" in df.columns:
-            df["TIEMPO_DESPACHO_DIAS"] = (df["FECHA DESPACHO"] - df["FECHA_FACTURA"]).dt.days
-            df["TIEMPO_DESPACHO_HORAS"] = (df["FECHA DESPACHO"] - df["FECHA_FACTURA"]).dt.total_seconds() / 3600
-
-        # Limpiar espacios en ALISTAMIENTO
-        if "ALISTAMIENTO" in df.columns:
-            df["ALISTAMIENTO"] = df["ALISTAMIENTO"].astype(str).str.strip()
-        
-        # Limpiar costos - ser más agresivo con la limpieza
-        if "COSTO FLETE" in df.columns:
-            # Convertir a string primero para limpiar
-            df["COSTO FLETE"] = df["COSTO FLETE"].astype(str)
-            # Remover caracteres no numéricos excepto puntos y comas
-            df["COSTO FLETE"] = df["COSTO FLETE"].str.replace(r'[^\d.,]', '', regex=True)
-            # Reemplazar comas por puntos para decimales
-            df["COSTO FLETE"] = df["COSTO FLETE"].str.replace(',', '.')
-            # Convertir a numérico
-            df["COSTO FLETE"] = pd.to_numeric(df["COSTO FLETE"], errors="coerce").fillna(0)
-            
-        # Lista de plataformas conocidas
-        plataformas_conocidas = [
-            "PAGINA WEB", "FALABELLA", "SODIMAC", "ADDI", "AGAVAL",
-            "APER", "CRICKET", "MERCADO LIBRE", "PUNTOS COLOMBIA", "TUGO"
-        ]
-
-        # Asegurar que la columna PLATAFORMA existe
-        if "PLATAFORMA" in df.columns:
-            # Limpiar espacios y poner en mayúsculas para comparar mejor
-            df["PLATAFORMA_CLEAN"] = df["PLATAFORMA"].astype(str).str.strip().str.upper()
-
-            def clasificar_canal(plataforma):
-                if pd.isna(plataforma) or plataforma.strip() == "":
-                    return np.nan  # No se ha despachado
-                elif any(p in plataforma for p in plataformas_conocidas):
-                    return plataforma  # Es una plataforma conocida
-                else:
-                    return "PARTICULAR"  # No coincide, asumimos que es nombre de persona
-
-            # Aplicar función
-            df["CANAL_VENTA"] = df["PLATAFORMA_CLEAN"].apply(clasificar_canal)
-
-            # (Opcional) Eliminar columna temporal
-            df.drop(columns=["PLATAFORMA_CLEAN"], inplace=True)
-        
-        # Crear variables temporales
-        if "FECHA DESPACHO" in df.columns:
-            mask_fecha_valida = df["FECHA DESPACHO"].notna()
-            df.loc[mask_fecha_valida, "AÑO"] = df.loc[mask_fecha_valida, "FECHA DESPACHO"].dt.year
-            df.loc[mask_fecha_valida, "MES"] = df.loc[mask_fecha_valida, "FECHA DESPACHO"].dt.month
-            df.loc[mask_fecha_valida, "DIA_SEMANA"] = df.loc[mask_fecha_valida, "FECHA DESPACHO"].dt.day_name()
-            df.loc[mask_fecha_valida, "SEMANA"] = df.loc[mask_fecha_valida, "FECHA DESPACHO"].dt.isocalendar().week
-        
-        # Categorizar estatus - ser más flexible
-        if "ESTATUS" in df.columns:
-            df["ESTATUS_CLEAN"] = df["ESTATUS"].fillna("SIN ESTATUS").astype(str).str.upper().str.strip()
-            df["IS_ENTREGADO"] = df["ESTATUS_CLEAN"].isin(["ENTREGADO", "ENTREGADA", "DELIVERED", "COMPLETADO", "DESPACHADO", "DEPACHADO"])
-            
-            # Verificar que existe la columna NRO. CRUCE antes de usarla
-            if "NRO. CRUCE" in df.columns:
-                # Convertir a numérico primero para detectar tanto 0 como 0.0
-                df["NRO_CRUCE_NUMERIC"] = pd.to_numeric(df["NRO. CRUCE"], errors='coerce')
-                
-                # Un producto NO está facturado si:
-                # - El valor numérico es 0 (incluye 0.0, 0, etc.)
-                # - Es NaN (valores faltantes o no numéricos)
-                df["IS_NO_FACTURADO"] = (df["NRO_CRUCE_NUMERIC"] == 0) | (df["NRO_CRUCE_NUMERIC"].isna())
-                df["IS_FACTURADO"] = ~df["IS_NO_FACTURADO"]
-                
-                # Limpiar columna temporal
-                df.drop("NRO_CRUCE_NUMERIC", axis=1, inplace=True)
-                
-                # Un producto está facturado pero no despachado si está facturado pero no está entregado
-                df["IS_FACTURADO_NO_DESPACHADO"] = (df["IS_FACTURADO"]) & (~df["IS_ENTREGADO"])
-            else:
-                df["IS_FACTURADO_NO_DESPACHADO"] = False
-                df["IS_NO_FACTURADO"] = False
-                df["IS_FACTURADO"] = False
-        
-        return df
-    except Exception as e:
-        st.error(f"Error al procesar el archivo: {str(e)}")
-        import traceback
-        st.error(f"Detalles del error: {traceback.format_exc()}")
-        return None
-
-@st.cache_data
-def load_vendedores_data(uploaded_file):
-    """Carga el archivo de vendedores para hacer el cruce"""
-    if uploaded_file is not None:
-        try:
-            df_vendedores = pd.read_excel(uploaded_file)
-            # Limpiar columnas
-            df_vendedores.columns = df_vendedores.columns.astype(str).str.strip().str.upper()
-            df_vendedores.columns = [' '.join(col.split()) for col in df_vendedores.columns]
-            
-            st.write(f"**Vendedores cargados:** {len(df_vendedores)} registros")
-            st.write("**Columnas en archivo de vendedores:**")
-            st.write(list(df_vendedores.columns))
-            
-            return df_vendedores
-        except Exception as e:
-            st.error(f"Error al cargar archivo de vendedores: {str(e)}")
-            return None
-    return None
-
-def merge_vendedores(df, df_vendedores):
-    """Hace el cruce entre despachos y vendedores"""
-    try:
-        if df_vendedores is not None and "VEND" in df.columns:
-            # Limpiar nombres de columnas del catálogo de vendedores
-            df_vendedores.columns = df_vendedores.columns.str.strip().str.replace('"', '').str.upper()
-
-            # Mostrar información de depuración
-            st.write("**Columnas en archivo de vendedores:**")
-            st.write(df_vendedores.columns.tolist())
-            st.write(f"**Códigos de vendedor únicos en despachos:** {df['VEND'].nunique()}")
-            st.write(f"**Códigos de vendedor únicos en catálogo:** {df_vendedores['VENDEDOR'].nunique() if 'VENDEDOR' in df_vendedores.columns else 'Columna VENDEDOR no encontrada'}")
-
-            if "VENDEDOR" in df_vendedores.columns and "NOMBRE" in df_vendedores.columns:
-                # Asegurar formatos consistentes
-                df["VEND"] = df["VEND"].astype(str).str.strip().str.upper()
-                df_vendedores["VENDEDOR"] = df_vendedores["VENDEDOR"].astype(str).str.strip().str.upper()
-
-                # Hacer el merge
-                df_original_len = len(df)
-                df = df.merge(
-                    df_vendedores[["VENDEDOR", "NOMBRE"]],
-                    left_on="VEND",
-                    right_on="VENDEDOR",
-                    how="left"
-                )
-
-                df.rename(columns={"NOMBRE_y": "NOMBRE"}, inplace=True)
-
-                # Verificar si el merge alteró la cantidad de registros
-                if len(df) != df_original_len:
-                    st.warning(f"⚠️ El merge cambió el número de registros: de {df_original_len} a {len(df)}")
-
-                # Crear columna combinada con nombre del vendedor
-                df["VENDEDOR_NOMBRE"] = df.apply(lambda row:
-                    f"{row['VEND']} - {row['NOMBRE']}" if pd.notna(row.get("NOMBRE")) and str(row.get("NOMBRE")).strip() != ""
-                    else f"{row['VEND']} - Sin nombre", axis=1)
-
-                # Mostrar estadísticas del cruce
-                if "NOMBRE" in df.columns:
-                    vendedores_con_nombre = df["NOMBRE"].notna().sum()
-                    st.success(f"✅ Cruce completado: {vendedores_con_nombre} registros con nombre de vendedor")
-                else:
-                    st.warning(f"⚠️ 'NOMBRE' no se encuentra en df después del merge. Columnas actuales: {df.columns.tolist()}")
-
-            else:
-                st.error("❌ El archivo de vendedores debe tener columnas 'VENDEDOR' y 'NOMBRE'")
-
-    except Exception as e:
-        st.warning(f"⚠️ Error al vincular vendedores: {str(e)}")
-        import traceback
-        st.error(f"📄 Detalles del error:\n\n{traceback.format_exc()}")
-
-    return df
+@instrumentar()
+@st.cache_resource(max_entries=4, show_spinner=False)
+def cargar_despachos(uploaded_file, vendedores_file):
+    """
+    Carga, procesa y cruza con vendedores una sola vez por proceso y
+    combinación de archivos: las sesiones comparten el frame y reciben
+    vistas de solo lectura. Devuelve (Compartidos, diagnósticos por etapa).
+    """
+    df, diagnostico = despachos.cargar_despachos(uploaded_file)
+    diagnosticos = [diagnostico]
+    if df is not None and vendedores_file is not None:
+        df_vendedores, diagnostico_vendedores = despachos.cargar_vendedores(vendedores_file)
+        diagnosticos.append(diagnostico_vendedores)
+        if df_vendedores is not None:
+            df, diagnostico_cruce = despachos.cruzar_vendedores(df, df_vendedores)
+            diagnosticos.append(diagnostico_cruce)
+    return Compartidos(despachos=df), diagnosticos
 
 
 def format_currency(value):
-    """Formatea un valor como moneda"""
+    """Formatea un valor como moneda (para métricas; las tablas usan column_config)"""
     if pd.isna(value) or value == 0:
         return "$0"
     return f"${value:,.0f}"
@@ -283,16 +99,21 @@ def show_detailed_selection(df, filter_column, filter_value, title):
             alertas = df_filtered["IS_FACTURADO_NO_DESPACHADO"].sum()
             st.metric("🚨 Alertas", alertas, delta_color="inverse")
     
-    # Mostrar tabla detallada
-    st.dataframe(df_filtered, use_container_width=True, height=400)
+    # Mostrar tabla detallada (paginada, filtro y orden en el servidor)
+    mostrar_grilla(
+        df_filtered,
+        clave=f"seleccion_{filter_column}",
+        column_config=configurar_columnas(df_filtered, pesos=["COSTO FLETE"]),
+        height=400
+    )
     
-    # Opción de descarga
-    csv = df_filtered.to_csv(index=False)
-    st.download_button(
-        label="📥 Descargar datos filtrados",
-        data=csv,
-        file_name=f"detalle_{filter_value}_{datetime.now().strftime('%Y%m%d')}.csv",
-        mime="text/csv"
+    # Opción de descarga (el archivo se genera al hacer clic)
+    boton_descarga(
+        df_filtered,
+        f"detalle_{filter_value}_{datetime.now().strftime('%Y%m%d')}",
+        etiqueta="📥 Descargar datos filtrados",
+        formatos=("csv", "xlsx", "parquet"),
+        clave="detalle_seleccion"
     )
 
 def create_kpi_metrics(df):
@@ -354,18 +175,21 @@ def main():
     )
 
     if uploaded_file:
+        # Copy-on-write de pandas en todo el proceso: las vistas de Compartidos dependen de él.
+        # Va aquí y no al inicio para que la pantalla de carga no importe pandas
+        activar_copia_en_escritura()
+
         # Cargar datos
         with st.spinner("Cargando y procesando datos..."):
-            df = load_and_process_data(uploaded_file)
+            # Carga y cruce con vendedores (si hay catálogo), compartidos entre sesiones
+            datos_despachos, diagnosticos = cargar_despachos(uploaded_file, vendedores_file)
+            for diagnostico in diagnosticos:
+                mostrar_diagnostico(diagnostico)
             
+            df = datos_despachos.vista("despachos")
             if df is None:
                 st.error("No se pudo cargar el archivo. Verifica el formato.")
                 return
-            
-            # Cargar y hacer cruce con vendedores si está disponible
-            df_vendedores = load_vendedores_data(vendedores_file) if vendedores_file else None
-            if df_vendedores is not None:
-                df = merge_vendedores(df, df_vendedores)
         
         st.success(f"✅ Datos cargados exitosamente: {len(df)} registros")
    
@@ -440,6 +264,7 @@ def main():
 
 
 
+@instrumentar()
 def apply_filters(df):
     """Aplica todos los filtros seleccionados"""
     st.sidebar.subheader("🔍 Filtros")
@@ -540,6 +365,7 @@ def apply_filters(df):
         st.error(f"Error aplicando filtros: {str(e)}")
         return df
 
+@instrumentar()
 def show_kpi_dashboard(df):
     """Muestra el dashboard de KPIs"""
     st.subheader("📊 Resumen Ejecutivo")
@@ -564,6 +390,7 @@ def show_kpi_dashboard(df):
     
     st.markdown("---")
 
+@instrumentar()
 def show_critical_alerts(df):
     """Muestra alertas críticas"""
     if "IS_FACTURADO_NO_DESPACHADO" in df.columns:
@@ -579,22 +406,21 @@ def show_critical_alerts(df):
                     cols_mostrar = ["NRO. CRUCE", "FECHA_FACTURA", "CANAL_VENTA", "ALISTAMIENTO", "VENDEDOR_NOMBRE", "ESTATUS_CLEAN", "COSTO FLETE"]
                     cols_disponibles = [col for col in cols_mostrar if col in alertas_df.columns]
                     
-                    # Formatear costos en la tabla
-                    df_display = alertas_df[cols_disponibles].copy()
-                    if "COSTO FLETE" in df_display.columns:
-                        df_display["COSTO FLETE"] = df_display["COSTO FLETE"].apply(format_currency)
-                    
-                    st.dataframe(df_display, use_container_width=True)
+                    df_display = alertas_df[cols_disponibles]
+                    st.dataframe(
+                        df_display,
+                        use_container_width=True,
+                        column_config=configurar_columnas(df_display, pesos=["COSTO FLETE"])
+                    )
                     
                     # Opción de descarga
-                    csv = alertas_df.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Descargar alertas en CSV",
-                        data=csv,
-                        file_name=f"alertas_despachos_{datetime.now().strftime('%Y%m%d')}.csv",
-                        mime="text/csv"
+                    boton_descarga(
+                        alertas_df,
+                        f"alertas_despachos_{datetime.now().strftime('%Y%m%d')}",
+                        etiqueta="📥 Descargar alertas en CSV"
                     )
 
+@instrumentar()
 def show_temporal_analysis(df):
     """Muestra análisis temporal"""
     st.subheader("📅 Análisis Temporal")
@@ -610,12 +436,10 @@ def show_temporal_analysis(df):
                 despachos_mes["FECHA DESPACHO"] = despachos_mes["FECHA DESPACHO"].astype(str)
                 despachos_mes.columns = ["Mes", "Cantidad"]
                 
-                fig_temporal = px.line(
-                    despachos_mes,
-                    x="Mes",
-                    y="Cantidad",
-                    title="Evolución Mensual de Despachos",
-                    markers=True
+                fig_temporal = figura_series(
+                    despachos_mes, "Mes", "Cantidad",
+                    titulo="Evolución Mensual de Despachos",
+                    ancho=ANCHO_COMPLETO // 2
                 )
                 fig_temporal.update_layout(xaxis_tickangle=-45)
                 st.plotly_chart(fig_temporal, use_container_width=True)
@@ -628,18 +452,20 @@ def show_temporal_analysis(df):
                 try:
                     dias_orden = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
                     df_dias_validos = df[df["DIA_SEMANA"].notna()]
-                    despachos_dia = df_dias_validos.groupby("DIA_SEMANA").size().reindex(dias_orden).fillna(0)
+                    despachos_dia = df_dias_validos.groupby("DIA_SEMANA", observed=True).size().reindex(dias_orden).fillna(0)
                     
-                    fig_dias = px.bar(
+                    fig_dias = figura(
+                        px.bar,
                         x=despachos_dia.index,
                         y=despachos_dia.values,
-                        title="Despachos por Día de la Semana"
+                        title="Despachos por Día de la Semana",
+                        diseno=dict(xaxis_tickangle=-45)
                     )
-                    fig_dias.update_layout(xaxis_tickangle=-45)
                     st.plotly_chart(fig_dias, use_container_width=True)
                 except Exception as e:
                     st.warning(f"Error generando gráfico por día: {str(e)}")
 
+@instrumentar()
 def show_cost_analysis(df):
     """Muestra análisis de costos"""
     if "COSTO FLETE" not in df.columns:
@@ -685,6 +511,7 @@ def show_cost_analysis(df):
         except Exception as e:
             st.warning(f"Error generando distribución de costos: {str(e)}")
 
+@instrumentar()
 def show_logistics_analysis(df):
     """Muestra análisis por logístico con interactividad"""
     if "ALISTAMIENTO" not in df.columns:
@@ -721,36 +548,35 @@ def show_logistics_analysis(df):
                 key="logistico_detail_selector"
             )
         
-        # Formatear costos en la tabla
-        resumen_display = resumen_alistamiento.copy()
-        resumen_display["Costo_Total"] = resumen_display["Costo_Total"].apply(format_currency)
-        resumen_display["Costo_Promedio"] = resumen_display["Costo_Promedio"].apply(format_currency)
-        
         # Mostrar tabla
-        st.dataframe(resumen_display, use_container_width=True)
+        st.dataframe(
+            resumen_alistamiento,
+            use_container_width=True,
+            column_config=configurar_columnas(resumen_alistamiento, pesos=["Costo_Total", "Costo_Promedio"])
+        )
         
         # Gráficos de performance
         if not resumen_alistamiento.empty:
             col1, col2 = st.columns(2)
             
             with col1:
-                fig_logistico = px.bar(
-                    resumen_alistamiento,
+                fig_logistico = figura(
+                    px.bar, resumen_alistamiento,
                     x="ALISTAMIENTO",
                     y="Total_Despachos",
-                    title="Despachos por Logístico (Click para ver detalles)"
+                    title="Despachos por Logístico (Click para ver detalles)",
+                    diseno=dict(xaxis_tickangle=-45)
                 )
-                fig_logistico.update_layout(xaxis_tickangle=-45)
                 st.plotly_chart(fig_logistico, use_container_width=True)
             
             with col2:
-                fig_tasa = px.bar(
-                    resumen_alistamiento,
+                fig_tasa = figura(
+                    px.bar, resumen_alistamiento,
                     x="ALISTAMIENTO",
                     y="Tasa_Entrega_%",
-                    title="Tasa de Entrega por Logístico"
+                    title="Tasa de Entrega por Logístico",
+                    diseno=dict(xaxis_tickangle=-45)
                 )
-                fig_tasa.update_layout(xaxis_tickangle=-45)
                 st.plotly_chart(fig_tasa, use_container_width=True)
         
         # Mostrar detalles si se seleccionó un logístico específico
@@ -762,6 +588,7 @@ def show_logistics_analysis(df):
     except Exception as e:
         st.warning(f"Error en análisis de logísticos: {str(e)}")
 
+@instrumentar()
 def show_channel_analysis(df):
     """Muestra análisis por canal de venta con interactividad"""
     if "CANAL_VENTA" not in df.columns:
@@ -797,19 +624,18 @@ def show_channel_analysis(df):
                 key="canal_detail_selector"
             )
         
-        # Formatear costos en la tabla
-        resumen_display = resumen_canal.copy()
-        resumen_display["Costo_Total"] = resumen_display["Costo_Total"].apply(format_currency)
-        resumen_display["Costo_Promedio"] = resumen_display["Costo_Promedio"].apply(format_currency)
-        
-        st.dataframe(resumen_display, use_container_width=True)
+        st.dataframe(
+            resumen_canal,
+            use_container_width=True,
+            column_config=configurar_columnas(resumen_canal, pesos=["Costo_Total", "Costo_Promedio"])
+        )
         
         if not resumen_canal.empty:
             col1, col2 = st.columns(2)
             
             with col1:
-                fig_canal = px.pie(
-                    resumen_canal,
+                fig_canal = figura(
+                    px.pie, resumen_canal,
                     values="Total_Despachos",
                     names="CANAL_VENTA",
                     title="Distribución de Despachos por Canal (Click para detalles)"
@@ -817,13 +643,13 @@ def show_channel_analysis(df):
                 st.plotly_chart(fig_canal, use_container_width=True)
             
             with col2:
-                fig_canal_costo = px.bar(
-                    resumen_canal,
+                fig_canal_costo = figura(
+                    px.bar, resumen_canal,
                     x="CANAL_VENTA",
                     y="Costo_Total",
-                    title="Costo Total por Canal"
+                    title="Costo Total por Canal",
+                    diseno=dict(xaxis_tickangle=-45)
                 )
-                fig_canal_costo.update_layout(xaxis_tickangle=-45)
                 st.plotly_chart(fig_canal_costo, use_container_width=True)
         
         # Mostrar detalles si se seleccionó un canal específico
@@ -835,6 +661,7 @@ def show_channel_analysis(df):
     except Exception as e:
         st.warning(f"Error en análisis de canales: {str(e)}")
 
+@instrumentar()
 def show_city_analysis(df):
     """Muestra análisis por ciudad con interactividad"""
     if "CIUDAD" not in df.columns:
@@ -871,19 +698,18 @@ def show_city_analysis(df):
                 key="ciudad_detail_selector"
             )
         
-        # Formatear costos en la tabla
-        resumen_display = resumen_ciudad.copy()
-        resumen_display["Costo_Total"] = resumen_display["Costo_Total"].apply(format_currency)
-        resumen_display["Costo_Promedio"] = resumen_display["Costo_Promedio"].apply(format_currency)
-        
-        st.dataframe(resumen_display, use_container_width=True)
+        st.dataframe(
+            resumen_ciudad,
+            use_container_width=True,
+            column_config=configurar_columnas(resumen_ciudad, pesos=["Costo_Total", "Costo_Promedio"])
+        )
         
         if not resumen_ciudad.empty:
             col1, col2 = st.columns(2)
             
             with col1:
-                fig_ciudad = px.pie(
-                    resumen_ciudad,
+                fig_ciudad = figura(
+                    px.pie, resumen_ciudad,
                     values="Total_Despachos",
                     names="CIUDAD",
                     title="Distribución de Despachos por Ciudad (Click para detalles)"
@@ -891,13 +717,13 @@ def show_city_analysis(df):
                 st.plotly_chart(fig_ciudad, use_container_width=True)
             
             with col2:
-                fig_ciudad_costo = px.bar(
-                    resumen_ciudad,
+                fig_ciudad_costo = figura(
+                    px.bar, resumen_ciudad,
                     x="CIUDAD",
                     y="Costo_Total",
-                    title="Costo Total por Ciudad"
+                    title="Costo Total por Ciudad",
+                    diseno=dict(xaxis_tickangle=-45)
                 )
-                fig_ciudad_costo.update_layout(xaxis_tickangle=-45)
                 st.plotly_chart(fig_ciudad_costo, use_container_width=True)
         
         # Mostrar detalles si se seleccionó una ciudad específica
@@ -909,6 +735,7 @@ def show_city_analysis(df):
     except Exception as e:
         st.warning(f"Error en análisis de ciudades: {str(e)}")
 
+@instrumentar()
 def show_temporal_cost_analysis(df, periodo_seleccionado):
     """Muestra análisis de costos por período temporal"""
     
@@ -947,13 +774,13 @@ def show_temporal_cost_analysis(df, periodo_seleccionado):
                 gastos_mes = df_validos.groupby(df_validos["FECHA DESPACHO"].dt.to_period("M"))["COSTO FLETE"].sum().reset_index()
                 gastos_mes["FECHA DESPACHO"] = gastos_mes["FECHA DESPACHO"].astype(str)
                 
-                fig_gastos_mes = px.bar(
-                    gastos_mes,
+                fig_gastos_mes = figura(
+                    px.bar, gastos_mes,
                     x="FECHA DESPACHO",
                     y="COSTO FLETE",
-                    title="Gastos en Fletes por Mes"
+                    title="Gastos en Fletes por Mes",
+                    diseno=dict(xaxis_tickangle=-45)
                 )
-                fig_gastos_mes.update_layout(xaxis_tickangle=-45)
                 st.plotly_chart(fig_gastos_mes, use_container_width=True)
             
             elif periodo_seleccionado == "Mes actual":
@@ -962,8 +789,8 @@ def show_temporal_cost_analysis(df, periodo_seleccionado):
                 gastos_dia["DIA"] = gastos_dia["FECHA DESPACHO"].dt.day
                 gastos_dia = gastos_dia.sort_values("FECHA DESPACHO")
                 
-                fig_gastos_dia = px.bar(
-                    gastos_dia,
+                fig_gastos_dia = figura(
+                    px.bar, gastos_dia,
                     x="DIA",
                     y="COSTO FLETE",
                     title=f"Gastos en Fletes por Día - {datetime.now().strftime('%B %Y')}",
@@ -974,11 +801,11 @@ def show_temporal_cost_analysis(df, periodo_seleccionado):
         with col2:
             # Gastos por canal en el período
             if "CANAL_VENTA" in df_validos.columns:
-                gastos_canal = df_validos.groupby("CANAL_VENTA")["COSTO FLETE"].sum().reset_index()
+                gastos_canal = df_validos.groupby("CANAL_VENTA", observed=True)["COSTO FLETE"].sum().reset_index()
                 gastos_canal = gastos_canal.sort_values("COSTO FLETE", ascending=False)
                 
-                fig_gastos_canal = px.pie(
-                    gastos_canal,
+                fig_gastos_canal = figura(
+                    px.pie, gastos_canal,
                     values="COSTO FLETE",
                     names="CANAL_VENTA",
                     title="Distribución de Gastos por Canal"
@@ -1030,25 +857,24 @@ def show_temporal_cost_analysis(df, periodo_seleccionado):
             df_categorias = pd.DataFrame(categorias_gastos).round(2)
             df_categorias = df_categorias.sort_values("Gasto_Total", ascending=False)
             
-            # Formatear costos
-            df_categorias_display = df_categorias.copy()
-            df_categorias_display["Gasto_Total"] = df_categorias_display["Gasto_Total"].apply(format_currency)
-            df_categorias_display["Promedio_Envío"] = df_categorias_display["Promedio_Envío"].apply(format_currency)
-            
-            st.dataframe(df_categorias_display, use_container_width=True)
+            st.dataframe(
+                df_categorias,
+                use_container_width=True,
+                column_config=configurar_columnas(df_categorias, pesos=["Gasto_Total", "Promedio_Envío"])
+            )
             
             # Descarga del reporte
-            csv = df_categorias.to_csv(index=False)
-            st.download_button(
-                label=f"📥 Descargar reporte de gastos - {periodo_seleccionado}",
-                data=csv,
-                file_name=f"reporte_gastos_fletes_{periodo_seleccionado.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv"
+            boton_descarga(
+                df_categorias,
+                f"reporte_gastos_fletes_{periodo_seleccionado.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}",
+                etiqueta=f"📥 Descargar reporte de gastos - {periodo_seleccionado}",
+                clave="reporte_gastos"
             )
     
     except Exception as e:
         st.warning(f"Error en análisis temporal de costos: {str(e)}")
 
+@instrumentar()
 def show_seller_analysis(df):
     """Muestra análisis por vendedor con interactividad"""
     st.subheader("🤝 Análisis por Vendedor")
@@ -1083,39 +909,39 @@ def show_seller_analysis(df):
                 key="vendedor_detail_selector"
             )
         
-        # Formatear costos en la tabla
-        resumen_display = resumen_vendedor.copy()
-        resumen_display["Costo_Total"] = resumen_display["Costo_Total"].apply(format_currency)
-        resumen_display["Costo_Promedio"] = resumen_display["Costo_Promedio"].apply(format_currency)
-        
-        st.dataframe(resumen_display, use_container_width=True, height=300)
+        st.dataframe(
+            resumen_vendedor,
+            use_container_width=True,
+            height=300,
+            column_config=configurar_columnas(resumen_vendedor, pesos=["Costo_Total", "Costo_Promedio"])
+        )
         
         if not resumen_vendedor.empty:
             col1, col2 = st.columns(2)
             
             with col1:
                 top_vendedores = resumen_vendedor.head(10)
-                fig_top_vendedores = px.bar(
-                    top_vendedores,
+                fig_top_vendedores = figura(
+                    px.bar, top_vendedores,
                     x="Total_Despachos",
                     y="VENDEDOR_NOMBRE",
                     orientation="h",
-                    title="Top 10 Vendedores (Click para detalles)"
+                    title="Top 10 Vendedores (Click para detalles)",
+                    diseno=dict(height=500)
                 )
-                fig_top_vendedores.update_layout(height=500)
                 st.plotly_chart(fig_top_vendedores, use_container_width=True)
             
             with col2:
                 vendedores_relevantes = resumen_vendedor[resumen_vendedor["Total_Despachos"] >= 5].head(10)
                 if not vendedores_relevantes.empty:
-                    fig_tasa_vendedores = px.bar(
-                        vendedores_relevantes,
+                    fig_tasa_vendedores = figura(
+                        px.bar, vendedores_relevantes,
                         x="Tasa_Entrega_%",
                         y="VENDEDOR_NOMBRE",
                         orientation="h",
-                        title="Tasa de Entrega por Vendedor (≥5 despachos)"
+                        title="Tasa de Entrega por Vendedor (≥5 despachos)",
+                        diseno=dict(height=500)
                     )
-                    fig_tasa_vendedores.update_layout(height=500)
                     st.plotly_chart(fig_tasa_vendedores, use_container_width=True)
         
         # Mostrar detalles si se seleccionó un vendedor específico
@@ -1127,6 +953,7 @@ def show_seller_analysis(df):
     except Exception as e:
         st.warning(f"Error en análisis de vendedores: {str(e)}")
         
+@instrumentar()
 def show_time_analysis(df):
     """Muestra análisis de tiempos"""
     if "TIEMPO_DESPACHO_DIAS" not in df.columns:
@@ -1166,28 +993,26 @@ def show_time_analysis(df):
     except Exception as e:
         st.warning(f"Error en análisis de tiempos: {str(e)}")
 
+@instrumentar()
 def show_detailed_data(df):
     """Muestra datos detallados"""
     with st.expander("🔍 Ver Datos Detallados"):
-        # Crear una copia para mostrar con formatos
-        df_display = df.copy()
-        
-        # Formatear columnas de costo si existen
+        # El formato de moneda lo aplica el navegador; los valores siguen numéricos
         cost_columns = ["COSTO FLETE"]
-        for col in cost_columns:
-            if col in df_display.columns:
-                df_display[col] = df_display[col].apply(format_currency)
-        
-        st.dataframe(df_display, use_container_width=True)
+        mostrar_grilla(
+            df,
+            clave="detalle",
+            column_config=configurar_columnas(df, pesos=cost_columns)
+        )
         
-        # Opción de descarga
+        # Opción de descarga (el archivo se genera al hacer clic)
         try:
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="📥 Descargar datos filtrados",
-                data=csv,
-                file_name=f"despachos_detallados_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv"
+            boton_descarga(
+                df,
+                f"despachos_detallados_{datetime.now().strftime('%Y%m%d')}",
+                etiqueta="📥 Descargar datos filtrados",
+                formatos=("csv", "xlsx", "parquet"),
+                clave="despachos_detallados"
             )
         except Exception as e:
             st.warning(f"Error preparando descarga: {str(e)}")
@@ -1254,4 +1079,7 @@ if __name__ == "__main__":
         st.error(f"Error general en la aplicación: {str(e)}")
         import traceback
         st.error(f"Detalles del error: {traceback.format_exc()}")
-        st.info("Por favor, recarga la página e intenta nuevamente.")
\ No newline at end of file
+        st.info("Por favor, recarga la página e intenta nuevamente.")
+    finally:
+        # Panel de rendimiento (solo si se activó en la barra lateral)
+        mostrar_rendimiento()
\ No newline at end of file
@@ -1,18 +1,37 @@
 # streamlit_dashboard_pedidos_ceo.py
 # Dashboard CEO Premium para análisis completo de pedidos por comercios
-# Requisitos: pip install streamlit pandas plotly openpyxl seaborn
+# Requisitos: pip install streamlit pandas plotly openpyxl
 
 import streamlit as st
 import re
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
+import sys
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+# Paquete compartido en la raíz del repositorio
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core import pareto, perezoso
+
+# Se importan al primer uso: la pantalla de carga no los necesita
+pd = perezoso.modulo("pandas")
+np = perezoso.modulo("numpy")
+px = perezoso.modulo("plotly.express")
+go = perezoso.modulo("plotly.graph_objects")
+make_subplots = perezoso.funcion("plotly.subplots", "make_subplots")
+
+from ekonomodo_core.compacto import compactar
+from ekonomodo_core.compartidos import Compartidos, activar_copia_en_escritura, posiciones
+from ekonomodo_core.diagnostico import Diagnostico
+from ekonomodo_core.instrumentacion import instrumentar, seccion
+from ekonomodo_core.pipelines import pedidos
+from ekonomodo_core.vistas.descargas import boton_descarga
+from ekonomodo_core.vistas.diagnostico import mostrar_diagnostico
+from ekonomodo_core.vistas.graficos import ANCHO_COMPLETO, figura, figura_series
+from ekonomodo_core.vistas.rendimiento import iniciar_rendimiento, mostrar_rendimiento
+from ekonomodo_core.vistas.tablas import configurar_columnas, mostrar_tabla
+
 # Logo en la esquina superior
 top_col1, top_col2 = st.columns([0.7,0.3])
 with top_col2:
@@ -20,6 +39,9 @@ with top_col2:
 
 st.set_page_config(layout="wide", page_title="Dashboard CEO - Análisis de Pedidos", page_icon="📊")
 
+# Panel de rendimiento (se activa desde la barra lateral)
+iniciar_rendimiento("pedidos")
+
 # ----------------------- Custom CSS for CEO styling -----------------------
 st.markdown("""
 <style>
@@ -48,154 +70,56 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ----------------------- Helper Functions -----------------------
-@st.cache_data
+@instrumentar()
 def load_excel(file):
     return pd.read_excel(file, engine='openpyxl',header=6)
 
-@st.cache_data
-def preprocess_orders(df):
-    df = df.copy()
-    # Normalizar nombres de columnas
-    df.columns = [c.strip() for c in df.columns]
-
-    # Fechas - Mejor manejo de errores
-    for col in ['FECHA', 'FECHA ENT.', 'FECHA PAC']:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce')
-
-    # Valores numéricos
-    numeric_cols = ['VAL.PEDIDO', 'VAL.ENTREGAD', 'CANT.PEDIDA', 'CANT.ENTREGA', 'CANT PEND', 'CANT.PENDIENTE LOTE']
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-
-    # Limpieza de códigos
-    if 'COMPROBA' in df.columns:
-        df['COMPROBA'] = df['COMPROBA'].astype(str).str.strip()
-
-    # Columnas auxiliares - Solo si hay fechas válidas
-    if 'FECHA' in df.columns:
-        # Crear FECHA_DATE solo donde FECHA no es nulo
-        df['FECHA_DATE'] = df['FECHA'].dt.date
-        
-        # Solo calcular columnas temporales donde hay fechas válidas
-        mask_fechas_validas = df['FECHA'].notna()
-        
-        df['MES'] = None
-        df['SEMANA'] = None
-        df['DIA_SEMANA'] = None
-        
-        if mask_fechas_validas.any():
-            df.loc[mask_fechas_validas, 'MES'] = df.loc[mask_fechas_validas, 'FECHA'].dt.to_period('M')
-            df.loc[mask_fechas_validas, 'SEMANA'] = df.loc[mask_fechas_validas, 'FECHA'].dt.isocalendar().week
-            df.loc[mask_fechas_validas, 'DIA_SEMANA'] = df.loc[mask_fechas_validas, 'FECHA'].dt.day_name()
-    
-    # Calcular eficiencia de entrega
-    if 'VAL.PEDIDO' in df.columns and 'VAL.ENTREGAD' in df.columns:
-        df['EFICIENCIA_ENTREGA'] = np.where(df['VAL.PEDIDO'] > 0, 
-                                           df['VAL.ENTREGAD'] / df['VAL.PEDIDO'], 0)
-    
-    # Estado del pedido
-    if 'CANT PEND' in df.columns:
-        df['ESTADO_PEDIDO'] = np.where(df['CANT PEND'] == 0, 'Completado', 
-                              np.where(df['CANT PEND'] > 0, 'Pendiente', 'Error'))
-
-    return df
-
-@st.cache_data
-def merge_comercios(df_orders, df_shops, code_col_orders='COMPROBA'):
-    df = df_orders.copy()
-    df_shops = df_shops.copy()
-    
-    # Limpiar columnas
-    df_shops.columns = [c.strip() for c in df_shops.columns]
-    code_col_shops = df_shops.columns[0]
-    name_col = df_shops.columns[1] if len(df_shops.columns) > 1 else df_shops.columns[0]
-
-    df_shops[code_col_shops] = df_shops[code_col_shops].astype(str).str.strip()
-    df_shops[name_col] = df_shops[name_col].astype(str).str.strip()
-
-    merged = df.merge(df_shops, left_on=code_col_orders, right_on=code_col_shops, how='left')
-    merged = merged.rename(columns={name_col: 'NOMBRE_COMERCIO'})
-    merged['NOMBRE_COMERCIO'] = merged['NOMBRE_COMERCIO'].fillna(merged[code_col_orders])
-    
-    return merged
-
-@st.cache_data
-def merge_vendedores(df_orders, df_vendors, code_col_orders='VEND'):
-    df = df_orders.copy()
-    df_vendors = df_vendors.copy()
-    
-    # Limpiar nombres de columnas - convertir todo a string primero
-    df_vendors.columns = [str(c).strip() if hasattr(c, 'strip') else str(c) for c in df_vendors.columns]
-    
-    # Eliminar filas completamente vacías
-    df_vendors = df_vendors.dropna(how='all').reset_index(drop=True)
-    
-    # Buscar las columnas por posición ya que los nombres pueden estar mal
-    # Asumir: primera columna = VENDEDOR, tercera columna = NOMBRE
-    if len(df_vendors.columns) >= 2:
-        code_col_vendors = df_vendors.columns[0]  # Primera columna
-        name_col = df_vendors.columns[1]          # Segunda columna
-    else:
-        st.error(f"El archivo de vendedores debe tener al menos 2 columnas. Encontradas: {len(df_vendors.columns)}")
-        return df
-    
-    # Crear copia para trabajo con las columnas identificadas
-    vendors_clean = df_vendors[[code_col_vendors, name_col]].copy()
-    
-    # Función para normalizar códigos
-    def clean_code(code):
+def load_catalogo(file):
+    """Catálogo de comercios o vendedores en CSV o Excel"""
+    if str(file.name).lower().endswith('.csv'):
+        return pd.read_csv(file)
+    return load_excel(file)
+
+@instrumentar()
+@st.cache_resource(max_entries=4, show_spinner=False)
+def cargar_pedidos(orders_file, shops_file, vendors_file):
+    """
+    Pedidos preparados y cruzados con los catálogos, una sola vez por proceso
+    y combinación de archivos: las sesiones comparten el frame y reciben
+    vistas de solo lectura. Devuelve (Compartidos, diagnóstico de catálogos).
+    """
+    diagnostico = Diagnostico("catálogos")
+    df, _ = pedidos.preparar_pedidos(load_excel(orders_file))
+
+    # Merge con comercios
+    df_shops = None
+    if shops_file is not None:
         try:
-            if pd.isna(code):
-                return ''
-            code_str = str(code).strip()
-            # Asegurarse de quitar ceros solo si es estrictamente necesario
-            return code_str.lstrip('0') or '0'
-        except:
-            return str(code) if code is not None else ''
-
-    
-    # Función para limpiar nombres  
-    def clean_name(name):
+            df_shops = load_catalogo(shops_file)
+        except Exception as e:
+            diagnostico.advertencia(f'⚠️ No se pudo cargar comercios: {e}')
+    if df_shops is not None:
+        df, _ = pedidos.cruzar_comercios(df, df_shops)
+    elif 'COMPROBA' in df.columns:
+        df = df.assign(NOMBRE_COMERCIO=df['COMPROBA'])
+
+    # Merge con vendedores
+    df_vendors = None
+    if vendors_file is not None:
         try:
-            if pd.isna(name):
-                return ''
-            return str(name).strip()
-        except:
-            return str(name) if name is not None else ''
-    
-    # Aplicar limpieza
-    vendors_clean['VENDEDOR_CLEAN'] = vendors_clean[code_col_vendors].apply(clean_code)
-    vendors_clean['NOMBRE_CLEAN'] = vendors_clean[name_col].apply(clean_name)
-    
-    # Limpiar códigos en df principal
-    df['VEND_CLEAN'] = df[code_col_orders].apply(clean_code)
-
-    # 👉 DEBUG: Comparar códigos después de limpiar
-    st.write("Códigos en pedidos (df_orders) después de limpiar:")
-    st.write(df['VEND_CLEAN'].unique())
-
-    st.write("Códigos en archivo de vendedores después de limpiar:")
-    st.write(vendors_clean['VENDEDOR_CLEAN'].unique())
-    
-    # Eliminar duplicados en vendedores
-    vendors_clean = vendors_clean.drop_duplicates(subset=['VENDEDOR_CLEAN'], keep='first')
-    
-    # Hacer merge
-    merged = df.merge(
-        vendors_clean[['VENDEDOR_CLEAN', 'NOMBRE_CLEAN']],
-        left_on='VEND_CLEAN',
-        right_on='VENDEDOR_CLEAN',
-        how='left'
-    )
-    
-    # Limpiar resultado
-    merged['NOMBRE_VENDEDOR'] = merged['NOMBRE_CLEAN'].fillna(merged[code_col_orders].astype(str))
-    merged = merged.drop(['VENDEDOR_CLEAN', 'VEND_CLEAN', 'NOMBRE_CLEAN'], axis=1, errors='ignore')
-    
-    return merged
-
+            df_vendors = load_catalogo(vendors_file)
+        except Exception as e:
+            diagnostico.advertencia(f'⚠️ No se pudo cargar vendedores: {e}')
+    if df_vendors is not None:
+        df, diagnostico_vendedores = pedidos.cruzar_vendedores(df, df_vendors)
+        diagnostico.agregar(diagnostico_vendedores)
+    elif 'VEND' in df.columns:
+        df = df.assign(NOMBRE_VENDEDOR=df['VEND'])
+
+    df = compactar(df, "pedidos", pedidos.COLUMNAS_CATEGORICAS, pedidos.COLUMNAS_DINERO)
+    return Compartidos(pedidos=df), diagnostico
+
+@instrumentar()
 def calculate_growth_rate(df, date_col='FECHA_DATE', value_col='VAL.PEDIDO', periods=30):
     """Calcular tasa de crecimiento comparando últimos N días vs N días anteriores"""
     if df.empty:
@@ -250,54 +174,23 @@ if orders_file is None:
     """, unsafe_allow_html=True)
     st.stop()
 
-# Cargar datos
+# Copy-on-write de pandas en todo el proceso: las vistas de Compartidos dependen de él.
+# Va aquí y no al inicio para que la pantalla de carga no importe pandas
+activar_copia_en_escritura()
+
+# Cargar datos (preparados una vez por proceso y compartidos entre sesiones)
 try:
-    df_orders_raw = load_excel(orders_file)
+    datos_pedidos, diagnostico_catalogos = cargar_pedidos(orders_file, shops_file, vendors_file)
 except Exception as e:
     st.error(f'❌ Error cargando pedidos: {e}')
     st.stop()
-
-df_shops = None
-if shops_file is not None:
-    try:
-        if str(shops_file.name).lower().endswith('.csv'):
-            df_shops = pd.read_csv(shops_file)
-        else:
-            df_shops = load_excel(shops_file)
-    except Exception as e:
-        st.warning(f'⚠️ No se pudo cargar comercios: {e}')
-
-df_vendors = None
-if vendors_file is not None:
-    try:
-        if str(vendors_file.name).lower().endswith('.csv'):
-            df_vendors = pd.read_csv(vendors_file)
-        else:
-            df_vendors = load_excel(vendors_file)
-    except Exception as e:
-        st.warning(f'⚠️ No se pudo cargar vendedores: {e}')
-
-# Preprocesar datos
-df_orders = preprocess_orders(df_orders_raw)
-
-# Merge con comercios
-if df_shops is not None:
-    df = merge_comercios(df_orders, df_shops)
-else:
-    df = df_orders.copy()
-    if 'COMPROBA' in df.columns:
-        df['NOMBRE_COMERCIO'] = df['COMPROBA']
-
-# Merge con vendedores
-if df_vendors is not None:
-    df = merge_vendedores(df, df_vendors)
-else:
-    if 'VEND' in df.columns:
-        df['NOMBRE_VENDEDOR'] = df['VEND']
+mostrar_diagnostico(diagnostico_catalogos)
+df = datos_pedidos.vista("pedidos")
 
 st.sidebar.markdown("<div class='section-header'>🎯 FILTROS GLOBALES</div>", unsafe_allow_html=True)
 
 # Filtros mejorados - Manejo seguro de fechas
+seccion("Filtros", len(df))
 if 'FECHA_DATE' in df.columns and not df['FECHA_DATE'].isna().all():
     # Filtrar valores no nulos antes de calcular min/max
     fechas_validas = df['FECHA_DATE'].dropna()
@@ -368,9 +261,10 @@ if vend_sel:
 if 'VAL.PEDIDO' in df.columns:
     mask &= (df['VAL.PEDIDO'] >= val_range[0]) & (df['VAL.PEDIDO'] <= val_range[1])
 
-df_filtered = df[mask].copy()
+df_filtered = datos_pedidos.vista("pedidos", posiciones(mask))
 
 # ----------------------- EXECUTIVE DASHBOARD -----------------------
+seccion("KPIs ejecutivos", len(df_filtered))
 st.markdown("<h1 style='text-align: center; color: #2E4057;'>📊 DASHBOARD CEO - ANÁLISIS DE PEDIDOS</h1>", unsafe_allow_html=True)
 
 # ----------------------- KPIs Ejecutivos Avanzados -----------------------
@@ -410,6 +304,7 @@ with kpi_col5:
               "🎯 Meta: 95%" if eficiencia_promedio < 95 else "✅ Excelente")
 
 # ----------------------- Análisis de Comercios - Sección Principal -----------------------
+seccion("🏪 Análisis de comercios", len(df_filtered))
 st.markdown("<div class='section-header'>🏪 ANÁLISIS DE COMERCIOS</div>", unsafe_allow_html=True)
 
 if len(df_filtered) == 0:
@@ -418,7 +313,7 @@ if len(df_filtered) == 0:
     st.stop()  # Detiene la ejecución del resto del dashboard
 
 # Preparar datos agregados por comercio
-agg_comercios = df_filtered.groupby('NOMBRE_COMERCIO').agg({
+agg_comercios = df_filtered.groupby('NOMBRE_COMERCIO', observed=True).agg({
     'VAL.PEDIDO': 'sum',
     'VAL.ENTREGAD': 'sum',
     'CANT.PEDIDA': 'sum',
@@ -483,6 +378,9 @@ agg_comercios['CLASIFICACION_CANTIDAD'] = pd.cut(
     labels=['🟢 Excelente', '🟡 Regular', '🔴 Crítico']
 )
 
+# Ranking Pareto de comercios por ventas: posición, % acumulado y clase ABC
+ranking_comercios = pareto.clasificar_agregado(agg_comercios[['NOMBRE_COMERCIO', 'VAL_PEDIDO']], 'VAL_PEDIDO')
+
 # Análisis visual principal
 main_col1, main_col2 = st.columns([2, 1])
 
@@ -491,7 +389,7 @@ with main_col1:
     top_n = st.slider('🎯 Top N comercios a mostrar', 10, 50, 20)
     top_comercios = agg_comercios.nlargest(top_n, 'VAL_PEDIDO')
     
-    fig_main = px.bar(top_comercios, 
+    fig_main = figura(px.bar, top_comercios, 
                       x='VAL_PEDIDO', 
                       y='NOMBRE_COMERCIO', 
                       orientation='h',
@@ -499,14 +397,15 @@ with main_col1:
                       color_continuous_scale='RdYlGn',
                       title=f'🏆 Top {top_n} Comercios por Ventas',
                       labels={'VAL_PEDIDO': 'Valor Total Pedidos', 
-                             'EFICIENCIA': 'Eficiencia %'})
-    fig_main.update_layout(height=600, showlegend=True)
+                             'EFICIENCIA': 'Eficiencia %'},
+                      diseno=dict(height=600, showlegend=True))
     st.plotly_chart(fig_main, use_container_width=True)
 
 with main_col2:
     # Distribución por clasificación - CORREGIDO
     class_dist = agg_comercios['CLASIFICACION'].value_counts()
-    fig_pie = px.pie(values=class_dist.values, 
+    fig_pie = figura(px.pie,
+                     values=class_dist.values, 
                      names=class_dist.index,
                      title='📊 Distribución por Rendimiento',
                      color_discrete_map={
@@ -527,6 +426,7 @@ with main_col2:
 # ==========================
 # ANÁLISIS MEJORADO DE CANTIDADES PENDIENTES
 # ==========================
+seccion("Cantidades pendientes y Pareto", len(df_filtered))
 st.markdown("<div class='section-header'>📦 ANÁLISIS DE CANTIDADES PENDIENTES</div>", unsafe_allow_html=True)
 
 # KPIs de cantidades
@@ -577,24 +477,21 @@ pareto_col1, pareto_col2 = st.columns([3, 1])
 with pareto_col1:
     # VALIDACIÓN CRÍTICA: Verificar que hay datos antes de proceder
     if len(agg_comercios) > 0:
-        agg_comercios_sorted = agg_comercios.sort_values('VAL_PEDIDO', ascending=False)
-        agg_comercios_sorted['ACUM_PERC'] = agg_comercios_sorted['VAL_PEDIDO'].cumsum() / agg_comercios_sorted['VAL_PEDIDO'].sum()
-        
-        # Encontrar el punto 80%
-        comercios_80 = len(agg_comercios_sorted[agg_comercios_sorted['ACUM_PERC'] <= 0.8])
+        # Comercios de clase A: los que suman hasta el 80% acumulado
+        comercios_80 = int((ranking_comercios['CLASIFICACION'] == 'A').sum())
         
         fig_pareto = make_subplots(specs=[[{"secondary_y": True}]])
         
         fig_pareto.add_trace(
-            go.Bar(x=list(range(len(agg_comercios_sorted))), 
-                   y=agg_comercios_sorted['VAL_PEDIDO'],
+            go.Bar(x=list(range(len(ranking_comercios))), 
+                   y=ranking_comercios['VAL_PEDIDO'],
                    name="Ventas por Comercio",
                    marker_color='lightblue'),
             secondary_y=False)
         
         fig_pareto.add_trace(
-            go.Scatter(x=list(range(len(agg_comercios_sorted))), 
-                      y=agg_comercios_sorted['ACUM_PERC']*100,
+            go.Scatter(x=list(range(len(ranking_comercios))), 
+                      y=ranking_comercios['ACUMULADO'],
                       mode='lines+markers',
                       name="% Acumulado",
                       line=dict(color='red', width=2)),
@@ -633,6 +530,7 @@ with pareto_col2:
         st.info("Ajusta los filtros para ver más comercios")
 
 # ----------------------- Estado Diario por Comercio -----------------------
+seccion("📅 Análisis temporal por comercio", len(df_filtered))
 st.markdown("<div class='section-header'>📅 ANÁLISIS TEMPORAL POR COMERCIO</div>", unsafe_allow_html=True)
 
 # Selector de comercio mejorado
@@ -654,21 +552,12 @@ if comercio_selected:
                 'CANT PEND': 'sum'
             }).reset_index()
             
-            fig_temporal = go.Figure()
-            
-            fig_temporal.add_trace(go.Scatter(
-                x=ts_daily['FECHA_DATE'],
-                y=ts_daily['VAL.PEDIDO'],
-                mode='lines+markers',
-                name='💰 Valor Pedido',
-                line=dict(color='blue', width=2)))
-            
-            fig_temporal.add_trace(go.Scatter(
-                x=ts_daily['FECHA_DATE'],
-                y=ts_daily['VAL.ENTREGAD'],
-                mode='lines+markers',
-                name='🚚 Valor Entregado',
-                line=dict(color='green', width=2)))
+            # Un punto por día reducido al ancho de la columna (2/3 de la página)
+            fig_temporal = figura_series(
+                ts_daily, 'FECHA_DATE', ['VAL.PEDIDO', 'VAL.ENTREGAD'],
+                nombres={'VAL.PEDIDO': '💰 Valor Pedido', 'VAL.ENTREGAD': '🚚 Valor Entregado'},
+                colores=['blue', 'green'], ancho=ANCHO_COMPLETO * 2 // 3)
+            fig_temporal.update_traces(line_width=2)
             
             fig_temporal.update_layout(
                 title=f'📈 Evolución Temporal: {comercio_selected}',
@@ -690,24 +579,25 @@ if comercio_selected:
             st.metric("⚡ Eficiencia", f"{comercio_stats['EFICIENCIA']*100:.1f}%")
             
             # Ranking del comercio
-            ranking = agg_comercios.sort_values('VAL_PEDIDO', ascending=False).reset_index(drop=True)
-            posicion = ranking[ranking['NOMBRE_COMERCIO'] == comercio_selected].index[0] + 1
-            st.info(f"🏆 Ranking: #{posicion} de {len(agg_comercios)} comercios")
+            posicion = ranking_comercios.index[ranking_comercios['NOMBRE_COMERCIO'] == comercio_selected][0]
+            clase = ranking_comercios.at[posicion, 'CLASIFICACION']
+            st.info(f"🏆 Ranking: #{posicion + 1} de {len(agg_comercios)} comercios (clase {clase})")
         
         # Análisis por día de la semana
         if 'DIA_SEMANA' in comercio_data.columns:
             st.markdown("### 📅 Análisis por Día de la Semana")
             
-            dow_analysis = comercio_data.groupby('DIA_SEMANA')['VAL.PEDIDO'].sum().reset_index()
+            dow_analysis = comercio_data.groupby('DIA_SEMANA', observed=True)['VAL.PEDIDO'].sum().reset_index()
             days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
             dow_analysis['DIA_SEMANA'] = pd.Categorical(dow_analysis['DIA_SEMANA'], categories=days_order, ordered=True)
             dow_analysis = dow_analysis.sort_values('DIA_SEMANA')
             
-            fig_dow = px.bar(dow_analysis, x='DIA_SEMANA', y='VAL.PEDIDO',
+            fig_dow = figura(px.bar, dow_analysis, x='DIA_SEMANA', y='VAL.PEDIDO',
                            title=f'💼 Ventas por Día de la Semana - {comercio_selected}')
             st.plotly_chart(fig_dow, use_container_width=True)
 
 # ----------------------- Análisis por Vendedores y Plataformas -----------------------
+seccion("👥 Vendedores y plataformas", len(df_filtered))
 st.markdown("<div class='section-header'>👥 ANÁLISIS POR VENDEDORES Y PLATAFORMAS</div>", unsafe_allow_html=True)
 
 if 'VEND' in df_filtered.columns:
@@ -716,7 +606,7 @@ if 'VEND' in df_filtered.columns:
     
     with vendedor_col1:
         # Performance por vendedor
-        vend_performance = df_filtered.groupby('NOMBRE_VENDEDOR').agg({
+        vend_performance = df_filtered.groupby('NOMBRE_VENDEDOR', observed=True).agg({
             'VAL.PEDIDO': 'sum',
             'VAL.ENTREGAD': 'sum',
             'NOMBRE_COMERCIO': 'nunique',
@@ -729,7 +619,7 @@ if 'VEND' in df_filtered.columns:
         vend_performance = vend_performance.sort_values('VENTAS_TOTAL', ascending=False)
         vend_performance.reset_index(inplace=True)
         
-        fig_vendors = px.bar(vend_performance.head(15), 
+        fig_vendors = figura(px.bar, vend_performance.head(15), 
                            x='VENTAS_TOTAL', 
                            y='NOMBRE_VENDEDOR',
                            orientation='h',
@@ -748,6 +638,7 @@ if 'VEND' in df_filtered.columns:
             st.write("---")
         
 # ----------------------- Alertas y Monitoreo Ejecutivo -----------------------
+seccion("🚨 Alertas", len(df_filtered))
 st.markdown("<div class='section-header'>🚨 ALERTAS Y MONITOREO EJECUTIVO</div>", unsafe_allow_html=True)
 
 # Identificar comercios en riesgo y oportunidades
@@ -808,14 +699,15 @@ with alertas_col3:
         """, unsafe_allow_html=True)
 
 # ----------------------- Análisis Geográfico -----------------------
+seccion("🗺️ Análisis geográfico", len(df_filtered))
 st.markdown("<div class='section-header'>🗺️ ANÁLISIS GEOGRÁFICO</div>", unsafe_allow_html=True)
 
-if 'COS' in df_filtered.columns:
+if 'CIUDAD' in df_filtered.columns:
     geo_col1, geo_col2 = st.columns([2, 1])
     
     with geo_col1:
-        # Análisis por ciudades
-        city_analysis = df_filtered.groupby('COS').agg({
+        # Análisis por departamento y ciudad (COS ubicado en el catálogo de municipios)
+        city_analysis = df_filtered.groupby(['DEPARTAMENTO', 'CIUDAD'], observed=True).agg({
             'VAL.PEDIDO': 'sum',
             'VAL.ENTREGAD': 'sum',
             'NOMBRE_COMERCIO': 'nunique',
@@ -827,8 +719,9 @@ if 'COS' in df_filtered.columns:
         city_analysis.reset_index(inplace=True)
         city_analysis = city_analysis.sort_values('VENTAS_TOTAL', ascending=False)
         
-        fig_cities = px.treemap(city_analysis,
-                               path=['COS'],
+        # El treemap es el gráfico más caro de armar: se reutiliza mientras el agregado no cambie
+        fig_cities = figura(px.treemap, city_analysis,
+                               path=[px.Constant('Colombia'), 'DEPARTAMENTO', 'CIUDAD'],
                                values='VENTAS_TOTAL',
                                color='EFICIENCIA',
                                color_continuous_scale='RdYlGn',
@@ -838,11 +731,12 @@ if 'COS' in df_filtered.columns:
     with geo_col2:
         st.markdown("**🏆 Ranking de Ciudades:**")
         st.dataframe(
-            city_analysis.head(10)[['COS', 'VENTAS_TOTAL', 'COMERCIOS', 'EFICIENCIA']]
+            city_analysis.head(10)[['CIUDAD', 'DEPARTAMENTO', 'VENTAS_TOTAL', 'COMERCIOS', 'EFICIENCIA']]
             .style.format({'VENTAS_TOTAL': '${:,.0f}', 'EFICIENCIA': '{:.1%}'})
         )
 
 # ----------------------- Análisis de Tendencias y Forecasting -----------------------
+seccion("📈 Tendencias", len(df_filtered))
 st.markdown("<div class='section-header'>📈 ANÁLISIS DE TENDENCIAS</div>", unsafe_allow_html=True)
 
 if 'FECHA_DATE' in df_filtered.columns:
@@ -907,6 +801,7 @@ if 'FECHA_DATE' in df_filtered.columns:
                 st.warning("⚠️ Tendencia negativa")
 
 # ----------------------- Cuadro de Mando Ejecutivo -----------------------
+seccion("📋 Cuadro de mando", len(df_filtered))
 st.markdown("<div class='section-header'>📋 CUADRO DE MANDO EJECUTIVO</div>", unsafe_allow_html=True)
 
 # Resumen ejecutivo en columnas
@@ -953,6 +848,7 @@ with exec_col4:
     st.metric("📈 Tasa Crecimiento", f"{growth_rate:+.1f}%")
 
 # ----------------------- Tabla Resumen Ejecutiva -----------------------
+seccion("Tabla resumen ejecutiva", len(df_filtered))
 st.markdown("### 📊 TABLA RESUMEN EJECUTIVA - TOP 20 COMERCIOS")
 
 # Preparar tabla ejecutiva
@@ -961,65 +857,56 @@ tabla_ejecutiva = agg_comercios.head(20)[['NOMBRE_COMERCIO', 'VAL_PEDIDO', 'VAL_
                                          'PEDIDOS_UNICOS', 'CLASIFICACION']].copy()
 
 # Formatear para presentación ejecutiva
-st.dataframe(
-    tabla_ejecutiva.style.format({
-        'VAL_PEDIDO': '${:,.0f}',
-        'VAL_ENTREGADO': '${:,.0f}',
-        'VALOR_PENDIENTE': '${:,.0f}',
-        'EFICIENCIA': '{:.1%}',
-        'TICKET_PROMEDIO': '${:,.0f}',
-        'PEDIDOS_UNICOS': '{:.0f}'
-    }).background_gradient(subset=['VAL_PEDIDO'], cmap='RdYlGn'),
-    use_container_width=True
+mostrar_tabla(
+    tabla_ejecutiva,
+    column_config=configurar_columnas(
+        tabla_ejecutiva,
+        pesos=['VAL_PEDIDO', 'VAL_ENTREGADO', 'VALOR_PENDIENTE', 'TICKET_PROMEDIO'],
+        enteros=['PEDIDOS_UNICOS'],
+        porcentajes=['EFICIENCIA'],
+        barras={'VAL_PEDIDO': 'auto'}
+    ),
+    clave='tabla_ejecutiva'
 )
 
 # ----------------------- Exportaciones y Reportes -----------------------
+seccion("📤 Exportaciones", len(df_filtered))
 st.markdown("<div class='section-header'>📤 EXPORTACIONES Y REPORTES</div>", unsafe_allow_html=True)
 
 export_col1, export_col2, export_col3 = st.columns(3)
 
+# Cada archivo (y su selección de columnas) se arma solo al hacer clic
 with export_col1:
-    if st.button('📊 Exportar Resumen Ejecutivo'):
-        # Preparar datos para export
-        export_data = agg_comercios[['NOMBRE_COMERCIO', 'VAL_PEDIDO', 'VAL_ENTREGADO', 
-                                   'EFICIENCIA', 'TICKET_PROMEDIO', 'CLASIFICACION']]
-        csv_data = export_data.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="💾 Descargar CSV Ejecutivo",
-            data=csv_data,
-            file_name=f"resumen_ejecutivo_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime='text/csv'
-        )
+    boton_descarga(
+        lambda: agg_comercios[['NOMBRE_COMERCIO', 'VAL_PEDIDO', 'VAL_ENTREGADO',
+                               'EFICIENCIA', 'TICKET_PROMEDIO', 'CLASIFICACION']],
+        f"resumen_ejecutivo_{datetime.now().strftime('%Y%m%d')}",
+        etiqueta='📊 Exportar Resumen Ejecutivo',
+        formatos=('csv', 'xlsx'))
 
 with export_col2:
-    if st.button('👥 Exportar Análisis Vendedores'):
-        if 'VEND' in df_filtered.columns:
-            csv_vendedores = vend_performance.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="💾 Descargar Vendedores CSV",
-                data=csv_vendedores,
-                file_name=f"analisis_vendedores_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime='text/csv'
-            )
+    if 'VEND' in df_filtered.columns:
+        boton_descarga(
+            vend_performance,
+            f"analisis_vendedores_{datetime.now().strftime('%Y%m%d')}",
+            etiqueta='👥 Exportar Análisis Vendedores',
+            formatos=('csv', 'xlsx'))
 
 with export_col3:
-    if st.button('🚨 Exportar Alertas'):
-        alertas_data = pd.concat([
+    boton_descarga(
+        lambda: pd.concat([
             comercios_riesgo[['NOMBRE_COMERCIO', 'EFICIENCIA', 'VALOR_PENDIENTE']].assign(TIPO='RIESGO'),
             comercios_atencion[['NOMBRE_COMERCIO', 'EFICIENCIA', 'VALOR_PENDIENTE']].assign(TIPO='ATENCION'),
             comercios_oportunidad[['NOMBRE_COMERCIO', 'EFICIENCIA', 'VALOR_PENDIENTE']].assign(TIPO='OPORTUNIDAD')
-        ])
-        csv_alertas = alertas_data.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="💾 Descargar Alertas CSV",
-            data=csv_alertas,
-            file_name=f"alertas_comercios_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime='text/csv'
-        )
+        ]),
+        f"alertas_comercios_{datetime.now().strftime('%Y%m%d')}",
+        etiqueta='🚨 Exportar Alertas',
+        formatos=('csv', 'xlsx'))
 
 # ==========================
 # RESUMEN EJECUTIVO MEJORADO (REEMPLAZAR EL EXISTENTE)
 # ==========================
+seccion("Resumen ejecutivo de comercios", len(df_filtered))
 st.markdown("### 📋 Resumen Ejecutivo de Comercios")
 
 # Seleccionar columnas relevantes para el resumen
@@ -1031,29 +918,27 @@ columnas_resumen = [
 
 tabla_resumen = agg_comercios[columnas_resumen].copy()
 
-# Aplicar formato mejorado
-styled_summary = tabla_resumen.style.format({
-    'VAL_PEDIDO': "${:,.0f}",
-    'VALOR_PENDIENTE': "${:,.0f}",
-    'VAL_ENTREGADO': "${:,.0f}",
-    'CANT_PEDIDA': "{:,.0f}",
-    'CANT_PENDIENTE': "{:,.0f}",
-    'CANT_ENTREGADA': "{:,.0f}",
-    'EFICIENCIA': "{:.1%}",
-    'EFICIENCIA_CANTIDAD': "{:.1%}"
-}).background_gradient(
-    subset=['VAL_PEDIDO'], cmap='YlGn'
-).background_gradient(
-    subset=['VALOR_PENDIENTE', 'CANT_PENDIENTE'], cmap='Reds'
-).background_gradient(
-    subset=['EFICIENCIA', 'EFICIENCIA_CANTIDAD'], cmap='RdYlGn'
+# Aplicar formato mejorado (barras en lugar de degradados de Styler)
+config_resumen = configurar_columnas(
+    tabla_resumen,
+    pesos=['VAL_PEDIDO', 'VALOR_PENDIENTE', 'VAL_ENTREGADO'],
+    enteros=['CANT_PEDIDA', 'CANT_PENDIENTE', 'CANT_ENTREGADA'],
+    porcentajes=['EFICIENCIA', 'EFICIENCIA_CANTIDAD'],
+    barras={
+        'VAL_PEDIDO': 'green',
+        'VALOR_PENDIENTE': 'red',
+        'CANT_PENDIENTE': 'red',
+        'EFICIENCIA': 'auto',
+        'EFICIENCIA_CANTIDAD': 'auto'
+    }
 )
 
-st.dataframe(styled_summary, use_container_width=True)
+mostrar_tabla(tabla_resumen, column_config=config_resumen, clave='resumen_comercios')
 
 # ==========================
 # TABLA DE COMERCIOS CRÍTICOS
 # ==========================
+seccion("Comercios críticos", len(df_filtered))
 st.markdown("### 🚨 Comercios que Requieren Atención Inmediata")
 
 comercios_criticos_detalle = agg_comercios[
@@ -1066,14 +951,16 @@ if len(comercios_criticos_detalle) > 0:
         'PROP_CANT_PENDIENTE', 'VALOR_PENDIENTE', 'CLASIFICACION_CANTIDAD'
     ]].copy()
     
-    st.dataframe(
-        tabla_criticos.style.format({
-            'CANT_PENDIENTE': "{:,.0f}",
-            'CANT_PEDIDA': "{:,.0f}",
-            'PROP_CANT_PENDIENTE': "{:.1%}",
-            'VALOR_PENDIENTE': "${:,.0f}"
-        }).background_gradient(subset=['PROP_CANT_PENDIENTE'], cmap='Reds'),
-        use_container_width=True
+    mostrar_tabla(
+        tabla_criticos,
+        column_config=configurar_columnas(
+            tabla_criticos,
+            pesos=['VALOR_PENDIENTE'],
+            enteros=['CANT_PENDIENTE', 'CANT_PEDIDA'],
+            porcentajes=['PROP_CANT_PENDIENTE'],
+            barras={'PROP_CANT_PENDIENTE': 'red'}
+        ),
+        clave='comercios_criticos'
     )
     
     # Estadísticas de comercios críticos
@@ -1092,4 +979,7 @@ else:
     st.success("✅ No hay comercios críticos en este momento")
 
 
-st.success("✅ Dashboard cargado exitosamente. Todos los análisis están actualizados con los datos filtrados.")
\ No newline at end of file
+st.success("✅ Dashboard cargado exitosamente. Todos los análisis están actualizados con los datos filtrados.")
+
+# Panel de rendimiento (solo si se activó en la barra lateral)
+mostrar_rendimiento()
@@ -14,6 +14,12 @@ import plotly.graph_objects as go
 import numpy as np
 from pandas.tseries.holiday import AbstractHolidayCalendar, Holiday
 from pandas.tseries.offsets import CustomBusinessDay
+import sys
+from pathlib import Path
+
+# Paquete compartido en la raíz del repositorio
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core.sheets import id_libro, url_csv, url_gviz_csv
 
 # Logo en la esquina superior
 top_col1, top_col2 = st.columns([0.7,0.3])
@@ -25,8 +31,8 @@ def cargar_datos(sheet_url):
     """Carga los datos desde Google Sheets"""
     try:
         # Convertir URL a formato CSV export
-        sheet_id = sheet_url.split('/d/')[1].split('/')[0]
-        csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=1456329364"
+        sheet_id = id_libro(sheet_url)
+        csv_url = url_csv(sheet_id, gid=1456329364)
         
         df = pd.read_csv(csv_url, header=1, keep_default_na=False, na_values=[''])
         
@@ -50,12 +56,6 @@ def cargar_datos(sheet_url):
         df['CUENTA'] = df['CUENTA'].astype(str).str.strip()
         df['EKM'] = df['EKM'].astype(str).str.strip()
 
-        # DIAGNÓSTICO - Temporal para ver qué hay en los datos
-        st.sidebar.write("🔍 Diagnóstico de datos:")
-        st.sidebar.write(f"Total filas cargadas: {len(df)}")
-        st.sidebar.write(f"Conteo por ESTATUS:")
-        st.sidebar.write(df['ESTATUS'].value_counts())
-
         return df
     except Exception as e:
         st.error(f"Error al cargar datos: {str(e)}")
@@ -65,8 +65,8 @@ def cargar_datos(sheet_url):
 def cargar_estatus(sheet_url):
     """Carga los datos de la hoja Estatus"""
     try:
-        sheet_id = sheet_url.split('/d/')[1].split('/')[0]
-        csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet=Estatus"
+        sheet_id = id_libro(sheet_url)
+        csv_url = url_gviz_csv(sheet_id, "Estatus")
         
         df_estatus = pd.read_csv(csv_url)
         
@@ -8,188 +8,62 @@ st.set_page_config(
 )
 
 import pandas as pd
-from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
-from pandas.tseries.holiday import AbstractHolidayCalendar, Holiday
-from pandas.tseries.offsets import CustomBusinessDay
+import os
+import sys
+from pathlib import Path
+
+# Paquete compartido en la raíz del repositorio
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core import historial_alertas
+from ekonomodo_core.instrumentacion import instrumentar, medir, seccion
+from ekonomodo_core.pipelines import control
+from ekonomodo_core.planificador import Planificador
+from ekonomodo_core.vistas.alertas import mostrar_alertas
+from ekonomodo_core.vistas.diagnostico import mostrar_diagnostico
+from ekonomodo_core.vistas.graficos import ANCHO_COMPLETO, figura, figura_series
+from ekonomodo_core.vistas.grilla import mostrar_grilla
+from ekonomodo_core.vistas.rendimiento import iniciar_rendimiento, mostrar_rendimiento
+from ekonomodo_core.vistas.tablas import mostrar_tabla
+
+# Panel de rendimiento (se activa desde la barra lateral)
+iniciar_rendimiento("control")
 
 # Logo en la esquina superior
 top_col1, top_col2 = st.columns([0.7,0.3])
 with top_col2:
     st.image("https://ekonomodo.com/cdn/shop/files/Logo-Ekonomodo-color.svg?v=1736956350&width=450", width=5000)
 
-@st.cache_data(ttl=300)  # Cache por 5 minutos
-def cargar_datos(sheet_url):
-    """Carga los datos desde Google Sheets"""
-    try:
-        # Convertir URL a formato CSV export
-        sheet_id = sheet_url.split('/d/')[1].split('/')[0]
-        csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=1456329364"
-        
-        df = pd.read_csv(csv_url, header=1, keep_default_na=False, na_values=[''])
-        
-        # Normalizar nombres de columnas
-        df = df.rename(columns={
-            'COMERCIAL ORDEN': 'ORDEN',
-            'PRODUCCION ESTATUS': 'ESTATUS'
-        })
-
-        # Convertir ORDEN a string limpio (sin .0), manejando valores vacíos
-        df['ORDEN'] = pd.to_numeric(df['ORDEN'], errors='coerce').fillna(0).astype(int).astype(str)
-        # Eliminar filas con ORDEN = "0" (que eran vacías o inválidas)
-        df = df[df['ORDEN'] != '0']
-        
-        # Convertir fechas
-        df['FECHA DE VENTA'] = pd.to_datetime(df['FECHA DE VENTA'], format='%d/%m/%Y', errors='coerce')
-        df['FECHA DE VENCIMIENTO'] = pd.to_datetime(df['FECHA DE VENCIMIENTO'], format='%d/%m/%Y', errors='coerce')
-
-        # Limpiar y normalizar datos
-        df['ORDEN'] = df['ORDEN'].astype(str).str.strip().str.upper()
-        df['ESTATUS'] = df['ESTATUS'].astype(str).str.strip().str.upper()
-        df['ESTATUS LOGISTICA'] = df['ESTATUS LOGISTICA'].astype(str).str.strip().str.upper()
-        df['CUENTA'] = df['CUENTA'].astype(str).str.strip()
-        df['EKM'] = df['EKM'].astype(str).str.strip()
+# Segundos entre recálculos del tablero en segundo plano
+INTERVALO_REFRESCO = 300
+# Historial de alertas (lo escribe el planificador en cada recálculo)
+RUTA_HISTORIAL = Path(os.environ.get("EKONOMODO_HISTORIAL_ALERTAS", Path(__file__).resolve().parent / "historial_alertas.sqlite"))
 
-        # DIAGNÓSTICO - Temporal para ver qué hay en los datos
-        st.sidebar.write("🔍 Diagnóstico de datos:")
-        st.sidebar.write(f"Total filas cargadas: {len(df)}")
-        st.sidebar.write(f"Conteo por ESTATUS:")
-        st.sidebar.write(df['ESTATUS'].value_counts())
-
-        return df
-    except Exception as e:
-        st.error(f"Error al cargar datos: {str(e)}")
-        return None
-    
-@st.cache_data(ttl=300)
-def cargar_estatus(sheet_url):
-    """Carga los datos de las hojas Estatus 2025 y Estatus 2026 y las combina"""
-    try:
-        sheet_id = sheet_url.split('/d/')[1].split('/')[0]
-        
-        # Lista para almacenar los dataframes
-        dfs_estatus = []
-        
-        # Cargar Estatus 2025
-        try:
-            csv_url_2025 = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet=Estatus%202025"
-            df_2025 = pd.read_csv(csv_url_2025)
-            dfs_estatus.append(df_2025)
-            # st.sidebar.write("✅ Estatus 2025 cargado")
-        except Exception as e:
-            st.sidebar.warning(f"⚠️ No se pudo cargar Estatus 2025: {str(e)}")
-        
-        # Cargar Estatus 2026
-        try:
-            csv_url_2026 = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet=Estatus%202026"
-            df_2026 = pd.read_csv(csv_url_2026)
-            dfs_estatus.append(df_2026)
-            # st.sidebar.write("✅ Estatus 2026 cargado")
-        except Exception as e:
-            st.sidebar.warning(f"⚠️ No se pudo cargar Estatus 2026: {str(e)}")
-        
-        # Combinar ambas hojas
-        if len(dfs_estatus) == 0:
-            st.error("No se pudo cargar ninguna hoja de Estatus")
-            return None
-        
-        df_estatus = pd.concat(dfs_estatus, ignore_index=True)
-        
-        # Renombrar columnas para que sea más fácil trabajar
-        df_estatus = df_estatus.rename(columns={
-            'Marca temporal': 'FECHA_ENTREGA',
-            'N° Orden': 'ORDEN'
-        })
-
-        # Convertir ORDEN a entero primero (elimina .0) y luego a string
-        df_estatus['ORDEN'] = df_estatus['ORDEN'].fillna(0).astype(float).astype(int).astype(str)
-        
-        # Convertir fecha de entrega a datetime
-        df_estatus['FECHA_ENTREGA'] = pd.to_datetime(df_estatus['FECHA_ENTREGA'], format='mixed', dayfirst=True, errors='coerce')
-        
-        # st.sidebar.write(f"📊 Total registros de entrega: {len(df_estatus)}")
-        
-        return df_estatus
-    except Exception as e:
-        st.error(f"Error al cargar estatus: {str(e)}")
-        return None
-    
-def dias_habiles_colombia(fecha_inicio, dias_habiles_objetivo):
+@st.cache_resource
+def planificador_control(sheet_url):
     """
-    Calcula la fecha después de X días hábiles en Colombia (excluyendo fines de semana y festivos)
+    Un solo planificador por proceso: recarga el Sheet y recalcula alertas y
+    agregados cada INTERVALO_REFRESCO segundos; todas las sesiones leen su
+    última instantánea en lugar de recalcular en cada ejecución. Los
+    histogramas de tiempos viven con el planificador: cada recálculo solo
+    suma las entregas nuevas.
     """
-    cal = ColombiaHolidayCalendar()
-    fecha_actual = pd.Timestamp(fecha_inicio)
-    dias_contados = 0
-    
-    while dias_contados < dias_habiles_objetivo:
-        fecha_actual += timedelta(days=1)
-        # Si es día hábil (no fin de semana ni festivo)
-        if fecha_actual.weekday() < 5 and fecha_actual not in cal.holidays():
-            dias_contados += 1
-    
-    return fecha_actual
+    histogramas = control.crear_histogramas()
+    return Planificador("control",
+                        lambda: control.calcular_tablero(sheet_url, historial=RUTA_HISTORIAL, histogramas=histogramas),
+                        INTERVALO_REFRESCO)
 
-class ColombiaHolidayCalendar(AbstractHolidayCalendar):
-    """Calendario de festivos de Colombia"""
-    rules = [
-        # Festivos fijos
-        Holiday('Año Nuevo', month=1, day=1),
-        Holiday('Día del Trabajo', month=5, day=1),
-        Holiday('Día de la Independencia', month=7, day=20),
-        Holiday('Batalla de Boyacá', month=8, day=7),
-        Holiday('Inmaculada Concepción', month=12, day=8),
-        Holiday('Navidad', month=12, day=25),
-        
-        # Festivos 2024
-        Holiday('Reyes Magos 2024', month=1, day=8, year=2024),
-        Holiday('San José 2024', month=3, day=25, year=2024),
-        Holiday('Jueves Santo 2024', month=3, day=28, year=2024),
-        Holiday('Viernes Santo 2024', month=3, day=29, year=2024),
-        Holiday('Ascensión 2024', month=5, day=13, year=2024),
-        Holiday('Corpus Christi 2024', month=6, day=3, year=2024),
-        Holiday('Sagrado Corazón 2024', month=6, day=10, year=2024),
-        Holiday('San Pedro y San Pablo 2024', month=7, day=1, year=2024),
-        Holiday('Asunción 2024', month=8, day=19, year=2024),
-        Holiday('Día de la Raza 2024', month=10, day=14, year=2024),
-        Holiday('Todos los Santos 2024', month=11, day=4, year=2024),
-        Holiday('Independencia de Cartagena 2024', month=11, day=11, year=2024),
-        
-        # Festivos 2025
-        Holiday('Reyes Magos 2025', month=1, day=6, year=2025),
-        Holiday('San José 2025', month=3, day=24, year=2025),
-        Holiday('Jueves Santo 2025', month=4, day=17, year=2025),
-        Holiday('Viernes Santo 2025', month=4, day=18, year=2025),
-        Holiday('Ascensión 2025', month=6, day=2, year=2025),
-        Holiday('Corpus Christi 2025', month=6, day=23, year=2025),
-        Holiday('Sagrado Corazón 2025', month=6, day=30, year=2025),
-        Holiday('San Pedro y San Pablo 2025', month=6, day=30, year=2025),
-        Holiday('Asunción 2025', month=8, day=18, year=2025),
-        Holiday('Día de la Raza 2025', month=10, day=13, year=2025),
-        Holiday('Todos los Santos 2025', month=11, day=3, year=2025),
-        Holiday('Independencia de Cartagena 2025', month=11, day=17, year=2025),
-    ]
+@instrumentar("Instantánea del tablero")
+def leer_tablero(sheet_url):
+    return planificador_control(sheet_url).actual()
 
-def calcular_dias_habiles(fecha_inicio, fecha_fin):
-    """
-    Calcula días hábiles entre dos fechas excluyendo fines de semana y festivos colombianos
-    """
-    if pd.isna(fecha_inicio) or pd.isna(fecha_fin):
-        return None
-    
-    # Crear calendario colombiano
-    cal = ColombiaHolidayCalendar()
-    
-    # Crear rango de días hábiles
-    dias_habiles = pd.bdate_range(
-        start=fecha_inicio,
-        end=fecha_fin,
-        freq=CustomBusinessDay(calendar=cal)
-    )
-    
-    return len(dias_habiles)
+@instrumentar()
+@st.cache_data(ttl=INTERVALO_REFRESCO, show_spinner=False)
+def leer_historial(ruta, dias, generacion):
+    """Conteos de alertas de los últimos ``dias``; ``generacion`` invalida el cache con cada instantánea"""
+    return historial_alertas.consultar_conteos(ruta, desde=pd.Timestamp.now() - pd.Timedelta(days=dias))
 
 # Título principal
 st.title("Control de Producción y Logística - Ekonomodo")
@@ -197,239 +71,72 @@ st.title("Control de Producción y Logística - Ekonomodo")
 st.sidebar.header("⚙️ Configuración")
 
 # URL fija del Google Sheet de Control
-sheet_url = "https://docs.google.com/spreadsheets/d/1zIax4vUnzs8p2UJBgXqM2DxeHOYO_llGN5iJrC4hNlM/edit?resourcekey=&gid=218363912#gid=218363912"
+sheet_url = control.URL_CONTROL
 
 # Selector de rango de días
 dias_historico = st.sidebar.selectbox(
     "📅 Rango de datos históricos",
-    options=[30, 60, 90, 180, 365],
+    options=list(control.VENTANAS_HISTORICO),
     index=2,  # Por defecto 60 días
     format_func=lambda x: f"Últimos {x} días"
 )
 
 if sheet_url:
     try:
-        df = cargar_datos(sheet_url)
-        df_estatus = cargar_estatus(sheet_url)
+        instantanea = leer_tablero(sheet_url)
         
-        if df is not None and not df.empty:
-            # Filtrar por último mes
-            fecha_actual = datetime.now()
-            fecha_mes_atras = fecha_actual - timedelta(days=dias_historico)
-            df_ultimo_mes = df[df['FECHA DE VENTA'] >= fecha_mes_atras]
-
-            # Cruzar con datos de entrega y calcular días de producción
-            if df_estatus is not None:
-                
-                # Tomar solo la última entrega por orden (por si hay múltiples registros)
-                df_estatus_ultimo = df_estatus.groupby('ORDEN').agg({
-                    'FECHA_ENTREGA': 'max'
-                }).reset_index()
-                
-                # st.sidebar.write(f"Después de agrupar: {len(df_estatus_ultimo)} órdenes únicas")
-                
-                # Cruzar datos
-                df_ultimo_mes = df_ultimo_mes.merge(
-                    df_estatus_ultimo, 
-                    on='ORDEN', 
-                    how='left'
-                )
-                
-                # st.sidebar.write(f"Después del merge, órdenes con FECHA_ENTREGA: {df_ultimo_mes['FECHA_ENTREGA'].notna().sum()}")
-                
-            # Calcular días de producción en días hábiles (solo para órdenes con fecha de entrega)
-            df_ultimo_mes['DIAS_PRODUCCION'] = None
-            mask = df_ultimo_mes['FECHA_ENTREGA'].notna() & df_ultimo_mes['FECHA DE VENTA'].notna()
-
-            # Calcular días hábiles para cada orden
-            for idx in df_ultimo_mes[mask].index:
-                dias = calcular_dias_habiles(
-                    df_ultimo_mes.loc[idx, 'FECHA DE VENTA'],
-                    df_ultimo_mes.loc[idx, 'FECHA_ENTREGA']
-                )
-                df_ultimo_mes.loc[idx, 'DIAS_PRODUCCION'] = dias
+        # Los avisos de carga se muestran en cada ejecución
+        mostrar_diagnostico(instantanea.diagnostico, niveles=("error",))
+        mostrar_diagnostico(instantanea.diagnostico, contenedor=st.sidebar, niveles=("advertencia",))
+        
+        if instantanea.datos is not None:
+            # Órdenes, alertas y agregados ya calculados para la ventana elegida
+            fecha_actual = instantanea.datos['fecha']
+            ventana = instantanea.datos['ventanas'][dias_historico]
+            df_ultimo_mes = ventana['periodo']
+            alertas = ventana['alertas']
+            agregados = ventana['agregados']
             
         # ==== ALERTAS PRINCIPALES ====
+        seccion("🚨 Alertas", len(df_ultimo_mes))
         st.header("🚨 Alertas Importantes")
 
-        # Primera fila de alertas
-        col1, col2, col3 = st.columns(3)
-
-        # 1. ALERTA: Órdenes vencidas
-        vencidas = df_ultimo_mes[
-            (df_ultimo_mes['FECHA DE VENCIMIENTO'] < fecha_actual) &
-            (df_ultimo_mes['ESTATUS'] == 'PRODUCCION')
-        ]
-
-        with col1:
-            if len(vencidas) > 0:
-                st.error(f"🔴 {len(vencidas)} órdenes de producción VENCIDAS")
-                with st.expander("Ver detalles"):
-                    # Calcular días de tardanza en días hábiles para las vencidas
-                    vencidas_display = vencidas.copy()
-                    vencidas_display['DIAS_TARDANZA'] = vencidas_display.apply(
-                        lambda row: calcular_dias_habiles(row['FECHA DE VENTA'], fecha_actual),
-                        axis=1
-                    )
-                    
-                    # Crear función para colorear las celdas
-                    def colorear_tardanza(val):
-                        if pd.isna(val):
-                            return ''
-                        if val <= 7:
-                            return 'background-color: #90EE90'  # Verde claro
-                        elif val <= 14:
-                            return 'background-color: #FFD700'  # Amarillo
-                        elif val <= 21:
-                            return 'background-color: #FFA500'  # Naranja
-                        else:
-                            return 'background-color: #FF6B6B'  # Rojo claro
-                    
-                    # Mostrar dataframe con estilo
-                    styled_df = vencidas_display[['ORDEN', 'CUENTA', 'DESCRIPCION PLATAFORMA', 
-                            'FECHA DE VENCIMIENTO', 'ESTATUS', 'DIAS_TARDANZA']].style.map(
-                                colorear_tardanza, subset=['DIAS_TARDANZA']
-                            )
-                    
-                    st.dataframe(styled_df, hide_index=True, use_container_width=True)
-            else:
-                st.success("✅ No hay órdenes vencidas")
-
-        # 2. ALERTA: Próximos a vencer en 2 días hábiles
-        fecha_limite = dias_habiles_colombia(fecha_actual, 2)
-        proximos_vencer = df_ultimo_mes[
-            (df_ultimo_mes['FECHA DE VENCIMIENTO'] <= fecha_limite) & 
-            (df_ultimo_mes['FECHA DE VENCIMIENTO'] >= fecha_actual) &
-            (df_ultimo_mes['ESTATUS'] == 'PRODUCCION')
-        ]
-
-        with col2:
-            if len(proximos_vencer) > 0:
-                st.error(f"⚠️ {len(proximos_vencer)} órdenes de producción vencen en 2 días hábiles")
-                with st.expander("Ver detalles"):
-                    st.dataframe(
-                        proximos_vencer[['ORDEN', 'CUENTA', 'DESCRIPCION PLATAFORMA', 
-                                    'FECHA DE VENCIMIENTO', 'ESTATUS']],
-                        hide_index=True
-                    )
-            else:
-                st.success("✅ No hay órdenes próximas a vencer")
-
-        # 3. ALERTA: Devoluciones
-        devoluciones = df_ultimo_mes[df_ultimo_mes['ESTATUS LOGISTICA'] == 'DEVOLUCION']
-
-        with col3:
-            if len(devoluciones) > 0:
-                st.error(f"🔄 {len(devoluciones)} devoluciones pendientes")
-                with st.expander("Ver detalles"):
-                    st.dataframe(
-                        devoluciones[['ORDEN', 'CUENTA', 'DESCRIPCION PLATAFORMA', 'EKM']],
-                        hide_index=True
-                    )
-            else:
-                st.success("✅ No hay devoluciones")
-
-        # Segunda fila de alertas
-        col4, col5, col6 = st.columns(3)
-
-        # 4. ALERTA: Entregados pero no recibidos en logística
-        entregados_no_recibidos = df_ultimo_mes[
-            (df_ultimo_mes['ESTATUS'] == 'ENTREGADO') & 
-            (df_ultimo_mes['ESTATUS LOGISTICA'].isna() | (df_ultimo_mes['ESTATUS LOGISTICA'] == '') | (df_ultimo_mes['ESTATUS LOGISTICA'] == 'NAN'))
-        ]
-
-        with col4:
-            if len(entregados_no_recibidos) > 0:
-                st.warning(f"⚠️ {len(entregados_no_recibidos)} entregados sin recibir en logística")
-                with st.expander("Ver detalles"):
-                    st.dataframe(
-                        entregados_no_recibidos[['ORDEN', 'CUENTA', 'DESCRIPCION PLATAFORMA', 'CANTIDAD', 'EKM']],
-                        hide_index=True
-                    )
-            else:
-                st.success("✅ Todos los entregados recibidos")
-
-        # 5. ALERTA: Pendientes de despacho en logística
-        pendientes_despacho = df_ultimo_mes[
-            (df_ultimo_mes['ESTATUS'].isin(['IMPORTADO', 'PRODUCCION', 'ENTREGADO'])) & 
-            (~df_ultimo_mes['LOGISTICA'].isin(['ENTREGADO', 'DESPACHADO']))
-        ]
-
-        with col5:
-            if len(pendientes_despacho) > 0:
-                st.warning(f"📦 {len(pendientes_despacho)} órdenes sin despachar")
-                with st.expander("Ver detalles"):
-                    st.dataframe(
-                        pendientes_despacho[['ORDEN', 'CUENTA', 'FECHA DE VENTA', 'FECHA DE VENCIMIENTO', 'DESCRIPCION PLATAFORMA', 
-                                            'CANTIDAD', 'ESTATUS', 'LOGISTICA']],
-                        hide_index=True
-                    )
-            else:
-                st.success("✅ Todo despachado")
-
-        # 6. ALERTA: Órdenes sin facturar
-        # Filtrar solo órdenes válidas (que tienen número en ORDEN, no están canceladas)
-        ordenes_validas = df_ultimo_mes[
-            df_ultimo_mes['ORDEN'].notna() & 
-            (df_ultimo_mes['ORDEN'] != '') & 
-            (df_ultimo_mes['ORDEN'] != 'NAN') &
-            (df_ultimo_mes['ESTATUS'] != 'CANCELADO')
-        ].copy()
-
-        # Convertir FACTURADO a string para análisis
-        ordenes_validas['FACTURADO_STR'] = ordenes_validas['FACTURADO'].astype(str).str.strip()
+        # Tres alertas por fila, declaradas en control.REGLAS_ALERTAS
+        mostrar_alertas(control.REGLAS_ALERTAS, alertas)
 
-        # Convertir a numérico para detectar ceros
-        ordenes_validas['FACTURADO_NUM'] = pd.to_numeric(ordenes_validas['FACTURADO'], errors='coerce')
-
-        # Filtrar NO FACTURADAS: Tienen ORDEN válido y FACTURADO = 0
-        no_facturadas = ordenes_validas[ordenes_validas['FACTURADO_NUM'] == 0]
-
-        with col6:
-            if len(no_facturadas) > 0:
-                st.error(f"💰 {len(no_facturadas)} órdenes NO facturadas")
-                with st.expander("Ver detalles"):
-                    st.dataframe(
-                        no_facturadas[['ORDEN', 'CUENTA', 'FECHA DE VENTA', 'DESCRIPCION PLATAFORMA', 
-                                    'ESTATUS', 'ESTATUS LOGISTICA', 'FACTURADO']],
-                        hide_index=True,
-                        use_container_width=True
-                    )
+        # Historial de alertas (ventana de histórico más larga)
+        with st.expander("📉 Historial de alertas"):
+            dias_historial = st.selectbox(
+                "Periodo del historial",
+                options=[1, 7, 30, 90],
+                index=1,
+                format_func=lambda x: f"Últimos {x} días"
+            )
+            if RUTA_HISTORIAL.exists():
+                historial = leer_historial(RUTA_HISTORIAL, dias_historial, instantanea.generacion)
             else:
-                st.success("✅ Todas las órdenes facturadas")
-
-        # Tercera fila de alertas
-        col7, col8, col9 = st.columns(3)
-
-        # 7. ALERTA: No registradas en Siigo
-        # Tienen ORDEN válido pero FACTURADO contiene '#N/A' o variaciones
-        no_registradas = ordenes_validas[
-            (ordenes_validas['FACTURADO_STR'].str.contains('#N/A', case=False, na=False)) |
-            (ordenes_validas['FACTURADO_STR'].str.upper() == '#N/A') |
-            (ordenes_validas['FACTURADO_STR'] == 'N/A') |
-            (ordenes_validas['FACTURADO'].isna())
-        ]
-
-        with col7:
-            if len(no_registradas) > 0:
-                st.warning(f"⚠️ {len(no_registradas)} órdenes no registradas en Siigo")
-                with st.expander("Ver detalles"):
-                    st.dataframe(
-                        no_registradas[['ORDEN', 'CUENTA', 'FECHA DE VENTA', 'DESCRIPCION PLATAFORMA', 
-                                    'ESTATUS', 'ESTATUS LOGISTICA', 'FACTURADO']],
-                        hide_index=True,
-                        use_container_width=True
-                    )
+                historial = pd.DataFrame()
+            
+            if len(historial) > 0:
+                historial['alerta'] = historial['alerta'].str.replace('_', ' ').str.capitalize()
+                fig = px.line(historial, x='momento', y='conteo', color='alerta',
+                            labels={'momento': '', 'conteo': 'Órdenes', 'alerta': 'Alerta'},
+                            title=f'Alertas en los últimos {dias_historial} días',
+                            line_shape='hv')
+                st.plotly_chart(fig, use_container_width=True)
+                st.caption(f"{historial['momento'].nunique()} registros, uno por recálculo del tablero "
+                        f"(cada {INTERVALO_REFRESCO // 60} minutos)")
             else:
-                st.success("✅ Todas registradas en Siigo")
+                st.info("Todavía no hay historial de alertas en este periodo")
 
         st.divider()
 
         # ==== ESTADÍSTICA Y ANALÍTICA ====
+        seccion("📈 Estadística y analítica", len(df_ultimo_mes))
         st.header("📈 Estadística y Analítica")
 
-        # Filtrar datos de los últimos 30 días para análisis diario
-        df_analisis = df_ultimo_mes.copy()
+        # Los agregados vienen de la instantánea; no se modifican en sitio
+        df_analisis = df_ultimo_mes
 
         # Preparar datos para análisis temporal
         tab_stat1, tab_stat2, tab_stat3, tab_stat4 = st.tabs([
@@ -439,7 +146,7 @@ if sheet_url:
             "📉 Tendencias"
         ])
 
-        with tab_stat1:
+        with tab_stat1, medir("📊 Flujo Diario", len(df_analisis)):
             st.subheader("Flujo de Órdenes Diario")
 
             col1, col2 = st.columns(2)
@@ -447,14 +154,12 @@ if sheet_url:
             with col1:
                 # Órdenes que pasaron por PRODUCCION (incluyendo las ya ENTREGADAS)
                 st.markdown("**Entradas a Producción por día**")
-                entradas_prod = df_analisis[df_analisis['ESTATUS'].isin(['PRODUCCION', 'ENTREGADO'])]
-                entradas_prod_dia = entradas_prod.groupby(entradas_prod['FECHA DE VENTA'].dt.date).size().reset_index()
-                entradas_prod_dia.columns = ['Fecha', 'Cantidad']
+                entradas_prod_dia = agregados['entradas_prod_dia']
                 
                 if len(entradas_prod_dia) > 0:
-                    fig = px.line(entradas_prod_dia, x='Fecha', y='Cantidad', 
-                                title='Órdenes entrando a Producción',
-                                markers=True)
+                    fig = figura_series(entradas_prod_dia, 'Fecha', 'Cantidad',
+                                        titulo='Órdenes entrando a Producción',
+                                        ancho=ANCHO_COMPLETO // 2)
                     st.plotly_chart(fig, use_container_width=True)
                     st.metric("Promedio diario", f"{entradas_prod_dia['Cantidad'].mean():.1f} órdenes")
                 else:
@@ -463,14 +168,12 @@ if sheet_url:
             with col2:
                 # Órdenes entrando a IMPORTADO por día
                 st.markdown("**Entradas a IMPORTADO por día**")
-                entradas_log = df_analisis[df_analisis['ESTATUS'].isin(['IMPORTADO'])]
-                entradas_log_dia = entradas_log.groupby(entradas_log['FECHA DE VENTA'].dt.date).size().reset_index()
-                entradas_log_dia.columns = ['Fecha', 'Cantidad']
+                entradas_log_dia = agregados['entradas_log_dia']
                 
                 if len(entradas_log_dia) > 0:
-                    fig = px.line(entradas_log_dia, x='Fecha', y='Cantidad',
-                                title='Órdenes entrando a IMPORTADO',
-                                markers=True, color_discrete_sequence=['orange'])
+                    fig = figura_series(entradas_log_dia, 'Fecha', 'Cantidad',
+                                        titulo='Órdenes entrando a IMPORTADO',
+                                        colores=['orange'], ancho=ANCHO_COMPLETO // 2)
                     st.plotly_chart(fig, use_container_width=True)
                     st.metric("Promedio diario", f"{entradas_log_dia['Cantidad'].mean():.1f} órdenes")
                 else:
@@ -483,9 +186,8 @@ if sheet_url:
             col1, col2, col3 = st.columns(3)
             
             # Órdenes entregadas por día
-            entregadas = df_analisis[df_analisis['FECHA_ENTREGA'].notna()]
-            if len(entregadas) > 0:
-                entregadas_dia = entregadas.groupby(entregadas['FECHA_ENTREGA'].dt.date).size()
+            entregadas_dia = agregados['entregadas_dia']
+            if len(entregadas_dia) > 0:
                 promedio_salida = entregadas_dia.mean()
             else:
                 promedio_salida = 0
@@ -503,7 +205,7 @@ if sheet_url:
                 st.metric("Diferencia", f"{diferencia:+.1f} órdenes", 
                         delta_color="inverse" if diferencia > 0 else "normal")
             
-            if len(entregadas) > 0:
+            if len(entregadas_dia) > 0:
                 # Gráfico comparativo
                 comparacion = pd.DataFrame({
                     'Fecha': list(entradas_prod_dia['Fecha']) + list(entregadas_dia.index),
@@ -511,9 +213,8 @@ if sheet_url:
                     'Tipo': ['Entrada']*len(entradas_prod_dia) + ['Salida']*len(entregadas_dia)
                 })
                 
-                fig = px.line(comparacion, x='Fecha', y='Cantidad', color='Tipo',
-                            title='Comparación Entrada vs Salida en Producción',
-                            markers=True)
+                fig = figura_series(comparacion, 'Fecha', 'Cantidad', color='Tipo',
+                                    titulo='Comparación Entrada vs Salida en Producción')
                 st.plotly_chart(fig, use_container_width=True)
 
         # Tabla detallada de flujo diario
@@ -521,11 +222,11 @@ if sheet_url:
             st.markdown("**📊 Tabla de Flujo Diario**")
             
             # Crear tabla combinada
-            if len(entradas_prod_dia) > 0 or len(entregadas) > 0:
+            if len(entradas_prod_dia) > 0 or len(entregadas_dia) > 0:
                 tabla_flujo = entradas_prod_dia.copy()
                 tabla_flujo = tabla_flujo.rename(columns={'Cantidad': 'Entradas'})
                 
-                if len(entregadas) > 0:
+                if len(entregadas_dia) > 0:
                     salidas_df = entregadas_dia.reset_index()
                     salidas_df.columns = ['Fecha', 'Salidas']
                     tabla_flujo = tabla_flujo.merge(salidas_df, on='Fecha', how='outer')
@@ -543,32 +244,25 @@ if sheet_url:
                 
                 st.dataframe(tabla_flujo, hide_index=True, use_container_width=True)           
 
-        with tab_stat2:
+        with tab_stat2, medir("🔥 Productos Populares", len(df_analisis)):
             st.subheader("Productos Más Populares")
             
             col1, col2 = st.columns(2)
             
             with col1:
                 st.markdown("**🏭 Top 10 en Producción**")
-                prod_data = df_analisis[df_analisis['ESTATUS'].isin(['PRODUCCION', 'ENTREGADO'])].groupby('EKM').agg({
-                    'ORDEN': 'count',
-                    'DESCRIPCION PLATAFORMA': 'first'
-                }).reset_index()
-                prod_data.columns = ['EKM', 'Cantidad', 'Descripción']
-                prod_data = prod_data.sort_values('Cantidad', ascending=False).head(10)
+                # Top 10 con etiqueta combinada (EKM - descripción)
+                prod_data = agregados['top_produccion']
                 
                 if len(prod_data) > 0:
-                    # Crear etiqueta combinada
-                    prod_data['Label'] = prod_data['EKM'] + ' - ' + prod_data['Descripción'].str[:30]
-                    
-                    fig = px.bar(prod_data, x='Cantidad', y='Label', 
+                    fig = figura(px.bar, prod_data, x='Cantidad', y='Label', 
                                 orientation='h',
                                 labels={'Cantidad': 'Cantidad de Órdenes', 'Label': ''},
                                 title='Productos más frecuentes en Producción',
                                 color='Cantidad',
                                 color_continuous_scale='Reds',
-                                hover_data={'EKM': True, 'Descripción': True})
-                    fig.update_layout(yaxis={'categoryorder':'total ascending'})
+                                hover_data={'EKM': True, 'Descripción': True},
+                                diseno=dict(yaxis={'categoryorder':'total ascending'}))
                     st.plotly_chart(fig, use_container_width=True)
                     
                     # Tabla detallada
@@ -578,25 +272,17 @@ if sheet_url:
             
             with col2:
                 st.markdown("**📦 Top 10 en IMPORTADO**")
-                log_data = df_analisis[df_analisis['ESTATUS'] == 'IMPORTADO'].groupby('EKM').agg({
-                    'ORDEN': 'count',
-                    'DESCRIPCION PLATAFORMA': 'first'
-                }).reset_index()
-                log_data.columns = ['EKM', 'Cantidad', 'Descripción']
-                log_data = log_data.sort_values('Cantidad', ascending=False).head(10)
+                log_data = agregados['top_importado']
                 
                 if len(log_data) > 0:
-                    # Crear etiqueta combinada
-                    log_data['Label'] = log_data['EKM'] + ' - ' + log_data['Descripción'].str[:30]
-                    
-                    fig = px.bar(log_data, x='Cantidad', y='Label',
+                    fig = figura(px.bar, log_data, x='Cantidad', y='Label',
                                 orientation='h',
                                 labels={'Cantidad': 'Cantidad de Órdenes', 'Label': ''},
                                 title='Productos más frecuentes en Logística',
                                 color='Cantidad',
                                 color_continuous_scale='Blues',
-                                hover_data={'EKM': True, 'Descripción': True})
-                    fig.update_layout(yaxis={'categoryorder':'total ascending'})
+                                hover_data={'EKM': True, 'Descripción': True},
+                                diseno=dict(yaxis={'categoryorder':'total ascending'}))
                     st.plotly_chart(fig, use_container_width=True)
                     
                     # Tabla detallada
@@ -604,80 +290,74 @@ if sheet_url:
                 else:
                     st.info("No hay órdenes en logística")
 
-        with tab_stat3:
+        with tab_stat3, medir("⚡ Velocidad de Producción", len(df_analisis)):
             st.subheader("Velocidad de Producción por Producto")
             
-            # Calcular mediana de días de producción por EKM (PRODUCCION + ENTREGADO)
-            ordenes_con_tiempo = df_analisis[
-                (df_analisis['ESTATUS'].isin(['PRODUCCION', 'ENTREGADO'])) &
-                (df_analisis['DIAS_PRODUCCION'].notna())
-            ].copy()
+            # Percentiles de días de producción por EKM (PRODUCCION + ENTREGADO, al menos 3 órdenes)
+            ordenes_con_tiempo = agregados['ordenes_con_tiempo']
             
             if len(ordenes_con_tiempo) > 0:
-                velocidad_por_ekm = ordenes_con_tiempo.groupby('EKM').agg({
-                    'DIAS_PRODUCCION': [('mediana', 'median'), ('promedio', 'mean'), ('cantidad', 'count')],
-                    'DESCRIPCION PLATAFORMA': 'first'
-                }).reset_index()
-
-                # Aplanar columnas
-                velocidad_por_ekm.columns = ['EKM', 'mediana', 'promedio', 'cantidad', 'Descripción']
-
-                # AGREGAR ESTA LÍNEA:
-                velocidad_por_ekm['mediana'] = pd.to_numeric(velocidad_por_ekm['mediana'], errors='coerce')
-                velocidad_por_ekm['promedio'] = pd.to_numeric(velocidad_por_ekm['promedio'], errors='coerce')
-
-                # Filtrar productos con al menos 3 órdenes completadas
-                velocidad_por_ekm = velocidad_por_ekm[velocidad_por_ekm['cantidad'] >= 3]
-                    
-                # Filtrar productos con al menos 3 órdenes completadas
-                velocidad_por_ekm = velocidad_por_ekm[velocidad_por_ekm['cantidad'] >= 3]
+                velocidad_por_ekm = agregados['velocidad_por_ekm']
+                
+                # p90/p95: cuánto tarda un producto en sus órdenes lentas, no solo la típica
+                percentil = st.radio(
+                    "Ordenar por",
+                    options=['mediana', 'p90', 'p95'],
+                    format_func={'mediana': 'Mediana (p50)', 'p90': 'Percentil 90', 'p95': 'Percentil 95'}.get,
+                    horizontal=True
+                )
                 
                 if len(velocidad_por_ekm) > 0:
                     col1, col2 = st.columns(2)
                     
                     with col1:
                         st.markdown("**⚡ Top 10 Más Rápidos**")
-                        mas_rapidos = velocidad_por_ekm.sort_values('mediana').head(10)
+                        mas_rapidos = velocidad_por_ekm.sort_values(percentil).head(10)
                         mas_rapidos['Label'] = mas_rapidos['EKM'] + ' - ' + mas_rapidos['Descripción'].str[:25]
                         
-                        fig = px.bar(mas_rapidos, x='mediana', y='Label',
+                        fig = px.bar(mas_rapidos, x=percentil, y='Label',
                                     orientation='h',
-                                    labels={'mediana': 'Días (mediana)', 'Label': ''},
+                                    labels={percentil: f'Días ({percentil})', 'Label': ''},
                                     title='Productos con menor tiempo de producción',
-                                    color='mediana',
+                                    color=percentil,
                                     color_continuous_scale='Greens_r',
-                                    hover_data={'cantidad': True, 'promedio': ':.1f'})
+                                    hover_data={'cantidad': True, 'promedio': ':.1f', 'mediana': True, 'p90': True})
                         fig.update_layout(yaxis={'categoryorder':'total ascending'})
                         st.plotly_chart(fig, use_container_width=True)
                     
                     with col2:
                         st.markdown("**🐌 Top 10 Más Lentos**")
-                        mas_lentos = velocidad_por_ekm.sort_values('mediana', ascending=False).head(10)
+                        mas_lentos = velocidad_por_ekm.sort_values(percentil, ascending=False).head(10)
                         mas_lentos['Label'] = mas_lentos['EKM'] + ' - ' + mas_lentos['Descripción'].str[:25]
                         
-                        fig = px.bar(mas_lentos, x='mediana', y='Label',
+                        fig = px.bar(mas_lentos, x=percentil, y='Label',
                                     orientation='h',
-                                    labels={'mediana': 'Días (mediana)', 'Label': ''},
+                                    labels={percentil: f'Días ({percentil})', 'Label': ''},
                                     title='Productos con mayor tiempo de producción',
-                                    color='mediana',
+                                    color=percentil,
                                     color_continuous_scale='Reds',
-                                    hover_data={'cantidad': True, 'promedio': ':.1f'})
+                                    hover_data={'cantidad': True, 'promedio': ':.1f', 'mediana': True, 'p90': True})
                         fig.update_layout(yaxis={'categoryorder':'total descending'})
                         st.plotly_chart(fig, use_container_width=True)
                     
                     # Tabla detallada
                     st.divider()
                     st.markdown("**📊 Tabla Completa de Tiempos de Producción**")
-                    velocidad_display = velocidad_por_ekm.sort_values('mediana')
-                    velocidad_display['mediana'] = velocidad_display['mediana'].round(1)
-                    velocidad_display['promedio'] = velocidad_display['promedio'].round(1)
+                    velocidad_display = velocidad_por_ekm.sort_values(percentil)
+                    velocidad_display[['mediana', 'promedio', 'p90', 'p95']] = velocidad_display[['mediana', 'promedio', 'p90', 'p95']].round(1)
                     st.dataframe(velocidad_display, hide_index=True, use_container_width=True)
+                    
+                    # Mismos percentiles por cuenta (canal de venta)
+                    st.markdown("**🏬 Tiempos de Producción por Cuenta**")
+                    velocidad_cuenta = agregados['velocidad_por_cuenta'].sort_values(percentil)
+                    velocidad_cuenta[['mediana', 'promedio', 'p90', 'p95']] = velocidad_cuenta[['mediana', 'promedio', 'p90', 'p95']].round(1)
+                    st.dataframe(velocidad_cuenta, hide_index=True, use_container_width=True)
                 else:
                     st.info("No hay suficientes datos. Se necesitan al menos 3 órdenes completadas por producto.")
             else:
                 st.info("No hay órdenes con tiempo de producción calculado aún.")
 
-        with tab_stat4:
+        with tab_stat4, medir("📉 Tendencias", len(df_analisis)):
             st.subheader("Tendencias Generales")
             
             # Distribución de días de producción
@@ -715,14 +395,17 @@ if sheet_url:
                     st.metric("Máximo", f"{ordenes_con_tiempo['DIAS_PRODUCCION'].max():.0f} días")
             
         # ==== VISUALIZACIONES ====
+        seccion("📊 Visualizaciones", len(df_ultimo_mes))
         st.header("📊 Visualizaciones Generales")
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("Estado de Órdenes")
-            estatus_counts = df_ultimo_mes['ESTATUS'].value_counts()
-            fig = px.pie(
+            # ESTATUS es categórica: se omiten los estatus sin órdenes en el periodo
+            estatus_counts = df_ultimo_mes['ESTATUS'].value_counts().loc[lambda conteos: conteos > 0]
+            fig = figura(
+                px.pie,
                 values=estatus_counts.values,
                 names=estatus_counts.index,
                 title="Distribución por Estatus",
@@ -733,7 +416,8 @@ if sheet_url:
         with col2:
             st.subheader("Órdenes por Cuenta")
             cuenta_counts = df_ultimo_mes['CUENTA'].value_counts().head(10)
-            fig = px.bar(
+            fig = figura(
+                px.bar,
                 x=cuenta_counts.index,
                 y=cuenta_counts.values,
                 title="Top 10 Cuentas",
@@ -746,6 +430,7 @@ if sheet_url:
         st.divider()
         
         # ==== TABLAS DETALLADAS ====
+        seccion("📋 Detalle de órdenes", len(df_ultimo_mes))
         st.header("📋 Detalle de Órdenes")
         
         tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -758,11 +443,10 @@ if sheet_url:
         
         with tab1:
             produccion = df_ultimo_mes[df_ultimo_mes['ESTATUS'] == 'PRODUCCION']
-            st.dataframe(
+            mostrar_grilla(
                 produccion[['ORDEN', 'CUENTA', 'FECHA DE VENCIMIENTO', 
                           'DESCRIPCION PLATAFORMA', 'CANTIDAD', 'EKM', 'DIAS_PRODUCCION']],
-                hide_index=True,
-                use_container_width=True
+                clave='produccion'
             )
         
         with tab2:
@@ -770,47 +454,48 @@ if sheet_url:
                 (df_ultimo_mes['ESTATUS'] == 'IMPORTADO') &
                 (~df_ultimo_mes['LOGISTICA'].isin(['ENTREGADO', 'DESPACHADO']))
             ]
-            st.dataframe(
+            mostrar_grilla(
                 logistica[['ORDEN', 'CUENTA', 'FECHA DE VENCIMIENTO', 
                         'DESCRIPCION PLATAFORMA', 'CANTIDAD', 'EKM', 
                         'ESTATUS LOGISTICA', 'LOGISTICA', 'DIAS_PRODUCCION']],
-                hide_index=True,
-                use_container_width=True
+                clave='logistica'
             )
         
         with tab3:
             recibidos = df_ultimo_mes[df_ultimo_mes['ESTATUS LOGISTICA'] == 'RECIBIDO']
-            st.dataframe(
+            mostrar_grilla(
                 recibidos[['ORDEN', 'CUENTA', 'FECHA DE VENCIMIENTO', 
                          'DESCRIPCION PLATAFORMA', 'CANTIDAD', 'EKM', 'DIAS_PRODUCCION']],
-                hide_index=True,
-                use_container_width=True
+                clave='recibidos'
             )
 
         with tab4:
             despachados = df_ultimo_mes[df_ultimo_mes['LOGISTICA'].isin(['ENTREGADO', 'DESPACHADO'])]
-            st.dataframe(
+            mostrar_grilla(
                 despachados[['ORDEN', 'CUENTA', 'FECHA DE VENCIMIENTO', 
                         'DESCRIPCION PLATAFORMA', 'CANTIDAD', 'EKM', 
                         'LOGISTICA', 'DIAS_PRODUCCION']],
-                hide_index=True,
-                use_container_width=True
+                clave='despachados'
             )
         
         with tab5:
-            buscar = st.text_input("Buscar por número de orden o código EKM")
+            col_buscar, col_prefijo = st.columns([0.8, 0.2])
+            with col_buscar:
+                buscar = st.text_input("Buscar por orden, código EKM, cuenta o descripción")
+            with col_prefijo:
+                solo_prefijo = st.checkbox("Solo al inicio", help="Coincidir solo con el comienzo del texto")
             if buscar:
-                resultado = df_ultimo_mes[
-                    (df_ultimo_mes['ORDEN'].astype(str).str.contains(buscar, case=False, na=False)) |
-                    (df_ultimo_mes['EKM'].astype(str).str.contains(buscar, case=False, na=False))
-                ]
+                # Índice de la instantánea: busca en todo el histórico, no solo en el rango elegido
+                busqueda = instantanea.datos['busqueda']
+                posiciones = busqueda['indice'].buscar(buscar, prefijo=solo_prefijo)
+                resultado = busqueda['ordenes'].iloc[posiciones]
                 if len(resultado) > 0:
-                    st.dataframe(
+                    st.caption(f"{len(resultado):,} órdenes en todo el histórico, las más relevantes primero")
+                    mostrar_tabla(
                         resultado[['ORDEN', 'CUENTA', 'FECHA DE VENTA', 'FECHA DE VENCIMIENTO',
                                  'DESCRIPCION PLATAFORMA', 'CANTIDAD', 'EKM', 'ESTATUS', 
                                  'ESTATUS LOGISTICA', 'DIAS_PRODUCCION']],
-                        hide_index=True,
-                        use_container_width=True
+                        clave='buscar'
                     )
                 else:
                     st.warning("No se encontraron resultados")
@@ -818,12 +503,16 @@ if sheet_url:
         # Botón de actualización
         st.sidebar.divider()
         if st.sidebar.button("🔄 Actualizar datos"):
-            st.cache_data.clear()
+            # Recalcula ya la instantánea compartida (o espera la que está en curso)
+            planificador_control(sheet_url).refrescar()
             st.rerun()
         
-        # Información de última actualización
-        st.sidebar.info(f"📅 Última actualización: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
+        # Información de última actualización (cálculo de la instantánea)
+        st.sidebar.info(f"📅 Última actualización: {instantanea.calculada.strftime('%d/%m/%Y %H:%M:%S')}")
         
     except Exception as e:
         st.error(f"Error: {str(e)}")
-        st.info("👆 Asegúrate de configurar correctamente las credenciales de Google Cloud")
\ No newline at end of file
+        st.info("👆 Asegúrate de configurar correctamente las credenciales de Google Cloud")
+
+# Panel de rendimiento (solo si se activó en la barra lateral)
+mostrar_rendimiento()
@@ -1,9 +1,27 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
-import numpy as np
+import sys
+from pathlib import Path
+
+# Paquete compartido en la raíz del repositorio
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core import perezoso
+
+# Se importan al primer uso: la pantalla de carga no los necesita
+pd = perezoso.modulo("pandas")
+np = perezoso.modulo("numpy")
+go = perezoso.modulo("plotly.graph_objects")
+
+from ekonomodo_core.compacto import compactar
+from ekonomodo_core.compartidos import Compartidos, activar_copia_en_escritura, posiciones
+from ekonomodo_core.diagnostico import Diagnostico
+from ekonomodo_core.instrumentacion import instrumentar, seccion
+from ekonomodo_core.pipelines import comparativo
+from ekonomodo_core.vistas.descargas import boton_descarga
+from ekonomodo_core.vistas.graficos import figura
+from ekonomodo_core.vistas.diagnostico import mostrar_diagnostico
+from ekonomodo_core.vistas.rendimiento import iniciar_rendimiento, mostrar_rendimiento
+from ekonomodo_core.vistas.tablas import configurar_columnas, mostrar_tabla
 
 # Logo en la esquina superior
 top_col1, top_col2 = st.columns([0.7,0.3])
@@ -17,6 +35,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Panel de rendimiento (se activa desde la barra lateral)
+iniciar_rendimiento("ventas_comparativo")
+
 # Estilos personalizados
 st.markdown("""
 <style>
@@ -44,217 +65,116 @@ def clean_column_names(df):
     df.columns = df.columns.str.strip()
     return df
 
+def leer_archivo(file):
+    """Lee un CSV o Excel y limpia los nombres de columna"""
+    if file.name.endswith(".csv"):
+        df = pd.read_csv(file, encoding='utf-8')
+    else:
+        df = pd.read_excel(file)
+    return clean_column_names(df)
+
+@instrumentar()
 def load_file(file):
     """Carga archivos CSV o Excel con manejo de errores"""
     if file is None:
         return None
     try:
-        if file.name.endswith(".csv"):
-            df = pd.read_csv(file, encoding='utf-8')
-        else:
-            df = pd.read_excel(file)
-        return clean_column_names(df)
+        return leer_archivo(file)
     except Exception as e:
         st.error(f"Error cargando {file.name}: {str(e)}")
         return None
 
-def validate_columns(df, required_cols, file_name):
-    """Valida que las columnas requeridas existan en el DataFrame"""
-    missing_cols = [col for col in required_cols if col not in df.columns]
-    if missing_cols:
-        st.error(f"❌ {file_name}: Faltan columnas: {missing_cols}")
-        st.info(f"Columnas disponibles: {list(df.columns)}")
-        return False
-    return True
-
-def preparar_datos(df_ventas, df_aux, df_comercios, df_vendedores, year):
-    """Prepara y cruza los datos de ventas"""
-    try:
-        # Validar columnas requeridas
-        if not validate_columns(df_aux, ["NRO. CRUCE", "COMPROBA", "C MP. CR", "FECHA", "CANT.ENTREGA", "REFERENCIA", "VEND"], f"Auxiliar {year}"):
-            return None
-        if not validate_columns(df_ventas, ["NRO", "FECHA", "GRAVADAS IVA"], f"Libro de ventas {year}"):
-            return None
-        # Hacer auxiliar opcional
-        for col in ["NRO. CRUCE", "COMPROBA", "REFERENCIA", "VEND"]:
-            if col not in df_aux.columns:
-                df_aux[col] = None
-        if not validate_columns(df_comercios, ["Z", "Nombre"], "Comercios"):
-            return None
-
-        # Validar vendedores (opcional)
-        if not validate_columns(df_vendedores, ["VENDEDOR", "NOMBRE"], "Vendedores"):
-            st.warning("Archivo de vendedores no válido, se usarán códigos numéricos")
-            df_vendedores = None
-        
-        # Buscar columna C MP. CR en auxiliar ANTES del merge
-        cmp_col_aux = None
-        for col in df_aux.columns:
-            if "C MP" in col.upper() and "CR" in col.upper():
-                cmp_col_aux = col
-                break
-
-        # Usar Libro de ventas como base principal
-        df = pd.merge(df_ventas, df_aux, left_on="NRO", right_on="NRO. CRUCE", how="left", suffixes=('', '_aux'))
-
-        # Si encontramos C MP. CR, verificar que esté en el resultado
-        if cmp_col_aux and cmp_col_aux in df.columns:
-            st.info(f"✓ Columna '{cmp_col_aux}' encontrada y disponible para clasificar Falabella")
-        else:
-            st.warning(f"⚠️ Columna C MP. CR no encontrada en el merge. Columnas disponibles: {[c for c in df.columns if 'MP' in c.upper() or 'CR' in c.upper()]}")
-
-        # Eliminar duplicados por NRO, priorizando registros con datos completos
-        df = df.sort_values('COMPROBA', na_position='last')
-        df = df.drop_duplicates(subset=['NRO'], keep='first')
-
-        # Resetear índice después de eliminar duplicados
-        df = df.reset_index(drop=True)
+@instrumentar()
+@st.cache_resource(max_entries=2, show_spinner=False)
+def preparar_comparativo(ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores_file):
+    """
+    Ventas 2024 y 2025 preparadas, cruzadas y concatenadas una sola vez por
+    proceso y combinación de archivos: las sesiones comparten ``df_all`` y
+    el catálogo de vendedores y reciben vistas de solo lectura. Devuelve
+    (Compartidos o None, registros por año, diagnósticos).
+    """
+    carga = Diagnostico("carga de archivos")
+    frames = {}
+    for nombre, archivo in [("v24", ventas_2024), ("a24", aux_2024), ("v25", ventas_2025),
+                            ("a25", aux_2025), ("com", comercios_file), ("vendedores", vendedores_file)]:
+        try:
+            frames[nombre] = leer_archivo(archivo)
+        except Exception as e:
+            carga.error(f"Error cargando {archivo.name}: {str(e)}")
+            frames[nombre] = None
+    if any(frames[nombre] is None for nombre in ("v24", "a24", "v25", "a25", "com")):
+        return None, {}, [carga]
+
+    # Preparar datos
+    df2024, diagnostico_2024 = comparativo.preparar_datos(frames["v24"], frames["a24"], frames["com"], frames["vendedores"], 2024)
+    df2025, diagnostico_2025 = comparativo.preparar_datos(frames["v25"], frames["a25"], frames["com"], frames["vendedores"], 2025)
+    diagnosticos = [carga, diagnostico_2024, diagnostico_2025]
+    if df2024 is None or df2025 is None:
+        return None, {}, diagnosticos
+
+    # Verificar y alinear columnas antes de concatenar: solo las columnas comunes
+    common_cols = list(set(df2024.columns).intersection(df2025.columns))
+    df_all = pd.concat([df2024[common_cols], df2025[common_cols]], ignore_index=True)
+    df_all = compactar(df_all, "comparativo", comparativo.COLUMNAS_CATEGORICAS, comparativo.COLUMNAS_DINERO)
+    registros = {2024: len(df2024), 2025: len(df2025)}
+    return Compartidos(df_all=df_all, vendedores=frames["vendedores"]), registros, diagnosticos
 
-        if df.empty:
-            st.warning(f"⚠️ No se encontraron coincidencias entre auxiliar y ventas para {year}")
-            return None
+# ==============================
+# GRÁFICOS (se arman con graficos.figura sobre los pivots mensuales)
+# ==============================
 
-        # Usar fecha del libro de ventas directamente
-        df["FECHA"] = pd.to_datetime(df["FECHA"], errors="coerce")
-        
-        df = df.dropna(subset=["FECHA"])
-        
-        # Crear columnas de tiempo
-        df["mes"] = df["FECHA"].dt.strftime("%m")  # Solo el número del mes (01, 02, 03...)
-        df["mes_nombre"] = df["FECHA"].dt.strftime("%Y-%m")  # Para referencia
-        df["año"] = year
-        df["mes_num"] = df["FECHA"].dt.month
-        df["trimestre"] = df["FECHA"].dt.quarter
-        
-        # Limpiar códigos de comercios
-        df["COMPROBA"] = df["COMPROBA"].astype(str).str.strip()
-        df_comercios["Z"] = df_comercios["Z"].astype(str).str.strip()
-        
-        # Cruzar con comercios (mantener el cruce original)
-        df = pd.merge(df, df_comercios, left_on="COMPROBA", right_on="Z", how="left")
-
-        # Diferenciar Falabella de Falabella Verde basado en C MP. CR
-        # Buscar la columna C MP. CR que puede tener espacios
-        cmp_col = None
-        for col in df.columns:
-            if "C MP" in col.upper() and "CR" in col.upper():
-                cmp_col = col
-                break
-
-        if cmp_col:
-            # Identificar registros de Falabella (Z-082 o nombre Falabella)
-            mask_falabella = (df["COMPROBA"] == "Z-082") | (df["Nombre"].str.contains("Falabella", case=False, na=False))
-            
-            if mask_falabella.sum() > 0:
-                # Extraer el primer carácter de C MP. CR y convertir a mayúscula
-                df.loc[mask_falabella, "prefijo_temp"] = df.loc[mask_falabella, cmp_col].astype(str).str.strip().str[0].str.upper()
-                
-                # Asignar nombres según el prefijo
-                df.loc[mask_falabella & (df["prefijo_temp"] == "F"), "Nombre"] = "Falabella"
-                df.loc[mask_falabella & (df["prefijo_temp"] == "S"), "Nombre"] = "Falabella Verde"
-                
-                # Limpiar columna temporal
-                df = df.drop(columns=["prefijo_temp"], errors="ignore")
-                
-                st.info(f"📊 Procesados {mask_falabella.sum():,} registros de Falabella (F={len(df[(df['Nombre']=='Falabella') & mask_falabella])}, S={len(df[(df['Nombre']=='Falabella Verde') & mask_falabella])})")
-
-        # Buscar la columna NOMBRE del Libro que puede tener espacios
-        nombre_col = None
-        for col in df.columns:
-            if col.strip().upper() == "NOMBRE" and col != "Nombre":  # Evitar confusión con Nombre del comercio
-                nombre_col = col
-                break
-
-        if nombre_col:
-            # Solo mapear registros que NO tienen comercio asignado (principalmente devoluciones)
-            def asignar_comercio_por_nombre(nombre_str, cmp_cr=None):
-                if pd.isna(nombre_str):
-                    return "PARTICULAR"
-                
-                nombre_upper = str(nombre_str).upper()
-                
-                if "SODIMAC COLOMBIA" in nombre_upper:
-                    return "Homecenter"
-                elif "ALMACENES EXITO" in nombre_upper:
-                    return "Éxito-Emplea" 
-                elif "TUGO" in nombre_upper:
-                    return "Tugo"
-                elif "ALMACENES MAXIMO" in nombre_upper:
-                    return "Maximo"
-                elif "APER COLOMBIA" in nombre_upper:
-                    return "Aper Colombia"
-                elif "FALABELLA" in nombre_upper:
-                    # Diferenciar Falabella por C MP. CR si está disponible
-                    if pd.notna(cmp_cr):
-                        prefijo = str(cmp_cr)[0].upper()
-                        if prefijo == "S":
-                            return "Falabella Verde"
-                        else:
-                            return "Falabella"
-                    else:
-                        return "Falabella"  # Por defecto si no hay C MP. CR
-                else:
-                    # Buscar coincidencia con nombres de comercios del catálogo Z
-                    for _, row in df_comercios.iterrows():
-                        if str(row["Nombre"]).upper() in nombre_upper:
-                            return row["Nombre"]
-                    return "PARTICULAR"
-
-            # Aplicar solo a registros sin comercio asignado
-            # Aplicar solo a registros sin comercio asignado
-            mask_sin_comercio = pd.isna(df["Nombre"])
-            if mask_sin_comercio.sum() > 0:
-                # Buscar columna C MP. CR
-                cmp_col = None
-                for col in df.columns:
-                    if col.strip().upper() == "C MP. CR":
-                        cmp_col = col
-                        break
-                
-                if cmp_col:
-                    df.loc[mask_sin_comercio, "Nombre"] = df.loc[mask_sin_comercio].apply(
-                        lambda row: asignar_comercio_por_nombre(row[nombre_col], row[cmp_col]), axis=1
-                    )
-                else:
-                    df.loc[mask_sin_comercio, "Nombre"] = df.loc[mask_sin_comercio, nombre_col].apply(
-                        lambda x: asignar_comercio_por_nombre(x, None)
-                    )
-
-            # AGREGAR ESTA NORMALIZACIÓN DESPUÉS:
-            # Normalizar nombres de comercios para evitar duplicados
-            df["Nombre"] = df["Nombre"].astype(str)
-            df.loc[df["Nombre"].str.upper() == "PARTICULAR", "Nombre"] = "Particular"
-            # Capitalizar correctamente otros nombres comunes
-            df.loc[df["Nombre"].str.upper() == "HOMECENTER", "Nombre"] = "Homecenter"
-            df.loc[df["Nombre"].str.upper() == "ÉXITO-EMPLEA", "Nombre"] = "Éxito-Emplea"
-            df.loc[df["Nombre"].str.upper() == "TUGO", "Nombre"] = "Tugo"
-            df.loc[df["Nombre"].str.upper() == "MAXIMO", "Nombre"] = "Maximo"
-            df.loc[df["Nombre"].str.upper() == "APER COLOMBIA", "Nombre"] = "Aper Colombia"                
-        else:
-            st.warning("No se encontró columna NOMBRE en el Libro de ventas para mapear devoluciones")
-
-        # Cruzar con vendedores
-        if df_vendedores is not None:
-            df_vendedores["VENDEDOR"] = df_vendedores["VENDEDOR"].astype(str).str.strip()
-            df["VEND"] = df["VEND"].astype(str).str.strip()
-            df = pd.merge(df, df_vendedores, left_on="VEND", right_on="VENDEDOR", how="left", suffixes=('', '_vendedor'))
-            df["Nombre_Vendedor"] = df["NOMBRE_vendedor"].fillna(f"Vendedor {df['VEND']}")
-        else:
-            df["Nombre_Vendedor"] = "Vendedor " + df["VEND"].astype(str)
-        
-        # Limpiar datos
-        df["GRAVADAS IVA"] = pd.to_numeric(df["GRAVADAS IVA"], errors="coerce")
-        df["CANT.ENTREGA"] = pd.to_numeric(df["CANT.ENTREGA"], errors="coerce")
-        df = df.dropna(subset=["GRAVADAS IVA"])  # Eliminar registros sin valor
-        
-        # Identificar productos EKM
-        df["es_producto_ekm"] = df["REFERENCIA"].astype(str).str.startswith("EKM")
-        
-        return df
-    
-    except Exception as e:
-        st.error(f"Error procesando datos {year}: {str(e)}")
-        return None
+ANIOS = [2024, 2025]
+DISENO_MESES = dict(xaxis=dict(title='Mes', type='category', tickangle=-45), height=450,
+                    legend=dict(orientation='h', y=1.02, yanchor='bottom', x=1, xanchor='right'))
+
+def grafico_barras_anios(pivot, titulo, eje_y, colores, formato):
+    """Barras agrupadas por mes, una serie por año, con el valor sobre cada barra"""
+    fig = go.Figure()
+    for anio, color in zip(pivot.columns, colores):
+        fig.add_trace(go.Bar(x=pivot.index, y=pivot[anio], name=str(anio), marker_color=color,
+                             opacity=0.8, texttemplate=formato, textposition='outside',
+                             hovertemplate=f'Mes %{{x}}<br>{anio}: {formato}<extra></extra>'))
+    fig.update_layout(title=titulo, yaxis_title=eje_y, barmode='group', **DISENO_MESES)
+    return fig
+
+def grafico_tendencia(pivot):
+    """Líneas del monto mensual de cada año"""
+    fig = go.Figure()
+    for anio, color, simbolo in zip(pivot.columns, ('#1f77b4', '#ff7f0e'), ('circle', 'square')):
+        fig.add_trace(go.Scatter(x=pivot.index, y=pivot[anio], name=str(anio), mode='lines+markers',
+                                 line=dict(color=color, width=2), marker=dict(symbol=simbolo, size=8),
+                                 hovertemplate=f'Mes %{{x}}<br>{anio}: $%{{y:,.0f}}<extra></extra>'))
+    fig.update_layout(title='Tendencia de Ventas', yaxis=dict(title='Monto Total ($)', tickformat='$,.0f'),
+                      **DISENO_MESES)
+    return fig
+
+def grafico_cambio(cambio):
+    """Variación porcentual por mes: verde si sube, rojo si baja"""
+    valores = cambio.fillna(0)
+    fig = go.Figure(go.Bar(x=cambio.index, y=valores, marker_color=np.where(valores > 0, 'green', 'red'),
+                           opacity=0.7, text=[f'{v:.1f}%' if pd.notna(v) else '' for v in cambio],
+                           textposition='outside', hovertemplate='Mes %{x}<br>%{y:.1f}%<extra></extra>'))
+    fig.add_hline(y=0, line_color='black', opacity=0.3)
+    fig.update_layout(title='Variación Porcentual 2025 vs 2024', yaxis_title='% de Cambio', showlegend=False,
+                      **DISENO_MESES)
+    return fig
+
+def mostrar_comparativo(tabla, montos=True):
+    """
+    Tabla 2024 vs 2025 (índice a la vista) con el formato en el navegador y el
+    % Cambio, que viene en escala 0-100, como barra coloreada al estilo RdYlGn
+    """
+    # Los años son columnas enteras; column_config tomaría una clave int como posición
+    tabla = tabla.rename(columns=str)
+    columnas = [str(anio) for anio in ANIOS] + ["Diferencia"]
+    config = configurar_columnas(
+        tabla,
+        pesos=columnas if montos else (),
+        enteros=() if montos else columnas,
+        barras={"% Cambio": "auto"},
+        formatos={"% Cambio": "%.1f%%"},
+    )
+    mostrar_tabla(tabla, column_config=config, hide_index=False)
 
 # ==============================
 # SIDEBAR - SUBIDA DE ARCHIVOS
@@ -281,54 +201,41 @@ dev_vend_2025 = st.sidebar.file_uploader("↩️ Devoluciones por vendedor 2025"
 if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores_file, 
         ventas_vend_2024, dev_vend_2024, ventas_vend_2025, dev_vend_2025]):
 
+    # Copy-on-write de pandas en todo el proceso: las vistas de Compartidos dependen de él.
+    # Va aquí y no al inicio para que la pantalla de carga no importe pandas
+    activar_copia_en_escritura()
+
     with st.spinner("Cargando y procesando archivos..."):
-        # Cargar archivos
-        df_v24 = load_file(ventas_2024)
-        df_a24 = load_file(aux_2024)
-        df_v25 = load_file(ventas_2025)
-        df_a25 = load_file(aux_2025)
-        df_com = load_file(comercios_file)
-        df_vendedores = load_file(vendedores_file)
+        seccion("Carga y preparación")
+        # Ventas de ambos años, preparadas una vez por proceso y compartidas entre sesiones
+        datos_comparativo, registros, diagnosticos = preparar_comparativo(
+            ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores_file
+        )
+        for diagnostico in diagnosticos:
+            mostrar_diagnostico(diagnostico)
+        if datos_comparativo is None:
+            st.stop()
+        df_all, df_vendedores = datos_comparativo.vistas("df_all", "vendedores")
+
+        # Archivos de vendedores (se leen en cada ejecución)
         df_ventas_vend_24 = load_file(ventas_vend_2024)
         df_dev_vend_24 = load_file(dev_vend_2024)
         df_ventas_vend_25 = load_file(ventas_vend_2025)
         df_dev_vend_25 = load_file(dev_vend_2025)
         
         # Verificar que todos los archivos se cargaron correctamente
-        if any(df is None for df in [df_v24, df_a24, df_v25, df_a25, df_com, 
-                                    df_ventas_vend_24, df_dev_vend_24, 
+        if any(df is None for df in [df_ventas_vend_24, df_dev_vend_24, 
                                     df_ventas_vend_25, df_dev_vend_25]):
             st.stop()
         
-        # Preparar datos
-        df2024 = preparar_datos(df_v24, df_a24, df_com, df_vendedores, 2024)
-        df2025 = preparar_datos(df_v25, df_a25, df_com, df_vendedores, 2025)
-        
-        if df2024 is None or df2025 is None:
-            st.stop()
-        
-        # Verificar y alinear columnas antes de concatenar
-        cols_2024 = set(df2024.columns)
-        cols_2025 = set(df2025.columns)
-        common_cols = list(cols_2024.intersection(cols_2025))
-
-        # Usar solo las columnas comunes
-        df2024_clean = df2024[common_cols].copy().reset_index(drop=True)
-        df2025_clean = df2025[common_cols].copy().reset_index(drop=True)
-
-        # Concatenar
-        df_all = pd.concat([df2024_clean, df2025_clean], ignore_index=True)
-
-        # st.info(f"Columnas usadas para análisis: {len(common_cols)} columnas comunes")
-        
         # Mostrar estadísticas básicas
         st.success(f"✅ Datos procesados exitosamente!")
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Registros 2024", f"{len(df2024):,}")
+            st.metric("Registros 2024", f"{registros[2024]:,}")
         with col2:
-            st.metric("Registros 2025", f"{len(df2025):,}")
+            st.metric("Registros 2025", f"{registros[2025]:,}")
         with col3:
             st.metric("Comercios únicos", df_all["Nombre"].nunique())
         with col4:
@@ -337,6 +244,7 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
     # ==============================
     # FILTROS
     # ==============================
+    seccion("Filtros", len(df_all))
     
     st.sidebar.markdown("---")
     st.sidebar.header("🔍 Filtros")
@@ -352,17 +260,19 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
     # Filtro de productos EKM
     solo_ekm = st.sidebar.checkbox("🏷️ Solo productos EKM", value=False)
     
-    # Aplicar filtros
-    df_filtrado = df_all.copy()
+    # Aplicar filtros: una sola máscara y una sola selección de filas del frame compartido
+    mascara = pd.Series(True, index=df_all.index)
     
     if comercio_sel != "Todos":
-        df_filtrado = df_filtrado[df_filtrado["Nombre"] == comercio_sel]
+        mascara &= df_all["Nombre"] == comercio_sel
     
     if "Todos" not in mes_sel and mes_sel:
-        df_filtrado = df_filtrado[df_filtrado["mes"].isin(mes_sel)]
+        mascara &= df_all["mes"].isin(mes_sel)
     
     if solo_ekm:
-        df_filtrado = df_filtrado[df_filtrado["es_producto_ekm"]]
+        mascara &= df_all["es_producto_ekm"]
+    
+    df_filtrado = df_all if mascara.all() else datos_comparativo.vista("df_all", posiciones(mascara))
     
     if df_filtrado.empty:
         st.warning("⚠️ No hay datos para los filtros seleccionados")
@@ -371,6 +281,7 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
     # ==============================
     # ANÁLISIS Y MÉTRICAS
     # ==============================
+    seccion("📈 Análisis comparativo", len(df_filtrado))
     
     st.header("📈 Análisis Comparativo")
     
@@ -384,7 +295,7 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
         st.error("No se encontró columna para contar órdenes (NUMERO o NRO. CRUCE)")
         st.stop()
 
-    resumen_mensual = df_filtrado.groupby(["año", "mes"]).agg({
+    resumen_mensual = df_filtrado.groupby(["año", "mes"], observed=True).agg({
         "GRAVADAS IVA": "sum",
         "NRO": "nunique",
         "CANT.ENTREGA": "sum",
@@ -413,6 +324,7 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
     # ==============================
     # MÉTRICAS PRINCIPALES
     # ==============================
+    seccion("Métricas principales", len(df_filtrado))
     
     total_2024 = df_filtrado[df_filtrado["año"] == 2024]["GRAVADAS IVA"].sum()
     total_2025 = df_filtrado[df_filtrado["año"] == 2025]["GRAVADAS IVA"].sum()
@@ -489,60 +401,19 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
     # ==============================
     # TABLAS COMPARATIVAS
     # ==============================
+    seccion("Tablas comparativas", len(df_filtrado))
     
     st.subheader("📋 Comparativo Mensual - Montos")
-
-    # Verificar qué columnas existen para el formato
-    format_dict = {}
-    if 2024 in pivot_monto.columns:
-        format_dict[2024] = "${:,.0f}"
-    if 2025 in pivot_monto.columns:
-        format_dict[2025] = "${:,.0f}"
-    if "Diferencia" in pivot_monto.columns:
-        format_dict["Diferencia"] = "${:,.0f}"
-    if "% Cambio" in pivot_monto.columns:
-        format_dict["% Cambio"] = "{:.1f}%"
-
-    # Aplicar formato solo si hay columnas de % Cambio
-    if "% Cambio" in pivot_monto.columns:
-        st.dataframe(
-            pivot_monto.style.format(format_dict).background_gradient(subset=["% Cambio"], cmap="RdYlGn"),
-            use_container_width=True
-        )
-    else:
-        st.dataframe(
-            pivot_monto.style.format(format_dict),
-            use_container_width=True
-        )
+    # Sin uno de los años solo hay columnas de monto (configurar_columnas omite las que faltan)
+    mostrar_comparativo(pivot_monto)
     
     st.subheader("📋 Comparativo Mensual - Órdenes")
-
-    # Verificar qué columnas existen para el formato
-    format_dict_ordenes = {}
-    if 2024 in pivot_ordenes.columns:
-        format_dict_ordenes[2024] = "{:,.0f}"
-    if 2025 in pivot_ordenes.columns:
-        format_dict_ordenes[2025] = "{:,.0f}"
-    if "Diferencia" in pivot_ordenes.columns:
-        format_dict_ordenes["Diferencia"] = "{:,.0f}"
-    if "% Cambio" in pivot_ordenes.columns:
-        format_dict_ordenes["% Cambio"] = "{:.1f}%"
-
-    # Aplicar formato solo si hay columnas de % Cambio
-    if "% Cambio" in pivot_ordenes.columns:
-        st.dataframe(
-            pivot_ordenes.style.format(format_dict_ordenes).background_gradient(subset=["% Cambio"], cmap="RdYlGn"),
-            use_container_width=True
-        )
-    else:
-        st.dataframe(
-            pivot_ordenes.style.format(format_dict_ordenes),
-            use_container_width=True
-        )
+    mostrar_comparativo(pivot_ordenes, montos=False)
     
     # ==============================
     # ANÁLISIS DETALLADO DE DEVOLUCIONES
     # ==============================
+    seccion("🔍 Devoluciones", len(df_filtrado))
 
     st.subheader("🔍 Análisis Detallado de Devoluciones")
 
@@ -570,7 +441,7 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
 
     with tab2:
         # Devoluciones por mes
-        devoluciones_mes = df_filtrado[df_filtrado["GRAVADAS IVA"] < 0].groupby(["año", "mes"]).agg({
+        devoluciones_mes = df_filtrado[df_filtrado["GRAVADAS IVA"] < 0].groupby(["año", "mes"], observed=True).agg({
             "GRAVADAS IVA": ["sum", "count"],
             "NRO": "nunique"
         }).round(2).reset_index()
@@ -579,18 +450,15 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
         devoluciones_mes["monto_devolucion"] = abs(devoluciones_mes["monto_devolucion"])
         
         if not devoluciones_mes.empty:
-            pivot_dev = devoluciones_mes.pivot(index="mes", columns="año", values="monto_devolucion").fillna(0)
-            st.dataframe(
-                pivot_dev.style.format("${:,.0f}"),
-                use_container_width=True
-            )
+            pivot_dev = devoluciones_mes.pivot(index="mes", columns="año", values="monto_devolucion").fillna(0).rename(columns=str)
+            mostrar_tabla(pivot_dev, column_config=configurar_columnas(pivot_dev, pesos=pivot_dev.columns), hide_index=False)
         else:
             st.info("No hay devoluciones en el período/filtro seleccionado")
 
     with tab3:
         # Devoluciones por comercio (solo si no hay filtro de comercio)
         if comercio_sel == "Todos":
-            dev_comercio = df_filtrado[df_filtrado["GRAVADAS IVA"] < 0].groupby(["Nombre", "año"]).agg({
+            dev_comercio = df_filtrado[df_filtrado["GRAVADAS IVA"] < 0].groupby(["Nombre", "año"], observed=True).agg({
                 "GRAVADAS IVA": ["sum", "count"]
             }).round(2).reset_index()
             
@@ -598,10 +466,12 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
             dev_comercio["monto_devolucion"] = abs(dev_comercio["monto_devolucion"])
             
             if not dev_comercio.empty:
-                pivot_dev_comercio = dev_comercio.pivot(index="Comercio", columns="año", values="monto_devolucion").fillna(0)
-                st.dataframe(
-                    pivot_dev_comercio.style.format("${:,.0f}"),
-                    use_container_width=True
+                pivot_dev_comercio = (dev_comercio.pivot(index="Comercio", columns="año", values="monto_devolucion")
+                                      .fillna(0).rename(columns=str))
+                mostrar_tabla(
+                    pivot_dev_comercio,
+                    column_config=configurar_columnas(pivot_dev_comercio, pesos=pivot_dev_comercio.columns),
+                    hide_index=False
                 )
             else:
                 st.info("No hay devoluciones por comercio en el período seleccionado")
@@ -619,136 +489,50 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
     # ==============================
     # GRÁFICOS
     # ==============================
+    seccion("📊 Visualizaciones", len(df_filtrado))
     
     st.subheader("📊 Visualizaciones")
     
-    # Configurar estilo de matplotlib
-    plt.style.use('default')
-    
     col1, col2 = st.columns(2)
     
-    with col1:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        if 2024 in pivot_monto.columns and 2025 in pivot_monto.columns:
-            x_pos = range(len(pivot_monto.index))
-            width = 0.35
-            
-            bars1 = ax.bar([x - width/2 for x in x_pos], pivot_monto[2024], width, label='2024', alpha=0.8, color='#1f77b4')
-            bars2 = ax.bar([x + width/2 for x in x_pos], pivot_monto[2025], width, label='2025', alpha=0.8, color='#ff7f0e')
-            
-            ax.set_xlabel('Mes')
-            ax.set_ylabel('Monto Total ($)')
-            ax.set_title('Comparativo de Ventas por Mes')
-            ax.set_xticks(x_pos)
-            ax.set_xticklabels(pivot_monto.index, rotation=45)
-            ax.legend()
-            ax.grid(axis='y', alpha=0.3)
-            
-            # Agregar valores en las barras
-            for bar in bars1:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height, f'${height:,.0f}',
-                       ha='center', va='bottom', fontsize=8, rotation=90)
-            
-            for bar in bars2:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height, f'${height:,.0f}',
-                       ha='center', va='bottom', fontsize=8, rotation=90)
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+    # Las figuras salen de los pivots ya agregados y se reutilizan mientras no cambien
+    if 2024 in pivot_monto.columns and 2025 in pivot_monto.columns:
+        with col1:
+            fig_montos = figura(grafico_barras_anios, pivot_monto[ANIOS],
+                                titulo='Comparativo de Ventas por Mes', eje_y='Monto Total ($)',
+                                colores=('#1f77b4', '#ff7f0e'), formato='$%{y:,.0f}')
+            st.plotly_chart(fig_montos, use_container_width=True)
     
-    with col2:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        if 2024 in pivot_ordenes.columns and 2025 in pivot_ordenes.columns:
-            x_pos = range(len(pivot_ordenes.index))
-            width = 0.35
-            
-            bars1 = ax.bar([x - width/2 for x in x_pos], pivot_ordenes[2024], width, label='2024', alpha=0.8, color='#2ca02c')
-            bars2 = ax.bar([x + width/2 for x in x_pos], pivot_ordenes[2025], width, label='2025', alpha=0.8, color='#d62728')
-            
-            ax.set_xlabel('Mes')
-            ax.set_ylabel('Número de Órdenes')
-            ax.set_title('Comparativo de Órdenes por Mes')
-            ax.set_xticks(x_pos)
-            ax.set_xticklabels(pivot_ordenes.index, rotation=45)
-            ax.legend()
-            ax.grid(axis='y', alpha=0.3)
-            
-            # Agregar valores en las barras
-            for bar in bars1:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height, f'{int(height)}',
-                       ha='center', va='bottom', fontsize=8)
-            
-            for bar in bars2:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height, f'{int(height)}',
-                       ha='center', va='bottom', fontsize=8)
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+    if 2024 in pivot_ordenes.columns and 2025 in pivot_ordenes.columns:
+        with col2:
+            fig_ordenes = figura(grafico_barras_anios, pivot_ordenes[ANIOS],
+                                 titulo='Comparativo de Órdenes por Mes', eje_y='Número de Órdenes',
+                                 colores=('#2ca02c', '#d62728'), formato='%{y:,.0f}')
+            st.plotly_chart(fig_ordenes, use_container_width=True)
     
     # Gráfico de tendencias
     col1, col2 = st.columns(2)
     
-    with col1:
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        if 2024 in pivot_monto.columns and 2025 in pivot_monto.columns:
-            ax.plot(range(len(pivot_monto.index)), pivot_monto[2024], marker='o', linewidth=2, markersize=8, label='2024', color='#1f77b4')
-            ax.plot(range(len(pivot_monto.index)), pivot_monto[2025], marker='s', linewidth=2, markersize=8, label='2025', color='#ff7f0e')
-            
-            ax.set_xlabel('Mes')
-            ax.set_ylabel('Monto Total ($)')
-            ax.set_title('Tendencia de Ventas')
-            ax.set_xticks(range(len(pivot_monto.index)))
-            ax.set_xticklabels(pivot_monto.index, rotation=45)
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-            
-            # Formato del eje Y
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+    if 2024 in pivot_monto.columns and 2025 in pivot_monto.columns:
+        with col1:
+            fig_tendencia = figura(grafico_tendencia, pivot_monto[ANIOS])
+            st.plotly_chart(fig_tendencia, use_container_width=True)
     
-    with col2:
-        # Gráfico de % de cambio
-        if "% Cambio" in pivot_monto.columns:
-            fig, ax = plt.subplots(figsize=(12, 6))
-            
-            colors = ['green' if x > 0 else 'red' for x in pivot_monto["% Cambio"].fillna(0)]
-            bars = ax.bar(range(len(pivot_monto.index)), pivot_monto["% Cambio"].fillna(0), color=colors, alpha=0.7)
-            
-            ax.set_xlabel('Mes')
-            ax.set_ylabel('% de Cambio')
-            ax.set_title('Variación Porcentual 2025 vs 2024')
-            ax.set_xticks(range(len(pivot_monto.index)))
-            ax.set_xticklabels(pivot_monto.index, rotation=45)
-            ax.axhline(y=0, color='black', linestyle='-', alpha=0.3)
-            ax.grid(axis='y', alpha=0.3)
-            
-            # Agregar valores en las barras
-            for i, bar in enumerate(bars):
-                height = bar.get_height()
-                if not np.isnan(height):
-                    ax.text(bar.get_x() + bar.get_width()/2., height + (1 if height >= 0 else -3),
-                           f'{height:.1f}%', ha='center', va='bottom' if height >= 0 else 'top', fontsize=9)
-            
-            plt.tight_layout()
-            st.pyplot(fig)
+    # Gráfico de % de cambio
+    if "% Cambio" in pivot_monto.columns:
+        with col2:
+            fig_cambio = figura(grafico_cambio, pivot_monto["% Cambio"])
+            st.plotly_chart(fig_cambio, use_container_width=True)
     
     # ==============================
     # ANÁLISIS POR COMERCIOS
     # ==============================
+    seccion("Análisis por comercios", len(df_filtrado))
     
     if comercio_sel == "Todos":
         st.subheader("🏪 Análisis por Comercios")
         
-        comercios_resumen = df_filtrado.groupby(["Nombre", "año"]).agg({
+        comercios_resumen = df_filtrado.groupby(["Nombre", "año"], observed=True).agg({
             "GRAVADAS IVA": "sum",
             "NUMERO": "nunique"
         }).reset_index()
@@ -760,19 +544,12 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
             comercios_pivot["% Cambio"] = ((comercios_pivot[2025] - comercios_pivot[2024]) / comercios_pivot[2024] * 100).round(2)
             comercios_pivot["% Cambio"] = comercios_pivot["% Cambio"].replace([np.inf, -np.inf], np.nan)
             
-            st.dataframe(
-                comercios_pivot.style.format({
-                    2024: "${:,.0f}",
-                    2025: "${:,.0f}",
-                    "Diferencia": "${:,.0f}",
-                    "% Cambio": "{:.1f}%"
-                }).background_gradient(subset=["% Cambio"], cmap="RdYlGn"),
-                use_container_width=True
-            )
+            mostrar_comparativo(comercios_pivot)
 
     # ==============================
     # ANÁLISIS POR VENDEDORES
     # ==============================
+    seccion("👤 Análisis por vendedores", len(df_filtrado))
 
     st.subheader("👤 Análisis por Vendedores")
 
@@ -846,14 +623,8 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
         if not top_2025.empty:
             display_2025 = top_2025[["Nombre_Vendedor", "venta", "devolucion", "ventas_netas"]].copy()
             display_2025.columns = ["Vendedor", "Ventas Brutas", "Devoluciones", "Ventas Netas"]
-            st.dataframe(
-                display_2025.style.format({
-                    "Ventas Brutas": "${:,.0f}",
-                    "Devoluciones": "${:,.0f}",
-                    "Ventas Netas": "${:,.0f}"
-                }),
-                use_container_width=True
-            )
+            mostrar_tabla(display_2025, column_config=configurar_columnas(
+                display_2025, pesos=["Ventas Brutas", "Devoluciones", "Ventas Netas"]))
         else:
             st.info("No hay datos de vendedores para 2025")
 
@@ -863,14 +634,8 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
         if not top_2024.empty:
             display_2024 = top_2024[["Nombre_Vendedor", "venta", "devolucion", "ventas_netas"]].copy()
             display_2024.columns = ["Vendedor", "Ventas Brutas", "Devoluciones", "Ventas Netas"]
-            st.dataframe(
-                display_2024.style.format({
-                    "Ventas Brutas": "${:,.0f}",
-                    "Devoluciones": "${:,.0f}",
-                    "Ventas Netas": "${:,.0f}"
-                }),
-                use_container_width=True
-            )
+            mostrar_tabla(display_2024, column_config=configurar_columnas(
+                display_2024, pesos=["Ventas Brutas", "Devoluciones", "Ventas Netas"]))
         else:
             st.info("No hay datos de vendedores para 2024")
 
@@ -892,21 +657,14 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
         comparativo_vendedores["% Cambio"] = ((comparativo_vendedores[2025] - comparativo_vendedores[2024]) / comparativo_vendedores[2024] * 100).round(2)
         comparativo_vendedores["% Cambio"] = comparativo_vendedores["% Cambio"].replace([np.inf, -np.inf], np.nan)
         
-        st.dataframe(
-            comparativo_vendedores.sort_values("% Cambio", ascending=False).head(20).style.format({
-                2024: "${:,.0f}",
-                2025: "${:,.0f}",
-                "Diferencia": "${:,.0f}",
-                "% Cambio": "{:.1f}%"
-            }).background_gradient(subset=["% Cambio"], cmap="RdYlGn"),
-            use_container_width=True
-        )
+        mostrar_comparativo(comparativo_vendedores.sort_values("% Cambio", ascending=False).head(20))
     else:
         st.info("No hay vendedores con datos en ambos años para comparar")
     
     # ==============================
     # DATOS DETALLADOS
     # ==============================
+    seccion("Datos detallados", len(df_filtrado))
     
     with st.expander("📋 Ver datos detallados"):
         st.subheader("Datos filtrados")
@@ -915,11 +673,12 @@ if all([ventas_2024, aux_2024, ventas_2025, aux_2025, comercios_file, vendedores
             use_container_width=True
         )
         
-        st.download_button(
-            label="📥 Descargar datos filtrados (CSV)",
-            data=df_filtrado.to_csv(index=False).encode('utf-8'),
-            file_name=f'ventas_filtradas_{datetime.now().strftime("%Y%m%d_%H%M")}.csv',
-            mime='text/csv'
+        boton_descarga(
+            df_filtrado,
+            f'ventas_filtradas_{datetime.now().strftime("%Y%m%d_%H%M")}',
+            etiqueta="📥 Descargar datos filtrados",
+            formatos=("csv", "xlsx", "parquet"),
+            clave="ventas_filtradas"
         )
 
 else:
@@ -967,4 +726,7 @@ with st.expander("👤 Catálogo de Vendedores"):
     st.markdown("""
     - **VENDEDOR**: Código del vendedor (para cruce con VEND)
     - **NOMBRE**: Nombre del vendedor
-    """)
\ No newline at end of file
+    """)
+
+# Panel de rendimiento (solo si se activó en la barra lateral)
+mostrar_rendimiento()
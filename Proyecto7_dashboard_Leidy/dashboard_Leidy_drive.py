@@ -1,11 +1,24 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 import requests
+import hashlib
 from io import BytesIO
+import sys
+from pathlib import Path
+
+# Paquete compartido en la raíz del repositorio
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core import pareto
+from ekonomodo_core.compacto import compactar
+from ekonomodo_core.instrumentacion import instrumentar, medir, seccion
+from ekonomodo_core.sheets import id_libro, url_xlsx
+from ekonomodo_core.vistas.rendimiento import iniciar_rendimiento, mostrar_rendimiento
+from ekonomodo_core.vistas.grilla import mostrar_grilla
+from ekonomodo_core.vistas.tablas import configurar_columnas, mostrar_tabla
 
 # Logo en la esquina superior
 top_col1, top_col2 = st.columns([0.7,0.3])
@@ -13,6 +26,10 @@ with top_col2:
     st.image("https://ekonomodo.com/cdn/shop/files/Logo-Ekonomodo-color.svg?v=1736956350&width=450", width=5000)
 
 st.set_page_config(page_title="Dashboard Pedidos Ekonomodo", layout="wide")
+
+# Panel de rendimiento (se activa desde la barra lateral)
+iniciar_rendimiento("leidy")
+
 st.title("Dashboard de Pedidos - Ekonomodo CEO")
 
 # ======================
@@ -42,15 +59,106 @@ def format_metric_card(title, value, delta=None, delta_color="normal"):
 # ======================
 st.sidebar.header("🔧 Configuración")
 
-# Función para cargar desde Google Sheets
+# Función para descargar el libro desde Google Sheets
+@instrumentar()
 @st.cache_data(ttl=300)  # Cache por 5 minutos
 def load_google_sheet(url):
+    """Descarga el libro completo (xlsx) y devuelve su contenido y una huella del mismo"""
     # Convertir URL de Google Sheets a formato de exportación
-    file_id = url.split('/d/')[1].split('/')[0]
-    export_url = f'https://docs.google.com/spreadsheets/d/{file_id}/export?format=xlsx'
+    export_url = url_xlsx(id_libro(url))
     
     response = requests.get(export_url)
-    return pd.read_excel(BytesIO(response.content), sheet_name="BASE")
+    response.raise_for_status()
+    return response.content, hashlib.sha1(response.content).hexdigest()
+
+VALORES_VACIOS_FACTURA = ["", "#N/A", "#N/D", "NAN", "NONE"]
+VALORES_SIN_GUIA = ["", "CANCELADO", "0"]
+# Columnas de texto con pocos valores (filtros y agrupaciones)
+COLUMNAS_CATEGORICAS = ("PLATAFORMA", "COMERCIAL", "BODEGA")
+COLUMNAS_DINERO = ("COSTO TOTAL ANTES DE IVA",)
+
+@instrumentar()
+@st.cache_data(max_entries=4)
+def build_order_model(huella, hoy, _contenido):
+    """
+    Modelo de pedidos: hoja BASE limpia en una sola pasada, con banderas de estado precalculadas.
+    
+    Se cachea por huella del libro (y por la hora de ``hoy``, que define el
+    vencimiento), así que cada pestaña y KPI solo combina máscaras booleanas:
+    - ES_CANCELADO: DESPACHADO contiene "CANCELADO"
+    - ES_CANCELADO_EXACTO: DESPACHADO es exactamente "CANCELADO"
+    - ES_FACTURADO: # FACTURA numérica y distinta de 0
+    - FACTURA_POSITIVA: # FACTURA mayor que 0
+    - ES_DESPACHADO: tiene GUIA válida (no vacía, 0 ni CANCELADO)
+    - VENCE_3_DIAS: no facturado o no despachado y FECHA VENC en [hoy, hoy + 3 días]
+    - ES_FLETE: SKU EKM contiene "EKMFLETE"
+    """
+    df = pd.read_excel(BytesIO(_contenido), sheet_name="BASE")
+    
+    # Normalizamos nombres de columnas (eliminar espacios y convertir a mayúsculas)
+    df.columns = df.columns.astype(str).str.strip().str.upper()
+    
+    # Agregar indicadores de semana
+    df = add_week_indicators(df)
+    
+    # Limpiar y convertir columna # FACTURA
+    if "# FACTURA" in df.columns:
+        factura = df["# FACTURA"].astype(str).str.strip().str.upper()
+        factura = factura.replace(VALORES_VACIOS_FACTURA, pd.NA)
+        df["# FACTURA"] = pd.to_numeric(factura, errors='coerce')
+        es_facturado = df["# FACTURA"].notna() & (df["# FACTURA"] != 0)
+        factura_positiva = df["# FACTURA"] > 0
+    else:
+        es_facturado = pd.Series(False, index=df.index)
+        factura_positiva = es_facturado
+    
+    if "GUIA" in df.columns:
+        guia = df["GUIA"]
+        sin_guia = guia.isna() | (guia == 0) | guia.astype(str).str.upper().isin(VALORES_SIN_GUIA)
+        es_despachado = ~sin_guia
+    else:
+        es_despachado = pd.Series(False, index=df.index)
+    
+    if "DESPACHADO" in df.columns:
+        despachado = df["DESPACHADO"].astype(str).str.strip().str.upper()
+        es_cancelado = despachado.str.contains("CANCELADO", na=False)
+        es_cancelado_exacto = despachado == "CANCELADO"
+    else:
+        es_cancelado = pd.Series(False, index=df.index)
+        es_cancelado_exacto = es_cancelado
+    
+    if "FECHA VENC" in df.columns:
+        en_ventana = df["FECHA VENC"].between(hoy, hoy + timedelta(days=3))
+        vence_3_dias = en_ventana & ~(es_facturado & es_despachado)
+    else:
+        vence_3_dias = pd.Series(False, index=df.index)
+    
+    if "SKU EKM" in df.columns:
+        es_flete = df["SKU EKM"].astype(str).str.upper().str.contains("EKMFLETE", na=False)
+    else:
+        es_flete = pd.Series(False, index=df.index)
+    
+    # Banderas como bool de NumPy (1 byte por fila)
+    df["ES_CANCELADO"] = es_cancelado.to_numpy(dtype=bool)
+    df["ES_CANCELADO_EXACTO"] = es_cancelado_exacto.to_numpy(dtype=bool)
+    df["ES_FACTURADO"] = es_facturado.to_numpy(dtype=bool)
+    df["FACTURA_POSITIVA"] = factura_positiva.to_numpy(dtype=bool)
+    df["ES_DESPACHADO"] = es_despachado.to_numpy(dtype=bool)
+    df["VENCE_3_DIAS"] = vence_3_dias.to_numpy(dtype=bool)
+    df["ES_FLETE"] = es_flete.to_numpy(dtype=bool)
+    
+    if "FECHA DE ORDEN" in df.columns and "FECHA DE DESPACHO INTERNO" in df.columns:
+        df["TIEMPO_ENTREGA"] = (df["FECHA DE DESPACHO INTERNO"] - df["FECHA DE ORDEN"]).dt.days
+    
+    return compactar(df, "pedidos Leidy", COLUMNAS_CATEGORICAS, COLUMNAS_DINERO)
+
+@instrumentar()
+@st.cache_data(max_entries=4)
+def load_catalog_sheet(huella, _contenido):
+    """Hoja LISTA DE PRECIOS del mismo libro ya descargado"""
+    catalog_df = pd.read_excel(BytesIO(_contenido), sheet_name="LISTA DE PRECIOS")
+    catalog_df.columns = catalog_df.columns.astype(str).str.strip().str.upper()
+    return catalog_df
 
 # URL de tu Google Sheet
 SHEET_URL = "https://docs.google.com/spreadsheets/d/1L_gT_jKH_7KKqdqj_tVm5IeWHVO2fYOr5UvKUp6uZmo/edit?usp=sharing"
@@ -62,57 +170,17 @@ if st.sidebar.button("🔄 Actualizar Datos"):
 
 if SHEET_URL:
     try:
-        df_original = load_google_sheet(SHEET_URL)  # Guardar copia original
-        df = df_original.copy()  # Trabajar con copia
+        contenido, huella = load_google_sheet(SHEET_URL)
+        hoy = pd.Timestamp.now().floor("h")
         
-        # Normalizamos nombres de columnas (eliminar espacios y convertir a mayúsculas)
-        df.columns = df.columns.astype(str).str.strip().str.upper()
-        
-        # Agregar indicadores de semana
-        df = add_week_indicators(df)
+        # Modelo completo (con cancelados) para alertas; el df de trabajo excluye cancelados
+        df_completo = build_order_model(huella, hoy, contenido)
+        df = df_completo[~df_completo["ES_CANCELADO"]]
 
-        # Limpiar columna # FACTURA ANTES de filtrar
-        if "# FACTURA" in df.columns:
-            df["# FACTURA"] = df["# FACTURA"].astype(str).str.strip().str.upper()
-            df["# FACTURA"] = df["# FACTURA"].replace(["", "#N/A", "#N/D", "NAN", "NONE"], pd.NA)
-            df["# FACTURA"] = pd.to_numeric(df["# FACTURA"], errors='coerce')
-        
-        # Guardar dataframe completo (con cancelados) para alertas
-        df_completo = df.copy()
-        
-        # Excluir pedidos cancelados SOLO del df de trabajo
-        if "DESPACHADO" in df.columns:
-            df = df[~df["DESPACHADO"].astype(str).str.strip().str.upper().str.contains("CANCELADO", na=False)]
-
-        # Excluir pedidos cancelados de todos los análisis
-        if "DESPACHADO" in df.columns:
-            df = df[~df["DESPACHADO"].astype(str).str.strip().str.upper().str.contains("CANCELADO", na=False)]
-        
-        # AGREGAR AQUÍ: Limpiar y convertir columna # FACTURA
-        if "# FACTURA" in df.columns:
-            # Convertir todo a string primero
-            df["# FACTURA_ORIGINAL"] = df["# FACTURA"].copy()  # Guardar original
-            df["# FACTURA"] = df["# FACTURA"].astype(str).str.strip().str.upper()
-            
-            # Reemplazar valores vacíos y #N/A por NaN
-            df["# FACTURA"] = df["# FACTURA"].replace(["", "#N/A", "#N/D", "NAN", "NONE"], pd.NA)
-            
-            # Convertir a numérico (los que se puedan)
-            df["# FACTURA"] = pd.to_numeric(df["# FACTURA"], errors='coerce')
-
-        # Cargar catálogo de productos desde la misma hoja de Google Sheets
+        # Cargar catálogo de productos desde el mismo libro de Google Sheets
         catalog_df = None
         try:
-            # Función para cargar la hoja de catálogo
-            @st.cache_data(ttl=300)
-            def load_catalog_sheet(url):
-                file_id = url.split('/d/')[1].split('/')[0]
-                export_url = f'https://docs.google.com/spreadsheets/d/{file_id}/export?format=xlsx'
-                response = requests.get(export_url)
-                return pd.read_excel(BytesIO(response.content), sheet_name="LISTA DE PRECIOS")
-            
-            catalog_df = load_catalog_sheet(SHEET_URL)
-            catalog_df.columns = catalog_df.columns.astype(str).str.strip().str.upper()
+            catalog_df = load_catalog_sheet(huella, contenido)
             st.sidebar.success("✅ Catálogo cargado correctamente desde Google Sheets")
         except Exception as e:
             st.sidebar.warning(f"No se pudo cargar el catálogo: {str(e)}")
@@ -120,12 +188,17 @@ if SHEET_URL:
         # ======================
         # Filtros en sidebar
         # ======================
+        seccion("Filtros", len(df))
         st.sidebar.subheader("📅 Filtros")
         
+        # Estado de los filtros: clave de los resultados que se guardan por filtro (Pareto de productos)
+        estado_filtros = [huella]
+        
         # Filtro por plataforma
         if "PLATAFORMA" in df.columns:
             plataformas = ["Todas"] + sorted(df["PLATAFORMA"].dropna().unique().tolist())
             selected_plataforma = st.sidebar.selectbox("Filtrar por Plataforma:", plataformas)
+            estado_filtros.append(selected_plataforma)
             if selected_plataforma != "Todas":
                 df = df[df["PLATAFORMA"] == selected_plataforma]
         
@@ -133,6 +206,7 @@ if SHEET_URL:
         if "COMERCIAL" in df.columns:
             comerciales = ["Todos"] + sorted(df["COMERCIAL"].dropna().unique().tolist())
             selected_comercial = st.sidebar.selectbox("Filtrar por Comercial:", comerciales)
+            estado_filtros.append(selected_comercial)
             if selected_comercial != "Todos":
                 df = df[df["COMERCIAL"] == selected_comercial]
         
@@ -140,6 +214,7 @@ if SHEET_URL:
         if "BODEGA" in df.columns:
             bodegas = ["Todas"] + sorted(df["BODEGA"].dropna().unique().tolist())
             selected_bodega = st.sidebar.selectbox("Filtrar por Bodega:", bodegas)
+            estado_filtros.append(selected_bodega)
             if selected_bodega != "Todas":
                 df = df[df["BODEGA"] == selected_bodega]
         
@@ -147,6 +222,7 @@ if SHEET_URL:
         if "FECHA DE ORDEN_SEMANA_AÑO" in df.columns:
             semanas_disponibles = ["Todas"] + sorted(df["FECHA DE ORDEN_SEMANA_AÑO"].dropna().unique().tolist(), reverse=True)
             selected_semana = st.sidebar.selectbox("Filtrar por Semana de Orden:", semanas_disponibles)
+            estado_filtros.append(selected_semana)
             if selected_semana != "Todas":
                 df = df[df["FECHA DE ORDEN_SEMANA_AÑO"] == selected_semana]
         
@@ -161,6 +237,7 @@ if SHEET_URL:
                     min_value=min_date.date(),
                     max_value=max_date.date()
                 )
+                estado_filtros.append(tuple(date_range))
                 if len(date_range) == 2:
                     start_date, end_date = date_range
                     df = df[(df["FECHA DE ORDEN"].dt.date >= start_date) & 
@@ -169,54 +246,30 @@ if SHEET_URL:
         # ======================
         # KPIs principales
         # ======================
+        seccion("KPIs", len(df))
         st.subheader("KPIs Principales")
         
         col1, col2, col3, col4 = st.columns(4)
         
+        # Las banderas vienen precalculadas en el modelo: cada KPI es una máscara
         # 1. Pedidos no facturados
-        no_facturados = df[
-            (df["# FACTURA"].isna()) | 
-            (df["# FACTURA"] == 0) | 
-            (df["# FACTURA"].astype(str).str.upper().isin(["#N/D", "0"]))
-        ]
+        no_facturados = df[~df["ES_FACTURADO"]]
         
         # 2. Pedidos no despachados
         if "GUIA" in df.columns:
-            no_despachados = df[
-                (df["# FACTURA"].notna()) &
-                (df["# FACTURA"] != 0) &
-                (~df["# FACTURA"].astype(str).str.upper().isin(["#N/D", "0"])) &
-                ((df["GUIA"].isna()) | 
-                (df["GUIA"] == 0) | 
-                (df["GUIA"].astype(str).str.upper().isin(["", "CANCELADO", "0"])))
-            ]
+            no_despachados = df[df["ES_FACTURADO"] & ~df["ES_DESPACHADO"]]
         else:
             no_despachados = pd.DataFrame()
             st.warning("No se encontró la columna 'GUIA' en el archivo.")
         
-        # 3. Alerta de vencimiento (solo pedidos no despachados)
-        hoy = datetime.today()
+        # 3. Alerta de vencimiento (no despachados que vencen en los próximos 3 días)
         if "FECHA VENC" in df.columns:
-            # Filtrar solo pedidos que NO han sido despachados Y que vencen en los próximos 3 días
-            alerta_vencimiento = df[
-                (df["FECHA VENC"].notna()) & 
-                (df["FECHA VENC"] >= hoy) &  # Que no hayan vencido ya
-                (df["FECHA VENC"] <= hoy + timedelta(days=3)) &  # Que venzan en 3 días o menos
-                (  # Y que NO estén despachados (misma lógica de no_despachados)
-                    (df["# FACTURA"].isna()) | 
-                    (df["# FACTURA"] == 0) | 
-                    (df["# FACTURA"].astype(str).str.upper().isin(["#N/D", "0"])) |
-                    ((df["GUIA"].isna()) | 
-                    (df["GUIA"] == 0) | 
-                    (df["GUIA"].astype(str).str.upper().isin(["", "CANCELADO", "0"])))
-                )
-            ]
+            alerta_vencimiento = df[df["VENCE_3_DIAS"]]
         else:
             alerta_vencimiento = pd.DataFrame()
         
         # 4. Tiempo de entrega promedio
-        if "FECHA DE ORDEN" in df.columns and "FECHA DE DESPACHO INTERNO" in df.columns:
-            df["TIEMPO_ENTREGA"] = (df["FECHA DE DESPACHO INTERNO"] - df["FECHA DE ORDEN"]).dt.days
+        if "TIEMPO_ENTREGA" in df.columns:
             tiempo_entrega_prom = df["TIEMPO_ENTREGA"].mean(skipna=True)
         else:
             tiempo_entrega_prom = None
@@ -236,6 +289,7 @@ if SHEET_URL:
         # ======================
         # Análisis detallado
         # ======================
+        seccion("Análisis detallado", len(df))
         
         # Crear pestañas para mejor organización
         tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
@@ -250,14 +304,15 @@ if SHEET_URL:
             "🏆 Top Productos"
         ])
         
-        with tab1:
+        with tab1, medir("📋 No Facturados", len(df)):
             st.subheader("1. Pedidos No Facturados")
             st.write(f"Total: **{len(no_facturados)}** pedidos")
             
             if len(no_facturados) > 0:
                 # Resumen por plataforma
                 if "PLATAFORMA" in no_facturados.columns:
-                    resumen_no_fact = no_facturados["PLATAFORMA"].value_counts().reset_index()
+                    # PLATAFORMA es categórica: se omiten las plataformas sin pedidos en el resumen
+                    resumen_no_fact = no_facturados["PLATAFORMA"].value_counts().loc[lambda conteos: conteos > 0].reset_index()
                     resumen_no_fact.columns = ["PLATAFORMA", "Cantidad de Pedidos"]
                     st.write("**Por Plataforma:**")
                     st.dataframe(resumen_no_fact)
@@ -266,16 +321,16 @@ if SHEET_URL:
                 columns_to_show = ["ORDEN", "PLATAFORMA", "COMERCIAL", "FECHA DE ORDEN", 
                                  "FECHA DE ORDEN_SEMANA_AÑO", "SKU CLIENTE", "BODEGA"]
                 available_cols = [col for col in columns_to_show if col in no_facturados.columns]
-                st.dataframe(no_facturados[available_cols], use_container_width=True)
+                mostrar_grilla(no_facturados[available_cols], clave="no_facturados")
         
-        with tab2:
+        with tab2, medir("📦 No Despachados", len(df)):
             st.subheader("2. Pedidos No Despachados (Facturados)")
             st.write(f"Total: **{len(no_despachados)}** pedidos")
             
             if len(no_despachados) > 0:
                 # Resumen por plataforma
                 if "PLATAFORMA" in no_despachados.columns:
-                    resumen_no_desp = no_despachados["PLATAFORMA"].value_counts().reset_index()
+                    resumen_no_desp = no_despachados["PLATAFORMA"].value_counts().loc[lambda conteos: conteos > 0].reset_index()
                     resumen_no_desp.columns = ["PLATAFORMA", "Cantidad de Pedidos"]
                     st.write("**Por Plataforma:**")
                     st.dataframe(resumen_no_desp)
@@ -284,25 +339,25 @@ if SHEET_URL:
                 columns_to_show = ["ORDEN", "PLATAFORMA", "COMERCIAL", "# FACTURA", 
                                  "FECHA DE ORDEN", "FECHA DE ORDEN_SEMANA_AÑO", "BODEGA", "GUIA"]
                 available_cols = [col for col in columns_to_show if col in no_despachados.columns]
-                st.dataframe(no_despachados[available_cols], use_container_width=True)
+                mostrar_grilla(no_despachados[available_cols], clave="no_despachados")
         
-        with tab3:
+        with tab3, medir("🏪 Por Comercio", len(df)):
             st.subheader("3. Pendientes por Despachar por Comercio")
             
             # Análisis por plataforma
             if "PLATAFORMA" in no_despachados.columns:
-                pendientes_por_comercio = no_despachados.groupby("PLATAFORMA").size().reset_index(name="Pendientes")
+                pendientes_por_comercio = no_despachados.groupby("PLATAFORMA", observed=True).size().reset_index(name="Pendientes")
                 pendientes_por_comercio = pendientes_por_comercio.sort_values("Pendientes", ascending=False)
                 st.dataframe(pendientes_por_comercio, use_container_width=True)
             
             # Análisis por comercial
             if "COMERCIAL" in no_despachados.columns:
                 st.write("**Por Comercial:**")
-                pendientes_por_vendedor = no_despachados.groupby("COMERCIAL").size().reset_index(name="Pendientes")
+                pendientes_por_vendedor = no_despachados.groupby("COMERCIAL", observed=True).size().reset_index(name="Pendientes")
                 pendientes_por_vendedor = pendientes_por_vendedor.sort_values("Pendientes", ascending=False)
                 st.dataframe(pendientes_por_vendedor, use_container_width=True)
         
-        with tab4:
+        with tab4, medir("⚠️ Alertas", len(df)):
             st.subheader("4. Alertas de Vencimiento (≤ 3 días)")
             st.write(f"Total: **{len(alerta_vencimiento)}** pedidos")
             
@@ -323,9 +378,7 @@ if SHEET_URL:
             
             # Detectar pedidos cancelados con factura (usando df_completo)
             pedidos_cancelados_facturados = df_completo[
-                (df_completo["DESPACHADO"].astype(str).str.strip().str.upper() == "CANCELADO") &
-                (df_completo["# FACTURA"].notna()) &
-                (df_completo["# FACTURA"] > 0)
+                df_completo["ES_CANCELADO_EXACTO"] & df_completo["FACTURA_POSITIVA"]
             ]
             
             st.write(f"Total: **{len(pedidos_cancelados_facturados)}** pedidos")
@@ -336,32 +389,29 @@ if SHEET_URL:
                                  "DESPACHADO", "FECHA DE ORDEN", "GUIA", "BODEGA"]
                 available_cols = [col for col in columns_to_show if col in pedidos_cancelados_facturados.columns]
                 
-                # Crear copia para formatear
-                df_display = pedidos_cancelados_facturados[available_cols].copy()
-                
-                # Formatear columnas numéricas sin decimales
-                if "ORDEN" in df_display.columns:
-                    df_display["ORDEN"] = df_display["ORDEN"].apply(lambda x: f"{int(x)}" if pd.notna(x) else x)
-                if "# FACTURA" in df_display.columns:
-                    df_display["# FACTURA"] = df_display["# FACTURA"].apply(lambda x: f"{int(x)}" if pd.notna(x) else x)
+                # Números de orden y factura sin decimales ni separadores (formato en el navegador)
+                config_ids = {
+                    col: st.column_config.NumberColumn(format="%d")
+                    for col in ["ORDEN", "# FACTURA"] if col in available_cols
+                }
                 
-                st.dataframe(
-                    df_display.style.apply(
-                        lambda x: ['background-color: #ffcccc'] * len(x), axis=1
-                    ),
-                    use_container_width=True
+                mostrar_tabla(
+                    pedidos_cancelados_facturados[available_cols],
+                    column_config=config_ids,
+                    hide_index=False,
+                    clave="cancelados_facturados"
                 )
                 
                 # Resumen por plataforma
                 if "PLATAFORMA" in pedidos_cancelados_facturados.columns:
                     st.write("**Casos por Plataforma:**")
-                    casos_por_plataforma = pedidos_cancelados_facturados["PLATAFORMA"].value_counts().reset_index()
+                    casos_por_plataforma = pedidos_cancelados_facturados["PLATAFORMA"].value_counts().loc[lambda conteos: conteos > 0].reset_index()
                     casos_por_plataforma.columns = ["PLATAFORMA", "Cantidad de Casos"]
                     st.dataframe(casos_por_plataforma, use_container_width=True)
             else:
                 st.success("✅ No hay pedidos cancelados con factura")
         
-        with tab5:
+        with tab5, medir("📊 Análisis", len(df)):
             st.subheader("5. Análisis de Tiempos de Entrega")
             
             if tiempo_entrega_prom is not None:
@@ -377,7 +427,7 @@ if SHEET_URL:
                 
                 with col2:
                     if "PLATAFORMA" in df.columns:
-                        tiempo_por_plataforma = df.groupby("PLATAFORMA")["TIEMPO_ENTREGA"].mean().sort_values(ascending=False)
+                        tiempo_por_plataforma = df.groupby("PLATAFORMA", observed=True)["TIEMPO_ENTREGA"].mean().sort_values(ascending=False)
                         st.write("**Tiempo promedio por Plataforma:**")
                         st.dataframe(tiempo_por_plataforma.round(1))
                 
@@ -390,7 +440,7 @@ if SHEET_URL:
             else:
                 st.warning("No se pueden calcular tiempos de entrega. Verificar columnas de fecha.")
         
-        with tab6:
+        with tab6, medir("📈 Gráficos", len(df)):
             st.subheader("📈 Visualizaciones")
             
             # Gráfico de pedidos por semana
@@ -426,7 +476,7 @@ if SHEET_URL:
             
             # Gráfico por plataforma
             if "PLATAFORMA" in df.columns:
-                pedidos_por_plataforma = df["PLATAFORMA"].value_counts()
+                pedidos_por_plataforma = df["PLATAFORMA"].value_counts().loc[lambda conteos: conteos > 0]
                 fig3 = px.bar(
                     x=pedidos_por_plataforma.values,
                     y=pedidos_por_plataforma.index,
@@ -436,12 +486,12 @@ if SHEET_URL:
                 )
                 st.plotly_chart(fig3, use_container_width=True)
         
-        with tab7:
+        with tab7, medir("💰 Fletes", len(df)):
             st.subheader("🚚 Análisis de Costos de Fletes (EKMFLETES)")
             
             if "COSTO TOTAL ANTES DE IVA" in df.columns and "SKU EKM" in df.columns:
                 # Filtrar solo los fletes (SKU que contengan EKMFLETE)
-                df_fletes = df[df["SKU EKM"].astype(str).str.upper().str.contains("EKMFLETE", na=False)].copy()
+                df_fletes = df[df["ES_FLETE"]].copy()
                 
                 if len(df_fletes) > 0:
                     # Convertir a numérico
@@ -467,54 +517,59 @@ if SHEET_URL:
                         st.write("**Gastos en Fletes por Mes:**")
                         fletes_por_mes = df_fletes.groupby("MES_AÑO")["COSTO_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
                         fletes_por_mes.columns = ['Gasto Total en Fletes', 'Cantidad de Fletes', 'Costo Promedio']
-                        # Formatear columnas de dinero
-                        fletes_por_mes['Gasto Total en Fletes'] = fletes_por_mes['Gasto Total en Fletes'].apply(lambda x: f"${x:,.2f}")
-                        fletes_por_mes['Costo Promedio'] = fletes_por_mes['Costo Promedio'].apply(lambda x: f"${x:,.2f}")
-                        st.dataframe(fletes_por_mes, use_container_width=True)
+                        st.dataframe(
+                            fletes_por_mes,
+                            use_container_width=True,
+                            column_config=configurar_columnas(fletes_por_mes, pesos=['Gasto Total en Fletes', 'Costo Promedio'], enteros=['Cantidad de Fletes'])
+                        )
                     
                     # Análisis por plataforma
                     if "PLATAFORMA" in df_fletes.columns:
                         st.write("**Gastos en Fletes por Plataforma:**")
-                        fletes_por_plataforma = df_fletes.groupby("PLATAFORMA")["COSTO_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
+                        fletes_por_plataforma = df_fletes.groupby("PLATAFORMA", observed=True)["COSTO_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
                         fletes_por_plataforma.columns = ['Gasto Total en Fletes', 'Cantidad de Fletes', 'Costo Promedio']
                         fletes_por_plataforma = fletes_por_plataforma.sort_values('Gasto Total en Fletes', ascending=False)
-                        # Formatear columnas de dinero
-                        fletes_por_plataforma['Gasto Total en Fletes'] = fletes_por_plataforma['Gasto Total en Fletes'].apply(lambda x: f"${x:,.2f}")
-                        fletes_por_plataforma['Costo Promedio'] = fletes_por_plataforma['Costo Promedio'].apply(lambda x: f"${x:,.2f}")
-                        st.dataframe(fletes_por_plataforma, use_container_width=True)
+                        st.dataframe(
+                            fletes_por_plataforma,
+                            use_container_width=True,
+                            column_config=configurar_columnas(fletes_por_plataforma, pesos=['Gasto Total en Fletes', 'Costo Promedio'], enteros=['Cantidad de Fletes'])
+                        )
                     
                     # Análisis por bodega
                     if "BODEGA" in df_fletes.columns:
                         st.write("**Gastos en Fletes por Bodega:**")
-                        fletes_por_bodega = df_fletes.groupby("BODEGA")["COSTO_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
+                        fletes_por_bodega = df_fletes.groupby("BODEGA", observed=True)["COSTO_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
                         fletes_por_bodega.columns = ['Gasto Total en Fletes', 'Cantidad de Fletes', 'Costo Promedio']
                         fletes_por_bodega = fletes_por_bodega.sort_values('Gasto Total en Fletes', ascending=False)
-                        # Formatear columnas de dinero
-                        fletes_por_bodega['Gasto Total en Fletes'] = fletes_por_bodega['Gasto Total en Fletes'].apply(lambda x: f"${x:,.2f}")
-                        fletes_por_bodega['Costo Promedio'] = fletes_por_bodega['Costo Promedio'].apply(lambda x: f"${x:,.2f}")
-                        st.dataframe(fletes_por_bodega, use_container_width=True)
+                        st.dataframe(
+                            fletes_por_bodega,
+                            use_container_width=True,
+                            column_config=configurar_columnas(fletes_por_bodega, pesos=['Gasto Total en Fletes', 'Costo Promedio'], enteros=['Cantidad de Fletes'])
+                        )
 
                     # Análisis por bodega
                     if "BODEGA" in df_fletes.columns:
                         st.write("**Gastos en Fletes por Bodega:**")
-                        fletes_por_bodega = df_fletes.groupby("BODEGA")["COSTO_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
+                        fletes_por_bodega = df_fletes.groupby("BODEGA", observed=True)["COSTO_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
                         fletes_por_bodega.columns = ['Gasto Total en Fletes', 'Cantidad de Fletes', 'Costo Promedio']
                         fletes_por_bodega = fletes_por_bodega.sort_values('Gasto Total en Fletes', ascending=False)
-                        # Formatear columnas de dinero
-                        fletes_por_bodega['Gasto Total en Fletes'] = fletes_por_bodega['Gasto Total en Fletes'].apply(lambda x: f"${x:,.2f}")
-                        fletes_por_bodega['Costo Promedio'] = fletes_por_bodega['Costo Promedio'].apply(lambda x: f"${x:,.2f}")
-                        st.dataframe(fletes_por_bodega, use_container_width=True)
+                        st.dataframe(
+                            fletes_por_bodega,
+                            use_container_width=True,
+                            column_config=configurar_columnas(fletes_por_bodega, pesos=['Gasto Total en Fletes', 'Costo Promedio'], enteros=['Cantidad de Fletes'])
+                        )
                     
                     # Análisis por comercial
                     if "COMERCIAL" in df_fletes.columns:
                         st.write("**Gastos en Fletes por Comercial:**")
-                        fletes_por_comercial = df_fletes.groupby("COMERCIAL")["COSTO_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
+                        fletes_por_comercial = df_fletes.groupby("COMERCIAL", observed=True)["COSTO_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
                         fletes_por_comercial.columns = ['Gasto Total en Fletes', 'Cantidad de Fletes', 'Costo Promedio']
                         fletes_por_comercial = fletes_por_comercial.sort_values('Gasto Total en Fletes', ascending=False)
-                        # Formatear columnas de dinero
-                        fletes_por_comercial['Gasto Total en Fletes'] = fletes_por_comercial['Gasto Total en Fletes'].apply(lambda x: f"${x:,.2f}")
-                        fletes_por_comercial['Costo Promedio'] = fletes_por_comercial['Costo Promedio'].apply(lambda x: f"${x:,.2f}")
-                        st.dataframe(fletes_por_comercial, use_container_width=True)
+                        st.dataframe(
+                            fletes_por_comercial,
+                            use_container_width=True,
+                            column_config=configurar_columnas(fletes_por_comercial, pesos=['Gasto Total en Fletes', 'Costo Promedio'], enteros=['Cantidad de Fletes'])
+                        )
                         
                 else:
                     st.warning("No se encontraron pedidos con SKU que contengan 'EKMFLETE'")
@@ -522,16 +577,12 @@ if SHEET_URL:
             else:
                 st.warning("No se encontraron las columnas necesarias: 'COSTO TOTAL ANTES DE IVA' o 'SKU EKM'")
 
-        with tab8:
+        with tab8, medir("💵 Ventas", len(df)):
             st.subheader("💵 Análisis de Ventas")
             
             if "COSTO TOTAL ANTES DE IVA" in df.columns and "SKU EKM" in df.columns and "# FACTURA" in df.columns:
                 # Excluir fletes Y filtrar solo pedidos facturados
-                df_ventas = df[
-                    (~df["SKU EKM"].astype(str).str.upper().str.contains("EKMFLETE", na=False)) &
-                    (df["# FACTURA"].notna()) &
-                    (df["# FACTURA"] > 0)
-                ].copy()
+                df_ventas = df[~df["ES_FLETE"] & df["FACTURA_POSITIVA"]].copy()
                 
                 if len(df_ventas) > 0:
                     # Convertir a numérico
@@ -562,11 +613,11 @@ if SHEET_URL:
                         ventas_por_mes.columns = ['Ventas Totales', 'Cantidad Pedidos', 'Venta Promedio']
                         ventas_por_mes = ventas_por_mes.sort_index(ascending=False)
                         
-                        # Formatear columnas de dinero
-                        ventas_por_mes_display = ventas_por_mes.copy()
-                        ventas_por_mes_display['Ventas Totales'] = ventas_por_mes_display['Ventas Totales'].apply(lambda x: f"${x:,.2f}")
-                        ventas_por_mes_display['Venta Promedio'] = ventas_por_mes_display['Venta Promedio'].apply(lambda x: f"${x:,.2f}")
-                        st.dataframe(ventas_por_mes_display, use_container_width=True)
+                        st.dataframe(
+                            ventas_por_mes,
+                            use_container_width=True,
+                            column_config=configurar_columnas(ventas_por_mes, pesos=['Ventas Totales', 'Venta Promedio'], enteros=['Cantidad Pedidos'])
+                        )
                         
                         # Gráfico de ventas por mes
                         fig_ventas_mes = px.bar(
@@ -582,15 +633,15 @@ if SHEET_URL:
                     # Análisis por plataforma
                     if "PLATAFORMA" in df_ventas.columns:
                         st.write("### 🏪 Ventas por Plataforma")
-                        ventas_por_plataforma = df_ventas.groupby("PLATAFORMA")["VENTA_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
+                        ventas_por_plataforma = df_ventas.groupby("PLATAFORMA", observed=True)["VENTA_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
                         ventas_por_plataforma.columns = ['Ventas Totales', 'Cantidad Pedidos', 'Venta Promedio']
                         ventas_por_plataforma = ventas_por_plataforma.sort_values('Ventas Totales', ascending=False)
                         
-                        # Formatear columnas de dinero
-                        ventas_por_plataforma_display = ventas_por_plataforma.copy()
-                        ventas_por_plataforma_display['Ventas Totales'] = ventas_por_plataforma_display['Ventas Totales'].apply(lambda x: f"${x:,.2f}")
-                        ventas_por_plataforma_display['Venta Promedio'] = ventas_por_plataforma_display['Venta Promedio'].apply(lambda x: f"${x:,.2f}")
-                        st.dataframe(ventas_por_plataforma_display, use_container_width=True)
+                        st.dataframe(
+                            ventas_por_plataforma,
+                            use_container_width=True,
+                            column_config=configurar_columnas(ventas_por_plataforma, pesos=['Ventas Totales', 'Venta Promedio'], enteros=['Cantidad Pedidos'])
+                        )
                         
                         # Gráfico de ventas por plataforma
                         fig_ventas_plataforma = px.pie(
@@ -605,15 +656,15 @@ if SHEET_URL:
                     # Análisis por comercial
                     if "COMERCIAL" in df_ventas.columns:
                         st.write("### 👤 Ventas por Comercial")
-                        ventas_por_comercial = df_ventas.groupby("COMERCIAL")["VENTA_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
+                        ventas_por_comercial = df_ventas.groupby("COMERCIAL", observed=True)["VENTA_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
                         ventas_por_comercial.columns = ['Ventas Totales', 'Cantidad Pedidos', 'Venta Promedio']
                         ventas_por_comercial = ventas_por_comercial.sort_values('Ventas Totales', ascending=False)
                         
-                        # Formatear columnas de dinero
-                        ventas_por_comercial_display = ventas_por_comercial.copy()
-                        ventas_por_comercial_display['Ventas Totales'] = ventas_por_comercial_display['Ventas Totales'].apply(lambda x: f"${x:,.2f}")
-                        ventas_por_comercial_display['Venta Promedio'] = ventas_por_comercial_display['Venta Promedio'].apply(lambda x: f"${x:,.2f}")
-                        st.dataframe(ventas_por_comercial_display, use_container_width=True)
+                        st.dataframe(
+                            ventas_por_comercial,
+                            use_container_width=True,
+                            column_config=configurar_columnas(ventas_por_comercial, pesos=['Ventas Totales', 'Venta Promedio'], enteros=['Cantidad Pedidos'])
+                        )
                         
                         # Gráfico de ventas por comercial
                         fig_ventas_comercial = px.bar(
@@ -630,15 +681,15 @@ if SHEET_URL:
                     # Análisis por bodega
                     if "BODEGA" in df_ventas.columns:
                         st.write("### 🏭 Ventas por Bodega")
-                        ventas_por_bodega = df_ventas.groupby("BODEGA")["VENTA_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
+                        ventas_por_bodega = df_ventas.groupby("BODEGA", observed=True)["VENTA_NUMERICO"].agg(['sum', 'count', 'mean']).round(2)
                         ventas_por_bodega.columns = ['Ventas Totales', 'Cantidad Pedidos', 'Venta Promedio']
                         ventas_por_bodega = ventas_por_bodega.sort_values('Ventas Totales', ascending=False)
                         
-                        # Formatear columnas de dinero
-                        ventas_por_bodega_display = ventas_por_bodega.copy()
-                        ventas_por_bodega_display['Ventas Totales'] = ventas_por_bodega_display['Ventas Totales'].apply(lambda x: f"${x:,.2f}")
-                        ventas_por_bodega_display['Venta Promedio'] = ventas_por_bodega_display['Venta Promedio'].apply(lambda x: f"${x:,.2f}")
-                        st.dataframe(ventas_por_bodega_display, use_container_width=True)
+                        st.dataframe(
+                            ventas_por_bodega,
+                            use_container_width=True,
+                            column_config=configurar_columnas(ventas_por_bodega, pesos=['Ventas Totales', 'Venta Promedio'], enteros=['Cantidad Pedidos'])
+                        )
                     
                 else:
                     st.warning("No se encontraron datos de ventas (todos los pedidos son fletes)")
@@ -646,16 +697,21 @@ if SHEET_URL:
             else:
                 st.warning("No se encontraron las columnas necesarias: 'COSTO TOTAL ANTES DE IVA' o 'SKU EKM'")
 
-        with tab9:
+        with tab9, medir("🏆 Top Productos", len(df)):
                     st.subheader("🏆 Productos Más Vendidos")
                     
                     if "SKU EKM" in df.columns:
-                        # Excluir fletes del análisis de top productos
-                        df_productos = df[~df["SKU EKM"].astype(str).str.upper().str.contains("EKMFLETE", na=False)].copy()
-                        
-                        # Contar productos más vendidos
-                        top_productos = df_productos["SKU EKM"].value_counts().head(20).reset_index()
-                        top_productos.columns = ['SKU EKM', 'Cantidad Vendida']
+                        # Pareto de productos por unidades vendidas, sin fletes (se guarda por huella y filtros)
+                        productos_pareto = pareto.clasificar(
+                            df[~df["ES_FLETE"]],
+                            "SKU EKM",
+                            {"Cantidad Vendida": ("SKU EKM", "size")},
+                            "Cantidad Vendida",
+                            clave=tuple(estado_filtros),
+                        )
+                        clase_a = int((productos_pareto["CLASIFICACION"] == "A").sum())
+                        st.caption(f"{clase_a:,} de {len(productos_pareto):,} productos (clase A) suman el 80% de los pedidos")
+                        top_productos = productos_pareto.head(20)[["SKU EKM", "Cantidad Vendida", "ACUMULADO", "CLASIFICACION"]]
                         
                         # Si hay catálogo, hacer el cruce
                         if catalog_df is not None and "EKM" in catalog_df.columns and "NOMBRE" in catalog_df.columns:
@@ -672,7 +728,7 @@ if SHEET_URL:
                             # Limpiar columnas auxiliares
                             top_productos = top_productos.drop(columns=["SKU_EKM_CLEAN", "EKM_CLEAN"])
                             # Reorganizar columnas
-                            top_productos = top_productos[["SKU EKM", "NOMBRE", "Cantidad Vendida"]]
+                            top_productos = top_productos[["SKU EKM", "NOMBRE", "Cantidad Vendida", "ACUMULADO", "CLASIFICACION"]]
                             top_productos["NOMBRE"] = top_productos["NOMBRE"].fillna("Sin nombre")
                         else:
                             st.info("💡 Sube el catálogo de productos para ver los nombres de los productos")
@@ -742,4 +798,7 @@ else:
     }
     
     for col, desc in expected_columns.items():
-        st.write(f"- **{col}**: {desc}")
\ No newline at end of file
+        st.write(f"- **{col}**: {desc}")
+
+# Panel de rendimiento (solo si se activó en la barra lateral)
+mostrar_rendimiento()
@@ -3,6 +3,18 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import sys
+from pathlib import Path
+
+# Paquete compartido en la raíz del repositorio
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core import kpis
+from ekonomodo_core.instrumentacion import instrumentar, seccion
+from ekonomodo_core.sheets import id_libro, url_csv
+from ekonomodo_core.vistas.descargas import boton_descarga
+from ekonomodo_core.vistas.rendimiento import iniciar_rendimiento, mostrar_rendimiento
+from ekonomodo_core.vistas.tablas import configurar_columnas
 
 # Logo en la esquina superior
 top_col1, top_col2 = st.columns([0.7,0.3])
@@ -16,6 +28,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Panel de rendimiento (se activa desde la barra lateral)
+iniciar_rendimiento("ventas_mensual")
+
 # Título principal
 st.title("Dashboard de Análisis de Ventas")
 st.markdown("---")
@@ -85,21 +100,37 @@ def normalizar_datos(df):
     
     return df
 
+# Descargas simultáneas como máximo
+MAX_DESCARGAS = 6
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cargar_mes(sheet_id, mes):
+    """Descarga y normaliza la hoja de un mes (cache independiente por mes)"""
+    csv_url = url_csv(sheet_id, hoja=mes)
+    df_mes = pd.read_csv(csv_url, thousands='.', decimal=',')
+    df_mes['MES'] = mes  # Agregar columna de mes
+    return normalizar_datos(df_mes)
+
+@instrumentar()
 def cargar_google_sheets(url, meses):
-    """Carga datos desde Google Sheets para uno o múltiples meses"""
+    """
+    Carga datos desde Google Sheets para uno o múltiples meses.
+    
+    Cada mes se cachea por separado, así que agregar un mes a la selección
+    solo descarga ese mes; los que no están en cache se descargan en paralelo.
+    """
     try:
         if '/edit' in url:
             url = url.split('/edit')[0]
-        sheet_id = url.split('/d/')[1].split('/')[0]
+        sheet_id = id_libro(url)
+        
+        with ThreadPoolExecutor(max_workers=min(len(meses), MAX_DESCARGAS)) as pool:
+            futuros = {mes: pool.submit(cargar_mes, sheet_id, mes) for mes in meses}
         
         dfs = []
-        for mes in meses:
+        for mes, futuro in futuros.items():
             try:
-                # Intentar cargar cada mes
-                csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&sheet={mes}"
-                df_mes = pd.read_csv(csv_url, thousands='.', decimal=',')
-                df_mes['MES'] = mes  # Agregar columna de mes
-                dfs.append(df_mes)
+                dfs.append(futuro.result())
                 st.sidebar.success(f"✅ {mes} cargado")
             except Exception as e:
                 st.sidebar.warning(f"⚠️ {mes} no encontrado o sin datos")
@@ -108,9 +139,8 @@ def cargar_google_sheets(url, meses):
             st.error("No se pudo cargar ningún mes")
             return None
         
-        # Combinar todos los DataFrames
-        df_combined = pd.concat(dfs, ignore_index=True)
-        return normalizar_datos(df_combined)
+        # Combinar solo los meses seleccionados (ya normalizados)
+        return pd.concat(dfs, ignore_index=True)
         
     except Exception as e:
         st.error(f"Error al cargar datos de Google Sheets: {str(e)}")
@@ -132,6 +162,7 @@ if not google_sheet_url:
 if df is not None and not df.empty:
     
     # KPIs principales
+    seccion("KPIs", len(df))
     col1, col2, col3, col4 = st.columns(4)
     
     total_ventas = df['VALOR'].sum()
@@ -163,6 +194,7 @@ if df is not None and not df.empty:
     st.markdown("---")
     
     # Gráfico de progreso de meta
+    seccion("Progreso hacia la meta", len(df))
     st.subheader("Progreso hacia la Meta")
     progreso = (total_ventas / meta_ventas) * 100
     
@@ -195,6 +227,7 @@ if df is not None and not df.empty:
     st.markdown("---")
     
     # Dos columnas para gráficos
+    seccion("Vendedores y ciudades", len(df))
     col1, col2 = st.columns(2)
     
     with col1:
@@ -213,10 +246,11 @@ if df is not None and not df.empty:
     
     with col2:
         st.subheader("🌆 Ventas por Ciudad")
-        ventas_ciudad = df.groupby('CIUDAD')['VALOR'].sum().sort_values(ascending=False)
+        ventas_ciudad = kpis.ventas(df, 'CIUDAD', valor='VALOR', documento=None, unidades=None, cliente=None)
         fig_ciudad = px.pie(
-            values=ventas_ciudad.values,
-            names=ventas_ciudad.index,
+            ventas_ciudad,
+            values='VALOR_TOTAL',
+            names='CIUDAD',
             hole=0.4
         )
         fig_ciudad.update_layout(height=400)
@@ -225,6 +259,7 @@ if df is not None and not df.empty:
     st.markdown("---")
     
     # Productos más vendidos
+    seccion("Top productos", len(df))
     col1, col2 = st.columns(2)
     
     with col1:
@@ -258,34 +293,39 @@ if df is not None and not df.empty:
     st.markdown("---")
     
     # Tabla detallada de vendedores
+    seccion("Detalle por vendedor", len(df))
     st.subheader("Detalle por Vendedor")
-    detalle_vendedor = df.groupby('NOMBRE').agg({
-        'VALOR': 'sum',
-        'CANTIDAD': 'sum',
-        'REFERENCIA': 'count',
-        'CIUDAD': 'first'
-    }).round(2)
-    detalle_vendedor.columns = ['Ventas ($)', 'Unidades', 'Num. Transacciones', 'Ciudad']
+    # Un solo groupby con agregaciones con nombre; la participación se divide sobre el resultado
+    detalle_vendedor = kpis.ventas(
+        df, 'NOMBRE', valor='VALOR', documento=None, unidades='CANTIDAD', cliente=None,
+        adicionales={'TRANSACCIONES': ('REFERENCIA', 'count'), 'CIUDAD': ('CIUDAD', 'first')}
+    ).set_index('NOMBRE').round(2)
+    detalle_vendedor.columns = ['Ventas ($)', 'Unidades', 'Num. Transacciones', 'Ciudad', '% de Participación']
     detalle_vendedor = detalle_vendedor.sort_values('Ventas ($)', ascending=False)
     detalle_vendedor['% de Meta Individual'] = (detalle_vendedor['Ventas ($)'] / meta_ventas * 100).round(2)
     
-    # Formatear la tabla para mostrar
-    detalle_vendedor_formatted = detalle_vendedor.copy()
-    detalle_vendedor_formatted['Ventas ($)'] = detalle_vendedor_formatted['Ventas ($)'].apply(lambda x: f"${x:,.2f}")
-    detalle_vendedor_formatted['% de Meta Individual'] = detalle_vendedor_formatted['% de Meta Individual'].apply(lambda x: f"{x:.2f}%")
+    # Formato en el navegador: la tabla sigue numérica y se puede ordenar
+    config_detalle = configurar_columnas(
+        detalle_vendedor,
+        pesos=['Ventas ($)'],
+        enteros=['Unidades', 'Num. Transacciones']
+    )
+    # % de Participación y % de Meta Individual ya vienen en escala 0-100
+    config_detalle['% de Participación'] = st.column_config.NumberColumn(format="%.2f%%")
+    config_detalle['% de Meta Individual'] = st.column_config.NumberColumn(format="%.2f%%")
     
-    st.dataframe(detalle_vendedor_formatted, use_container_width=True)
+    st.dataframe(detalle_vendedor, use_container_width=True, column_config=config_detalle)
     
     # Opción de descargar datos procesados
+    seccion("Exportar datos", len(df))
     st.markdown("---")
     st.subheader("💾 Exportar Datos")
     
-    csv = detalle_vendedor.to_csv().encode('utf-8')
-    st.download_button(
-        label="📥 Descargar Resumen por Vendedor (CSV)",
-        data=csv,
-        file_name=f"resumen_ventas_{datetime.now().strftime('%Y%m%d')}.csv",
-        mime="text/csv"
+    # El vendedor es el índice; se pasa a columna al generar el archivo
+    boton_descarga(
+        lambda: detalle_vendedor.reset_index(),
+        f"resumen_ventas_{datetime.now().strftime('%Y%m%d')}",
+        etiqueta="📥 Descargar Resumen por Vendedor (CSV)"
     )
 
 else:
@@ -314,4 +354,7 @@ else:
     - DESCRIPCION (descripción del producto - tercera columna con este nombre)
     - CANTIDAD
     - VALOR
-    """)
\ No newline at end of file
+    """)
+
+# Panel de rendimiento (solo si se activó en la barra lateral)
+mostrar_rendimiento()
@@ -0,0 +1,143 @@
+"""
+Benchmark: alertas del tablero de control con filtros a mano vs motor de reglas.
+
+Genera órdenes sintéticas con la hoja de ``servidor_sheets.py`` (más
+variantes de '#N/A' en FACTURADO), las limpia con ``limpiar_pedidos`` y
+compara:
+
+- filtros: los siete bloques de filtros booleanos que tenía el dashboard
+  (con ``FACTURADO_STR`` y sus tres comparaciones de texto fila por fila)
+  contra ``control.calcular_alertas`` sobre ``REGLAS_ALERTAS``;
+- tardanza: ``calcular_dias_habiles`` orden por orden contra
+  ``contar_dias_habiles`` sobre una muestra de las vencidas.
+
+Verifica que ambos caminos den las mismas filas y los mismos días.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_alertas.py
+    python benchmarks/bench_alertas.py --filas 10000 100000 --repeticiones 5 --muestra 100
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.append(str(RAIZ))
+sys.path.append(str(RAIZ / "benchmarks"))
+from ekonomodo_core.pipelines import control
+from servidor_sheets import hoja_pedidos_control
+
+
+def medir(funcion, repeticiones):
+    """Devuelve la mediana (segundos) de ``repeticiones`` llamadas."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def alertas_filtros(df_periodo, fecha_actual):
+    """Los filtros que tenía el dashboard antes del motor de reglas (sin tardanza)"""
+    vencidas = df_periodo[
+        (df_periodo['FECHA DE VENCIMIENTO'] < fecha_actual) &
+        (df_periodo['ESTATUS'] == 'PRODUCCION')
+    ]
+    fecha_limite = control.dias_habiles_colombia(fecha_actual, 2)
+    proximos_vencer = df_periodo[
+        (df_periodo['FECHA DE VENCIMIENTO'] <= fecha_limite) &
+        (df_periodo['FECHA DE VENCIMIENTO'] >= fecha_actual) &
+        (df_periodo['ESTATUS'] == 'PRODUCCION')
+    ]
+    devoluciones = df_periodo[df_periodo['ESTATUS LOGISTICA'] == 'DEVOLUCION']
+    entregados_no_recibidos = df_periodo[
+        (df_periodo['ESTATUS'] == 'ENTREGADO') &
+        (df_periodo['ESTATUS LOGISTICA'].isna() | (df_periodo['ESTATUS LOGISTICA'] == '') | (df_periodo['ESTATUS LOGISTICA'] == 'NAN'))
+    ]
+    pendientes_despacho = df_periodo[
+        (df_periodo['ESTATUS'].isin(['IMPORTADO', 'PRODUCCION', 'ENTREGADO'])) &
+        (~df_periodo['LOGISTICA'].isin(['ENTREGADO', 'DESPACHADO']))
+    ]
+    ordenes_validas = df_periodo[
+        df_periodo['ORDEN'].notna() &
+        (df_periodo['ORDEN'] != '') &
+        (df_periodo['ORDEN'] != 'NAN') &
+        (df_periodo['ESTATUS'] != 'CANCELADO')
+    ].copy()
+    ordenes_validas['FACTURADO_STR'] = ordenes_validas['FACTURADO'].astype(str).str.strip()
+    ordenes_validas['FACTURADO_NUM'] = pd.to_numeric(ordenes_validas['FACTURADO'], errors='coerce')
+    no_facturadas = ordenes_validas[ordenes_validas['FACTURADO_NUM'] == 0]
+    no_registradas = ordenes_validas[
+        (ordenes_validas['FACTURADO_STR'].str.contains('#N/A', case=False, na=False)) |
+        (ordenes_validas['FACTURADO_STR'].str.upper() == '#N/A') |
+        (ordenes_validas['FACTURADO_STR'] == 'N/A') |
+        (ordenes_validas['FACTURADO'].isna())
+    ]
+    return {
+        'vencidas': vencidas,
+        'proximos_vencer': proximos_vencer,
+        'devoluciones': devoluciones,
+        'entregados_no_recibidos': entregados_no_recibidos,
+        'pendientes_despacho': pendientes_despacho,
+        'no_facturadas': no_facturadas,
+        'no_registradas': no_registradas,
+    }
+
+
+def ordenes_sinteticas(n, rng, hoy):
+    """Órdenes limpias como las deja ``cargar_pedidos``"""
+    hoja = hoja_pedidos_control(n, rng, hoy)
+    # Variantes de no registrado en Siigo y valores numéricos de FACTURADO
+    extra = rng.random(n)
+    hoja.loc[extra < .03, "FACTURADO"] = "#n/a"
+    hoja.loc[(extra >= .03) & (extra < .05), "FACTURADO"] = " N/A "
+    hoja.loc[(extra >= .05) & (extra < .08), "FACTURADO"] = "0.0"
+    hoja["FACTURADO"] = hoja["FACTURADO"].replace("", np.nan)
+    return control.limpiar_pedidos(hoja)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--filas', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--muestra', type=int, default=200, help="vencidas para comparar la tardanza")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    hoy = pd.Timestamp.now().normalize() + pd.Timedelta(hours=10)
+    print(f"{'filas':>10} | {'filtros':>10} | {'reglas':>10} | speedup | {'muestra':>7} | {'tardanza/fila':>13} | {'vectorizada':>11} | speedup")
+    print("-" * 100)
+    for n in args.filas:
+        df = ordenes_sinteticas(n, rng, hoy)
+
+        esperado = alertas_filtros(df, hoy)
+        obtenido = control.calcular_alertas(df, hoy)
+        for nombre, filas in esperado.items():
+            if not filas.index.equals(obtenido[nombre].index):
+                raise RuntimeError(f"La alerta {nombre} no coincide con los filtros de referencia")
+
+        muestra = obtenido['vencidas'].head(args.muestra)
+        por_fila = [control.calcular_dias_habiles(fecha, hoy) for fecha in muestra['FECHA DE VENTA']]
+        if [d if d is not None else pd.NA for d in por_fila] != list(control.contar_dias_habiles(muestra['FECHA DE VENTA'], hoy)):
+            raise RuntimeError("contar_dias_habiles no coincide con calcular_dias_habiles")
+
+        t_filtros = medir(lambda: alertas_filtros(df, hoy), args.repeticiones)
+        t_reglas = medir(lambda: control.calcular_alertas(df, hoy), args.repeticiones)
+        t_fila = medir(lambda: [control.calcular_dias_habiles(fecha, hoy) for fecha in muestra['FECHA DE VENTA']], 1)
+        t_vector = medir(lambda: control.contar_dias_habiles(muestra['FECHA DE VENTA'], hoy), args.repeticiones)
+        print(f"{n:>10,} | {t_filtros * 1000:>7.1f} ms | {t_reglas * 1000:>7.1f} ms | {t_filtros / t_reglas:>6.1f}x | "
+              f"{len(muestra):>7,} | {t_fila * 1000:>10.1f} ms | {t_vector * 1000:>8.1f} ms | {t_fila / t_vector:>6.1f}x")
+
+    print("\nLa columna 'reglas' incluye la tardanza vectorizada de todas las vencidas;")
+    print("'filtros' no incluye tardanza (el dashboard la calculaba fila por fila al abrir el detalle).")
+
+
+if __name__ == '__main__':
+    main()
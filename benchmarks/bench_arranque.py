@@ -0,0 +1,102 @@
+"""
+Benchmark: arranque de los dashboards hasta la pantalla de carga.
+
+Corre la primera ejecución de cada dashboard (``AppTest``, sin archivos
+subidos, así que solo se pinta la pantalla de carga) en un proceso nuevo
+con ``python -X importtime``. Reporta el tiempo de esa primera ejecución y
+las importaciones más caras que dispara el script (las de Streamlit y
+``AppTest`` quedan antes de una marca y no se cuentan).
+
+Falla si la pantalla de carga importa alguno de ``PESADOS`` (se difieren
+con ``ekonomodo_core.perezoso``) o si algún dashboard pasa del presupuesto.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_arranque.py
+    python benchmarks/bench_arranque.py --presupuesto 0.5 --top 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+DASHBOARDS = {
+    "despachos": "Proyecto2_dashboard_despachos/dashboard_despachos.py",
+    "pedidos": "Proyecto4_dashboard_pedidos/dashboard_pedidos.py",
+    "comparativo": "Proyecto6_dashboard_ventas_comparativo/dashboard_ventas_comparativo.py",
+}
+PESADOS = ("pandas", "plotly", "matplotlib", "seaborn")
+MARCA = "@@ARRANQUE@@"
+
+# Se ejecuta en el proceso hijo: importa Streamlit, deja la marca y corre el script una vez
+PRIMERA_EJECUCION = f"""
+import sys, time
+from streamlit.testing.v1 import AppTest
+sys.stderr.write("{MARCA}\\n")
+sys.stderr.flush()
+inicio = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+print(time.perf_counter() - inicio, len(at.exception))
+"""
+
+
+def primera_ejecucion(script):
+    """(segundos, excepciones, [(módulo, acumulado_us)]) de una primera ejecución en un proceso nuevo"""
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PRIMERA_EJECUCION, str(RAIZ / script)],
+        capture_output=True, text=True, cwd=RAIZ, check=True,
+    )
+    segundos, excepciones = proceso.stdout.split()[-2:]
+    importaciones = []
+    lineas = proceso.stderr.splitlines()
+    for linea in lineas[lineas.index(MARCA) + 1:]:
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, modulo = linea.split("|")
+        # Solo las de primer nivel: las anidadas ya están en el acumulado de su padre
+        if not modulo.startswith("  "):
+            importaciones.append((modulo.strip(), int(acumulado)))
+    return float(segundos), int(excepciones), importaciones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dashboards", nargs="+", choices=list(DASHBOARDS), default=list(DASHBOARDS))
+    parser.add_argument("--presupuesto", type=float, default=1.0, help="segundos hasta la pantalla de carga")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    excedidos = []
+    print(f"{'dashboard':>12} | {'primera ejecución':>17} | {'importaciones':>13} | más caras")
+    print("-" * 90)
+    for nombre in args.dashboards:
+        corridas = [primera_ejecucion(DASHBOARDS[nombre]) for _ in range(args.repeticiones)]
+        segundos = statistics.median(corrida[0] for corrida in corridas)
+        _, excepciones, importaciones = corridas[-1]
+        if excepciones:
+            raise RuntimeError(f"{nombre}: la pantalla de carga terminó con {excepciones} excepción(es)")
+        pesados = sorted({modulo for modulo, _ in importaciones if modulo.split(".")[0] in PESADOS})
+        if pesados:
+            raise RuntimeError(f"{nombre}: la pantalla de carga importa {', '.join(pesados)}")
+
+        total = sum(acumulado for _, acumulado in importaciones) / 1e6
+        caras = sorted(importaciones, key=lambda par: par[1], reverse=True)[:args.top]
+        detalle = ", ".join(f"{modulo} {acumulado / 1000:.0f} ms" for modulo, acumulado in caras)
+        marca = "" if segundos <= args.presupuesto else "  <-- sobre el presupuesto"
+        print(f"{nombre:>12} | {segundos:>15.2f} s | {total:>11.2f} s | {detalle}{marca}")
+        if segundos > args.presupuesto:
+            excedidos.append(nombre)
+
+    print(f"\nPresupuesto: {args.presupuesto:.2f} s hasta la pantalla de carga")
+    if excedidos:
+        print(f"Sobre el presupuesto: {', '.join(excedidos)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
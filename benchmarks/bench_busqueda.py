@@ -0,0 +1,77 @@
+"""
+Benchmark: búsqueda de órdenes con ``str.contains`` vs ``IndiceBusqueda``.
+
+Compara lo que hacía la pestaña "🔍 Buscar Orden" del dashboard de control
+(``astype(str).str.contains`` sobre cada columna en cada rerun) con el índice
+de n-gramas que se construye una vez por instantánea, sobre las columnas de
+``control.CAMPOS_BUSQUEDA``. Verifica que ambos encuentren las mismas filas.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_busqueda.py
+    python benchmarks/bench_busqueda.py --filas 10000 100000 500000 --consultas 5012 ekm04 mesa
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.append(str(RAIZ))
+sys.path.append(str(RAIZ / "benchmarks"))
+from ekonomodo_core.busqueda import IndiceBusqueda
+from ekonomodo_core.pipelines import control
+from servidor_sheets import hoja_pedidos_control
+
+
+def medir(funcion, repeticiones):
+    """Devuelve la mediana (segundos) de ``repeticiones`` llamadas."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def buscar_contains(df, consulta, campos):
+    """Filas donde algún campo contiene la consulta, recorriendo el frame completo"""
+    mascara = np.zeros(len(df), dtype=bool)
+    for campo in campos:
+        mascara |= df[campo].astype(str).str.contains(consulta, case=False, regex=False, na=False).to_numpy()
+    return np.flatnonzero(mascara)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--filas', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--consultas', nargs='+', default=['501234', 'EKM04', 'falabella', 'silla erg', 'x9z'])
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    campos = list(control.CAMPOS_BUSQUEDA)
+    rng = np.random.default_rng(42)
+    print(f"{'filas':>10} | {'consulta':>10} | {'resultados':>10} | {'contains':>10} | {'índice':>10} | speedup")
+    print("-" * 76)
+    for n in args.filas:
+        df = control.limpiar_pedidos(hoja_pedidos_control(n, rng, pd.Timestamp.now()))
+        inicio = time.perf_counter()
+        indice = IndiceBusqueda(df, campos)
+        print(f"{n:>10,} | construir índice: {(time.perf_counter() - inicio) * 1000:.0f} ms ({len(indice):,} entradas)")
+        for consulta in args.consultas:
+            esperado = buscar_contains(df, consulta, campos)
+            if not np.array_equal(np.sort(indice.buscar(consulta)), esperado):
+                raise RuntimeError(f"El índice no coincide con str.contains para {consulta!r}")
+
+            t_contains = medir(lambda: buscar_contains(df, consulta, campos), args.repeticiones)
+            t_indice = medir(lambda: indice.buscar(consulta), args.repeticiones)
+            print(f"{n:>10,} | {consulta:>10} | {len(esperado):>10,} | {t_contains * 1000:>7.1f} ms | "
+                  f"{t_indice * 1000:>7.2f} ms | {t_contains / t_indice:>6.0f}x")
+
+
+if __name__ == '__main__':
+    main()
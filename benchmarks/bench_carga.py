@@ -0,0 +1,159 @@
+"""
+Benchmark: tiempo de carga de los dashboards contra el servidor local de Sheets.
+
+Por cada tamaño arranca ``servidor_sheets`` en el mismo proceso, apunta los
+dashboards a él con ``EKONOMODO_SHEETS_BASE`` y corre cada dashboard con
+``streamlit.testing.v1.AppTest``:
+
+- frío: cache de Streamlit vacío (y almacén SIIGO vacío), primera ejecución
+- tibio: segunda ejecución del mismo AppTest, con el cache lleno
+- parseo: solo ``pd.read_csv`` / ``pd.read_excel`` sobre las respuestas ya descargadas
+- pico de memoria: una ejecución en frío aparte bajo ``tracemalloc``
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_carga.py
+    python benchmarks/bench_carga.py --filas 1000 10000 --latencia 0.2 --dashboards control leidy
+"""
+
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+# Sin los avisos de Streamlit en la salida del benchmark
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.append(str(RAIZ))
+sys.path.append(str(Path(__file__).resolve().parent))
+import servidor_sheets
+from ekonomodo_core.sheets import VARIABLE_BASE, url_csv, url_gviz_csv, url_xlsx
+
+
+def _csv(**kwargs):
+    return lambda contenido: pd.read_csv(io.BytesIO(contenido), **kwargs)
+
+
+def _lecturas_control():
+    return [
+        (url_csv(servidor_sheets.ID_CONTROL_2026, gid=servidor_sheets.GID_PEDIDOS),
+         _csv(header=1, keep_default_na=False, na_values=[''])),
+        (url_gviz_csv(servidor_sheets.ID_CONTROL_2026, "Estatus 2025"), _csv()),
+        (url_gviz_csv(servidor_sheets.ID_CONTROL_2026, "Estatus 2026"), _csv()),
+    ]
+
+
+def _lecturas_ventas():
+    return [(url_gviz_csv(servidor_sheets.ID_SIIGO, hoja), _csv()) for hoja in ("SIIGO 2024", "SIIGO 2025")]
+
+
+def _lecturas_leidy():
+    return [(url_xlsx(servidor_sheets.ID_LEIDY),
+             lambda contenido: pd.read_excel(io.BytesIO(contenido), sheet_name=["BASE", "LISTA DE PRECIOS"]))]
+
+
+def _lecturas_ventas_mensual():
+    # El dashboard arranca con NOVIEMBRE seleccionado
+    return [(url_csv(servidor_sheets.ID_VENTAS_MENSUAL, hoja="NOVIEMBRE"), _csv(thousands='.', decimal=','))]
+
+
+DASHBOARDS = {
+    "control": ("Proyecto5_dashboard_control/dashboard_control_2026.py", _lecturas_control),
+    "ventas": ("Proyecto1_dashboard_ventas/dashboard_ventas.py", _lecturas_ventas),
+    "leidy": ("Proyecto7_dashboard_Leidy/dashboard_Leidy_drive.py", _lecturas_leidy),
+    "ventas_mensual": ("Proyecto8_dashboard_ventas_mensual/dashboard_ventas_mensual.py", _lecturas_ventas_mensual),
+}
+
+
+def _vaciar(almacen):
+    """Cache de Streamlit y almacén SIIGO vacíos para una ejecución en frío"""
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    shutil.rmtree(almacen, ignore_errors=True)
+
+
+def _correr(at):
+    inicio = time.perf_counter()
+    at.run()
+    duracion = time.perf_counter() - inicio
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return duracion
+
+
+def medir_dashboard(servidor, archivo, lecturas, almacen, timeout):
+    """Tiempos (s), pico de memoria (MB) y tráfico de un dashboard"""
+    _vaciar(almacen)
+    servidor.reiniciar_contadores()
+    at = AppTest.from_file(str(RAIZ / archivo), default_timeout=timeout)
+    frio = _correr(at)
+    solicitudes, descargado = servidor.solicitudes, servidor.bytes_enviados
+    tibio = _correr(at)
+
+    parseo = 0.0
+    for url, lector in lecturas():
+        contenido = requests.get(url).content
+        inicio = time.perf_counter()
+        lector(contenido)
+        parseo += time.perf_counter() - inicio
+
+    _vaciar(almacen)
+    tracemalloc.start()
+    try:
+        _correr(AppTest.from_file(str(RAIZ / archivo), default_timeout=timeout))
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "frio": frio,
+        "tibio": tibio,
+        "parseo": parseo,
+        "pico_mb": pico / 1e6,
+        "solicitudes": solicitudes,
+        "descargado_mb": descargado / 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--filas', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--latencia', type=float, default=0.0, help='segundos agregados a cada solicitud')
+    parser.add_argument('--dashboards', nargs='+', choices=list(DASHBOARDS), default=list(DASHBOARDS))
+    parser.add_argument('--timeout', type=float, default=600, help='segundos máximos por ejecución')
+    args = parser.parse_args()
+
+    almacen = Path(tempfile.mkdtemp(prefix="almacen_siigo_"))
+    os.environ["EKONOMODO_ALMACEN_SIIGO"] = str(almacen)
+
+    print(f"{'dashboard':>15} {'filas':>9} {'frío (s)':>9} {'tibio (s)':>10} {'parseo (s)':>11} "
+          f"{'pico (MB)':>10} {'solicitudes':>12} {'descarga (MB)':>14}", flush=True)
+    try:
+        for filas in args.filas:
+            servidor = servidor_sheets.iniciar(filas=filas, latencia=args.latencia)
+            os.environ[VARIABLE_BASE] = servidor.base
+            try:
+                for nombre in args.dashboards:
+                    archivo, lecturas = DASHBOARDS[nombre]
+                    r = medir_dashboard(servidor, archivo, lecturas, almacen, args.timeout)
+                    print(f"{nombre:>15} {filas:>9,} {r['frio']:>9.2f} {r['tibio']:>10.2f} {r['parseo']:>11.3f} "
+                          f"{r['pico_mb']:>10.1f} {r['solicitudes']:>12} {r['descargado_mb']:>14.2f}", flush=True)
+            finally:
+                servidor.shutdown()
+                servidor.server_close()
+    finally:
+        shutil.rmtree(almacen, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: memoria y agregaciones con los tipos compactos de la carga.
+
+Compara un frame con la forma de las ventas SIIGO preparadas tal como sale
+de la limpieza (texto como object, enteros int64) con el mismo frame pasado
+por ``ekonomodo_core.compacto.compactar``: bytes (``memory_usage(deep=True)``),
+tiempo de un groupby por plataforma y vendedor y tiempo de un filtro por
+plataforma. Verifica que las sumas por grupo den exactamente lo mismo (el
+dinero se queda en 64 bits) y muestra cuánto se perdería con ``float32``.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_compacto.py
+    python benchmarks/bench_compacto.py --filas 100000 1000000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core.compacto import compactar
+from ekonomodo_core.pipelines.ventas import COLUMNAS_CATEGORICAS, COLUMNAS_DINERO
+
+
+def medir(funcion, repeticiones):
+    """Devuelve la mediana (segundos) de ``repeticiones`` llamadas."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def ventas_sinteticas(n, rng):
+    """Frame con la forma de las ventas SIIGO preparadas"""
+    return pd.DataFrame({
+        "NUMERO": rng.integers(1, n // 3, n),
+        "FECHA": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D"),
+        "CLIENTE": rng.choice([f"CLIENTE {numero}" for numero in range(2_000)], n),
+        "PLATAFORMA": rng.choice(["FALABELLA", "MERCADOLIBRE", "HOMECENTER", "TIENDA WEB", "EXITO"], n),
+        "VENDEDOR": rng.choice(["0004 KATERINE", "0007 CARLOS", "0011 LAURA"], n),
+        "TIPO_CLIENTE": rng.choice(["Empresa", "Persona Natural"], n),
+        "VALOR NETO": rng.gamma(2.0, 150_000, n).round(0),
+        "CANT.PEDIDA": rng.integers(1, 10, n),
+    })
+
+
+def agrupar(df):
+    return df.groupby(["PLATAFORMA", "VENDEDOR"], observed=True)["VALOR NETO"].sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, nargs="+", default=[50_000, 500_000])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'filas':>9} | {'tipos':>10} | {'memoria':>9} | {'groupby':>9} | {'filtro':>9}")
+    print("-" * 59)
+    for n in args.filas:
+        original = ventas_sinteticas(n, rng)
+        compacto = compactar(original, "ventas", COLUMNAS_CATEGORICAS, COLUMNAS_DINERO, con_reporte=False)
+
+        esperado, obtenido = agrupar(original), agrupar(compacto)
+        if not np.array_equal(esperado.to_numpy(), obtenido.to_numpy()):
+            raise RuntimeError("Las sumas por grupo cambiaron al compactar")
+
+        for nombre, df in (("originales", original), ("compactos", compacto)):
+            mb = df.memory_usage(deep=True).sum() / 1e6
+            t_grupo = medir(lambda: agrupar(df), args.repeticiones)
+            t_filtro = medir(lambda: df[df["PLATAFORMA"] == "FALABELLA"], args.repeticiones)
+            print(f"{n:>9,} | {nombre:>10} | {mb:>6.1f} MB | {t_grupo * 1000:>6.1f} ms | {t_filtro * 1000:>6.1f} ms")
+
+        en_float32 = original.assign(**{"VALOR NETO": original["VALOR NETO"].astype("float32")})
+        error = (agrupar(en_float32).astype("float64") - esperado).abs().max()
+        print(f"{n:>9,} | con float32 en VALOR NETO las sumas por grupo se desvían hasta ${error:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
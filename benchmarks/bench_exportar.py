@@ -0,0 +1,100 @@
+"""
+Benchmark: costo de las descargas por rerun y por formato.
+
+Antes cada rerun serializaba a CSV el frame filtrado para pasarlo a
+``st.download_button``, aunque nadie hiciera clic. Con
+``ekonomodo_core.vistas.descargas.boton_descarga`` el archivo se genera en
+el clic; este script mide lo que cuesta cada formato de
+``ekonomodo_core.exportar`` cuando sí se pide (tiempo, tamaño y pico de
+memoria) y compara el XLSX por bloques con ``to_excel``. Verifica que cada
+archivo se pueda leer de vuelta con las mismas filas.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_exportar.py
+    python benchmarks/bench_exportar.py --filas 10000 100000 --formatos csv parquet
+"""
+
+import argparse
+import io
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core.exportar import ESCRITORES
+
+LECTORES = {"csv": pd.read_csv, "xlsx": pd.read_excel, "parquet": pd.read_parquet}
+
+
+def medir(funcion, repeticiones):
+    """Devuelve la mediana (segundos) de ``repeticiones`` llamadas."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def pico_mb(funcion):
+    """Pico de memoria (MB, tracemalloc) de una llamada"""
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def despachos_sinteticos(n, rng):
+    """Frame con la mezcla de tipos de un detalle de despachos"""
+    return pd.DataFrame({
+        "PEDIDO": rng.integers(100_000, 999_999, n).astype(str),
+        "CLIENTE": rng.choice(["FALABELLA", "MERCADOLIBRE", "HOMECENTER", "TIENDA WEB"], n),
+        "CIUDAD": rng.choice(["BOGOTA", "MEDELLIN", "CALI", "BARRANQUILLA", None], n),
+        "FECHA DESPACHO": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D"),
+        "COSTO FLETE": rng.gamma(2.0, 15_000, n).round(0),
+        "CANTIDAD": rng.integers(1, 10, n),
+    })
+
+
+def a_excel(df):
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, nargs="+", default=[5_000, 20_000])
+    parser.add_argument("--formatos", nargs="+", choices=list(ESCRITORES), default=list(ESCRITORES))
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'filas':>8} | {'formato':>12} | {'tiempo':>10} | {'tamaño':>9} | {'pico memoria':>12}")
+    print("-" * 64)
+    for n in args.filas:
+        df = despachos_sinteticos(n, rng)
+        casos = [(formato, ESCRITORES[formato]) for formato in args.formatos]
+        if "xlsx" in args.formatos:
+            casos.append(("to_excel", a_excel))
+        for nombre, escribir in casos:
+            contenido = escribir(df)
+            leido = LECTORES.get(nombre, pd.read_excel)(io.BytesIO(contenido))
+            if len(leido) != n:
+                raise RuntimeError(f"{nombre}: se leyeron {len(leido)} filas de {n}")
+            segundos = medir(lambda: escribir(df), 1 if nombre in ("xlsx", "to_excel") else args.repeticiones)
+            print(f"{n:>8,} | {nombre:>12} | {segundos * 1000:>7.0f} ms | {len(contenido) / 1e6:>6.2f} MB | "
+                  f"{pico_mb(lambda: escribir(df)):>9.1f} MB")
+        print(f"{n:>8,} | {'por rerun':>12} | antes {medir(lambda: df.to_csv(index=False), args.repeticiones) * 1000:.0f} ms "
+              f"(to_csv eager), ahora 0 ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: armar las figuras de Plotly en cada rerun frente a reutilizarlas del cache.
+
+Arma sobre agregados con la forma de los de despachos y pedidos (barras por
+ciudad, torta por clasificación, treemap departamento/ciudad) la figura de
+Plotly Express directamente, como antes en cada rerun, y con
+``ekonomodo_core.vistas.graficos.figura``, que en el rerun siguiente con el
+mismo agregado la devuelve del cache. También mide ``to_json``, la
+serialización que ``st.plotly_chart`` hace igual en cada rerun.
+
+Verifica que la figura del cache sea la misma (mismo JSON) que la armada
+directamente.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_figuras.py
+    python benchmarks/bench_figuras.py --repeticiones 10
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core.vistas import graficos
+
+DEPARTAMENTOS = {
+    "CUNDINAMARCA": ["BOGOTA", "SOACHA", "CHIA", "ZIPAQUIRA"],
+    "ANTIOQUIA": ["MEDELLIN", "ENVIGADO", "BELLO", "ITAGUI"],
+    "VALLE DEL CAUCA": ["CALI", "PALMIRA", "BUENAVENTURA"],
+    "ATLANTICO": ["BARRANQUILLA", "SOLEDAD"],
+    "SANTANDER": ["BUCARAMANGA", "FLORIDABLANCA", "GIRON"],
+}
+
+
+def medir(funcion, repeticiones):
+    """Devuelve la mediana (segundos) de ``repeticiones`` llamadas."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def agregados(rng):
+    """Agregados chicos como los que grafican los dashboards"""
+    ciudades = pd.DataFrame(
+        [(departamento, ciudad) for departamento, lista in DEPARTAMENTOS.items() for ciudad in lista],
+        columns=["DEPARTAMENTO", "CIUDAD"],
+    )
+    ciudades["VAL.PEDIDO"] = rng.gamma(2.0, 20_000_000, len(ciudades)).round(0)
+    ciudades["EFICIENCIA"] = rng.uniform(40, 100, len(ciudades)).round(1)
+    clases = pd.Series(rng.integers(5, 200, 4), index=["Premium", "Frecuente", "Ocasional", "Nuevo"])
+    return ciudades, clases
+
+
+def casos(ciudades, clases):
+    """(nombre, constructor, datos, opciones, diseno) de cada figura"""
+    return (
+        ("barras ciudad", px.bar, ciudades,
+         dict(x="CIUDAD", y="VAL.PEDIDO", color="EFICIENCIA", color_continuous_scale="RdYlGn",
+              title="Ventas por ciudad"),
+         dict(height=500, showlegend=False)),
+        ("torta clases", px.pie, None,
+         dict(values=clases.values, names=clases.index, title="Distribución de comercios"),
+         None),
+        ("treemap ciudad", px.treemap, ciudades,
+         dict(path=[px.Constant("Colombia"), "DEPARTAMENTO", "CIUDAD"], values="VAL.PEDIDO",
+              color="EFICIENCIA", color_continuous_scale="RdYlGn", title="Ventas por departamento y ciudad"),
+         dict(height=600)),
+    )
+
+
+def directa(constructor, datos, opciones, diseno):
+    """La figura armada como antes: ``px`` más ``update_layout``"""
+    fig = constructor(datos, **opciones) if datos is not None else constructor(**opciones)
+    if diseno:
+        fig.update_layout(**diseno)
+    return fig
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    ciudades, clases = agregados(np.random.default_rng(42))
+    print(f"{'figura':>15} | {'armar':>9} | {'cache':>9} | {'to_json':>9} | {'mejora':>7}")
+    print("-" * 62)
+    for nombre, constructor, datos, opciones, diseno in casos(ciudades, clases):
+        desde_cache = graficos.figura(constructor, datos, diseno=diseno, **opciones)
+        armada = directa(constructor, datos, opciones, diseno)
+        if desde_cache.to_json() != armada.to_json():
+            raise RuntimeError(f"{nombre}: la figura del cache no coincide con la armada")
+
+        t_armar = medir(lambda: directa(constructor, datos, opciones, diseno), args.repeticiones)
+        t_cache = medir(lambda: graficos.figura(constructor, datos, diseno=diseno, **opciones), args.repeticiones)
+        t_json = medir(armada.to_json, args.repeticiones)
+        print(f"{nombre:>15} | {t_armar * 1000:>6.1f} ms | {t_cache * 1000:>6.2f} ms | "
+              f"{t_json * 1000:>6.2f} ms | {t_armar / t_cache:>6.0f}x")
+    print(graficos.estado_figuras())
+
+
+if __name__ == "__main__":
+    main()
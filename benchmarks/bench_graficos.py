@@ -0,0 +1,81 @@
+"""
+Benchmark: gráfico de series diarias completo vs reducido con LTTB.
+
+Compara lo que mandaban los gráficos de flujo diario (``px.line`` con un
+punto por día y trazo) con ``ekonomodo_core.vistas.graficos.figura_series``:
+tiempo de armar la figura y serializarla, y tamaño del JSON que recibe el
+navegador. Verifica que los totales de los tooltips sumen lo mismo que la
+serie original.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_graficos.py
+    python benchmarks/bench_graficos.py --dias 365 1825 --trazos 3 --ancho 600
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core.vistas.graficos import ANCHO_COMPLETO, figura_series
+
+
+def medir(funcion, repeticiones):
+    """Devuelve la mediana (segundos) de ``repeticiones`` llamadas."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def serie_diaria(dias, trazos, rng):
+    """Conteos diarios de ``trazos`` tipos, como la comparación entrada vs salida"""
+    fechas = pd.date_range(end=pd.Timestamp.today().normalize(), periods=dias).date
+    return pd.DataFrame({
+        'Fecha': np.tile(fechas, trazos),
+        'Cantidad': rng.poisson(20, dias * trazos),
+        'Tipo': np.repeat([f"Tipo {numero + 1}" for numero in range(trazos)], dias),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--dias', type=int, nargs='+', default=[90, 365, 1825])
+    parser.add_argument('--trazos', type=int, default=2)
+    parser.add_argument('--ancho', type=int, default=ANCHO_COMPLETO // 2, help="ancho del gráfico en píxeles")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'días':>6} | {'puntos':>13} | {'px.line':>16} | {'figura_series':>16} | JSON")
+    print("-" * 80)
+    for dias in args.dias:
+        df = serie_diaria(dias, args.trazos, rng)
+        completa = lambda: px.line(df, x='Fecha', y='Cantidad', color='Tipo', markers=True).to_json()
+        reducida = lambda: figura_series(df, 'Fecha', 'Cantidad', color='Tipo', ancho=args.ancho).to_json()
+
+        figura = figura_series(df, 'Fecha', 'Cantidad', color='Tipo', ancho=args.ancho)
+        for trazo, (_, filas) in zip(figura.data, df.groupby('Tipo', sort=False)):
+            totales = sum(fila[0] for fila in trazo.customdata) if trazo.customdata is not None else sum(trazo.y)
+            if totales != filas['Cantidad'].sum():
+                raise RuntimeError(f"Los totales del tooltip de {trazo.name} no suman la serie")
+
+        puntos = sum(len(trazo.x) for trazo in figura.data)
+        t_completa = medir(completa, args.repeticiones)
+        t_reducida = medir(reducida, args.repeticiones)
+        kb_completa, kb_reducida = len(completa()) / 1024, len(reducida()) / 1024
+        print(f"{dias:>6,} | {len(df):>5,} -> {puntos:>5,} | {t_completa * 1000:>7.1f} ms {kb_completa:>5.0f} KB | "
+              f"{t_reducida * 1000:>7.1f} ms {kb_reducida:>5.0f} KB | {kb_completa / kb_reducida:.1f}x menos"
+              f"{' (WebGL)' if figura.data[0].type == 'scattergl' else ''}")
+
+
+if __name__ == '__main__':
+    main()
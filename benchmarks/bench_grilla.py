@@ -0,0 +1,97 @@
+"""
+Benchmark: tabla de detalle completa vs grilla paginada en el servidor.
+
+Compara lo que cuesta por rerun mandar el frame filtrado entero a
+``st.dataframe`` (serialización Arrow de todas las filas) con lo que hace
+``ekonomodo_core.vistas.grilla.mostrar_grilla``: filtrar y ordenar sobre
+posiciones y serializar solo la página visible. Verifica que la página
+coincida con las primeras filas del frame filtrado y ordenado con pandas.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_grilla.py
+    python benchmarks/bench_grilla.py --filas 10000 200000 --por-pagina 50
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core.reglas import filtrar
+from ekonomodo_core.vistas.grilla import FILAS_POR_PAGINA, _ordenar
+
+CONDICIONES = [("CLIENTE", "en", ["FALABELLA", "HOMECENTER"]), ("COSTO FLETE", ">=", 20_000)]
+
+
+def medir(funcion, repeticiones):
+    """Devuelve la mediana (segundos) de ``repeticiones`` llamadas."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def arrow(df):
+    """Bytes Arrow IPC de ``df``, como los arma ``st.dataframe``"""
+    sumidero = pa.BufferOutputStream()
+    tabla = pa.Table.from_pandas(df)
+    with pa.RecordBatchStreamWriter(sumidero, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    return sumidero.getvalue().to_pybytes()
+
+
+def despachos_sinteticos(n, rng):
+    """Frame con la mezcla de tipos de un detalle de despachos"""
+    return pd.DataFrame({
+        "PEDIDO": rng.integers(100_000, 999_999, n).astype(str),
+        "CLIENTE": rng.choice(["FALABELLA", "MERCADOLIBRE", "HOMECENTER", "TIENDA WEB"], n),
+        "CIUDAD": rng.choice(["BOGOTA", "MEDELLIN", "CALI", "BARRANQUILLA", None], n),
+        "FECHA DESPACHO": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D"),
+        "COSTO FLETE": rng.gamma(2.0, 15_000, n).round(0),
+        "CANTIDAD": rng.integers(1, 10, n),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--por-pagina", type=int, default=FILAS_POR_PAGINA)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'filas':>8} | {'completa':>20} | {'grilla':>20} | mejora")
+    print("-" * 66)
+    for n in args.filas:
+        df = despachos_sinteticos(n, rng)
+
+        def completa():
+            filtrado = df[df["CLIENTE"].isin(CONDICIONES[0][2]) & (df["COSTO FLETE"] >= CONDICIONES[1][2])]
+            return arrow(filtrado.sort_values("COSTO FLETE", ascending=False, kind="stable"))
+
+        def grilla():
+            posiciones = _ordenar(df, filtrar(df, CONDICIONES), "COSTO FLETE", True)
+            return arrow(df.iloc[posiciones[:args.por_pagina]])
+
+        esperado = df[df["CLIENTE"].isin(CONDICIONES[0][2]) & (df["COSTO FLETE"] >= CONDICIONES[1][2])]
+        esperado = esperado.sort_values("COSTO FLETE", ascending=False, kind="stable").head(args.por_pagina)
+        posiciones = _ordenar(df, filtrar(df, CONDICIONES), "COSTO FLETE", True)
+        if not df.iloc[posiciones[:args.por_pagina]].equals(esperado):
+            raise RuntimeError("La página de la grilla no coincide con el frame filtrado y ordenado")
+
+        t_completa, t_grilla = medir(completa, args.repeticiones), medir(grilla, args.repeticiones)
+        kb_completa, kb_grilla = len(completa()) / 1024, len(grilla()) / 1024
+        print(f"{n:>8,} | {t_completa * 1000:>6.1f} ms {kb_completa:>7.0f} KB | "
+              f"{t_grilla * 1000:>6.1f} ms {kb_grilla:>7.0f} KB | {kb_completa / kb_grilla:.0f}x menos datos")
+
+
+if __name__ == "__main__":
+    main()
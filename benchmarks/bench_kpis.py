@@ -0,0 +1,140 @@
+"""
+Benchmark: indicadores por grupo con apply/lambda frente a agregaciones con nombre.
+
+Compara, sobre un frame con la forma de las ventas SIIGO preparadas, lo que
+hacía ``dashboard_ventas.py`` con lo que hace ``ekonomodo_core.kpis``:
+
+- ticket por mes (12 grupos) y por cliente (2.000 grupos):
+  ``groupby(...).apply(lambda x: suma / facturas)`` frente a ``kpis.ventas``
+  (un groupby y la división sobre el resultado). El costo de ``apply`` crece
+  con el número de grupos, porque llama una función de Python por cada uno;
+- devoluciones por vendedor: ``agg({'VALOR': lambda x: abs(x.sum())})``
+  frente a ``kpis.devoluciones``;
+- resumen por plataforma (valor, facturas, unidades, clientes, participación
+  y ticket) agrupando con ``agg`` de diccionario y dividiendo aparte frente a
+  ``kpis.ventas``.
+
+Con pocos grupos y un ``agg`` de diccionario la diferencia es pequeña: lo
+que se gana ahí es un solo camino para todos los indicadores. Verifica que
+ambos caminos den los mismos números.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_kpis.py
+    python benchmarks/bench_kpis.py --filas 100000 1000000 --repeticiones 3
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core import kpis
+
+VENDEDORES = ["0004 KATERINE", "0007 CARLOS", "0011 LAURA", "0015 ANDRES", "0021 PAOLA"]
+
+
+def medir(funcion, repeticiones):
+    """Devuelve la mediana (segundos) de ``repeticiones`` llamadas."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def ventas_sinteticas(n, rng):
+    """Frame con la forma de las ventas SIIGO preparadas"""
+    return pd.DataFrame({
+        "NUMERO": rng.integers(1, n // 3, n),
+        "CLIENTE": rng.choice([f"CLIENTE {numero}" for numero in range(2_000)], n),
+        "PLATAFORMA": pd.Categorical(rng.choice(["FALABELLA", "MERCADOLIBRE", "HOMECENTER", "TIENDA WEB", "EXITO"], n)),
+        "VENDEDOR": pd.Categorical(rng.choice(VENDEDORES, n)),
+        "VALOR NETO": rng.gamma(2.0, 150_000, n).round(0),
+        "CANT.PEDIDA": rng.integers(1, 10, n),
+        "MES_NUM": rng.integers(1, 13, n),
+    })
+
+
+def devoluciones_sinteticas(n, rng):
+    """Frame con la forma de las devoluciones (valores negativos)"""
+    return pd.DataFrame({
+        "VENDEDOR": pd.Categorical(rng.choice(VENDEDORES, n)),
+        "VALOR": -rng.gamma(2.0, 150_000, n).round(0),
+        "CANTIDAD": -rng.integers(1, 5, n),
+    })
+
+
+def ticket_apply(df, por):
+    return df.groupby(por).apply(
+        lambda x: x["VALOR NETO"].sum() / x["NUMERO"].nunique() if x["NUMERO"].nunique() > 0 else 0,
+        include_groups=False,
+    )
+
+
+def ticket_kpis(df, por):
+    return kpis.ventas(df, por, unidades=None, cliente=None).set_index(por)["TICKET_PROM"]
+
+
+def devoluciones_lambda(df):
+    return df.groupby("VENDEDOR", observed=True).agg({
+        "VALOR": lambda x: abs(x.sum()),
+        "CANTIDAD": lambda x: abs(x.sum()),
+    })
+
+
+def devoluciones_kpis(df):
+    return kpis.devoluciones(df, "VENDEDOR").set_index("VENDEDOR")
+
+
+def plataforma_dict(df):
+    resumen = df.groupby("PLATAFORMA", observed=True).agg({
+        "VALOR NETO": "sum",
+        "NUMERO": "nunique",
+        "CANT.PEDIDA": "sum",
+        "CLIENTE": "nunique",
+    }).reset_index()
+    resumen.columns = ["PLATAFORMA", "VALOR_TOTAL", "FACTURAS", "UNIDADES", "CLIENTES"]
+    resumen["PARTICIPACION"] = resumen["VALOR_TOTAL"] / resumen["VALOR_TOTAL"].sum() * 100
+    resumen["TICKET_PROM"] = resumen["VALOR_TOTAL"] / resumen["FACTURAS"]
+    return resumen.set_index("PLATAFORMA")
+
+
+def plataforma_kpis(df):
+    return kpis.ventas(df, "PLATAFORMA").set_index("PLATAFORMA")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, nargs="+", default=[50_000, 500_000])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    casos = (
+        ("ticket por mes", lambda df: ticket_apply(df, "MES_NUM"), lambda df: ticket_kpis(df, "MES_NUM"), "ventas"),
+        ("ticket por cliente", lambda df: ticket_apply(df, "CLIENTE"), lambda df: ticket_kpis(df, "CLIENTE"), "ventas"),
+        ("devol. vendedor", devoluciones_lambda, devoluciones_kpis, "devoluciones"),
+        ("resumen plataforma", plataforma_dict, plataforma_kpis, "ventas"),
+    )
+    print(f"{'filas':>9} | {'indicador':>18} | {'apply/dict':>10} | {'kpis':>9} | {'mejora':>7}")
+    print("-" * 66)
+    for n in args.filas:
+        frames = {"ventas": ventas_sinteticas(n, rng), "devoluciones": devoluciones_sinteticas(n // 10, rng)}
+        for nombre, antes, despues, fuente in casos:
+            df = frames[fuente]
+            esperado, obtenido = antes(df), despues(df)
+            if not np.allclose(esperado.to_numpy(dtype="float64"), obtenido.to_numpy(dtype="float64"), rtol=1e-12):
+                raise RuntimeError(f"{nombre}: los indicadores no coinciden")
+            t_antes = medir(lambda: antes(df), args.repeticiones)
+            t_despues = medir(lambda: despues(df), args.repeticiones)
+            print(f"{n:>9,} | {nombre:>18} | {t_antes * 1000:>7.1f} ms | {t_despues * 1000:>6.1f} ms | {t_antes / t_despues:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: proyección de muchas series con la matriz completa frente a una por una.
+
+Genera series mensuales de ventas (dos años, con estacionalidad, tendencia
+y ruido) y proyecta el año siguiente con ``ekonomodo_core.pronostico``:
+
+- ``ciclo``: ``proyectar_matriz`` llamado serie por serie, como si se
+  ajustara un modelo por vendedor, plataforma o producto;
+- ``matriz``: una sola llamada sobre todas las series;
+- ``proyectar``: la llamada completa del dashboard (matriz más los frames de
+  proyección mensual y resumen).
+
+Verifica que el ciclo y la matriz den los mismos pronósticos e intervalos.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_pronostico.py
+    python benchmarks/bench_pronostico.py --series 100 1000 10000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core import pronostico
+
+
+def medir(funcion, repeticiones):
+    """Devuelve la mediana (segundos) de ``repeticiones`` llamadas."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def historia_sintetica(n, rng):
+    """n series de 24 meses: nivel, estacionalidad anual, crecimiento y ruido"""
+    meses = np.arange(24)
+    nivel = rng.gamma(2.0, 5_000_000, (n, 1))
+    estacion = 1 + 0.3 * np.sin(2 * np.pi * (meses + rng.integers(0, 12, (n, 1))) / 12)
+    tendencia = rng.uniform(0.8, 1.3, (n, 1)) ** (meses // 12)
+    ruido = rng.normal(1, 0.15, (n, 24))
+    valores = np.maximum(nivel * estacion * tendencia * ruido, 0).round(0)
+    return pd.DataFrame(
+        valores,
+        index=pd.Index([f"SERIE {numero}" for numero in range(n)], name="SERIE"),
+        columns=pd.period_range("2024-01", periods=24, freq="M"),
+    )
+
+
+def ciclo(y):
+    """Un ajuste por serie"""
+    return [pronostico.proyectar_matriz(y[fila:fila + 1]) for fila in range(len(y))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--series", type=int, nargs="+", default=[100, 500, 5_000])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'series':>7} | {'ciclo':>9} | {'matriz':>9} | {'proyectar':>9} | {'mejora':>7}")
+    print("-" * 55)
+    for n in args.series:
+        historia = historia_sintetica(n, rng)
+        y = historia.to_numpy()
+
+        por_serie = ciclo(y)
+        pronosticos, sigmas, _ = pronostico.proyectar_matriz(y)
+        if not (np.allclose(np.vstack([p for p, _, _ in por_serie]), pronosticos)
+                and np.allclose(np.concatenate([s for _, s, _ in por_serie]), sigmas)):
+            raise RuntimeError("La proyección en matriz no coincide con la de serie por serie")
+
+        t_ciclo = medir(lambda: ciclo(y), args.repeticiones)
+        t_matriz = medir(lambda: pronostico.proyectar_matriz(y), args.repeticiones)
+        t_proyectar = medir(lambda: pronostico.proyectar(historia), args.repeticiones)
+        print(f"{n:>7,} | {t_ciclo * 1000:>6.1f} ms | {t_matriz * 1000:>6.2f} ms | "
+              f"{t_proyectar * 1000:>6.1f} ms | {t_ciclo / t_matriz:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
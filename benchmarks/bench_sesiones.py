@@ -0,0 +1,126 @@
+"""
+Benchmark: memoria (RSS) que agrega cada sesión concurrente.
+
+Simula varias sesiones abiertas a la vez sobre los mismos datos de ventas y
+mide cuánto crece el RSS del proceso con cada una:
+
+- ``copia``: lo que hacía ``st.cache_data`` (cada llamada deserializa su
+  propia copia) seguido de ``ventas_filtradas = ventas_2025.copy()`` y un
+  filtro por plataforma;
+- ``compartido``: ``ekonomodo_core.compartidos.Compartidos`` guardado una
+  vez por proceso, con vistas copy-on-write y el filtro como posiciones.
+
+Cada modo corre en un proceso aparte para que el RSS de uno no ensucie al
+otro. Verifica que las vistas no alteren el frame compartido aunque la
+sesión les agregue columnas. Requiere Linux (lee ``/proc/self/statm``).
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_sesiones.py
+    python benchmarks/bench_sesiones.py --filas 500000 --sesiones 8
+"""
+
+import argparse
+import gc
+import json
+import os
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ekonomodo_core.compartidos import Compartidos, activar_copia_en_escritura, posiciones
+
+MODOS = ("copia", "compartido")
+
+
+def rss_mb():
+    """RSS actual del proceso en MB"""
+    with open("/proc/self/statm") as statm:
+        paginas = int(statm.read().split()[1])
+    return paginas * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def ventas_sinteticas(n, rng):
+    """Frame con la forma de las ventas SIIGO preparadas"""
+    return pd.DataFrame({
+        "NUMERO": rng.integers(1, n // 3, n).astype(str),
+        "FECHA": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D"),
+        "CLIENTE": rng.choice([f"CLIENTE {numero}" for numero in range(2_000)], n),
+        "PLATAFORMA": rng.choice(["FALABELLA", "MERCADOLIBRE", "HOMECENTER", "TIENDA WEB", "EXITO"], n),
+        "VENDEDOR": rng.choice(["0004 KATERINE", "0007 CARLOS", "0011 LAURA"], n),
+        "REFERENCIA": rng.choice([f"EKM{numero:04d}" for numero in range(800)], n),
+        "VALOR NETO": rng.gamma(2.0, 150_000, n).round(0),
+        "CANT.PEDIDA": rng.integers(1, 10, n),
+        "MES_NUM": rng.integers(1, 13, n),
+    })
+
+
+def sesion_copia(cache):
+    """Una sesión con cache_data: copia deserializada, copia de trabajo y filtro"""
+    ventas = pickle.loads(cache)
+    ventas_filtradas = ventas.copy()
+    ventas_filtradas["TIPO"] = "x"
+    return ventas, ventas_filtradas, ventas[ventas["PLATAFORMA"] == "FALABELLA"]
+
+
+def sesion_compartida(compartidos):
+    """Una sesión con el registro: vistas y filtro por posiciones"""
+    ventas = compartidos.vista("ventas")
+    ventas_filtradas = compartidos.vista("ventas")
+    ventas_filtradas["TIPO"] = "x"
+    return ventas, ventas_filtradas, compartidos.vista("ventas", posiciones(ventas["PLATAFORMA"] == "FALABELLA"))
+
+
+def medir_modo(modo, filas, sesiones):
+    """RSS base y RSS después de abrir cada sesión (corre en su propio proceso)"""
+    df = ventas_sinteticas(filas, np.random.default_rng(42))
+    if modo == "copia":
+        fuente = pickle.dumps(df)
+        abrir = sesion_copia
+    else:
+        activar_copia_en_escritura()
+        fuente = Compartidos(ventas=df)
+        abrir = sesion_compartida
+    del df
+    gc.collect()
+    rss = [rss_mb()]
+    abiertas = []
+    for _ in range(sesiones):
+        abiertas.append(abrir(fuente))
+        gc.collect()
+        rss.append(rss_mb())
+    if modo == "compartido" and "TIPO" in fuente.vista("ventas").columns:
+        raise RuntimeError("Una sesión modificó el frame compartido")
+    return {"modo": modo, "rss": rss}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=200_000)
+    parser.add_argument("--sesiones", type=int, default=5)
+    parser.add_argument("--modo", choices=MODOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.modo:
+        print(json.dumps(medir_modo(args.modo, args.filas, args.sesiones)))
+        return
+
+    print(f"{args.filas:,} filas, {args.sesiones} sesiones concurrentes")
+    print(f"{'modo':>11} | {'RSS base':>9} | {'RSS final':>9} | {'por sesión':>10}")
+    print("-" * 50)
+    for modo in MODOS:
+        salida = subprocess.run(
+            [sys.executable, __file__, "--modo", modo, "--filas", str(args.filas), "--sesiones", str(args.sesiones)],
+            capture_output=True, text=True, check=True,
+        )
+        rss = json.loads(salida.stdout.splitlines()[-1])["rss"]
+        por_sesion = (rss[-1] - rss[0]) / args.sesiones
+        print(f"{modo:>11} | {rss[0]:>6.0f} MB | {rss[-1]:>6.0f} MB | {por_sesion:>7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: tiempo de renderizado de tablas con pandas Styler vs column_config.
+
+Ejecuta cada variante dentro de un script de Streamlit con AppTest (sin
+navegador) y mide el tiempo de la llamada a ``st.dataframe``, que incluye la
+conversión del Styler o la serialización a Arrow del frame enviado.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_tablas.py
+    python benchmarks/bench_tablas.py --filas 1000 10000 50000 --repeticiones 3
+
+Requiere streamlit, pandas y matplotlib (este último solo para la variante
+Styler, porque ``background_gradient`` lo usa internamente).
+"""
+
+import argparse
+import statistics
+import sys
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.append(str(RAIZ))
+
+
+def _script_tabla(n_filas, variante, raiz):
+    """Script de Streamlit que construye el resumen de comercios y lo renderiza."""
+    import sys
+    import time
+
+    import numpy as np
+    import pandas as pd
+    import streamlit as st
+
+    sys.path.append(raiz)
+    from ekonomodo_core.vistas.tablas import configurar_columnas, mostrar_tabla
+
+    rng = np.random.default_rng(42)
+    val_pedido = rng.gamma(2.0, 2_500_000, n_filas).round(0)
+    val_entregado = (val_pedido * rng.uniform(0.2, 1.0, n_filas)).round(0)
+    cant_pedida = rng.integers(1, 500, n_filas)
+    cant_entregada = (cant_pedida * rng.uniform(0.2, 1.0, n_filas)).astype(int)
+    df = pd.DataFrame({
+        'NOMBRE_COMERCIO': [f"COMERCIO {i:06d}" for i in range(n_filas)],
+        'VAL_PEDIDO': val_pedido,
+        'VALOR_PENDIENTE': val_pedido - val_entregado,
+        'VAL_ENTREGADO': val_entregado,
+        'CANT_PEDIDA': cant_pedida,
+        'CANT_PENDIENTE': cant_pedida - cant_entregada,
+        'CANT_ENTREGADA': cant_entregada,
+        'EFICIENCIA': val_entregado / val_pedido,
+        'EFICIENCIA_CANTIDAD': cant_entregada / cant_pedida,
+        'CLASIFICACION': rng.choice(['Excelente', 'Bueno', 'Regular', 'Crítico'], n_filas),
+    })
+
+    inicio = time.perf_counter()
+    if variante == 'styler':
+        pd.set_option('styler.render.max_elements', df.size + 1)
+        styled = df.style.format({
+            'VAL_PEDIDO': "${:,.0f}",
+            'VALOR_PENDIENTE': "${:,.0f}",
+            'VAL_ENTREGADO': "${:,.0f}",
+            'CANT_PEDIDA': "{:,.0f}",
+            'CANT_PENDIENTE': "{:,.0f}",
+            'CANT_ENTREGADA': "{:,.0f}",
+            'EFICIENCIA': "{:.1%}",
+            'EFICIENCIA_CANTIDAD': "{:.1%}"
+        }).background_gradient(
+            subset=['VAL_PEDIDO'], cmap='YlGn'
+        ).background_gradient(
+            subset=['VALOR_PENDIENTE', 'CANT_PENDIENTE'], cmap='Reds'
+        ).background_gradient(
+            subset=['EFICIENCIA', 'EFICIENCIA_CANTIDAD'], cmap='RdYlGn'
+        )
+        st.dataframe(styled, width='stretch')
+    else:
+        config = configurar_columnas(
+            df,
+            pesos=['VAL_PEDIDO', 'VALOR_PENDIENTE', 'VAL_ENTREGADO'],
+            enteros=['CANT_PEDIDA', 'CANT_PENDIENTE', 'CANT_ENTREGADA'],
+            porcentajes=['EFICIENCIA', 'EFICIENCIA_CANTIDAD'],
+            barras={
+                'VAL_PEDIDO': 'green',
+                'VALOR_PENDIENTE': 'red',
+                'CANT_PENDIENTE': 'red',
+                'EFICIENCIA': 'auto',
+                'EFICIENCIA_CANTIDAD': 'auto'
+            }
+        )
+        filas_por_pagina = None if variante == 'column_config' else 1000
+        mostrar_tabla(df, column_config=config, filas_por_pagina=filas_por_pagina, clave='bench')
+    st.session_state['tiempo_render'] = time.perf_counter() - inicio
+
+
+def medir(n_filas, variante, repeticiones):
+    """Devuelve la mediana (segundos) de ``repeticiones`` renders."""
+    tiempos = []
+    for _ in range(repeticiones):
+        at = AppTest.from_function(
+            _script_tabla,
+            kwargs={'n_filas': n_filas, 'variante': variante, 'raiz': str(RAIZ)},
+            default_timeout=600,
+        )
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        tiempos.append(at.session_state['tiempo_render'])
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--filas', type=int, nargs='+', default=[1_000, 10_000, 50_000])
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args()
+
+    variantes = ['styler', 'column_config', 'column_config+paginado']
+    print(f"{'filas':>8} | " + " | ".join(f"{v:>22}" for v in variantes) + " | speedup")
+    print("-" * 95)
+    for n in args.filas:
+        resultados = [medir(n, v, args.repeticiones) for v in variantes]
+        speedup = resultados[0] / resultados[-1] if resultados[-1] > 0 else float('inf')
+        celdas = " | ".join(f"{r * 1000:>19.1f} ms" for r in resultados)
+        print(f"{n:>8,} | {celdas} | {speedup:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+"""
+Servidor local que imita las exportaciones de Google Sheets con datos sintéticos.
+
+Atiende los mismos endpoints que usan los dashboards:
+
+    /spreadsheets/d/<id>/export?format=csv&gid=<gid>
+    /spreadsheets/d/<id>/export?format=csv&sheet=<hoja>
+    /spreadsheets/d/<id>/gviz/tq?tqx=out:csv&sheet=<hoja>
+    /spreadsheets/d/<id>/export?format=xlsx
+
+con libros generados para los IDs reales de cada dashboard (control, ventas
+SIIGO, Leidy y ventas mensual), un tamaño configurable y una latencia
+artificial por solicitud. Los dashboards lo usan al definir
+``EKONOMODO_SHEETS_BASE`` (ver ``ekonomodo_core.sheets``).
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/servidor_sheets.py --filas 10000 --latencia 0.3
+    EKONOMODO_SHEETS_BASE=http://127.0.0.1:8765 streamlit run Proyecto5_dashboard_control/dashboard_control_2026.py
+"""
+
+import argparse
+import csv
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+ID_CONTROL_2026 = "1zIax4vUnzs8p2UJBgXqM2DxeHOYO_llGN5iJrC4hNlM"
+ID_CONTROL = "1xx9zB70fxzl0YyXkh5o0tIs_eCxpHYQaS8oesyTuUEs"
+ID_SIIGO = "1xh15BZGWNPvyoypQWtrUOgeKXY6Ihm8bNnq4JpmL0GI"
+ID_LEIDY = "1L_gT_jKH_7KKqdqj_tVm5IeWHVO2fYOr5UvKUp6uZmo"
+ID_VENTAS_MENSUAL = "16BlZobNzpy0zat8NyQFbMH02EWDRxqB2IG1yT_8eNPs"
+
+GID_PEDIDOS = 1456329364
+MESES = ['ENERO', 'FEBRERO', 'MARZO', 'ABRIL', 'MAYO', 'JUNIO',
+         'JULIO', 'AGOSTO', 'SEPTIEMBRE', 'OCTUBRE', 'NOVIEMBRE', 'DICIEMBRE']
+
+EKMS = [f"EKM{i:03d}" for i in range(1, 61)]
+CUENTAS = ["FALABELLA", "MERCADO LIBRE", "EXITO", "HOMECENTER", "LINIO", "TIENDA WEB"]
+CIUDADES = ["MEDELLIN-ANTIOQUIA", "BOGOTA D.C.", "CALI-VALLE", "BARRANQUILLA-ATLANTICO", "#N/D"]
+VENDEDORES = ["0004 KATERINE GARCES", "0001 ANA", "0002 LUIS", "0003 MARIA"]
+
+
+def _pesos_texto(valores):
+    """Montos como los exporta Sheets en configuración regional colombiana: 1.234.567"""
+    return [f"{x:,.0f}".replace(",", ".") for x in valores]
+
+
+def _fechas(rng, desde, dias, n):
+    return pd.Timestamp(desde) + pd.to_timedelta(rng.integers(0, dias, n), unit="D")
+
+
+def hoja_pedidos_control(filas, rng, hoy):
+    """Hoja principal del control de pedidos (columnas del libro real)"""
+    venta = _fechas(rng, hoy - pd.Timedelta(days=180), 180, filas)
+    return pd.DataFrame({
+        "COMERCIAL ORDEN": np.arange(filas) + 500000,
+        "PRODUCCION ESTATUS": rng.choice(
+            ["IMPORTADO", "PRODUCCION", "ENTREGADO", "CANCELADO", " importado "], filas, p=[.35, .25, .3, .05, .05]),
+        "FECHA DE VENTA": venta.strftime("%d/%m/%Y"),
+        "FECHA DE VENCIMIENTO": (venta + pd.to_timedelta(rng.integers(3, 20, filas), unit="D")).strftime("%d/%m/%Y"),
+        "ESTATUS LOGISTICA": rng.choice(["RECIBIDO", "DEVOLUCION", "", "EN TRANSITO"], filas, p=[.5, .05, .3, .15]),
+        "CUENTA": rng.choice(CUENTAS, filas),
+        "EKM": rng.choice(EKMS, filas),
+        "DESCRIPCION PLATAFORMA": rng.choice(["SILLA ERGONOMICA", "MESA COMEDOR", "CAMA DOBLE", "ESCRITORIO"], filas),
+        "CANTIDAD": rng.integers(1, 5, filas),
+        "LOGISTICA": rng.choice(["ENTREGADO", "DESPACHADO", "", "PENDIENTE"], filas, p=[.4, .3, .2, .1]),
+        "FACTURADO": rng.choice(["0", "", "FV-1234", "FV-5678", "#N/D"], filas, p=[.2, .1, .3, .3, .1]),
+    })
+
+
+def hoja_estatus(filas, rng, anio):
+    """Registro de entregas (formulario): marca temporal y número de orden"""
+    marca = _fechas(rng, f"{anio}-01-01", 365, filas) + pd.to_timedelta(rng.integers(0, 86400, filas), unit="s")
+    return pd.DataFrame({
+        "Marca temporal": marca.strftime("%d/%m/%Y %H:%M:%S"),
+        "N° Orden": rng.integers(500000, 500000 + max(filas, 1), filas),
+        "Recibido por": rng.choice(["BODEGA MED", "BODEGA BOG"], filas),
+    })
+
+
+def hoja_siigo(filas, rng, anio):
+    """Hoja SIIGO: ventas (A-P), columna vacía y devoluciones (R-AB) con encabezados repetidos"""
+    fechas = _fechas(rng, f"{anio}-01-01", 365, filas)
+    ventas = pd.DataFrame({
+        "FECHA": fechas.strftime("%Y-%m-%d"),
+        "NUMERO": rng.integers(1000, 1000 + max(filas, 1), filas),
+        "CLIENTE": rng.choice(["JUAN PEREZ", "MUEBLES S.A.S", "ACME LTDA", "#N/D"], filas),
+        "CIUDAD": rng.choice(CIUDADES, filas),
+        "REFERENCIA": rng.choice(EKMS, filas),
+        "DESCRIPCION": rng.choice(["SILLA", "MESA", "CAMA", "ESCRITORIO"], filas),
+        "CANT.PEDIDA": rng.integers(1, 5, filas),
+        "VALOR VENTA": _pesos_texto(rng.gamma(2, 3e5, filas)),
+        "IVA": _pesos_texto(rng.gamma(2, 5e4, filas)),
+        "TOTAL": _pesos_texto(rng.gamma(2, 3.5e5, filas)),
+        "VALOR NETO": _pesos_texto(rng.gamma(2, 3e5, filas)),
+        "VENDEDOR": rng.choice(VENDEDORES, filas),
+        "PLATAFORMA": rng.choice(CUENTAS, filas),
+        "MES": fechas.month,
+        "BODEGA": rng.choice(["MED", "BOG"], filas),
+        "OBS": "",
+    })
+    m = filas // 10
+    devoluciones = pd.DataFrame({
+        "FACTURA NO": [f"FV-{x}" for x in rng.integers(1000, 1000 + max(filas, 1), m)],
+        "FECHA ": fechas[:m].strftime("%Y-%m-%d"),
+        "VENDEDOR": rng.choice(VENDEDORES, m),
+        "NUMERO": rng.integers(1, 99, m),
+        "PLATAFORMA": rng.choice(CUENTAS, m),
+        "MES": rng.choice(MESES + ["OCT", "12"], m),
+        "VALOR": _pesos_texto(-rng.gamma(2, 1e5, m)),
+        "CANTIDAD": rng.integers(1, 3, m),
+        "REFERENCIA": rng.choice(EKMS, m),
+        "MOTIVO": "GARANTIA",
+        "NOTA": "",
+    })
+    hoja = pd.concat([ventas, pd.DataFrame({"": [""] * filas}), devoluciones.reindex(range(filas))], axis=1)
+    # Sheets exporta los encabezados tal cual; pandas agrega el sufijo .1 al leer
+    hoja.columns = list(ventas.columns) + [""] + list(devoluciones.columns)
+    return hoja
+
+
+def hoja_base_leidy(filas, rng, hoy):
+    """Hoja BASE del libro de pedidos de Leidy"""
+    orden = _fechas(rng, hoy - pd.Timedelta(days=120), 121, filas)
+    return pd.DataFrame({
+        "PLATAFORMA": rng.choice(CUENTAS, filas),
+        "COMERCIAL": rng.choice(["ANA", "LUIS", "MARIA"], filas),
+        "FECHA DE ORDEN": orden,
+        "FECHA DE DESPACHO INTERNO": orden + pd.to_timedelta(rng.integers(0, 10, filas), unit="D"),
+        "FECHA VENC": hoy + pd.to_timedelta(rng.integers(-5, 8, filas), unit="D"),
+        "ORDEN": np.arange(filas) + 100000,
+        "SKU EKM": rng.choice(EKMS + ["EKMFLETE"], filas),
+        "DESPACHADO": rng.choice(["DESPACHADO", "CANCELADO", "PENDIENTE"], filas, p=[.6, .1, .3]),
+        "BODEGA": rng.choice(["MEDELLIN", "BOGOTA", "RTA"], filas),
+        "GUIA": rng.choice(["", "CANCELADO", "0", "G12345", "G99887"], filas),
+        "# FACTURA": rng.choice(["", "#N/D", "0", "123", "456", "789"], filas),
+        "COSTO TOTAL ANTES DE IVA": rng.gamma(2, 50000, filas).round(0),
+    })
+
+
+def hoja_mes(filas, rng):
+    """Hoja mensual de ventas (tres columnas DESCRIPCION; la tercera es el producto)"""
+    hoja = pd.DataFrame({
+        "NOMBRE": rng.choice(["ANA ", " LUIS", "MARIA", "PEDRO"], filas),
+        "CIUDAD": rng.choice(CIUDADES, filas),
+        "REFERENCIA": rng.choice(EKMS, filas),
+        "DESCRIPCION_1": "PEDIDO",
+        "DESCRIPCION_2": "WEB",
+        "DESCRIPCION_3": rng.choice(["SILLA", "MESA", "CAMA", "FLETE ENVIO"], filas, p=[.35, .3, .3, .05]),
+        "CANTIDAD": rng.integers(1, 5, filas),
+        "VALOR": _pesos_texto(rng.gamma(2, 4e5, filas)),
+    })
+    hoja.columns = [c.split("_")[0] for c in hoja.columns]
+    return hoja
+
+
+def generar_libros(filas, semilla=0):
+    """
+    Libros sintéticos por ID: {sheet_id: {"hojas": {nombre: DataFrame}, "gids": {gid: nombre}, "titulo": {nombre: texto}}}
+
+    ``filas`` es el tamaño de la hoja principal de cada libro.
+    """
+    rng = np.random.default_rng(semilla)
+    hoy = pd.Timestamp.now().normalize()
+    estatus = max(filas // 2, 1)
+    return {
+        ID_CONTROL_2026: {
+            "hojas": {
+                "PEDIDOS": hoja_pedidos_control(filas, rng, hoy),
+                "Estatus 2025": hoja_estatus(estatus, rng, 2025),
+                "Estatus 2026": hoja_estatus(estatus, rng, 2026),
+            },
+            "gids": {GID_PEDIDOS: "PEDIDOS"},
+            "titulo": {"PEDIDOS": "CONTROL DE PEDIDOS EKONOMODO"},
+        },
+        ID_CONTROL: {
+            "hojas": {
+                "PEDIDOS": hoja_pedidos_control(filas, rng, hoy),
+                "Estatus": hoja_estatus(estatus, rng, 2025),
+            },
+            "gids": {GID_PEDIDOS: "PEDIDOS"},
+            "titulo": {"PEDIDOS": "CONTROL DE PEDIDOS EKONOMODO"},
+        },
+        ID_SIIGO: {
+            "hojas": {
+                "SIIGO 2024": hoja_siigo(filas, rng, 2024),
+                "SIIGO 2025": hoja_siigo(filas, rng, 2025),
+            },
+            "gids": {},
+            "titulo": {},
+        },
+        ID_LEIDY: {
+            "hojas": {
+                "BASE": hoja_base_leidy(filas, rng, hoy),
+                "LISTA DE PRECIOS": pd.DataFrame({"EKM": EKMS, "NOMBRE": [f"Producto {e}" for e in EKMS]}),
+            },
+            "gids": {},
+            "titulo": {},
+        },
+        ID_VENTAS_MENSUAL: {
+            "hojas": {mes: hoja_mes(filas, rng) for mes in MESES},
+            "gids": {},
+            "titulo": {},
+        },
+    }
+
+
+def exportar_csv(df, titulo=None, comillas=csv.QUOTE_MINIMAL):
+    """CSV como lo entrega Sheets; ``titulo`` agrega una primera fila de título sobre los encabezados"""
+    buf = io.StringIO()
+    if titulo:
+        buf.write(titulo + "," * (df.shape[1] - 1) + "\n")
+    df.to_csv(buf, index=False, quoting=comillas)
+    return buf.getvalue().encode("utf-8")
+
+
+def exportar_xlsx(hojas):
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf) as writer:
+        for nombre, df in hojas.items():
+            df.to_excel(writer, sheet_name=nombre, index=False)
+    return buf.getvalue()
+
+
+class ServidorSheets(ThreadingHTTPServer):
+    """
+    Servidor HTTP con los libros sintéticos.
+
+    Las respuestas se generan una vez y quedan en memoria; ``latencia``
+    (segundos) se agrega a cada solicitud. ``solicitudes`` y ``bytes_enviados``
+    llevan la cuenta para los benchmarks.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, direccion=("127.0.0.1", 8765), filas=1000, latencia=0.0, semilla=0):
+        super().__init__(direccion, _Manejador)
+        self.libros = generar_libros(filas, semilla)
+        self.latencia = latencia
+        self.respuestas = {}
+        self.solicitudes = 0
+        self.bytes_enviados = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base(self):
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def reiniciar_contadores(self):
+        with self._lock:
+            self.solicitudes = 0
+            self.bytes_enviados = 0
+
+    def respuesta(self, sheet_id, recurso, parametros):
+        """(contenido, tipo) para una solicitud, o None si el libro/hoja no existe"""
+        libro = self.libros.get(sheet_id)
+        if libro is None:
+            return None
+
+        formato = parametros.get("format", parametros.get("tqx", [""]))[0]
+        if recurso == "export" and formato == "xlsx":
+            llave = (sheet_id, "xlsx")
+            tipo = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        else:
+            if "sheet" in parametros:
+                hoja = parametros["sheet"][0]
+            elif "gid" in parametros:
+                hoja = libro["gids"].get(int(parametros["gid"][0]))
+            else:
+                hoja = next(iter(libro["hojas"]))
+            if hoja not in libro["hojas"]:
+                return None
+            llave = (sheet_id, recurso, hoja)
+            tipo = "text/csv; charset=utf-8"
+
+        with self._lock:
+            contenido = self.respuestas.get(llave)
+        if contenido is None:
+            if llave[1] == "xlsx":
+                contenido = exportar_xlsx(libro["hojas"])
+            elif recurso == "gviz":
+                # gviz entrega todas las celdas entre comillas y sin filas de título
+                contenido = exportar_csv(libro["hojas"][hoja], comillas=csv.QUOTE_ALL)
+            else:
+                contenido = exportar_csv(libro["hojas"][hoja], titulo=libro["titulo"].get(hoja))
+            with self._lock:
+                self.respuestas[llave] = contenido
+        return contenido, tipo
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        partes = url.path.strip("/").split("/")
+        # spreadsheets/d/<id>/export  o  spreadsheets/d/<id>/gviz/tq
+        if len(partes) < 4 or partes[:2] != ["spreadsheets", "d"]:
+            self.send_error(404)
+            return
+
+        if self.server.latencia:
+            time.sleep(self.server.latencia)
+        resultado = self.server.respuesta(partes[2], partes[3], parse_qs(url.query))
+        if resultado is None:
+            self.send_error(404)
+            return
+
+        contenido, tipo = resultado
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+        with self.server._lock:
+            self.server.solicitudes += 1
+            self.server.bytes_enviados += len(contenido)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def iniciar(filas=1000, latencia=0.0, puerto=0, semilla=0):
+    """Arranca el servidor en un hilo y lo devuelve (``puerto=0`` elige uno libre)"""
+    servidor = ServidorSheets(("127.0.0.1", puerto), filas=filas, latencia=latencia, semilla=semilla)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--filas', type=int, default=1000)
+    parser.add_argument('--latencia', type=float, default=0.0, help='segundos agregados a cada solicitud')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+
+    servidor = ServidorSheets(("127.0.0.1", args.puerto), filas=args.filas,
+                              latencia=args.latencia, semilla=args.semilla)
+    print(f"Sirviendo {args.filas:,} filas por libro en {servidor.base} (latencia {args.latencia}s)")
+    print(f"    EKONOMODO_SHEETS_BASE={servidor.base}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
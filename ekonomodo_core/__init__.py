@@ -0,0 +1,26 @@
+"""
+Utilidades compartidas por los dashboards de Ekonomodo.
+
+Cada dashboard vive en su propia carpeta (ProyectoN_*) y agrega la raíz del
+repositorio al ``sys.path`` para poder importar este paquete.
+
+- ``ekonomodo_core.almacen_ventas``: almacén Parquet de ventas SIIGO por año/mes.
+- ``ekonomodo_core.busqueda``: índice de n-gramas para buscar órdenes en memoria.
+- ``ekonomodo_core.compacto``: categorías y enteros compactos al cargar, con reporte de memoria.
+- ``ekonomodo_core.compartidos``: frames de solo lectura compartidos entre sesiones.
+- ``ekonomodo_core.cuantiles``: histogramas de días hábiles con percentiles por clave.
+- ``ekonomodo_core.diagnostico``: mensajes y conteos que devuelven los pipelines.
+- ``ekonomodo_core.exportar``: CSV, XLSX por bloques y Parquet generados bajo demanda.
+- ``ekonomodo_core.instrumentacion``: tiempo, filas y memoria por etapa de cada ejecución.
+- ``ekonomodo_core.kpis``: ticket, participación y devoluciones por grupo en un solo groupby.
+- ``ekonomodo_core.municipios``: catálogo DIVIPOLA de municipios con coordenadas y búsqueda por departamento sin tildes.
+- ``ekonomodo_core.pareto``: Pareto/ABC y rotación por cualquier dimensión, guardado por filtro.
+- ``ekonomodo_core.perezoso``: importación diferida de pandas, plotly y matplotlib.
+- ``ekonomodo_core.pipelines``: carga y limpieza de cada dashboard, sin Streamlit.
+- ``ekonomodo_core.planificador``: precálculo en segundo plano con instantáneas compartidas.
+- ``ekonomodo_core.pronostico``: proyección mensual estacional de muchas series a la vez.
+- ``ekonomodo_core.reduccion``: reducción LTTB de series largas para gráficos.
+- ``ekonomodo_core.reglas``: motor de reglas de alerta declaradas como datos.
+- ``ekonomodo_core.sheets``: URLs de exportación de Google Sheets (servidor configurable).
+- ``ekonomodo_core.vistas``: helpers de renderizado para Streamlit.
+"""
@@ -0,0 +1,166 @@
+"""
+Almacén local de ventas y devoluciones SIIGO particionado por año y mes.
+
+Cada partición es un archivo Parquet:
+
+    <raiz>/<tipo>/anio=<AAAA>/mes=<MM>/datos.parquet
+
+donde ``tipo`` es "ventas" o "devoluciones" y ``mes=00`` guarda las filas sin
+mes identificable. Los años cerrados se escriben una sola vez (y se marcan con
+``_CERRADO``); del año abierto solo se reescriben el último mes guardado (que
+puede seguir creciendo) y los meses nuevos, salvo que se pida la ingesta
+completa (correcciones en meses anteriores). Junto a cada año se guarda en
+``_VERSION`` la versión de la preparación con la que se escribió: si cambia,
+el año se vuelve a ingerir completo. Para volver a ingerir un año cerrado
+también basta con borrar su carpeta.
+
+Requiere pyarrow (ya viene como dependencia de Streamlit).
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from ekonomodo_core.exportar import compatible_parquet
+
+TIPOS = ("ventas", "devoluciones")
+ARCHIVO_PARTICION = "datos.parquet"
+MARCA_CERRADO = "_CERRADO"
+ARCHIVO_VERSION = "_VERSION"
+
+
+def _carpeta_anio(raiz, tipo, anio):
+    return Path(raiz) / tipo / f"anio={int(anio)}"
+
+
+def meses_guardados(raiz, tipo, anio):
+    """Meses (1-12, o 0 para filas sin mes) que ya tienen partición guardada"""
+    carpeta = _carpeta_anio(raiz, tipo, anio)
+    if not carpeta.exists():
+        return []
+    return sorted(
+        int(p.parent.name.split("=")[1])
+        for p in carpeta.glob(f"mes=*/{ARCHIVO_PARTICION}")
+    )
+
+
+def anios_guardados(raiz, tipo="ventas"):
+    """Años con al menos una partición guardada"""
+    carpeta = Path(raiz) / tipo
+    if not carpeta.exists():
+        return []
+    return sorted(
+        int(p.name.split("=")[1])
+        for p in carpeta.glob("anio=*")
+        if any(p.glob(f"mes=*/{ARCHIVO_PARTICION}"))
+    )
+
+
+def version_guardada(raiz, anio):
+    """Versión de la preparación con la que se escribió el año (None si no se registró)"""
+    archivo = _carpeta_anio(raiz, "ventas", anio) / ARCHIVO_VERSION
+    return archivo.read_text(encoding="utf-8").strip() if archivo.exists() else None
+
+
+def meses_pendientes(raiz, anio, abierto, version, completo=False):
+    """
+    Meses a partir de los cuales hay que (re)escribir el año.
+
+    Devuelve ``None`` si el año está cerrado y ya se ingirió completo con la
+    misma ``version`` (no hay nada que hacer); 1 si no hay nada guardado, si
+    la versión guardada es otra o si se pide ``completo``; o el último mes
+    guardado en otro caso (ese mes puede haber crecido desde la última ingesta).
+    """
+    guardados = [m for m in meses_guardados(raiz, "ventas", anio) if m > 0]
+    if not guardados or completo or version_guardada(raiz, anio) != str(version):
+        return 1
+    if not abierto and (_carpeta_anio(raiz, "ventas", anio) / MARCA_CERRADO).exists():
+        return None
+    return guardados[-1]
+
+
+def marcar_cerrado(raiz, anio):
+    """Marca un año como ingerido completo; no se vuelve a descargar"""
+    carpeta = _carpeta_anio(raiz, "ventas", anio)
+    carpeta.mkdir(parents=True, exist_ok=True)
+    (carpeta / MARCA_CERRADO).touch()
+
+
+def marcar_version(raiz, anio, version):
+    """Registra la versión de la preparación con la que se escribió el año"""
+    carpeta = _carpeta_anio(raiz, "ventas", anio)
+    carpeta.mkdir(parents=True, exist_ok=True)
+    (carpeta / ARCHIVO_VERSION).write_text(str(version), encoding="utf-8")
+
+
+def guardar_meses(raiz, tipo, anio, df, columna_mes, desde_mes=1):
+    """
+    Escribe una partición por mes para los meses >= ``desde_mes``.
+
+    ``columna_mes`` indica el número de mes (1-12) de cada fila; las filas sin
+    mes van a ``mes=00``, que se reescribe siempre. Las particiones guardadas
+    de esos meses que ya no traen filas se borran. Devuelve los meses escritos.
+    """
+    escritos = []
+    if df is not None and not df.empty:
+        if columna_mes in df.columns:
+            meses = pd.to_numeric(df[columna_mes], errors="coerce").fillna(0).astype(int)
+        else:
+            meses = pd.Series(0, index=df.index)
+        df = compatible_parquet(df)
+        for mes, grupo in df.groupby(meses.to_numpy(), sort=True):
+            if 0 < mes < desde_mes:
+                continue
+            carpeta = _carpeta_anio(raiz, tipo, anio) / f"mes={mes:02d}"
+            carpeta.mkdir(parents=True, exist_ok=True)
+            temporal = carpeta / f"{ARCHIVO_PARTICION}.tmp"
+            grupo.reset_index(drop=True).to_parquet(temporal, index=False)
+            temporal.replace(carpeta / ARCHIVO_PARTICION)
+            escritos.append(int(mes))
+
+    for mes in meses_guardados(raiz, tipo, anio):
+        if (mes == 0 or mes >= desde_mes) and mes not in escritos:
+            (_carpeta_anio(raiz, tipo, anio) / f"mes={mes:02d}" / ARCHIVO_PARTICION).unlink()
+    return escritos
+
+
+def consultar(raiz, anio_desde, anio_hasta=None, tipo="ventas", meses=None):
+    """
+    Lee las particiones de ``tipo`` entre ``anio_desde`` y ``anio_hasta`` (inclusive).
+
+    ``meses`` limita la lectura a esos números de mes. Devuelve ``None`` si no
+    hay particiones en el rango.
+    """
+    anio_hasta = anio_desde if anio_hasta is None else anio_hasta
+    archivos = []
+    for anio in range(int(anio_desde), int(anio_hasta) + 1):
+        for mes in meses_guardados(raiz, tipo, anio):
+            if meses is None or mes in meses:
+                archivos.append(_carpeta_anio(raiz, tipo, anio) / f"mes={mes:02d}" / ARCHIVO_PARTICION)
+    if not archivos:
+        return None
+    return pd.concat([pd.read_parquet(a) for a in archivos], ignore_index=True)
+
+
+def consultar_ventas_devoluciones(raiz, anio_desde, anio_hasta=None):
+    """Ventas y devoluciones de un rango de años: (ventas, devoluciones)"""
+    return (
+        consultar(raiz, anio_desde, anio_hasta, tipo="ventas"),
+        consultar(raiz, anio_desde, anio_hasta, tipo="devoluciones"),
+    )
+
+
+def huella(raiz, anios=None):
+    """
+    Identifica el estado del almacén (rutas y fechas de modificación) para
+    usar como llave de cache. Con ``anios`` solo cuentan las particiones de
+    esos años: reescribir el año abierto no cambia la huella de los cerrados.
+    """
+    raiz = Path(raiz)
+    if not raiz.exists():
+        return ()
+    patrones = ["anio=*"] if anios is None else [f"anio={int(anio)}" for anio in anios]
+    return tuple(
+        (str(p.relative_to(raiz)), p.stat().st_mtime_ns)
+        for p in sorted(p for patron in patrones for p in raiz.glob(f"*/{patron}/mes=*/{ARCHIVO_PARTICION}"))
+    )
@@ -0,0 +1,110 @@
+"""
+Índice de búsqueda en memoria por n-gramas.
+
+``IndiceBusqueda`` se construye una vez por instantánea de datos sobre unas
+columnas de texto (ORDEN, EKM, CUENTA...). Cada valor distinto de cada
+columna es una entrada; el índice invertido va de cada n-grama (de 1 a 3
+caracteres, en mayúsculas) a las entradas que lo contienen, y de cada
+entrada a las filas donde aparece.
+
+Una consulta de hasta 3 caracteres es un solo n-grama, así que su lista ya
+es la respuesta exacta. Una más larga intersecta las listas de sus
+trigramas y verifica la subcadena solo en esos candidatos. El costo
+depende del número de entradas que coinciden, no del número de filas.
+
+Los resultados se ordenan por relevancia: coincidencia exacta, luego
+prefijo, luego subcadena, y dentro de cada una por el orden de las columnas
+(la primera pesa más) y el orden de las filas del frame.
+"""
+
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+MAX_NGRAMA = 3
+VACIO = np.array([], dtype=np.int64)
+
+
+def _ngramas(texto, n):
+    return {texto[i:i + n] for i in range(len(texto) - n + 1)}
+
+
+class IndiceBusqueda:
+    """Índice invertido de n-gramas sobre ``campos`` de un DataFrame"""
+
+    def __init__(self, df, campos):
+        self.campos = list(campos)
+        self.filas = len(df)
+        self._textos = []
+        self._campo = []
+        # Filas de cada entrada: posiciones[inicio[e]:inicio[e + 1]]
+        posiciones, inicios = [], [0]
+        for numero, campo in enumerate(self.campos):
+            codigos, unicos = pd.factorize(df[campo].astype(str).str.strip().str.upper())
+            orden = np.argsort(codigos, kind="stable")
+            cortes = np.searchsorted(codigos[orden], np.arange(len(unicos) + 1))
+            posiciones.append(orden[cortes[0]:])
+            inicios.extend(inicios[-1] + cortes[1:] - cortes[0])
+            self._textos.extend(unicos)
+            self._campo.extend([numero] * len(unicos))
+        self._posiciones = np.concatenate(posiciones) if posiciones else VACIO
+        self._inicios = np.asarray(inicios)
+        self._campo = np.asarray(self._campo, dtype=np.int64)
+        # Los textos como arreglo para comparar muchas entradas a la vez
+        self._arreglo = np.asarray(self._textos, dtype=str)
+
+        listas = {}
+        for entrada, texto in enumerate(self._textos):
+            for n in range(1, MAX_NGRAMA + 1):
+                for ngrama in _ngramas(texto, n):
+                    listas.setdefault(ngrama, []).append(entrada)
+        self._listas = {ngrama: np.asarray(entradas) for ngrama, entradas in listas.items()}
+
+    def __len__(self):
+        return len(self._textos)
+
+    def __repr__(self):
+        return f"IndiceBusqueda(campos={self.campos}, filas={self.filas:,}, entradas={len(self):,}, ngramas={len(self._listas):,})"
+
+    def _entradas(self, consulta):
+        """Entradas cuyo texto contiene la consulta"""
+        if len(consulta) <= MAX_NGRAMA:
+            return self._listas.get(consulta, VACIO)
+        listas = [self._listas.get(ngrama, VACIO) for ngrama in _ngramas(consulta, MAX_NGRAMA)]
+        candidatos = reduce(np.intersect1d, sorted(listas, key=len))
+        return candidatos[np.char.find(self._arreglo[candidatos], consulta) >= 0]
+
+    def buscar(self, consulta, prefijo=False, limite=None):
+        """
+        Posiciones (para ``iloc``) de las filas donde algún campo contiene la
+        consulta (o empieza por ella con ``prefijo=True``), sin distinguir
+        mayúsculas, ordenadas por relevancia.
+        """
+        consulta = str(consulta).strip().upper()
+        if not consulta:
+            return VACIO
+
+        entradas = self._entradas(consulta)
+        # Relevancia de cada entrada: 0 exacta, 1 prefijo, 2 subcadena; luego el campo
+        textos = self._arreglo[entradas]
+        tipos = np.where(textos == consulta, 0, np.where(np.char.startswith(textos, consulta), 1, 2))
+        if prefijo:
+            entradas, tipos = entradas[tipos < 2], tipos[tipos < 2]
+        if len(entradas) == 0:
+            return VACIO
+        relevancias = tipos * len(self.campos) + self._campo[entradas]
+
+        # Filas de todas las entradas sin recorrerlas una por una
+        inicios = self._inicios[entradas]
+        largos = self._inicios[entradas + 1] - inicios
+        saltos = np.repeat(inicios - np.cumsum(largos) + largos, largos)
+        filas = self._posiciones[saltos + np.arange(largos.sum())]
+        relevancia_filas = np.repeat(relevancias, largos)
+
+        # Cada fila con su mejor relevancia, y en el orden del frame dentro de cada una
+        orden = np.lexsort((filas, relevancia_filas))
+        filas = filas[orden]
+        _, primeras = np.unique(filas, return_index=True)
+        resultado = filas[np.sort(primeras)]
+        return resultado[:limite] if limite is not None else resultado
@@ -0,0 +1,124 @@
+"""
+Etapa de compactación de tipos para los frames que cargan los dashboards.
+
+``compactar`` se aplica al final de cada carga, antes de que el frame se
+guarde en caché o en ``Compartidos``:
+
+- las columnas de texto que la fuente declara categóricas (plataforma,
+  ciudad, estatus, vendedor...) pasan a ``category`` si tienen pocos
+  valores distintos frente a las filas (``FRACCION_CATEGORIAS``);
+- las columnas enteras (cantidades, números de documento) bajan a
+  ``int32`` si su rango lo admite. No se baja más: con NumPy 2 las
+  operaciones con escalares conservan el tipo de la columna, así que un
+  ``int8`` o ``int16`` desbordaría en sumas o productos.
+
+Las columnas de ``dinero`` y los flotantes quedan en 64 bits: en
+``float32`` las sumas por grupo de ventas ya pierden pesos, un entero en
+centavos ocupa lo mismo que el ``float64`` y un valor en ``int32``
+desbordaría al multiplicarlo por una cantidad. Las fechas no se tocan.
+
+Quien agrupe por una columna categórica pasa ``observed=True`` (el
+comportamiento por defecto desde pandas 3), y ``value_counts`` sobre un
+frame filtrado cuenta en cero las categorías que no quedaron.
+
+Con ``con_reporte`` (o con el panel de rendimiento midiendo memoria) se
+registran los bytes por columna antes y después; ``reporte(fuente)`` y
+``reportes()`` los devuelven para mostrarlos.
+"""
+
+import threading
+
+from ekonomodo_core import instrumentacion, perezoso
+
+np = perezoso.modulo("numpy")
+pd = perezoso.modulo("pandas")
+
+# Una columna declarada categórica se convierte si sus valores distintos no
+# pasan de esta fracción de las filas
+FRACCION_CATEGORIAS = 0.5
+ENTERO_COMPACTO = "int32"
+
+_reportes = {}
+_candado = threading.Lock()
+
+
+def _a_categoria(serie):
+    """La serie como category, o None si no conviene (ya lo es, no es texto o tiene muchos valores)"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return None
+    if not (pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie)):
+        return None
+    if serie.nunique(dropna=True) > FRACCION_CATEGORIAS * len(serie):
+        return None
+    try:
+        return serie.astype("category")
+    except TypeError:
+        # Valores que no se pueden ordenar entre sí (texto mezclado con otros tipos)
+        return None
+
+
+def _a_entero(serie):
+    """La serie int64 como int32 si su rango lo admite, o None si no cambia"""
+    if serie.dtype != "int64" or serie.empty:
+        return None
+    limites = np.iinfo(ENTERO_COMPACTO)
+    if limites.min <= serie.min() and serie.max() <= limites.max:
+        return serie.astype(ENTERO_COMPACTO)
+    return None
+
+
+def reporte_memoria(antes, despues):
+    """Bytes por columna antes y después de compactar, de mayor a menor ahorro"""
+    reporte = pd.DataFrame({
+        "columna": [str(columna) for columna in antes.columns],
+        "tipo_antes": [str(tipo) for tipo in antes.dtypes],
+        "tipo_despues": [str(tipo) for tipo in despues.dtypes],
+        "bytes_antes": antes.memory_usage(deep=True, index=False).to_numpy(),
+        "bytes_despues": despues.memory_usage(deep=True, index=False).to_numpy(),
+    })
+    reporte["ahorro"] = reporte["bytes_antes"] - reporte["bytes_despues"]
+    return reporte.sort_values("ahorro", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def compactar(df, fuente, categoricas=(), dinero=(), con_reporte=None):
+    """
+    Copia superficial de ``df`` con las ``categoricas`` (las que existan)
+    como category y los enteros reducidos, salvo los de ``dinero``.
+    ``con_reporte`` True/False fuerza u omite el reporte de memoria de
+    ``fuente``; por defecto se arma solo si la corrida activa mide memoria.
+    """
+    if df is None:
+        return None
+    if con_reporte is None:
+        corrida = instrumentacion.corrida_actual()
+        con_reporte = corrida is not None and corrida.memoria
+
+    compacto = df.copy(deep=False)
+    categoricas, dinero = set(categoricas), set(dinero)
+    for posicion, columna in enumerate(df.columns):
+        serie = df.iloc[:, posicion]
+        if columna in categoricas:
+            nueva = _a_categoria(serie)
+        elif columna in dinero:
+            nueva = None
+        else:
+            nueva = _a_entero(serie)
+        if nueva is not None:
+            compacto.isetitem(posicion, nueva)
+
+    if con_reporte:
+        with _candado:
+            _reportes[fuente] = reporte_memoria(df, compacto)
+    return compacto
+
+
+def reporte(fuente):
+    """Último reporte de memoria de ``fuente`` en este proceso, o None"""
+    with _candado:
+        return _reportes.get(fuente)
+
+
+def reportes():
+    """{fuente: reporte} de todas las fuentes compactadas con reporte en este proceso"""
+    with _candado:
+        return dict(_reportes)
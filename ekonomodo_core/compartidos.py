@@ -0,0 +1,91 @@
+"""
+Frames compartidos entre sesiones, de solo lectura.
+
+``st.cache_data`` le entrega a cada llamada una copia nueva del resultado
+(lo deserializa), así que con varias sesiones abiertas cada una arma sus
+propios frames completos. ``Compartidos`` guarda los frames de una
+instantánea de la fuente una sola vez por proceso (en un dashboard, dentro
+de una función con ``st.cache_resource`` cuya clave es la instantánea:
+archivo subido o huella del almacén) y a las sesiones les entrega vistas.
+
+Con el copy-on-write de pandas activo, una vista comparte los arreglos del
+frame guardado y cualquier escritura de la sesión (columna nueva, ``loc``,
+``inplace``) copia solo lo que toca, sin alterar lo compartido. Es una
+opción global de pandas: cada dashboard la activa una vez, a la vista, con
+``activar_copia_en_escritura`` antes de cargar datos, y ``vista`` se niega a
+entregar vistas si no está activa (sin ella compartirían arreglos
+escribibles con el frame guardado). El frame
+guardado nunca sale del registro. Los filtros de la sesión se guardan como
+posiciones (``posiciones``) y se materializan con ``vista(nombre,
+posiciones)`` solo donde hacen falta.
+"""
+
+from datetime import datetime
+
+from ekonomodo_core import perezoso
+
+np = perezoso.modulo("numpy")
+pd = perezoso.modulo("pandas")
+
+
+def copia_en_escritura_activa():
+    """True si pandas trabaja con copy-on-write (siempre, desde pandas 3)"""
+    return int(pd.__version__.split(".")[0]) >= 3 or pd.options.mode.copy_on_write is True
+
+
+def activar_copia_en_escritura():
+    """Activa el copy-on-write de pandas para todo el proceso (el modo por defecto desde pandas 3)"""
+    if not copia_en_escritura_activa():
+        pd.options.mode.copy_on_write = True
+
+
+def posiciones(mascara):
+    """Posiciones de las filas que cumplen una máscara booleana (NA cuenta como falso)"""
+    if isinstance(mascara, pd.Series):
+        mascara = mascara.to_numpy(dtype=bool, na_value=False)
+    return np.flatnonzero(mascara)
+
+
+class Compartidos:
+    """Frames con nombre de una instantánea de la fuente; no se pueden reasignar"""
+
+    __slots__ = ("_frames", "huella", "creado")
+
+    def __init__(self, huella=None, **frames):
+        object.__setattr__(self, "_frames", dict(frames))
+        object.__setattr__(self, "huella", huella)
+        object.__setattr__(self, "creado", datetime.now())
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Compartidos es inmutable")
+
+    def __contains__(self, nombre):
+        return self._frames.get(nombre) is not None
+
+    def vista(self, nombre, posiciones=None):
+        """
+        Vista del frame ``nombre`` (None si no existe o es None): comparte
+        los datos hasta que la sesión escribe. Con ``posiciones`` devuelve
+        solo esas filas. Requiere el copy-on-write de pandas activo.
+        """
+        if not copia_en_escritura_activa():
+            raise RuntimeError("Compartidos.vista requiere el copy-on-write de pandas: "
+                               "llamar activar_copia_en_escritura() al arrancar el dashboard")
+        df = self._frames.get(nombre)
+        if df is None:
+            return None
+        if posiciones is not None:
+            return df.iloc[posiciones]
+        return df.copy(deep=False)
+
+    def vistas(self, *nombres):
+        """Tupla de vistas, en el orden de ``nombres``"""
+        return tuple(self.vista(nombre) for nombre in nombres)
+
+    def memoria(self):
+        """Bytes que ocupan los frames compartidos (``memory_usage(deep=True)``)"""
+        return sum(int(df.memory_usage(deep=True).sum()) for df in self._frames.values() if df is not None)
+
+    def __repr__(self):
+        frames = ", ".join(f"{nombre}={len(df):,}" for nombre, df in self._frames.items() if df is not None)
+        return f"Compartidos({frames}, {self.memoria() / 1e6:.1f} MB)"
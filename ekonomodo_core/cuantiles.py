@@ -0,0 +1,124 @@
+"""
+Histogramas de duraciones en días hábiles por clave (EKM, CUENTA...).
+
+Los días de producción son enteros pequeños, así que un histograma con un
+casillero por día (hasta ``MAX_DIAS``; lo que pasa de ahí cae en el
+último) guarda toda la distribución de cada clave en una fila de conteos.
+Con él los percentiles salen sin volver a recorrer las órdenes y son los
+mismos que da ``pandas.quantile`` (interpolación lineal) mientras ningún
+valor pase de ``MAX_DIAS``; el promedio se lleva aparte y es exacto.
+
+``actualizar`` recibe el estado completo (id, clave, días) y solo suma o
+resta las órdenes nuevas, cambiadas o que desaparecieron desde la llamada
+anterior, así que el mismo histograma se puede mantener entre recálculos.
+``general`` suma los casilleros de todas las claves y da los percentiles de
+todas las duraciones juntas (no un promedio de los percentiles por clave).
+"""
+
+import numpy as np
+import pandas as pd
+
+MAX_DIAS = 250
+CUANTILES = (0.5, 0.9, 0.95)
+
+
+def _percentiles(conteos, cantidad, cuantiles):
+    """
+    {"p50": ..., ...} de cada fila de ``conteos`` (casilleros por día) con
+    interpolación lineal entre los rangos vecinos, como pandas.
+    """
+    acumulados = conteos.cumsum(axis=1)
+    percentiles = {}
+    for q in cuantiles:
+        posicion = (cantidad - 1) * q
+        bajo, alto = np.floor(posicion), np.ceil(posicion)
+        valor_bajo = (acumulados > bajo[:, None]).argmax(axis=1)
+        valor_alto = (acumulados > alto[:, None]).argmax(axis=1)
+        percentiles[f"p{round(q * 100)}"] = valor_bajo + (posicion - bajo) * (valor_alto - valor_bajo)
+    return percentiles
+
+
+class HistogramaTiempos:
+    """Conteos por día hábil (0..maximo) de cada clave, más la suma para el promedio"""
+
+    def __init__(self, maximo=MAX_DIAS):
+        self.maximo = maximo
+        self._filas = {}
+        self._conteos = np.zeros((0, maximo + 1), dtype=np.int64)
+        self._sumas = np.zeros(0)
+        self._registrados = pd.DataFrame({'clave': pd.Series(dtype=object), 'dias': pd.Series(dtype=np.int64)})
+
+    @classmethod
+    def desde(cls, claves, dias, maximo=MAX_DIAS):
+        """Histograma con una duración por fila"""
+        histograma = cls(maximo)
+        histograma.agregar(claves, dias)
+        return histograma
+
+    def __len__(self):
+        return len(self._filas)
+
+    def __repr__(self):
+        return f"HistogramaTiempos(claves={len(self)}, duraciones={int(self._conteos.sum()):,})"
+
+    def _indices(self, claves):
+        nuevas = [clave for clave in pd.unique(claves) if clave not in self._filas]
+        if nuevas:
+            for clave in nuevas:
+                self._filas[clave] = len(self._filas)
+            self._conteos = np.vstack([self._conteos, np.zeros((len(nuevas), self.maximo + 1), dtype=np.int64)])
+            self._sumas = np.append(self._sumas, np.zeros(len(nuevas)))
+        return claves.map(self._filas).to_numpy(dtype=np.int64)
+
+    def agregar(self, claves, dias, signo=1):
+        """Suma (o resta con ``signo=-1``) una duración por fila"""
+        claves = pd.Series(claves).reset_index(drop=True)
+        if len(claves) == 0:
+            return
+        dias = np.asarray(dias, dtype=np.int64)
+        filas = self._indices(claves)
+        np.add.at(self._conteos, (filas, np.clip(dias, 0, self.maximo)), signo)
+        np.add.at(self._sumas, filas, signo * dias)
+
+    def actualizar(self, ids, claves, dias):
+        """
+        Lleva el histograma al estado dado (una fila por id) sumando y
+        restando solo las diferencias con el estado anterior. Devuelve el
+        número de duraciones sumadas o restadas.
+        """
+        nuevos = pd.DataFrame({'clave': list(claves), 'dias': np.asarray(dias, dtype=np.int64)}, index=pd.Index(ids))
+        nuevos = nuevos[~nuevos.index.duplicated(keep='last')]
+        previos = self._registrados
+
+        comunes = previos.index.intersection(nuevos.index)
+        distintos = (previos.loc[comunes] != nuevos.loc[comunes]).any(axis=1)
+        cambiados = comunes[distintos.to_numpy()]
+        salen = previos.index.difference(nuevos.index).union(cambiados)
+        entran = nuevos.index.difference(previos.index).union(cambiados)
+
+        self.agregar(previos.loc[salen, 'clave'], previos.loc[salen, 'dias'], signo=-1)
+        self.agregar(nuevos.loc[entran, 'clave'], nuevos.loc[entran, 'dias'])
+        self._registrados = nuevos
+        return len(salen) + len(entran)
+
+    def resumen(self, nombre='clave', cuantiles=CUANTILES):
+        """DataFrame por clave: cantidad, promedio y p50/p90/... (claves sin duraciones se omiten)"""
+        claves = np.asarray(list(self._filas), dtype=object)
+        cantidad = self._conteos.sum(axis=1)
+        hay = cantidad > 0
+        conteos, cantidad = self._conteos[hay], cantidad[hay]
+        resumen = pd.DataFrame({nombre: claves[hay], 'cantidad': cantidad, 'promedio': self._sumas[hay] / cantidad})
+        return resumen.assign(**_percentiles(conteos, cantidad, cuantiles))
+
+    def general(self, cuantiles=CUANTILES):
+        """
+        Cantidad, promedio y p50/p90/... de todas las duraciones juntas
+        (casilleros sumados entre claves); None si no hay duraciones.
+        """
+        conteos = self._conteos.sum(axis=0, keepdims=True)
+        cantidad = conteos.sum(axis=1)
+        if cantidad[0] == 0:
+            return None
+        percentiles = _percentiles(conteos, cantidad, cuantiles)
+        return {'cantidad': int(cantidad[0]), 'promedio': self._sumas.sum() / cantidad[0],
+                **{nombre: float(valor[0]) for nombre, valor in percentiles.items()}}
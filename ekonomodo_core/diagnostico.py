@@ -0,0 +1,66 @@
+"""
+Diagnóstico de una etapa de pipeline.
+
+Las funciones de ``ekonomodo_core.pipelines`` no escriben en la interfaz:
+devuelven sus datos junto con un ``Diagnostico`` que acumula los mensajes
+(información, advertencias, errores) y conteos de la ejecución. El dashboard
+lo muestra con ``ekonomodo_core.vistas.mostrar_diagnostico`` después de salir
+de la función cacheada, así que los avisos aparecen en cada rerun y no solo
+cuando el cache falla; desde la línea de comandos se imprime con ``str``.
+
+Es un objeto simple (listas y dicts), así que se puede cachear con
+``st.cache_data`` y enviar entre procesos.
+"""
+
+NIVELES = ("info", "advertencia", "error")
+
+
+class Diagnostico:
+    """Mensajes y conteos que deja una etapa del pipeline"""
+
+    def __init__(self, etapa=""):
+        self.etapa = etapa
+        self.mensajes = []
+        self.conteos = {}
+
+    def info(self, texto):
+        self.mensajes.append(("info", texto))
+
+    def advertencia(self, texto):
+        self.mensajes.append(("advertencia", texto))
+
+    def error(self, texto):
+        self.mensajes.append(("error", texto))
+
+    def contar(self, clave, valor):
+        """Registra un conteo (filas leídas, descartadas, sin cruce...)"""
+        self.conteos[clave] = valor
+
+    def agregar(self, otro):
+        """Suma al diagnóstico los mensajes y conteos de otra etapa (conteos con el nombre de la etapa)"""
+        self.mensajes.extend(otro.mensajes)
+        prefijo = f"{otro.etapa}: " if otro.etapa and otro.etapa != self.etapa else ""
+        self.conteos.update({prefijo + clave: valor for clave, valor in otro.conteos.items()})
+        return self
+
+    def de_nivel(self, nivel):
+        return [texto for n, texto in self.mensajes if n == nivel]
+
+    @property
+    def errores(self):
+        return self.de_nivel("error")
+
+    @property
+    def ok(self):
+        """True si la etapa no registró errores"""
+        return not self.errores
+
+    def __repr__(self):
+        return f"Diagnostico({self.etapa!r}, mensajes={len(self.mensajes)}, conteos={self.conteos})"
+
+    def __str__(self):
+        lineas = [f"[{self.etapa}]" if self.etapa else "[diagnóstico]"]
+        lineas += [f"  {nivel:<11} {texto}" for nivel, texto in self.mensajes]
+        lineas += [f"  {clave:<30} {valor:,}" if isinstance(valor, int) else f"  {clave:<30} {valor}"
+                   for clave, valor in self.conteos.items()]
+        return "\n".join(lineas)
@@ -0,0 +1,123 @@
+"""
+Exportación de DataFrames a CSV, XLSX y Parquet, generada bajo demanda.
+
+Los dashboards no serializan nada en cada rerun:
+``ekonomodo_core.vistas.descargas.boton_descarga`` le pasa a
+``st.download_button`` una función que llama a ``exportar`` solo cuando
+alguien hace clic. Cada exportación queda registrada por clave (filas,
+bytes, segundos) y ``ultima(clave)`` la devuelve para mostrarla junto al
+botón.
+
+El XLSX se escribe con openpyxl en modo ``write_only`` por bloques de
+``FILAS_POR_BLOQUE``: las filas van directo al archivo, sin el libro
+completo en memoria que arma ``to_excel``.
+"""
+
+import io
+import threading
+import time
+from datetime import datetime
+
+from ekonomodo_core import perezoso
+
+pd = perezoso.modulo("pandas")
+openpyxl = perezoso.modulo("openpyxl")
+
+FILAS_POR_BLOQUE = 10_000
+
+# extensión -> tipo MIME
+FORMATOS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class Exportacion:
+    """Métricas de una exportación: qué se generó, cuánto pesa y cuánto tardó"""
+
+    def __init__(self, formato, filas, bytes_, segundos):
+        self.formato = formato
+        self.filas = filas
+        self.bytes = bytes_
+        self.segundos = segundos
+        self.momento = datetime.now()
+
+    def __repr__(self):
+        return f"Exportacion({self.formato!r}, filas={self.filas:,}, {self.bytes / 1e6:.2f} MB, {self.segundos:.2f} s)"
+
+
+_ultimas = {}
+_candado = threading.Lock()
+
+
+def compatible_parquet(df):
+    """Convierte a texto las columnas object con tipos mezclados (pyarrow no las acepta)"""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == "object":
+            tipo = pd.api.types.infer_dtype(df[col], skipna=True)
+            if tipo not in ("string", "empty"):
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def a_csv(df, codificacion="utf-8"):
+    """CSV sin índice (``utf-8-sig`` para que Excel reconozca las tildes)"""
+    return df.to_csv(index=False).encode(codificacion)
+
+
+def a_parquet(df):
+    """Parquet sin índice"""
+    buffer = io.BytesIO()
+    compatible_parquet(df).to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _celdas(bloque):
+    """Filas del bloque con valores que openpyxl acepta (None para vacíos, fechas sin zona)"""
+    bloque = bloque.copy()
+    for col in bloque.columns:
+        if isinstance(bloque[col].dtype, pd.DatetimeTZDtype):
+            bloque[col] = bloque[col].dt.tz_localize(None)
+    bloque = bloque.astype(object).where(bloque.notna(), None)
+    return bloque.itertuples(index=False, name=None)
+
+
+def a_xlsx(df, hoja="Datos"):
+    """XLSX de una hoja escrito por bloques, con los encabezados en la primera fila"""
+    libro = openpyxl.Workbook(write_only=True)
+    pestana = libro.create_sheet(hoja[:31])
+    pestana.append([str(col) for col in df.columns])
+    for inicio in range(0, len(df), FILAS_POR_BLOQUE):
+        for fila in _celdas(df.iloc[inicio:inicio + FILAS_POR_BLOQUE]):
+            pestana.append(fila)
+    buffer = io.BytesIO()
+    libro.save(buffer)
+    return buffer.getvalue()
+
+
+ESCRITORES = {"csv": a_csv, "xlsx": a_xlsx, "parquet": a_parquet}
+
+
+def exportar(df, formato, clave=None, **opciones):
+    """
+    Bytes de ``df`` en ``formato`` (csv, xlsx o parquet). ``opciones`` va
+    al escritor (``codificacion`` para CSV, ``hoja`` para XLSX). Si hay
+    ``clave``, las métricas quedan disponibles en ``ultima(clave)``.
+    """
+    if formato not in ESCRITORES:
+        raise ValueError(f"formato debe ser uno de {list(ESCRITORES)}: {formato!r}")
+    inicio = time.perf_counter()
+    contenido = ESCRITORES[formato](df, **opciones)
+    exportacion = Exportacion(formato, len(df), len(contenido), time.perf_counter() - inicio)
+    if clave is not None:
+        with _candado:
+            _ultimas[clave] = exportacion
+    return contenido
+
+
+def ultima(clave):
+    """Última ``Exportacion`` registrada con ``clave`` en este proceso, o None"""
+    with _candado:
+        return _ultimas.get(clave)
@@ -0,0 +1,135 @@
+"""
+Historial local de las alertas del tablero de control (SQLite, solo agregar).
+
+Cada recálculo del tablero guarda, por alerta:
+
+- una fila en ``conteos`` (momento, alerta, conteo) para las gráficas;
+- en ``cambios`` solo las órdenes que entraron (delta +1) o salieron (-1)
+  de la alerta desde el registro anterior, así que el archivo crece con los
+  cambios y no con el tamaño de las alertas;
+- en la misma transacción, ``activas`` (alerta, orden) queda con las órdenes
+  de cada alerta en el último registro: el registro siguiente compara contra
+  esa tabla y no vuelve a sumar la historia, así que escribir cuesta lo
+  mismo aunque el historial crezca.
+
+Las órdenes de una alerta en un momento pasado se reconstruyen sumando los
+deltas hasta ese momento (``ordenes_en``). ``conteos`` y ``cambios`` nunca se
+reescriben ni se borran; para empezar de cero basta con borrar el archivo.
+Los registros se agregan en orden cronológico (los escribe el planificador).
+
+El archivo usa WAL, así que las sesiones pueden leer mientras el
+planificador escribe.
+"""
+
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+import pandas as pd
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS conteos (
+    momento TEXT NOT NULL,
+    alerta TEXT NOT NULL,
+    conteo INTEGER NOT NULL,
+    PRIMARY KEY (momento, alerta)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cambios (
+    momento TEXT NOT NULL,
+    alerta TEXT NOT NULL,
+    orden TEXT NOT NULL,
+    delta INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cambios_alerta ON cambios (alerta, orden);
+CREATE TABLE IF NOT EXISTS activas (
+    alerta TEXT NOT NULL,
+    orden TEXT NOT NULL,
+    PRIMARY KEY (alerta, orden)
+) WITHOUT ROWID;
+"""
+
+# PRAGMA user_version del archivo: 1 desde que existe la tabla ``activas``
+VERSION_ESQUEMA = 1
+
+FORMATO_MOMENTO = "%Y-%m-%d %H:%M:%S"
+
+
+def _conectar(ruta):
+    con = sqlite3.connect(ruta, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.executescript(ESQUEMA)
+    if con.execute("PRAGMA user_version").fetchone()[0] < VERSION_ESQUEMA:
+        # Archivos anteriores a ``activas``: se llena una vez sumando los deltas
+        with con:
+            con.execute("DELETE FROM activas")
+            con.execute("INSERT INTO activas SELECT alerta, orden FROM cambios "
+                        "GROUP BY alerta, orden HAVING SUM(delta) > 0")
+            con.execute(f"PRAGMA user_version = {VERSION_ESQUEMA}")
+    return con
+
+
+def _texto(momento):
+    return pd.Timestamp(momento).strftime(FORMATO_MOMENTO)
+
+
+def _ordenes_activas(con, alerta):
+    """Órdenes de la alerta en el último registro"""
+    return {orden for (orden,) in con.execute("SELECT orden FROM activas WHERE alerta = ?", (alerta,))}
+
+
+def _ordenes_hasta(con, alerta, hasta):
+    """Órdenes de la alerta en ``hasta``, sumando los deltas hasta ese momento"""
+    consulta = ("SELECT orden FROM cambios WHERE alerta = ? AND momento <= ? "
+                "GROUP BY orden HAVING SUM(delta) > 0")
+    return {orden for (orden,) in con.execute(consulta, (alerta, hasta))}
+
+
+def registrar(ruta, alertas, momento=None):
+    """
+    Agrega un registro del estado de las alertas: {alerta: órdenes}, donde
+    órdenes es una serie o lista (con repetidos si una orden tiene varias
+    filas). El conteo es el número de filas, como en el tablero; los deltas
+    son por orden distinta. Devuelve el número de deltas escritos.
+    """
+    momento = _texto(momento or datetime.now())
+    with closing(_conectar(ruta)) as con, con:
+        conteos = []
+        cambios = []
+        for alerta, ordenes in alertas.items():
+            ordenes = [str(orden) for orden in ordenes]
+            actuales = set(ordenes)
+            previas = _ordenes_activas(con, alerta)
+            conteos.append((momento, alerta, len(ordenes)))
+            cambios += [(momento, alerta, orden, 1) for orden in actuales - previas]
+            cambios += [(momento, alerta, orden, -1) for orden in previas - actuales]
+        con.executemany("INSERT OR REPLACE INTO conteos VALUES (?, ?, ?)", conteos)
+        con.executemany("INSERT INTO cambios VALUES (?, ?, ?, ?)", cambios)
+        con.executemany("INSERT INTO activas VALUES (?, ?)",
+                        [(alerta, orden) for _, alerta, orden, delta in cambios if delta > 0])
+        con.executemany("DELETE FROM activas WHERE alerta = ? AND orden = ?",
+                        [(alerta, orden) for _, alerta, orden, delta in cambios if delta < 0])
+    return len(cambios)
+
+
+def consultar_conteos(ruta, desde=None, alertas=None):
+    """Conteos registrados (momento, alerta, conteo) desde ``desde``, ordenados por momento"""
+    consulta = "SELECT momento, alerta, conteo FROM conteos"
+    condiciones, parametros = [], []
+    if desde is not None:
+        condiciones.append("momento >= ?")
+        parametros.append(_texto(desde))
+    if alertas:
+        condiciones.append(f"alerta IN ({', '.join('?' * len(alertas))})")
+        parametros += list(alertas)
+    if condiciones:
+        consulta += " WHERE " + " AND ".join(condiciones)
+    with closing(_conectar(ruta)) as con:
+        return pd.read_sql_query(consulta + " ORDER BY momento", con, params=parametros, parse_dates=["momento"])
+
+
+def ordenes_en(ruta, alerta, momento=None):
+    """Órdenes que tenía la alerta en ``momento`` (por defecto, en el último registro)"""
+    with closing(_conectar(ruta)) as con:
+        if momento is None:
+            return _ordenes_activas(con, alerta)
+        return _ordenes_hasta(con, alerta, _texto(momento))
@@ -0,0 +1,240 @@
+"""
+Medición por etapas de una ejecución de dashboard.
+
+Cada etapa (carga, limpieza, agregaciones, secciones) se mide con el
+decorador ``instrumentar``, el context manager ``medir`` o, en scripts
+planos, marcando el inicio de cada sección con ``seccion``; se registra el
+tiempo, las filas de entrada/salida y, si se pidió, el pico de memoria de
+la etapa (``tracemalloc``, por encima de lo que había al empezar) y su
+memoria neta (cuánto quedó retenido al terminar). ``tracemalloc`` es global
+al proceso: las corridas con memoria lo comparten con un contador (se
+detiene cuando termina la última). El pico solo se mide mientras una sola
+corrida mide memoria, porque hay que reiniciarlo en cada etapa; si otra
+sesión midió a la vez en algún momento de la etapa, el pico queda en None
+en lugar de un número que parece exacto. Los registros se acumulan en la
+``Corrida`` activa del hilo que ejecuta el script; sin corrida activa medir
+no hace nada, así que los dashboards pueden quedar instrumentados sin costo
+cuando el panel está apagado. ``contar`` suma a contadores con nombre de la
+corrida activa (por ejemplo, aciertos y fallos de un cache).
+
+No depende de Streamlit: el panel está en ``ekonomodo_core.vistas.rendimiento``.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from ekonomodo_core import perezoso
+
+pd = perezoso.modulo("pandas")
+
+VARIABLE_LOG = "EKONOMODO_LOG_RENDIMIENTO"
+LOG_POR_DEFECTO = Path(__file__).resolve().parent.parent / "rendimiento.jsonl"
+
+_local = threading.local()
+
+# Corridas con memoria activas en el proceso, si tracemalloc lo arrancaron ellas
+# y cuántas veces hubo más de una a la vez (una etapa que vio cambiar el número
+# compartió el pico con otra sesión)
+_memoria = {"corridas": 0, "propio": False, "solapes": 0}
+_candado_memoria = threading.Lock()
+
+
+class Corrida:
+    """Registros de las etapas medidas durante una ejecución del script"""
+
+    def __init__(self, dashboard, memoria=False):
+        self.dashboard = dashboard
+        self.memoria = memoria
+        self.inicio = time.perf_counter()
+        self.fecha = datetime.now().isoformat(timespec="seconds")
+        self.registros = []
+        self.contadores = {}
+        self._trazando = False
+        self._pila = []
+        self._seccion = None
+
+    def total(self):
+        """Segundos desde que empezó la corrida"""
+        return time.perf_counter() - self.inicio
+
+    def resumen(self):
+        """Registros como DataFrame, en el orden en que empezaron las etapas"""
+        columnas = ["etapa", "nivel", "segundos", "filas_entrada", "filas_salida", "memoria_mb", "memoria_neta_mb"]
+        resumen = pd.DataFrame(self.registros, columns=columnas)
+        return resumen.astype({"filas_entrada": "Int64", "filas_salida": "Int64",
+                               "memoria_mb": "float64", "memoria_neta_mb": "float64"})
+
+    def guardar_jsonl(self, ruta=None):
+        """Agrega una línea por etapa al log JSONL (``EKONOMODO_LOG_RENDIMIENTO`` o ``rendimiento.jsonl``)"""
+        ruta = Path(ruta or os.environ.get(VARIABLE_LOG, LOG_POR_DEFECTO))
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with open(ruta, "a", encoding="utf-8") as archivo:
+            for registro in self.registros:
+                linea = {"fecha": self.fecha, "dashboard": self.dashboard, **registro}
+                archivo.write(json.dumps(linea, ensure_ascii=False) + "\n")
+        return ruta
+
+
+def activar(corrida):
+    """Deja ``corrida`` como la corrida activa del hilo actual"""
+    _local.corrida = corrida
+    if corrida.memoria and not corrida._trazando:
+        with _candado_memoria:
+            if _memoria["corridas"] == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _memoria["propio"] = True
+            _memoria["corridas"] += 1
+            if _memoria["corridas"] > 1:
+                _memoria["solapes"] += 1
+        corrida._trazando = True
+    return corrida
+
+
+def desactivar():
+    """
+    Cierra la sección abierta y quita la corrida activa del hilo; tracemalloc
+    se detiene cuando termina la última corrida con memoria que lo arrancó.
+    """
+    cerrar_seccion()
+    corrida = corrida_actual()
+    _local.corrida = None
+    if corrida is not None and corrida._trazando:
+        corrida._trazando = False
+        with _candado_memoria:
+            _memoria["corridas"] -= 1
+            if _memoria["corridas"] == 0 and _memoria["propio"]:
+                tracemalloc.stop()
+                _memoria["propio"] = False
+    return corrida
+
+
+def corrida_actual():
+    return getattr(_local, "corrida", None)
+
+
+def contar(nombre, cantidad=1):
+    """Suma ``cantidad`` al contador ``nombre`` de la corrida activa (sin corrida no hace nada)"""
+    corrida = corrida_actual()
+    if corrida is not None:
+        corrida.contadores[nombre] = corrida.contadores.get(nombre, 0) + cantidad
+
+
+def contar_filas(valor):
+    """Filas de un DataFrame/Series, o la suma de las de una tupla/lista de ellos; None si no aplica"""
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return len(valor)
+    if isinstance(valor, (tuple, list)):
+        filas = [len(v) for v in valor if isinstance(v, (pd.DataFrame, pd.Series))]
+        return sum(filas) if filas else None
+    return None
+
+
+@contextmanager
+def medir(etapa, filas_entrada=None):
+    """
+    Mide el bloque como una etapa de la corrida activa.
+
+    Entrega un dict donde el bloque puede anotar ``filas_salida``. Las etapas
+    anidadas se registran con ``nivel`` > 0 y su memoria cuenta también en la
+    etapa que las contiene. ``memoria_mb`` es el pico de la memoria trazada
+    durante la etapa por encima de la del inicio (None si otra corrida midió
+    memoria a la vez); ``memoria_neta_mb``, la diferencia entre el fin y el
+    inicio (negativa si la etapa liberó más de lo que retuvo).
+    """
+    corrida = corrida_actual()
+    registro = {"etapa": etapa, "filas_entrada": filas_entrada, "filas_salida": None}
+    if corrida is None:
+        yield registro
+        return
+
+    con_memoria = corrida._trazando and tracemalloc.is_tracing()
+    padre = corrida._pila[-1] if corrida._pila else None
+    marco = {"pico": 0, "base": None, "solapes": None}
+    if con_memoria:
+        with _candado_memoria:
+            if _memoria["corridas"] == 1:
+                # El pico acumulado hasta aquí pertenece a la etapa que contiene a esta
+                if padre is not None:
+                    padre["pico"] = max(padre["pico"], tracemalloc.get_traced_memory()[1])
+                tracemalloc.reset_peak()
+                marco["solapes"] = _memoria["solapes"]
+            marco["base"] = tracemalloc.get_traced_memory()[0]
+    registro["nivel"] = len(corrida._pila)
+    corrida._pila.append(marco)
+    corrida.registros.append(registro)
+
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro["segundos"] = time.perf_counter() - inicio
+        corrida._pila.pop()
+        registro["memoria_mb"] = registro["memoria_neta_mb"] = None
+        if con_memoria and tracemalloc.is_tracing():
+            with _candado_memoria:
+                actual, pico = tracemalloc.get_traced_memory()
+                exclusiva = _memoria["corridas"] == 1 and marco["solapes"] == _memoria["solapes"]
+            registro["memoria_neta_mb"] = (actual - marco["base"]) / 1e6
+            if exclusiva:
+                pico = max(marco["pico"], pico)
+                registro["memoria_mb"] = (pico - marco["base"]) / 1e6
+                if padre is not None:
+                    padre["pico"] = max(padre["pico"], pico)
+
+
+def seccion(nombre, filas_entrada=None):
+    """
+    Cierra la sección anterior y empieza a medir otra.
+
+    Para scripts planos, donde envolver cada bloque en ``medir`` obligaría a
+    reindentarlo: cada llamada marca el inicio de la siguiente sección. Solo
+    se usa en el nivel superior del script, fuera de cualquier ``medir``.
+    """
+    corrida = corrida_actual()
+    if corrida is None:
+        return
+    cerrar_seccion()
+    corrida._seccion = medir(nombre, filas_entrada)
+    corrida._seccion.__enter__()
+
+
+def cerrar_seccion():
+    """Termina la sección abierta con ``seccion``, si hay una"""
+    corrida = corrida_actual()
+    if corrida is not None and corrida._seccion is not None:
+        corrida._seccion.__exit__(None, None, None)
+        corrida._seccion = None
+
+
+def instrumentar(etapa=None):
+    """
+    Decorador que mide cada llamada con ``medir``.
+
+    Las filas de entrada salen del primer argumento que sea DataFrame y las de
+    salida del valor devuelto (ver ``contar_filas``). Sobre una función con
+    ``st.cache_data`` conviene ponerlo por fuera, para que el panel muestre lo
+    que cuesta cada rerun (incluidos los aciertos de cache).
+    """
+    def decorador(funcion):
+        nombre = etapa or funcion.__name__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if corrida_actual() is None:
+                return funcion(*args, **kwargs)
+            entrada = next((contar_filas(a) for a in args if isinstance(a, pd.DataFrame)), None)
+            with medir(nombre, entrada) as registro:
+                resultado = funcion(*args, **kwargs)
+                registro["filas_salida"] = contar_filas(resultado)
+            return resultado
+
+        return envoltura
+
+    return decorador
@@ -0,0 +1,93 @@
+"""
+Indicadores comerciales por grupo (mes, ciudad, plataforma, vendedor, tipo
+de cliente) con un solo groupby de agregaciones con nombre.
+
+``ventas`` agrupa una vez (suma de valor y unidades, documentos y clientes
+distintos) y después divide sobre el frame agrupado: ``TICKET_PROM`` (valor
+por factura) y ``PARTICIPACION`` (% del total). Así ninguna función de
+Python corre por grupo, a diferencia de ``groupby(...).apply(lambda x: ...)``
+o de ``agg({'VALOR': lambda x: abs(x.sum())})``.
+
+``devoluciones`` agrupa las devoluciones igual (valor y unidades en valor
+absoluto, como en ``calcular_ventas_netas``) y ``netos`` completa un resumen
+que ya trae ``DEVOLUCIONES`` y ``UNIDADES_DEVUELTAS`` con ``VENTAS_NETAS``,
+``UNIDADES_NETAS`` y ``TASA_DEVOLUCION_%``; ticket y participación pasan a
+calcularse sobre el neto.
+
+Las columnas de entrada son las de las ventas SIIGO preparadas; con ``None``
+un indicador se omite. Los divisores en cero dan 0, no infinito ni NaN.
+"""
+
+from ekonomodo_core import perezoso
+
+np = perezoso.modulo("numpy")
+
+# Columnas de las ventas SIIGO preparadas
+VALOR = "VALOR NETO"
+DOCUMENTO = "NUMERO"
+UNIDADES = "CANT.PEDIDA"
+CLIENTE = "CLIENTE"
+
+
+def dividir(numerador, denominador, escala=1):
+    """``numerador / denominador * escala`` elemento a elemento, 0 donde el divisor es 0 o NaN"""
+    numerador = np.asarray(numerador, dtype="float64")
+    denominador = np.broadcast_to(np.asarray(denominador, dtype="float64"), numerador.shape)
+    resultado = np.zeros(numerador.shape)
+    validos = (denominador != 0) & ~np.isnan(denominador)
+    np.divide(numerador, denominador, out=resultado, where=validos)
+    return resultado * escala
+
+
+def _completar(resumen, valor):
+    """TICKET_PROM y PARTICIPACION sobre la columna ``valor`` del resumen"""
+    columnas = {"PARTICIPACION": dividir(resumen[valor], resumen[valor].sum(), 100)}
+    if "FACTURAS" in resumen.columns:
+        columnas["TICKET_PROM"] = dividir(resumen[valor], resumen["FACTURAS"])
+    return resumen.assign(**columnas)
+
+
+def ventas(df, por, valor=VALOR, documento=DOCUMENTO, unidades=UNIDADES, cliente=CLIENTE,
+           adicionales=None, dropna=True):
+    """
+    Una fila por grupo de ``por`` (columna o lista) con VALOR_TOTAL, FACTURAS,
+    UNIDADES y CLIENTES (los que tengan columna), las ``adicionales``
+    ({columna: (columna_origen, función)}), TICKET_PROM y PARTICIPACION.
+    """
+    agregaciones = {"VALOR_TOTAL": (valor, "sum")}
+    if documento is not None:
+        agregaciones["FACTURAS"] = (documento, "nunique")
+    if unidades is not None:
+        agregaciones["UNIDADES"] = (unidades, "sum")
+    if cliente is not None:
+        agregaciones["CLIENTES"] = (cliente, "nunique")
+    agregaciones.update(adicionales or {})
+    resumen = df.groupby(por, observed=True, dropna=dropna).agg(**agregaciones).reset_index()
+    return _completar(resumen, "VALOR_TOTAL")
+
+
+def devoluciones(df, por, valor="VALOR", unidades="CANTIDAD"):
+    """Una fila por grupo con DEVOLUCIONES y UNIDADES_DEVUELTAS (suma en valor absoluto)"""
+    agregaciones = {"DEVOLUCIONES": (valor, "sum")}
+    if unidades is not None:
+        agregaciones["UNIDADES_DEVUELTAS"] = (unidades, "sum")
+    resumen = df.groupby(por, observed=True).agg(**agregaciones)
+    return resumen.abs().reset_index()
+
+
+def netos(resumen, valor="VALOR_TOTAL"):
+    """
+    ``resumen`` con DEVOLUCIONES (y UNIDADES_DEVUELTAS) restadas: VENTAS_NETAS,
+    UNIDADES_NETAS, TASA_DEVOLUCION_% sobre ``valor`` y ticket y participación
+    recalculados sobre las ventas netas. Las devoluciones faltantes cuentan 0.
+    """
+    devoluciones = resumen["DEVOLUCIONES"].fillna(0)
+    columnas = {
+        "DEVOLUCIONES": devoluciones,
+        "VENTAS_NETAS": resumen[valor] - devoluciones,
+        "TASA_DEVOLUCION_%": dividir(devoluciones, resumen[valor], 100),
+    }
+    if "UNIDADES_DEVUELTAS" in resumen.columns and "UNIDADES" in resumen.columns:
+        columnas["UNIDADES_DEVUELTAS"] = resumen["UNIDADES_DEVUELTAS"].fillna(0)
+        columnas["UNIDADES_NETAS"] = resumen["UNIDADES"] - columnas["UNIDADES_DEVUELTAS"]
+    return _completar(resumen.assign(**columnas), "VENTAS_NETAS")
@@ -0,0 +1,194 @@
+"""
+Nomenclátor de municipios de Colombia para ubicar las ciudades de los datos.
+
+``datos/municipios.csv`` es la DIVIPOLA completa (1.122 municipios y áreas
+no municipalizadas): código DANE de cinco dígitos, departamento (y su
+código de dos), nombre oficial y coordenadas de la cabecera. Los nombres se
+comparan por una clave normalizada (``normalizar``: mayúsculas, sin tildes
+ni puntuación), así que "Medellín", "MEDELLIN" y "medellin." son el mismo
+municipio; ``ALIAS`` recoge los nombres cortos o antiguos ("Cúcuta",
+"Bogotá D.C."...) y ``ALIAS_POR_DEPARTAMENTO`` los que solo valen dentro de
+un departamento (Manaure es de La Guajira, pero en el Cesar es Manaure
+Balcón del Cesar).
+
+``resolver`` ubica una serie completa con un solo cruce sobre sus valores
+distintos. Con departamento, la ciudad se busca solo entre los municipios
+de ese departamento (exacta y luego por parecido con ``difflib`` para los
+errores de digitación): "La Paz, Santander" nunca cae en La Paz del Cesar.
+Sin departamento (o con uno que no está en el catálogo) se busca por el
+municipio solo (gana el primero del archivo) y luego por parecido. Lo que
+no se ubica queda en NA para que quien llama lo cuente.
+
+``ciudad_cos`` traduce la columna COS (centro de costo SIIGO) de despachos y
+pedidos a ciudad y departamento con el mismo catálogo.
+"""
+
+import difflib
+import functools
+import re
+import unicodedata
+from pathlib import Path
+
+from ekonomodo_core import perezoso
+
+pd = perezoso.modulo("pandas")
+
+RUTA_CATALOGO = Path(__file__).resolve().parent / "datos" / "municipios.csv"
+COLUMNAS = ["codigo", "municipio", "departamento", "codigo_departamento", "lat", "lon"]
+
+# Parecido mínimo (0-1, difflib) para aceptar un nombre mal escrito
+SIMILITUD_MINIMA = 0.85
+
+# Nombres alternos -> nombre del catálogo, ambos como clave normalizada
+ALIAS = {
+    "BOGOTA D C": "BOGOTA",
+    "BOGOTA DC": "BOGOTA",
+    "SANTAFE DE BOGOTA": "BOGOTA",
+    "SANTA FE DE BOGOTA": "BOGOTA",
+    "CARTAGENA": "CARTAGENA DE INDIAS",
+    "CUCUTA": "SAN JOSE DE CUCUTA",
+    "BUGA": "GUADALAJARA DE BUGA",
+    "CODAZZI": "AGUSTIN CODAZZI",
+    "UBATE": "VILLA DE SAN DIEGO DE UBATE",
+    "CARMEN DE VIBORAL": "EL CARMEN DE VIBORAL",
+    "CARMEN DE BOLIVAR": "EL CARMEN DE BOLIVAR",
+    "SINCE": "SAN LUIS DE SINCE",
+    "TOLU": "SANTIAGO DE TOLU",
+    "TOLUVIEJO": "SAN JOSE DE TOLUVIEJO",
+    "MOMPOS": "SANTA CRUZ DE MOMPOX",
+    "MOMPOX": "SANTA CRUZ DE MOMPOX",
+    "TUMACO": "SAN ANDRES DE TUMACO",
+    "MARIQUITA": "SAN SEBASTIAN DE MARIQUITA",
+    "GUICAN": "GUICAN DE LA SIERRA",
+    "PIENDAMO": "PIENDAMO TUNIA",
+    "CARLOSAMA": "CUASPUD CARLOSAMA",
+    "SAN JOSE DE ALBAN": "ALBAN",
+}
+# Nombres cortos que fuera de su departamento son otro municipio (o ninguno)
+ALIAS_POR_DEPARTAMENTO = {
+    "ANTIOQUIA": {"SAN VICENTE": "SAN VICENTE FERRER"},
+    "SANTANDER": {"SAN VICENTE": "SAN VICENTE DE CHUCURI"},
+    "CAUCA": {"LOPEZ": "LOPEZ DE MICAY", "SOTARA": "SOTARA PAISPAMBA"},
+    "CESAR": {"MANAURE": "MANAURE BALCON DEL CESAR"},
+    "CORDOBA": {"PURISIMA": "PURISIMA DE LA CONCEPCION"},
+}
+ALIAS_DEPARTAMENTOS = {
+    "BOGOTA": "BOGOTA D C",
+    "BOGOTA DC": "BOGOTA D C",
+    "CUNDINAMARCA BOGOTA": "BOGOTA D C",
+    "VALLE": "VALLE DEL CAUCA",
+    "GUAJIRA": "LA GUAJIRA",
+    "NORTE SANTANDER": "NORTE DE SANTANDER",
+    "N DE SANTANDER": "NORTE DE SANTANDER",
+    "SAN ANDRES Y PROVIDENCIA": "SAN ANDRES",
+    "ARCHIPIELAGO DE SAN ANDRES PROVIDENCIA Y SANTA CATALINA": "SAN ANDRES",
+}
+
+# Centros de costo SIIGO (columna COS) que corresponden a una ciudad (con el
+# nombre que muestran los dashboards) y los que se muestran con su propia etiqueta
+CENTROS_COSTO = {1: "Bogotá", 2: "Medellín"}
+ETIQUETAS_COS = {999: "RTA"}
+SIN_CIUDAD = "Sin ciudad"
+SIN_DEPARTAMENTO = "Sin departamento"
+
+
+def normalizar(texto):
+    """Clave de comparación: mayúsculas sin tildes ni puntuación, con espacios simples"""
+    texto = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.sub(r"[^A-Z0-9]+", " ", texto.upper()).split())
+
+
+@functools.lru_cache(maxsize=1)
+def catalogo():
+    """Municipios del archivo con sus claves (se lee una vez por proceso; no modificar)"""
+    df = pd.read_csv(RUTA_CATALOGO, dtype={"codigo": str, "codigo_departamento": str})
+    df["clave"] = [normalizar(municipio) for municipio in df["municipio"]]
+    df["clave_departamento"] = [normalizar(departamento) for departamento in df["departamento"]]
+    return df
+
+
+@functools.lru_cache(maxsize=1)
+def _indices():
+    """({clave_departamento: {clave: fila}}, {clave: primera fila}) del catálogo"""
+    df = catalogo()
+    por_departamento = {}
+    for fila, (clave, clave_departamento) in enumerate(zip(df["clave"], df["clave_departamento"])):
+        por_departamento.setdefault(clave_departamento, {})[clave] = fila
+    por_municipio = {}
+    for fila, clave in enumerate(df["clave"]):
+        por_municipio.setdefault(clave, fila)
+    return por_departamento, por_municipio
+
+
+def _buscar(clave, filas):
+    """Fila de ``clave`` en ``filas`` ({clave: fila}), exacta o por parecido, o -1"""
+    if clave in filas:
+        return filas[clave]
+    parecidas = difflib.get_close_matches(clave, filas, n=1, cutoff=SIMILITUD_MINIMA)
+    return filas[parecidas[0]] if parecidas else -1
+
+
+def _fila(ciudad, departamento):
+    """
+    Fila del catálogo para una ciudad, o -1. Si el departamento está en el
+    catálogo la ciudad solo se busca entre sus municipios.
+    """
+    if pd.isna(ciudad):
+        return -1
+    clave = normalizar(ciudad)
+    if not clave:
+        return -1
+    por_departamento, por_municipio = _indices()
+    if not pd.isna(departamento):
+        clave_departamento = normalizar(departamento)
+        clave_departamento = ALIAS_DEPARTAMENTOS.get(clave_departamento, clave_departamento)
+        if clave_departamento in por_departamento:
+            clave = ALIAS_POR_DEPARTAMENTO.get(clave_departamento, {}).get(clave, clave)
+            return _buscar(ALIAS.get(clave, clave), por_departamento[clave_departamento])
+    return _buscar(ALIAS.get(clave, clave), por_municipio)
+
+
+def resolver(ciudades, departamentos=None):
+    """
+    Frame con ``COLUMNAS`` (código DANE, municipio, departamento, código del
+    departamento, lat, lon) para cada valor de ``ciudades``, con su mismo
+    índice; ``departamentos`` (opcional, alineada) restringe la búsqueda de
+    cada ciudad a su departamento. Cada par distinto se busca una sola vez.
+    """
+    entrada = pd.DataFrame({
+        "ciudad": ciudades.astype(object).to_numpy(),
+        "departamento": None if departamentos is None else departamentos.astype(object).to_numpy(),
+    })
+    unicos = entrada.drop_duplicates(ignore_index=True)
+    unicos = unicos.assign(fila=[_fila(ciudad, departamento) for ciudad, departamento in unicos.itertuples(index=False)])
+    filas = entrada.merge(unicos, on=["ciudad", "departamento"], how="left")["fila"]
+    # La fila -1 no existe en el catálogo y sale toda en NA
+    return catalogo()[COLUMNAS].reindex(filas.to_numpy()).set_axis(ciudades.index)
+
+
+def _etiqueta_cos(valor):
+    """Nombre de ciudad o etiqueta para un valor de COS"""
+    codigo = pd.to_numeric(valor, errors="coerce")
+    if pd.isna(codigo):
+        return str(valor).strip() or SIN_CIUDAD
+    if codigo in CENTROS_COSTO:
+        return CENTROS_COSTO[codigo]
+    return ETIQUETAS_COS.get(codigo, f"Ciudad {int(codigo)}")
+
+
+def ciudad_cos(cos):
+    """
+    Frame con ``ciudad`` y ``departamento`` (mismo índice que ``cos``): los
+    centros de costo de ``CENTROS_COSTO`` y los nombres escritos se ubican en
+    el catálogo; el resto conserva su etiqueta ("RTA", "Ciudad 5"). Los de
+    ``CENTROS_COSTO`` muestran su propio nombre ("Bogotá") y no el oficial.
+    """
+    codigos, valores = pd.factorize(cos)
+    etiquetas = pd.Series([_etiqueta_cos(valor) for valor in valores] + [SIN_CIUDAD], dtype=object)
+    ubicacion = resolver(etiquetas)
+    tabla = pd.DataFrame({
+        "ciudad": ubicacion["municipio"].mask(etiquetas.isin(CENTROS_COSTO.values())).fillna(etiquetas),
+        "departamento": ubicacion["departamento"].fillna(SIN_DEPARTAMENTO),
+    })
+    # factorize marca los vacíos con -1, que toma la última fila (SIN_CIUDAD)
+    return tabla.iloc[codigos].set_axis(cos.index)
@@ -0,0 +1,94 @@
+"""
+Análisis Pareto/ABC para cualquier dimensión (producto, cliente, comercio, vendedor).
+
+``clasificar`` agrupa por la dimensión en una sola pasada (agregaciones con
+nombre) y ``clasificar_agregado`` completa un frame ya agrupado: ordena de
+mayor a menor ``valor`` y agrega, todo vectorizado:
+
+- ``PORCENTAJE`` y ``ACUMULADO``: participación y participación acumulada (%);
+- ``CLASIFICACION``: A hasta el 80 % acumulado, B hasta el 95 %, C el resto
+  (``CORTES_ABC``);
+- ``ROTACION``: Baja, Media o Alta según una columna de frecuencia (veces
+  vendido, pedidos) y ``CORTES_ROTACION``.
+
+Con ``clave`` (la huella de los datos más el estado de los filtros) el
+resultado queda en un registro del proceso y las llamadas siguientes con la
+misma clave y los mismos parámetros lo reutilizan sin volver a agrupar. Se
+guardan los ``MAX_RESULTADOS`` más recientes; cada llamada recibe su copia.
+"""
+
+import threading
+from collections import OrderedDict
+
+from ekonomodo_core import perezoso
+from ekonomodo_core.instrumentacion import instrumentar
+
+np = perezoso.modulo("numpy")
+pd = perezoso.modulo("pandas")
+
+# Límites superiores (% acumulado) de las clases A y B; lo que pasa de B es C
+CORTES_ABC = (80, 95)
+CLASES_ABC = ("A", "B", "C")
+# Límites superiores de frecuencia para rotación baja y media; lo que pasa es alta
+CORTES_ROTACION = (2, 10)
+CLASES_ROTACION = ("Baja", "Media", "Alta")
+
+MAX_RESULTADOS = 32
+
+_resultados = OrderedDict()
+_candado = threading.Lock()
+
+
+def _clases(valores, cortes, etiquetas):
+    """Etiqueta de cada valor según el primer corte que no supera"""
+    return np.asarray(etiquetas, dtype=object)[np.searchsorted(cortes, valores, side="left")]
+
+
+def clasificar_agregado(agregado, valor, frecuencia=None, cortes=CORTES_ABC, cortes_rotacion=CORTES_ROTACION):
+    """
+    ``agregado`` (una fila por elemento) ordenado de mayor a menor ``valor``
+    con PORCENTAJE, ACUMULADO, CLASIFICACION y, si se indica la columna de
+    ``frecuencia``, ROTACION. No modifica ``agregado``.
+    """
+    resultado = agregado.sort_values(valor, ascending=False, kind="stable").reset_index(drop=True)
+    valores = resultado[valor].to_numpy(dtype="float64")
+    total = valores.sum()
+    porcentaje = valores / total * 100 if total else np.zeros(len(valores))
+    acumulado = porcentaje.cumsum()
+    columnas = {
+        "PORCENTAJE": porcentaje,
+        "ACUMULADO": acumulado,
+        "CLASIFICACION": _clases(acumulado, cortes, CLASES_ABC),
+    }
+    if frecuencia is not None:
+        columnas["ROTACION"] = _clases(resultado[frecuencia].to_numpy(), cortes_rotacion, CLASES_ROTACION)
+    return resultado.assign(**columnas)
+
+
+@instrumentar()
+def clasificar(df, por, agregaciones, valor, frecuencia=None, clave=None,
+               cortes=CORTES_ABC, cortes_rotacion=CORTES_ROTACION):
+    """
+    Pareto de ``df`` por ``por`` (columna o lista): una fila por elemento con
+    las ``agregaciones`` con nombre ({columna: (columna_origen, función)}),
+    ordenada por la columna ``valor`` y clasificada con ``clasificar_agregado``.
+    Con ``clave`` se reutiliza el resultado guardado para esa clave.
+    """
+    if clave is not None:
+        llave = (clave, por if isinstance(por, str) else tuple(por), tuple(agregaciones.items()),
+                 valor, frecuencia, tuple(cortes), tuple(cortes_rotacion))
+        with _candado:
+            if llave in _resultados:
+                _resultados.move_to_end(llave)
+                return _resultados[llave].copy()
+
+    agregado = df.groupby(por, observed=True).agg(**agregaciones).reset_index()
+    resultado = clasificar_agregado(agregado, valor, frecuencia, cortes, cortes_rotacion)
+
+    if clave is not None:
+        with _candado:
+            _resultados[llave] = resultado
+            while len(_resultados) > MAX_RESULTADOS:
+                _resultados.popitem(last=False)
+        return resultado.copy()
+    return resultado
@@ -0,0 +1,65 @@
+"""
+Importación diferida de módulos pesados (pandas, numpy, plotly, matplotlib).
+
+``modulo("plotly.express")`` devuelve un módulo vacío que importa el real
+la primera vez que se le pide un atributo y copia sus nombres, así que
+después se usa igual que con ``import``. ``funcion("plotly.subplots",
+"make_subplots")`` hace lo mismo para un nombre suelto.
+
+Los dashboards con pantalla de carga (despachos, pedidos, comparativo) lo
+usan para que esa pantalla se pinte sin pagar estas importaciones; llegan
+con el primer archivo o el primer gráfico. Los módulos de
+``ekonomodo_core`` que esos dashboards importan al arrancar también lo
+usan. No sirve para nombres usados a nivel de módulo (herencia, valores
+por defecto, ``from x import y``): esos sí importan al cargar.
+
+``benchmarks/bench_arranque.py`` mide el arranque con ``-X importtime``.
+"""
+
+import importlib
+import sys
+import types
+
+
+class ModuloPerezoso(types.ModuleType):
+    """Módulo que se importa en el primer acceso a un atributo"""
+
+    def __init__(self, nombre):
+        super().__init__(nombre)
+        self._ekonomodo_real = None
+
+    def _cargar(self):
+        if self._ekonomodo_real is None:
+            real = importlib.import_module(self.__name__)
+            # Con los nombres copiados, los accesos siguientes no pasan por __getattr__
+            self.__dict__.update(vars(real))
+            self._ekonomodo_real = real
+        return self._ekonomodo_real
+
+    def __getattr__(self, nombre):
+        if nombre == "_ekonomodo_real":
+            raise AttributeError(nombre)
+        return getattr(self._cargar(), nombre)
+
+    def __dir__(self):
+        return dir(self._cargar())
+
+    def __repr__(self):
+        estado = "cargado" if self._ekonomodo_real is not None else "sin cargar"
+        return f"<módulo perezoso {self.__name__!r} ({estado})>"
+
+
+def modulo(nombre):
+    """Módulo ``nombre`` diferido; si ya se importó, el módulo real"""
+    return sys.modules.get(nombre) or ModuloPerezoso(nombre)
+
+
+def funcion(nombre_modulo, nombre):
+    """Función ``nombre`` de ``nombre_modulo``, importado en la primera llamada"""
+    origen = modulo(nombre_modulo)
+
+    def diferida(*args, **kwargs):
+        return getattr(origen, nombre)(*args, **kwargs)
+
+    diferida.__name__ = diferida.__qualname__ = nombre
+    return diferida
@@ -0,0 +1,18 @@
+"""
+Pipelines de datos de los dashboards, sin Streamlit.
+
+Cada módulo tiene la carga, limpieza y cruces de un dashboard como funciones
+puras que devuelven ``(datos, Diagnostico)``: no escriben en la interfaz, así
+que se pueden correr y perfilar desde la línea de comandos, precalcular o
+ejecutar en otros procesos. El dashboard envuelve cada función en su
+``st.cache_data`` y muestra el diagnóstico con
+``ekonomodo_core.vistas.mostrar_diagnostico``.
+
+- ``control``: pedidos y estatus de producción (Control 2026).
+- ``ventas``: hojas SIIGO y su ingesta al almacén de ventas.
+- ``despachos``: Excel de despachos y cruce con vendedores.
+- ``pedidos``: Excel de pedidos y cruces con comercios y vendedores.
+- ``comparativo``: libros de ventas y auxiliares 2024 vs 2025.
+
+Desde la raíz del repositorio: ``python -m ekonomodo_core.pipelines --help``.
+"""
@@ -0,0 +1,148 @@
+"""
+Corre un pipeline desde la línea de comandos y muestra su diagnóstico y el
+tiempo, filas (y opcionalmente memoria) de cada etapa. Con ``--memoria``
+también muestra los bytes por columna antes y después de compactar los tipos
+de cada fuente (``ekonomodo_core.compacto``).
+
+Uso (desde la raíz del repositorio):
+    python -m ekonomodo_core.pipelines control --dias 90
+    python -m ekonomodo_core.pipelines ventas --almacen /tmp/almacen_siigo --completo
+    python -m ekonomodo_core.pipelines despachos despachos.xlsx --vendedores vendedores.xlsx
+    python -m ekonomodo_core.pipelines pedidos pedidos.xlsx --comercios comercios.csv --memoria
+    python -m ekonomodo_core.pipelines comparativo --ventas v25.xlsx --auxiliar a25.xlsx \\
+        --comercios z.xlsx --vendedores vend.xlsx --anio 2025 --salida ventas_2025.parquet
+
+El servidor de Sheets se cambia con ``EKONOMODO_SHEETS_BASE`` (por ejemplo al
+de ``benchmarks/servidor_sheets.py``).
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from ekonomodo_core import compacto, instrumentacion
+from ekonomodo_core.exportar import ESCRITORES, exportar
+from ekonomodo_core.pipelines import comparativo, control, despachos, pedidos, ventas
+
+ALMACEN_POR_DEFECTO = Path(__file__).resolve().parents[2] / "Proyecto1_dashboard_ventas" / "almacen_siigo"
+
+
+def _leer_tabla(ruta, **kwargs):
+    """CSV o Excel según la extensión"""
+    if str(ruta).lower().endswith(".csv"):
+        return pd.read_csv(ruta)
+    return pd.read_excel(ruta, **kwargs)
+
+
+def _correr_control(args):
+    return control.preparar_control(args.url, args.dias)
+
+
+def _correr_ventas(args):
+    return ventas.sincronizar_almacen(args.almacen, args.url, args.completo)
+
+
+def _correr_despachos(args):
+    df, diagnostico = despachos.cargar_despachos(args.archivo)
+    if df is not None and args.vendedores:
+        df_vendedores, diagnostico_vendedores = despachos.cargar_vendedores(args.vendedores)
+        diagnostico.agregar(diagnostico_vendedores)
+        df, diagnostico_cruce = despachos.cruzar_vendedores(df, df_vendedores)
+        diagnostico.agregar(diagnostico_cruce)
+    return df, diagnostico
+
+
+def _correr_pedidos(args):
+    df_comercios = _leer_tabla(args.comercios, engine="openpyxl", header=6) if args.comercios else None
+    df_vendedores = _leer_tabla(args.vendedores, engine="openpyxl", header=6) if args.vendedores else None
+    return pedidos.procesar_pedidos(_leer_tabla(args.archivo, engine="openpyxl", header=6), df_comercios, df_vendedores)
+
+
+def _correr_comparativo(args):
+    tablas = [_leer_tabla(ruta).rename(columns=str.strip)
+              for ruta in (args.ventas, args.auxiliar, args.comercios, args.vendedores)]
+    df, diagnostico = comparativo.preparar_datos(*tablas, args.anio)
+    return compacto.compactar(df, "comparativo", comparativo.COLUMNAS_CATEGORICAS, comparativo.COLUMNAS_DINERO), diagnostico
+
+
+def _argumentos():
+    parser = argparse.ArgumentParser(prog="python -m ekonomodo_core.pipelines",
+                                     description="Corre un pipeline de datos sin Streamlit")
+    comunes = argparse.ArgumentParser(add_help=False)
+    comunes.add_argument("--memoria", action="store_true", help="mide el pico y la memoria neta de cada etapa (más lento)")
+    comunes.add_argument("--log", nargs="?", const="", metavar="RUTA",
+                         help="agrega las etapas al log JSONL de rendimiento")
+    comunes.add_argument("--salida", metavar="ARCHIVO", help="guarda el resultado (.parquet, .csv o .xlsx)")
+    sub = parser.add_subparsers(dest="pipeline", required=True)
+
+    p = sub.add_parser("control", parents=[comunes], help="pedidos del periodo con días de producción")
+    p.add_argument("--url", default=control.URL_CONTROL)
+    p.add_argument("--dias", type=int, default=90, help="días de histórico")
+    p.set_defaults(correr=_correr_control)
+
+    p = sub.add_parser("ventas", parents=[comunes], help="ingesta de las hojas SIIGO al almacén")
+    p.add_argument("--url", default=ventas.URL_SIIGO)
+    p.add_argument("--almacen", default=os.environ.get("EKONOMODO_ALMACEN_SIIGO", ALMACEN_POR_DEFECTO))
+    p.add_argument("--completo", action="store_true", help="vuelve a ingerir el año abierto entero")
+    p.set_defaults(correr=_correr_ventas)
+
+    p = sub.add_parser("despachos", parents=[comunes], help="Excel de despachos")
+    p.add_argument("archivo")
+    p.add_argument("--vendedores")
+    p.set_defaults(correr=_correr_despachos)
+
+    p = sub.add_parser("pedidos", parents=[comunes], help="Excel de pedidos por comercio")
+    p.add_argument("archivo")
+    p.add_argument("--comercios")
+    p.add_argument("--vendedores")
+    p.set_defaults(correr=_correr_pedidos)
+
+    p = sub.add_parser("comparativo", parents=[comunes], help="un año del comparativo de ventas")
+    for nombre in ("--ventas", "--auxiliar", "--comercios", "--vendedores"):
+        p.add_argument(nombre, required=True)
+    p.add_argument("--anio", type=int, required=True)
+    p.set_defaults(correr=_correr_comparativo)
+
+    return parser.parse_args()
+
+
+def main():
+    args = _argumentos()
+    corrida = instrumentacion.activar(instrumentacion.Corrida(f"cli:{args.pipeline}", memoria=args.memoria))
+    try:
+        resultado, diagnostico = args.correr(args)
+    finally:
+        total = corrida.total()
+        instrumentacion.desactivar()
+
+    print(diagnostico)
+    if isinstance(resultado, pd.DataFrame):
+        print(f"\nResultado: {len(resultado):,} filas x {len(resultado.columns)} columnas")
+    elif resultado is not None:
+        print(f"\nResultado: {resultado}")
+
+    resumen = corrida.resumen()
+    resumen["etapa"] = ["  " * nivel + etapa for nivel, etapa in zip(resumen["nivel"], resumen["etapa"])]
+    columnas = ["etapa", "segundos", "filas_entrada", "filas_salida"] + (["memoria_mb", "memoria_neta_mb"] if args.memoria else [])
+    print(f"\nTiempo total: {total:.2f} s")
+    print(resumen[columnas].to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    for fuente, reporte in compacto.reportes().items():
+        print(f"\nMemoria de {fuente}: {reporte['bytes_antes'].sum() / 1e6:.1f} MB -> "
+              f"{reporte['bytes_despues'].sum() / 1e6:.1f} MB")
+        print(reporte[reporte["ahorro"] != 0].to_string(index=False))
+
+    if args.log is not None:
+        print(f"Agregado a {corrida.guardar_jsonl(args.log or None)}")
+    if args.salida and isinstance(resultado, pd.DataFrame):
+        formato = Path(args.salida).suffix.lower().lstrip(".")
+        Path(args.salida).write_bytes(exportar(resultado, formato if formato in ESCRITORES else "parquet"))
+        print(f"Guardado en {args.salida}")
+
+    return 0 if diagnostico.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+Pipeline del dashboard comparativo de ventas 2024 vs 2025.
+
+Cruza el libro de ventas de un año con su auxiliar por número, el catálogo
+de comercios (Z) y el de vendedores, y separa Falabella de Falabella Verde
+según el prefijo de C MP. CR.
+"""
+
+from ekonomodo_core import perezoso
+from ekonomodo_core.diagnostico import Diagnostico
+from ekonomodo_core.instrumentacion import instrumentar
+
+pd = perezoso.modulo("pandas")
+
+# Columnas de texto con pocos valores (filtros y agrupaciones del dashboard)
+COLUMNAS_CATEGORICAS = ("Nombre", "mes", "VEND", "Nombre_Vendedor")
+COLUMNAS_DINERO = ("GRAVADAS IVA",)
+
+
+def validar_columnas(df, requeridas, nombre_archivo, diagnostico):
+    """True si ``df`` tiene las columnas requeridas; si no, deja el error en el diagnóstico"""
+    faltantes = [col for col in requeridas if col not in df.columns]
+    if faltantes:
+        diagnostico.error(f"❌ {nombre_archivo}: Faltan columnas: {faltantes}")
+        diagnostico.info(f"Columnas disponibles: {list(df.columns)}")
+        return False
+    return True
+
+
+@instrumentar()
+def preparar_datos(df_ventas, df_aux, df_comercios, df_vendedores, year):
+    """Prepara y cruza los datos de ventas de un año: (df o None, diagnóstico)"""
+    diagnostico = Diagnostico(f"ventas {year}")
+    try:
+        # Se trabaja sobre copias: los catálogos se comparten entre años
+        df_aux = df_aux.copy()
+        df_comercios = df_comercios.copy()
+        if df_vendedores is not None:
+            df_vendedores = df_vendedores.copy()
+
+        # Validar columnas requeridas
+        if not validar_columnas(df_aux, ["NRO. CRUCE", "COMPROBA", "C MP. CR", "FECHA", "CANT.ENTREGA", "REFERENCIA", "VEND"], f"Auxiliar {year}", diagnostico):
+            return None, diagnostico
+        if not validar_columnas(df_ventas, ["NRO", "FECHA", "GRAVADAS IVA"], f"Libro de ventas {year}", diagnostico):
+            return None, diagnostico
+        # Hacer auxiliar opcional
+        for col in ["NRO. CRUCE", "COMPROBA", "REFERENCIA", "VEND"]:
+            if col not in df_aux.columns:
+                df_aux[col] = None
+        if not validar_columnas(df_comercios, ["Z", "Nombre"], "Comercios", diagnostico):
+            return None, diagnostico
+
+        # Validar vendedores (opcional)
+        if not validar_columnas(df_vendedores, ["VENDEDOR", "NOMBRE"], "Vendedores", diagnostico):
+            diagnostico.advertencia("Archivo de vendedores no válido, se usarán códigos numéricos")
+            df_vendedores = None
+        
+        # Buscar columna C MP. CR en auxiliar ANTES del merge
+        cmp_col_aux = None
+        for col in df_aux.columns:
+            if "C MP" in col.upper() and "CR" in col.upper():
+                cmp_col_aux = col
+                break
+
+        # Usar Libro de ventas como base principal
+        df = pd.merge(df_ventas, df_aux, left_on="NRO", right_on="NRO. CRUCE", how="left", suffixes=('', '_aux'))
+
+        # Si encontramos C MP. CR, verificar que esté en el resultado
+        if cmp_col_aux and cmp_col_aux in df.columns:
+            diagnostico.info(f"✓ Columna '{cmp_col_aux}' encontrada y disponible para clasificar Falabella")
+        else:
+            diagnostico.advertencia(f"⚠️ Columna C MP. CR no encontrada en el merge. Columnas disponibles: {[c for c in df.columns if 'MP' in c.upper() or 'CR' in c.upper()]}")
+
+        # Eliminar duplicados por NRO, priorizando registros con datos completos
+        df = df.sort_values('COMPROBA', na_position='last')
+        df = df.drop_duplicates(subset=['NRO'], keep='first')
+
+        # Resetear índice después de eliminar duplicados
+        df = df.reset_index(drop=True)
+
+        if df.empty:
+            diagnostico.advertencia(f"⚠️ No se encontraron coincidencias entre auxiliar y ventas para {year}")
+            return None, diagnostico
+
+        # Usar fecha del libro de ventas directamente
+        df["FECHA"] = pd.to_datetime(df["FECHA"], errors="coerce")
+        
+        df = df.dropna(subset=["FECHA"])
+        
+        # Crear columnas de tiempo
+        df["mes"] = df["FECHA"].dt.strftime("%m")  # Solo el número del mes (01, 02, 03...)
+        df["mes_nombre"] = df["FECHA"].dt.strftime("%Y-%m")  # Para referencia
+        df["año"] = year
+        df["mes_num"] = df["FECHA"].dt.month
+        df["trimestre"] = df["FECHA"].dt.quarter
+        
+        # Limpiar códigos de comercios
+        df["COMPROBA"] = df["COMPROBA"].astype(str).str.strip()
+        df_comercios["Z"] = df_comercios["Z"].astype(str).str.strip()
+        
+        # Cruzar con comercios (mantener el cruce original)
+        df = pd.merge(df, df_comercios, left_on="COMPROBA", right_on="Z", how="left")
+
+        # Diferenciar Falabella de Falabella Verde basado en C MP. CR
+        # Buscar la columna C MP. CR que puede tener espacios
+        cmp_col = None
+        for col in df.columns:
+            if "C MP" in col.upper() and "CR" in col.upper():
+                cmp_col = col
+                break
+
+        if cmp_col:
+            # Identificar registros de Falabella (Z-082 o nombre Falabella)
+            mask_falabella = (df["COMPROBA"] == "Z-082") | (df["Nombre"].str.contains("Falabella", case=False, na=False))
+            
+            if mask_falabella.sum() > 0:
+                # Extraer el primer carácter de C MP. CR y convertir a mayúscula
+                df.loc[mask_falabella, "prefijo_temp"] = df.loc[mask_falabella, cmp_col].astype(str).str.strip().str[0].str.upper()
+                
+                # Asignar nombres según el prefijo
+                df.loc[mask_falabella & (df["prefijo_temp"] == "F"), "Nombre"] = "Falabella"
+                df.loc[mask_falabella & (df["prefijo_temp"] == "S"), "Nombre"] = "Falabella Verde"
+                
+                # Limpiar columna temporal
+                df = df.drop(columns=["prefijo_temp"], errors="ignore")
+                
+                diagnostico.info(f"📊 Procesados {mask_falabella.sum():,} registros de Falabella (F={len(df[(df['Nombre']=='Falabella') & mask_falabella])}, S={len(df[(df['Nombre']=='Falabella Verde') & mask_falabella])})")
+
+        # Buscar la columna NOMBRE del Libro que puede tener espacios
+        nombre_col = None
+        for col in df.columns:
+            if col.strip().upper() == "NOMBRE" and col != "Nombre":  # Evitar confusión con Nombre del comercio
+                nombre_col = col
+                break
+
+        if nombre_col:
+            # Solo mapear registros que NO tienen comercio asignado (principalmente devoluciones)
+            def asignar_comercio_por_nombre(nombre_str, cmp_cr=None):
+                if pd.isna(nombre_str):
+                    return "PARTICULAR"
+                
+                nombre_upper = str(nombre_str).upper()
+                
+                if "SODIMAC COLOMBIA" in nombre_upper:
+                    return "Homecenter"
+                elif "ALMACENES EXITO" in nombre_upper:
+                    return "Éxito-Emplea" 
+                elif "TUGO" in nombre_upper:
+                    return "Tugo"
+                elif "ALMACENES MAXIMO" in nombre_upper:
+                    return "Maximo"
+                elif "APER COLOMBIA" in nombre_upper:
+                    return "Aper Colombia"
+                elif "FALABELLA" in nombre_upper:
+                    # Diferenciar Falabella por C MP. CR si está disponible
+                    if pd.notna(cmp_cr):
+                        prefijo = str(cmp_cr)[0].upper()
+                        if prefijo == "S":
+                            return "Falabella Verde"
+                        else:
+                            return "Falabella"
+                    else:
+                        return "Falabella"  # Por defecto si no hay C MP. CR
+                else:
+                    # Buscar coincidencia con nombres de comercios del catálogo Z
+                    for _, row in df_comercios.iterrows():
+                        if str(row["Nombre"]).upper() in nombre_upper:
+                            return row["Nombre"]
+                    return "PARTICULAR"
+
+            # Aplicar solo a registros sin comercio asignado
+            # Aplicar solo a registros sin comercio asignado
+            mask_sin_comercio = pd.isna(df["Nombre"])
+            if mask_sin_comercio.sum() > 0:
+                # Buscar columna C MP. CR
+                cmp_col = None
+                for col in df.columns:
+                    if col.strip().upper() == "C MP. CR":
+                        cmp_col = col
+                        break
+                
+                if cmp_col:
+                    df.loc[mask_sin_comercio, "Nombre"] = df.loc[mask_sin_comercio].apply(
+                        lambda row: asignar_comercio_por_nombre(row[nombre_col], row[cmp_col]), axis=1
+                    )
+                else:
+                    df.loc[mask_sin_comercio, "Nombre"] = df.loc[mask_sin_comercio, nombre_col].apply(
+                        lambda x: asignar_comercio_por_nombre(x, None)
+                    )
+
+            # AGREGAR ESTA NORMALIZACIÓN DESPUÉS:
+            # Normalizar nombres de comercios para evitar duplicados
+            df["Nombre"] = df["Nombre"].astype(str)
+            df.loc[df["Nombre"].str.upper() == "PARTICULAR", "Nombre"] = "Particular"
+            # Capitalizar correctamente otros nombres comunes
+            df.loc[df["Nombre"].str.upper() == "HOMECENTER", "Nombre"] = "Homecenter"
+            df.loc[df["Nombre"].str.upper() == "ÉXITO-EMPLEA", "Nombre"] = "Éxito-Emplea"
+            df.loc[df["Nombre"].str.upper() == "TUGO", "Nombre"] = "Tugo"
+            df.loc[df["Nombre"].str.upper() == "MAXIMO", "Nombre"] = "Maximo"
+            df.loc[df["Nombre"].str.upper() == "APER COLOMBIA", "Nombre"] = "Aper Colombia"                
+        else:
+            diagnostico.advertencia("No se encontró columna NOMBRE en el Libro de ventas para mapear devoluciones")
+
+        # Cruzar con vendedores
+        if df_vendedores is not None:
+            df_vendedores["VENDEDOR"] = df_vendedores["VENDEDOR"].astype(str).str.strip()
+            df["VEND"] = df["VEND"].astype(str).str.strip()
+            df = pd.merge(df, df_vendedores, left_on="VEND", right_on="VENDEDOR", how="left", suffixes=('', '_vendedor'))
+            df["Nombre_Vendedor"] = df["NOMBRE_vendedor"].fillna(f"Vendedor {df['VEND']}")
+        else:
+            df["Nombre_Vendedor"] = "Vendedor " + df["VEND"].astype(str)
+        
+        # Limpiar datos
+        df["GRAVADAS IVA"] = pd.to_numeric(df["GRAVADAS IVA"], errors="coerce")
+        df["CANT.ENTREGA"] = pd.to_numeric(df["CANT.ENTREGA"], errors="coerce")
+        df = df.dropna(subset=["GRAVADAS IVA"])  # Eliminar registros sin valor
+        
+        # Identificar productos EKM
+        df["es_producto_ekm"] = df["REFERENCIA"].astype(str).str.startswith("EKM")
+        
+        diagnostico.contar("registros", len(df))
+        return df, diagnostico
+    
+    except Exception as e:
+        diagnostico.error(f"Error procesando datos {year}: {str(e)}")
+        return None, diagnostico
@@ -0,0 +1,540 @@
+"""
+Pipeline del dashboard de Control de Producción y Logística 2026.
+
+Lee la hoja de pedidos y las hojas de Estatus (entregas de producción) del
+libro de control, las limpia y calcula los días de producción en días
+hábiles de Colombia.
+"""
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import AbstractHolidayCalendar, Holiday
+from pandas.tseries.offsets import CustomBusinessDay
+
+from ekonomodo_core import historial_alertas
+from ekonomodo_core.busqueda import IndiceBusqueda
+from ekonomodo_core.compacto import compactar
+from ekonomodo_core.cuantiles import HistogramaTiempos
+from ekonomodo_core.diagnostico import Diagnostico
+from ekonomodo_core.instrumentacion import instrumentar
+from ekonomodo_core.reglas import Regla, evaluar_reglas, tipar
+from ekonomodo_core.sheets import id_libro, url_csv, url_gviz_csv
+
+URL_CONTROL = "https://docs.google.com/spreadsheets/d/1zIax4vUnzs8p2UJBgXqM2DxeHOYO_llGN5iJrC4hNlM/edit?resourcekey=&gid=218363912#gid=218363912"
+GID_PEDIDOS = 1456329364
+HOJAS_ESTATUS = ("Estatus 2025", "Estatus 2026")
+
+
+class ColombiaHolidayCalendar(AbstractHolidayCalendar):
+    """Calendario de festivos de Colombia"""
+    rules = [
+        # Festivos fijos
+        Holiday('Año Nuevo', month=1, day=1),
+        Holiday('Día del Trabajo', month=5, day=1),
+        Holiday('Día de la Independencia', month=7, day=20),
+        Holiday('Batalla de Boyacá', month=8, day=7),
+        Holiday('Inmaculada Concepción', month=12, day=8),
+        Holiday('Navidad', month=12, day=25),
+
+        # Festivos 2024
+        Holiday('Reyes Magos 2024', month=1, day=8, year=2024),
+        Holiday('San José 2024', month=3, day=25, year=2024),
+        Holiday('Jueves Santo 2024', month=3, day=28, year=2024),
+        Holiday('Viernes Santo 2024', month=3, day=29, year=2024),
+        Holiday('Ascensión 2024', month=5, day=13, year=2024),
+        Holiday('Corpus Christi 2024', month=6, day=3, year=2024),
+        Holiday('Sagrado Corazón 2024', month=6, day=10, year=2024),
+        Holiday('San Pedro y San Pablo 2024', month=7, day=1, year=2024),
+        Holiday('Asunción 2024', month=8, day=19, year=2024),
+        Holiday('Día de la Raza 2024', month=10, day=14, year=2024),
+        Holiday('Todos los Santos 2024', month=11, day=4, year=2024),
+        Holiday('Independencia de Cartagena 2024', month=11, day=11, year=2024),
+
+        # Festivos 2025
+        Holiday('Reyes Magos 2025', month=1, day=6, year=2025),
+        Holiday('San José 2025', month=3, day=24, year=2025),
+        Holiday('Jueves Santo 2025', month=4, day=17, year=2025),
+        Holiday('Viernes Santo 2025', month=4, day=18, year=2025),
+        Holiday('Ascensión 2025', month=6, day=2, year=2025),
+        Holiday('Corpus Christi 2025', month=6, day=23, year=2025),
+        Holiday('Sagrado Corazón 2025', month=6, day=30, year=2025),
+        Holiday('San Pedro y San Pablo 2025', month=6, day=30, year=2025),
+        Holiday('Asunción 2025', month=8, day=18, year=2025),
+        Holiday('Día de la Raza 2025', month=10, day=13, year=2025),
+        Holiday('Todos los Santos 2025', month=11, day=3, year=2025),
+        Holiday('Independencia de Cartagena 2025', month=11, day=17, year=2025),
+    ]
+
+
+def dias_habiles_colombia(fecha_inicio, dias_habiles_objetivo):
+    """
+    Calcula la fecha después de X días hábiles en Colombia (excluyendo fines de semana y festivos)
+    """
+    cal = ColombiaHolidayCalendar()
+    fecha_actual = pd.Timestamp(fecha_inicio)
+    dias_contados = 0
+
+    while dias_contados < dias_habiles_objetivo:
+        fecha_actual += timedelta(days=1)
+        # Si es día hábil (no fin de semana ni festivo)
+        if fecha_actual.weekday() < 5 and fecha_actual not in cal.holidays():
+            dias_contados += 1
+
+    return fecha_actual
+
+
+def calcular_dias_habiles(fecha_inicio, fecha_fin):
+    """
+    Calcula días hábiles entre dos fechas excluyendo fines de semana y festivos colombianos
+    """
+    if pd.isna(fecha_inicio) or pd.isna(fecha_fin):
+        return None
+
+    # Crear calendario colombiano
+    cal = ColombiaHolidayCalendar()
+
+    # Crear rango de días hábiles
+    dias_habiles = pd.bdate_range(
+        start=fecha_inicio,
+        end=fecha_fin,
+        freq=CustomBusinessDay(calendar=cal)
+    )
+
+    return len(dias_habiles)
+
+
+@lru_cache(maxsize=1)
+def _festivos_colombia():
+    return ColombiaHolidayCalendar().holidays().to_numpy(dtype='datetime64[D]')
+
+
+def contar_dias_habiles(fechas_inicio, fecha_fin):
+    """
+    Versión vectorizada de ``calcular_dias_habiles`` para una serie de fechas
+    de inicio y una fecha (o serie) de fin: días hábiles entre ambas,
+    incluidas, y NA donde falta alguna.
+    """
+    fin = fecha_fin if isinstance(fecha_fin, pd.Series) else pd.Series(pd.Timestamp(fecha_fin), index=fechas_inicio.index)
+    validos = (fechas_inicio.notna() & fin.notna()).to_numpy()
+    dias = pd.Series(pd.NA, index=fechas_inicio.index, dtype='Int64')
+    if validos.any():
+        desde = fechas_inicio.to_numpy(dtype='datetime64[D]')[validos]
+        hasta = fin.to_numpy(dtype='datetime64[D]')[validos] + np.timedelta64(1, 'D')
+        dias[validos] = np.maximum(np.busday_count(desde, hasta, holidays=_festivos_colombia()), 0)
+    return dias
+
+
+def limpiar_pedidos(df):
+    """Normaliza columnas, órdenes, fechas y estatus de la hoja de pedidos"""
+    # Normalizar nombres de columnas
+    df = df.rename(columns={
+        'COMERCIAL ORDEN': 'ORDEN',
+        'PRODUCCION ESTATUS': 'ESTATUS'
+    })
+
+    # Convertir ORDEN a string limpio (sin .0), manejando valores vacíos
+    df['ORDEN'] = pd.to_numeric(df['ORDEN'], errors='coerce').fillna(0).astype(int).astype(str)
+    # Eliminar filas con ORDEN = "0" (que eran vacías o inválidas)
+    df = df[df['ORDEN'] != '0'].copy()
+
+    # Convertir fechas
+    df['FECHA DE VENTA'] = pd.to_datetime(df['FECHA DE VENTA'], format='%d/%m/%Y', errors='coerce')
+    df['FECHA DE VENCIMIENTO'] = pd.to_datetime(df['FECHA DE VENCIMIENTO'], format='%d/%m/%Y', errors='coerce')
+
+    # Limpiar y normalizar datos
+    df['ORDEN'] = df['ORDEN'].astype(str).str.strip().str.upper()
+    df['ESTATUS'] = df['ESTATUS'].astype(str).str.strip().str.upper()
+    df['ESTATUS LOGISTICA'] = df['ESTATUS LOGISTICA'].astype(str).str.strip().str.upper()
+    df['CUENTA'] = df['CUENTA'].astype(str).str.strip()
+    df['EKM'] = df['EKM'].astype(str).str.strip()
+
+    return df
+
+
+@instrumentar()
+def cargar_pedidos(sheet_url):
+    """Hoja de pedidos limpia (o None) y su diagnóstico"""
+    diagnostico = Diagnostico("pedidos control")
+    try:
+        csv_url = url_csv(id_libro(sheet_url), gid=GID_PEDIDOS)
+        df = pd.read_csv(csv_url, header=1, keep_default_na=False, na_values=[''])
+        diagnostico.contar("filas leídas", len(df))
+        df = limpiar_pedidos(df)
+        diagnostico.contar("órdenes válidas", len(df))
+        return compactar(df, "control", COLUMNAS_CATEGORICAS), diagnostico
+    except Exception as e:
+        diagnostico.error(f"Error al cargar datos: {str(e)}")
+        return None, diagnostico
+
+
+def limpiar_estatus(df_estatus):
+    """Normaliza las columnas de orden y fecha de entrega de las hojas Estatus"""
+    # Renombrar columnas para que sea más fácil trabajar
+    df_estatus = df_estatus.rename(columns={
+        'Marca temporal': 'FECHA_ENTREGA',
+        'N° Orden': 'ORDEN'
+    })
+
+    # Convertir ORDEN a entero primero (elimina .0) y luego a string
+    df_estatus['ORDEN'] = df_estatus['ORDEN'].fillna(0).astype(float).astype(int).astype(str)
+
+    # Convertir fecha de entrega a datetime
+    df_estatus['FECHA_ENTREGA'] = pd.to_datetime(df_estatus['FECHA_ENTREGA'], format='mixed', dayfirst=True, errors='coerce')
+
+    return df_estatus
+
+
+@instrumentar()
+def cargar_estatus(sheet_url, hojas=HOJAS_ESTATUS):
+    """Hojas de Estatus combinadas y limpias (o None) y su diagnóstico"""
+    diagnostico = Diagnostico("estatus control")
+    try:
+        sheet_id = id_libro(sheet_url)
+
+        # Una hoja que falla no impide usar las demás
+        dfs_estatus = []
+        for hoja in hojas:
+            try:
+                dfs_estatus.append(pd.read_csv(url_gviz_csv(sheet_id, hoja)))
+            except Exception as e:
+                diagnostico.advertencia(f"⚠️ No se pudo cargar {hoja}: {str(e)}")
+
+        if len(dfs_estatus) == 0:
+            diagnostico.error("No se pudo cargar ninguna hoja de Estatus")
+            return None, diagnostico
+
+        df_estatus = limpiar_estatus(pd.concat(dfs_estatus, ignore_index=True))
+        diagnostico.contar("registros de entrega", len(df_estatus))
+        return df_estatus, diagnostico
+    except Exception as e:
+        diagnostico.error(f"Error al cargar estatus: {str(e)}")
+        return None, diagnostico
+
+
+@instrumentar("Días de producción")
+def agregar_dias_produccion(df_periodo, df_estatus):
+    """
+    Cruza las órdenes con su última entrega de producción y calcula
+    DIAS_PRODUCCION en días hábiles (solo para órdenes con fecha de entrega).
+    """
+    df_periodo = df_periodo.copy()
+    if df_estatus is not None:
+        # Tomar solo la última entrega por orden (por si hay múltiples registros)
+        df_estatus_ultimo = df_estatus.groupby('ORDEN').agg({
+            'FECHA_ENTREGA': 'max'
+        }).reset_index()
+        df_periodo = df_periodo.merge(df_estatus_ultimo, on='ORDEN', how='left')
+    else:
+        df_periodo['FECHA_ENTREGA'] = pd.NaT
+
+    # Días hábiles de venta a entrega (NA si falta alguna de las dos fechas)
+    df_periodo['DIAS_PRODUCCION'] = contar_dias_habiles(df_periodo['FECHA DE VENTA'], df_periodo['FECHA_ENTREGA'])
+
+    return df_periodo
+
+
+def filtrar_periodo(df, fecha_actual, dias_historico):
+    """Órdenes vendidas en los últimos ``dias_historico`` días"""
+    fecha_desde = fecha_actual - timedelta(days=dias_historico)
+    return df[df['FECHA DE VENTA'] >= fecha_desde]
+
+
+@instrumentar()
+def preparar_control(sheet_url=URL_CONTROL, dias_historico=90, fecha_actual=None):
+    """
+    Pipeline completo: pedidos del periodo con fecha de entrega y días de
+    producción, más el diagnóstico combinado de la carga.
+    """
+    fecha_actual = fecha_actual or datetime.now()
+    df, diagnostico = cargar_pedidos(sheet_url)
+    df_estatus, diagnostico_estatus = cargar_estatus(sheet_url)
+    diagnostico.agregar(diagnostico_estatus)
+    if df is None or df.empty:
+        return None, diagnostico
+
+    df_periodo = agregar_dias_produccion(filtrar_periodo(df, fecha_actual, dias_historico), df_estatus)
+    diagnostico.contar("órdenes del periodo", len(df_periodo))
+    return df_periodo, diagnostico
+
+
+# Opciones del selector "Rango de datos históricos" del dashboard
+VENTANAS_HISTORICO = (30, 60, 90, 180, 365)
+
+# Campos con percentiles de días de producción, y entregas mínimas para confiar en ellos
+CAMPOS_TIEMPOS = ('EKM', 'CUENTA')
+MIN_ORDENES_TIEMPO = 3
+
+# Columnas de la pestaña "🔍 Buscar Orden", de mayor a menor peso en el orden de resultados
+CAMPOS_BUSQUEDA = ('ORDEN', 'EKM', 'CUENTA', 'DESCRIPCION PLATAFORMA')
+
+
+@instrumentar()
+def indexar_busqueda(df_historico, campos=CAMPOS_BUSQUEDA):
+    """Índice de n-gramas para buscar órdenes en todo el histórico"""
+    return IndiceBusqueda(df_historico, campos)
+
+
+# Alertas del tablero, en el orden en que se muestran (tres por fila). Una
+# alerta nueva es una Regla más: ver ekonomodo_core.reglas para los operadores.
+REGLAS_ALERTAS = [
+    Regla("vencidas", "error",
+          [("FECHA DE VENCIMIENTO", "<", "$fecha_actual"), ("ESTATUS", "==", "PRODUCCION")],
+          ['ORDEN', 'CUENTA', 'DESCRIPCION PLATAFORMA', 'FECHA DE VENCIMIENTO', 'ESTATUS', 'DIAS_TARDANZA'],
+          "🔴 {n} órdenes de producción VENCIDAS", "✅ No hay órdenes vencidas",
+          # Semáforo de tardanza: ≤7 verde, ≤14 amarillo, ≤21 naranja, >21 rojo
+          semaforo=('DIAS_TARDANZA', [7, 14, 21], ['🟢', '🟡', '🟠', '🔴'])),
+    Regla("proximos_vencer", "error",
+          [("FECHA DE VENCIMIENTO", "<=", "$fecha_limite"), ("FECHA DE VENCIMIENTO", ">=", "$fecha_actual"),
+           ("ESTATUS", "==", "PRODUCCION")],
+          ['ORDEN', 'CUENTA', 'DESCRIPCION PLATAFORMA', 'FECHA DE VENCIMIENTO', 'ESTATUS'],
+          "⚠️ {n} órdenes de producción vencen en 2 días hábiles", "✅ No hay órdenes próximas a vencer"),
+    # Predicción: la entrega estimada con el p90 del producto cae después del vencimiento
+    Regla("en_riesgo", "advertencia",
+          [("ESTATUS", "==", "PRODUCCION"), ("FECHA DE VENCIMIENTO", ">=", "$fecha_actual"), ("EN_RIESGO", "==", True)],
+          ['ORDEN', 'CUENTA', 'DESCRIPCION PLATAFORMA', 'EKM', 'FECHA DE VENTA', 'FECHA DE VENCIMIENTO',
+           'FECHA_ESTIMADA', 'PLAZO_P90'],
+          "⏳ {n} órdenes en producción probablemente no se entregan antes del vencimiento",
+          "✅ Ninguna orden en riesgo según los tiempos de cada producto"),
+    Regla("devoluciones", "error",
+          [("ESTATUS LOGISTICA", "==", "DEVOLUCION")],
+          ['ORDEN', 'CUENTA', 'DESCRIPCION PLATAFORMA', 'EKM'],
+          "🔄 {n} devoluciones pendientes", "✅ No hay devoluciones"),
+    Regla("entregados_no_recibidos", "advertencia",
+          [("ESTATUS", "==", "ENTREGADO"), ("ESTATUS LOGISTICA", "vacio")],
+          ['ORDEN', 'CUENTA', 'DESCRIPCION PLATAFORMA', 'CANTIDAD', 'EKM'],
+          "⚠️ {n} entregados sin recibir en logística", "✅ Todos los entregados recibidos"),
+    Regla("pendientes_despacho", "advertencia",
+          [("ESTATUS", "en", ['IMPORTADO', 'PRODUCCION', 'ENTREGADO']), ("LOGISTICA", "no_en", ['ENTREGADO', 'DESPACHADO'])],
+          ['ORDEN', 'CUENTA', 'FECHA DE VENTA', 'FECHA DE VENCIMIENTO', 'DESCRIPCION PLATAFORMA',
+           'CANTIDAD', 'ESTATUS', 'LOGISTICA'],
+          "📦 {n} órdenes sin despachar", "✅ Todo despachado"),
+    # Facturación: solo órdenes válidas (con número en ORDEN, no canceladas)
+    Regla("no_facturadas", "error",
+          [("ORDEN", "no_vacio"), ("ESTATUS", "!=", "CANCELADO"), ("FACTURADO_NUM", "==", 0)],
+          ['ORDEN', 'CUENTA', 'FECHA DE VENTA', 'DESCRIPCION PLATAFORMA', 'ESTATUS', 'ESTATUS LOGISTICA', 'FACTURADO'],
+          "💰 {n} órdenes NO facturadas", "✅ Todas las órdenes facturadas"),
+    Regla("no_registradas", "advertencia",
+          [("ORDEN", "no_vacio"), ("ESTATUS", "!=", "CANCELADO"), ("FACTURADO_SIN_REGISTRO", "==", True)],
+          ['ORDEN', 'CUENTA', 'FECHA DE VENTA', 'DESCRIPCION PLATAFORMA', 'ESTATUS', 'ESTATUS LOGISTICA', 'FACTURADO'],
+          "⚠️ {n} órdenes no registradas en Siigo", "✅ Todas registradas en Siigo"),
+]
+
+# Columnas de texto con pocos valores: se compactan al cargar y las reglas se evalúan por categoría
+COLUMNAS_CATEGORICAS = ('ESTATUS', 'ESTATUS LOGISTICA', 'LOGISTICA')
+
+
+def tipar_ordenes(df_periodo):
+    """
+    Frame tipado para evaluar REGLAS_ALERTAS: estatus como categorías y
+    FACTURADO interpretado una sola vez por valor distinto (número y si es
+    un '#N/A' de Siigo) en lugar de fila por fila.
+    """
+    df = tipar(df_periodo, COLUMNAS_CATEGORICAS)
+    codigos, unicos = pd.factorize(df['FACTURADO'])
+    unicos = pd.Series(unicos, dtype=object)
+    texto = unicos.astype(str).str.strip()
+    # La última posición corresponde a FACTURADO vacío (código -1)
+    numero = np.append(pd.to_numeric(unicos, errors='coerce').to_numpy(dtype=float), np.nan)
+    sin_registro = np.append((texto.str.contains('#N/A', case=False) | (texto == 'N/A')).to_numpy(dtype=bool), True)
+    df['FACTURADO_NUM'] = numero[codigos]
+    df['FACTURADO_SIN_REGISTRO'] = sin_registro[codigos]
+    return df
+
+
+def estimar_entrega(df_periodo, tiempos_ekm=None, tiempos_generales=None):
+    """
+    Agrega PLAZO_P90 (días hábiles: p90 del EKM, o el p90 de todas las
+    entregas si el EKM tiene menos de MIN_ORDENES_TIEMPO), FECHA_ESTIMADA de
+    entrega desde la venta y EN_RIESGO (la estimada cae después del
+    vencimiento). ``tiempos_ekm`` es el resumen y ``tiempos_generales`` el
+    ``general()`` de HistogramaTiempos; sin ellos no hay estimación.
+    """
+    plazo = pd.Series(np.nan, index=df_periodo.index)
+    if tiempos_ekm is not None and len(tiempos_ekm) > 0:
+        confiables = tiempos_ekm[tiempos_ekm['cantidad'] >= MIN_ORDENES_TIEMPO]
+        plazo = df_periodo['EKM'].map(confiables.set_index('EKM')['p90'])
+    if tiempos_generales is not None:
+        plazo = plazo.fillna(tiempos_generales['p90'])
+    plazo = np.ceil(plazo).astype('Int64')
+
+    estimada = pd.Series(pd.NaT, index=df_periodo.index, dtype='datetime64[ns]')
+    validos = (df_periodo['FECHA DE VENTA'].notna() & plazo.notna() & (plazo > 0)).to_numpy()
+    if validos.any():
+        # El día de la venta cuenta como el primer día hábil (como en DIAS_PRODUCCION)
+        venta = df_periodo['FECHA DE VENTA'].to_numpy(dtype='datetime64[D]')[validos]
+        dias = plazo.to_numpy(dtype=np.int64, na_value=1)[validos] - 1
+        estimada[validos] = np.busday_offset(venta, dias, roll='forward', holidays=_festivos_colombia())
+
+    return df_periodo.assign(
+        PLAZO_P90=plazo,
+        FECHA_ESTIMADA=estimada,
+        EN_RIESGO=(estimada > df_periodo['FECHA DE VENCIMIENTO']).to_numpy(dtype=bool),
+    )
+
+
+@instrumentar()
+def calcular_alertas(df_periodo, fecha_actual, tiempos_ekm=None, reglas=REGLAS_ALERTAS, tiempos_generales=None):
+    """Filas de cada alerta del tablero: {nombre: DataFrame}"""
+    parametros = {
+        'fecha_actual': fecha_actual,
+        'fecha_limite': dias_habiles_colombia(fecha_actual, 2),
+    }
+    df_periodo = estimar_entrega(df_periodo, tiempos_ekm, tiempos_generales)
+    filas = evaluar_reglas(tipar_ordenes(df_periodo), reglas, parametros)
+    alertas = {nombre: df_periodo.iloc[posiciones] for nombre, posiciones in filas.items()}
+
+    # Tardanza de las vencidas en días hábiles desde la venta
+    if 'vencidas' in alertas:
+        alertas['vencidas'] = alertas['vencidas'].assign(
+            DIAS_TARDANZA=contar_dias_habiles(alertas['vencidas']['FECHA DE VENTA'], fecha_actual)
+        )
+    return alertas
+
+
+def con_tiempo(df):
+    """Órdenes que pasaron por producción y ya tienen DIAS_PRODUCCION"""
+    return df[df['ESTATUS'].isin(['PRODUCCION', 'ENTREGADO']) & df['DIAS_PRODUCCION'].notna()]
+
+
+def _velocidad(ordenes_con_tiempo, campo):
+    """Cantidad, promedio, mediana, p90 y p95 de días de producción por ``campo``"""
+    velocidad = HistogramaTiempos.desde(ordenes_con_tiempo[campo], ordenes_con_tiempo['DIAS_PRODUCCION']).resumen(campo)
+    velocidad = velocidad.rename(columns={'p50': 'mediana'})
+    velocidad = velocidad[velocidad['cantidad'] >= MIN_ORDENES_TIEMPO]
+    return velocidad[[campo, 'mediana', 'promedio', 'cantidad', 'p90', 'p95']].reset_index(drop=True)
+
+
+def crear_histogramas():
+    """Histogramas de días de producción por campo para mantener entre recálculos"""
+    return {campo: HistogramaTiempos() for campo in CAMPOS_TIEMPOS}
+
+
+@instrumentar()
+def actualizar_tiempos(histogramas, df_historico):
+    """
+    Suma a los histogramas solo las entregas nuevas o cambiadas del histórico
+    y devuelve {campo: resumen} con cantidad, promedio, p50, p90 y p95.
+    """
+    entregas = con_tiempo(df_historico)
+    # Una orden puede tener varias filas (una por EKM)
+    ids = entregas['ORDEN'] + '#' + entregas.groupby('ORDEN').cumcount().astype(str)
+    resumenes = {}
+    for campo, histograma in histogramas.items():
+        histograma.actualizar(ids, entregas[campo], entregas['DIAS_PRODUCCION'])
+        resumenes[campo] = histograma.resumen(campo)
+    return resumenes
+
+
+def _top_productos(df, etiqueta=30):
+    """Top 10 EKM por cantidad de órdenes, con etiqueta para las gráficas"""
+    top = df.groupby('EKM').agg({
+        'ORDEN': 'count',
+        'DESCRIPCION PLATAFORMA': 'first'
+    }).reset_index()
+    top.columns = ['EKM', 'Cantidad', 'Descripción']
+    top = top.sort_values('Cantidad', ascending=False).head(10)
+    top['Label'] = top['EKM'] + ' - ' + top['Descripción'].str[:etiqueta]
+    return top
+
+
+@instrumentar()
+def calcular_agregados(df_periodo):
+    """Agregados de la sección Estadística y Analítica: {nombre: DataFrame/Series}"""
+    # Flujo diario: entradas a producción (incluye ENTREGADO) e IMPORTADO, salidas por fecha de entrega
+    entradas_prod = df_periodo[df_periodo['ESTATUS'].isin(['PRODUCCION', 'ENTREGADO'])]
+    entradas_prod_dia = entradas_prod.groupby(entradas_prod['FECHA DE VENTA'].dt.date).size().reset_index()
+    entradas_prod_dia.columns = ['Fecha', 'Cantidad']
+
+    entradas_log = df_periodo[df_periodo['ESTATUS'].isin(['IMPORTADO'])]
+    entradas_log_dia = entradas_log.groupby(entradas_log['FECHA DE VENTA'].dt.date).size().reset_index()
+    entradas_log_dia.columns = ['Fecha', 'Cantidad']
+
+    entregadas = df_periodo[df_periodo['FECHA_ENTREGA'].notna()]
+    entregadas_dia = entregadas.groupby(entregadas['FECHA_ENTREGA'].dt.date).size()
+
+    # Velocidad de producción por EKM y por cuenta (al menos 3 órdenes completadas)
+    ordenes_con_tiempo = con_tiempo(df_periodo)
+    velocidad_por_ekm = _velocidad(ordenes_con_tiempo, 'EKM')
+    velocidad_por_ekm['Descripción'] = velocidad_por_ekm['EKM'].map(
+        ordenes_con_tiempo.drop_duplicates('EKM').set_index('EKM')['DESCRIPCION PLATAFORMA'])
+
+    return {
+        'entradas_prod_dia': entradas_prod_dia,
+        'entradas_log_dia': entradas_log_dia,
+        'entregadas_dia': entregadas_dia,
+        'top_produccion': _top_productos(entradas_prod),
+        'top_importado': _top_productos(df_periodo[df_periodo['ESTATUS'] == 'IMPORTADO']),
+        'ordenes_con_tiempo': ordenes_con_tiempo,
+        'velocidad_por_ekm': velocidad_por_ekm,
+        'velocidad_por_cuenta': _velocidad(ordenes_con_tiempo, 'CUENTA'),
+    }
+
+
+@instrumentar()
+def calcular_tablero(sheet_url=URL_CONTROL, ventanas=VENTANAS_HISTORICO, fecha_actual=None, historial=None,
+                     histogramas=None):
+    """
+    Todo lo que muestra el dashboard, para cada ventana de histórico:
+    ({"fecha": ..., "ventanas": {dias: {"periodo", "alertas", "agregados"}},
+    "busqueda": {"ordenes", "indice"}, "tiempos": {campo: percentiles}}, diagnóstico).
+
+    Las órdenes, los días de producción y las alertas se calculan una sola vez
+    sobre la ventana más larga; las demás ventanas son filtros por FECHA DE
+    VENTA de ese resultado (todas las alertas son filtros por fila).
+
+    Con ``historial`` (ruta de un archivo SQLite) las alertas de la ventana
+    más larga se agregan a ``ekonomodo_core.historial_alertas``. Los
+    percentiles de días de producción salen de ``histogramas``
+    (``crear_histogramas()``); si se pasan los mismos en cada llamada solo se
+    suman las entregas nuevas.
+    """
+    fecha_actual = fecha_actual or datetime.now()
+    df, diagnostico = cargar_pedidos(sheet_url)
+    df_estatus, diagnostico_estatus = cargar_estatus(sheet_url)
+    diagnostico.agregar(diagnostico_estatus)
+    if df is None or df.empty:
+        return None, diagnostico
+
+    # Todo el histórico, para la búsqueda de órdenes
+    df_historico = agregar_dias_produccion(df, df_estatus)
+    df_completo = filtrar_periodo(df_historico, fecha_actual, max(ventanas))
+
+    # Percentiles de todo el histórico: ranking y predicción de "en riesgo"
+    histogramas = histogramas if histogramas is not None else crear_histogramas()
+    tiempos = actualizar_tiempos(histogramas, df_historico)
+    alertas_completo = calcular_alertas(df_completo, fecha_actual, tiempos['EKM'],
+                                        tiempos_generales=histogramas['EKM'].general())
+
+    tablero = {
+        "fecha": fecha_actual,
+        "ventanas": {},
+        "busqueda": {"ordenes": df_historico, "indice": indexar_busqueda(df_historico)},
+        "tiempos": tiempos,
+    }
+    for dias in ventanas:
+        df_periodo = filtrar_periodo(df_completo, fecha_actual, dias)
+        tablero["ventanas"][dias] = {
+            "periodo": df_periodo,
+            "alertas": {nombre: filtrar_periodo(filas, fecha_actual, dias) for nombre, filas in alertas_completo.items()},
+            "agregados": calcular_agregados(df_periodo),
+        }
+    diagnostico.contar("órdenes del periodo", len(df_completo))
+    for nombre, filas in alertas_completo.items():
+        diagnostico.contar(f"alerta {nombre}", len(filas))
+
+    if historial is not None:
+        registrar_historial(historial, alertas_completo, fecha_actual, diagnostico)
+    return tablero, diagnostico
+
+
+@instrumentar("Historial de alertas")
+def registrar_historial(ruta, alertas, momento, diagnostico):
+    """Agrega las órdenes de cada alerta al historial; un fallo queda como advertencia"""
+    try:
+        cambios = historial_alertas.registrar(ruta, {nombre: filas['ORDEN'] for nombre, filas in alertas.items()}, momento)
+        diagnostico.contar("cambios en historial de alertas", cambios)
+    except Exception as e:
+        diagnostico.advertencia(f"⚠️ No se pudo guardar el historial de alertas: {str(e)}")
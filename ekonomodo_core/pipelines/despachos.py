@@ -0,0 +1,237 @@
+"""
+Pipeline del dashboard de Despachos.
+
+Limpia el Excel de despachos (fechas día/mes/año, costos, canal de venta,
+banderas de facturación y entrega) y lo cruza con el catálogo de vendedores.
+"""
+
+import traceback
+
+from ekonomodo_core import municipios, perezoso
+from ekonomodo_core.compacto import compactar
+from ekonomodo_core.diagnostico import Diagnostico
+from ekonomodo_core.instrumentacion import instrumentar
+
+np = perezoso.modulo("numpy")
+pd = perezoso.modulo("pandas")
+
+# Columnas de texto con pocos valores (filtros y agrupaciones del dashboard)
+COLUMNAS_CATEGORICAS = ('PLATAFORMA', 'CANAL_VENTA', 'CIUDAD', 'ESTATUS', 'ESTATUS_CLEAN', 'ALISTAMIENTO',
+                        'DIA_SEMANA', 'VEND', 'NOMBRE', 'VENDEDOR_NOMBRE')
+COLUMNAS_DINERO = ('COSTO FLETE',)
+
+
+def normalizar_columnas(df):
+    """Columnas en mayúsculas, sin espacios sobrantes"""
+    columnas = df.columns.astype(str).str.strip().str.upper()
+    return df.set_axis([' '.join(col.split()) for col in columnas], axis=1)
+
+
+@instrumentar()
+def procesar_despachos(df):
+    """Despachos limpios y con columnas derivadas, más el diagnóstico de las fechas"""
+    diagnostico = Diagnostico("despachos")
+
+    # Limpiar y normalizar columnas (eliminar espacios excesivos); trabaja sobre una copia
+    df = normalizar_columnas(df)
+    
+    # Mapeo de nombres de columnas comunes
+    column_mapping = {
+        'FECHA': 'FECHA_FACTURA',
+        'FECHA FACTURA': 'FECHA_FACTURA',
+    }
+    df.rename(columns=column_mapping, inplace=True)
+    
+    # Procesar fechas - formato día/mes/año
+    date_columns = ["FECHA_FACTURA", "FECHA DESPACHO"]
+    for col in date_columns:
+        if col in df.columns:
+            # Intentar múltiples formatos con prioridad en día/mes/año
+            try:
+                # Primero intentar con dayfirst=True (día/mes/año)
+                df[col] = pd.to_datetime(df[col], errors="coerce", dayfirst=True, format="%d/%m/%Y")
+                
+                # Si hay muchos NaN, intentar otros formatos comunes
+                if df[col].isna().sum() > len(df) * 0.5:  # Si más del 50% son NaN
+                    df[col] = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
+                
+                if df[col].isna().all():
+                    diagnostico.advertencia(f"No se pudieron procesar las fechas en la columna {col}")
+                else:
+                    fechas_procesadas = df[col].notna().sum()
+                    diagnostico.info(f"✅ Procesadas {fechas_procesadas} fechas en columna {col}")
+                    
+            except Exception as e:
+                diagnostico.advertencia(f"Error procesando fechas en {col}: {str(e)}")
+                # Fallback: intentar sin formato específico
+                df[col] = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
+
+    # Limpiar espacios en ALISTAMIENTO
+    if "ALISTAMIENTO" in df.columns:
+        df["ALISTAMIENTO"] = df["ALISTAMIENTO"].astype(str).str.strip()
+
+    # Ciudad del centro de costo, con el catálogo de municipios
+    if "COS" in df.columns:
+        df["CIUDAD"] = municipios.ciudad_cos(df["COS"])["ciudad"]
+    
+    # Calcular tiempo de despacho
+    if "FECHA_FACTURA" in df.columns and "FECHA DESPACHO" in df.columns:
+        df["TIEMPO_DESPACHO_DIAS"] = (df["FECHA DESPACHO"] - df["FECHA_FACTURA"]).dt.days
+        df["TIEMPO_DESPACHO_HORAS"] = (df["FECHA DESPACHO"] - df["FECHA_FACTURA"]).dt.total_seconds() / 3600
+
+    # Limpiar espacios en ALISTAMIENTO
+    if "ALISTAMIENTO" in df.columns:
+        df["ALISTAMIENTO"] = df["ALISTAMIENTO"].astype(str).str.strip()
+    
+    # Limpiar costos - ser más agresivo con la limpieza
+    if "COSTO FLETE" in df.columns:
+        # Convertir a string primero para limpiar
+        df["COSTO FLETE"] = df["COSTO FLETE"].astype(str)
+        # Remover caracteres no numéricos excepto puntos y comas
+        df["COSTO FLETE"] = df["COSTO FLETE"].str.replace(r'[^\d.,]', '', regex=True)
+        # Reemplazar comas por puntos para decimales
+        df["COSTO FLETE"] = df["COSTO FLETE"].str.replace(',', '.')
+        # Convertir a numérico
+        df["COSTO FLETE"] = pd.to_numeric(df["COSTO FLETE"], errors="coerce").fillna(0)
+        
+    # Lista de plataformas conocidas
+    plataformas_conocidas = [
+        "PAGINA WEB", "FALABELLA", "SODIMAC", "ADDI", "AGAVAL",
+        "APER", "CRICKET", "MERCADO LIBRE", "PUNTOS COLOMBIA", "TUGO"
+    ]
+
+    # Asegurar que la columna PLATAFORMA existe
+    if "PLATAFORMA" in df.columns:
+        # Limpiar espacios y poner en mayúsculas para comparar mejor
+        df["PLATAFORMA_CLEAN"] = df["PLATAFORMA"].astype(str).str.strip().str.upper()
+
+        def clasificar_canal(plataforma):
+            if pd.isna(plataforma) or plataforma.strip() == "":
+                return np.nan  # No se ha despachado
+            elif any(p in plataforma for p in plataformas_conocidas):
+                return plataforma  # Es una plataforma conocida
+            else:
+                return "PARTICULAR"  # No coincide, asumimos que es nombre de persona
+
+        # Aplicar función
+        df["CANAL_VENTA"] = df["PLATAFORMA_CLEAN"].apply(clasificar_canal)
+
+        # (Opcional) Eliminar columna temporal
+        df.drop(columns=["PLATAFORMA_CLEAN"], inplace=True)
+    
+    # Crear variables temporales
+    if "FECHA DESPACHO" in df.columns:
+        mask_fecha_valida = df["FECHA DESPACHO"].notna()
+        df.loc[mask_fecha_valida, "AÑO"] = df.loc[mask_fecha_valida, "FECHA DESPACHO"].dt.year
+        df.loc[mask_fecha_valida, "MES"] = df.loc[mask_fecha_valida, "FECHA DESPACHO"].dt.month
+        df.loc[mask_fecha_valida, "DIA_SEMANA"] = df.loc[mask_fecha_valida, "FECHA DESPACHO"].dt.day_name()
+        df.loc[mask_fecha_valida, "SEMANA"] = df.loc[mask_fecha_valida, "FECHA DESPACHO"].dt.isocalendar().week
+    
+    # Categorizar estatus - ser más flexible
+    if "ESTATUS" in df.columns:
+        df["ESTATUS_CLEAN"] = df["ESTATUS"].fillna("SIN ESTATUS").astype(str).str.upper().str.strip()
+        df["IS_ENTREGADO"] = df["ESTATUS_CLEAN"].isin(["ENTREGADO", "ENTREGADA", "DELIVERED", "COMPLETADO", "DESPACHADO", "DEPACHADO"])
+        
+        # Verificar que existe la columna NRO. CRUCE antes de usarla
+        if "NRO. CRUCE" in df.columns:
+            # Convertir a numérico primero para detectar tanto 0 como 0.0
+            df["NRO_CRUCE_NUMERIC"] = pd.to_numeric(df["NRO. CRUCE"], errors='coerce')
+            
+            # Un producto NO está facturado si:
+            # - El valor numérico es 0 (incluye 0.0, 0, etc.)
+            # - Es NaN (valores faltantes o no numéricos)
+            df["IS_NO_FACTURADO"] = (df["NRO_CRUCE_NUMERIC"] == 0) | (df["NRO_CRUCE_NUMERIC"].isna())
+            df["IS_FACTURADO"] = ~df["IS_NO_FACTURADO"]
+            
+            # Limpiar columna temporal
+            df.drop("NRO_CRUCE_NUMERIC", axis=1, inplace=True)
+            
+            # Un producto está facturado pero no despachado si está facturado pero no está entregado
+            df["IS_FACTURADO_NO_DESPACHADO"] = (df["IS_FACTURADO"]) & (~df["IS_ENTREGADO"])
+        else:
+            df["IS_FACTURADO_NO_DESPACHADO"] = False
+            df["IS_NO_FACTURADO"] = False
+            df["IS_FACTURADO"] = False
+
+    diagnostico.contar("registros", len(df))
+    return compactar(df, "despachos", COLUMNAS_CATEGORICAS, COLUMNAS_DINERO), diagnostico
+
+
+@instrumentar()
+def cargar_despachos(archivo):
+    """Lee y procesa el Excel de despachos: (df o None, diagnóstico)"""
+    try:
+        return procesar_despachos(pd.read_excel(archivo))
+    except Exception as e:
+        diagnostico = Diagnostico("despachos")
+        diagnostico.error(f"Error al procesar el archivo: {str(e)}")
+        diagnostico.error(f"Detalles del error: {traceback.format_exc()}")
+        return None, diagnostico
+
+
+@instrumentar()
+def cargar_vendedores(archivo):
+    """Lee el catálogo de vendedores: (df o None, diagnóstico)"""
+    diagnostico = Diagnostico("vendedores")
+    try:
+        df_vendedores = normalizar_columnas(pd.read_excel(archivo))
+        diagnostico.info(f"Vendedores cargados: {len(df_vendedores)} registros")
+        diagnostico.info(f"Columnas en archivo de vendedores: {list(df_vendedores.columns)}")
+        return df_vendedores, diagnostico
+    except Exception as e:
+        diagnostico.error(f"Error al cargar archivo de vendedores: {str(e)}")
+        return None, diagnostico
+
+
+@instrumentar()
+def cruzar_vendedores(df, df_vendedores):
+    """Agrega NOMBRE y VENDEDOR_NOMBRE a los despachos: (df, diagnóstico)"""
+    diagnostico = Diagnostico("cruce de vendedores")
+    try:
+        if df_vendedores is not None and "VEND" in df.columns:
+            # Limpiar nombres de columnas del catálogo de vendedores
+            df_vendedores = df_vendedores.set_axis(
+                df_vendedores.columns.str.strip().str.replace('"', '').str.upper(), axis=1
+            )
+
+            diagnostico.contar("códigos de vendedor en despachos", df['VEND'].nunique())
+            if 'VENDEDOR' in df_vendedores.columns:
+                diagnostico.contar("códigos de vendedor en catálogo", df_vendedores['VENDEDOR'].nunique())
+
+            if "VENDEDOR" in df_vendedores.columns and "NOMBRE" in df_vendedores.columns:
+                # Asegurar formatos consistentes
+                df = df.copy()
+                df["VEND"] = df["VEND"].astype(str).str.strip().str.upper()
+                catalogo = df_vendedores[["VENDEDOR", "NOMBRE"]].copy()
+                catalogo["VENDEDOR"] = catalogo["VENDEDOR"].astype(str).str.strip().str.upper()
+
+                # Hacer el merge
+                df_original_len = len(df)
+                df = df.merge(catalogo, left_on="VEND", right_on="VENDEDOR", how="left")
+
+                df.rename(columns={"NOMBRE_y": "NOMBRE"}, inplace=True)
+
+                # Verificar si el merge alteró la cantidad de registros
+                if len(df) != df_original_len:
+                    diagnostico.advertencia(f"⚠️ El merge cambió el número de registros: de {df_original_len} a {len(df)}")
+
+                # Crear columna combinada con nombre del vendedor
+                df["VENDEDOR_NOMBRE"] = df.apply(lambda row:
+                    f"{row['VEND']} - {row['NOMBRE']}" if pd.notna(row.get("NOMBRE")) and str(row.get("NOMBRE")).strip() != ""
+                    else f"{row['VEND']} - Sin nombre", axis=1)
+
+                # Estadísticas del cruce
+                if "NOMBRE" in df.columns:
+                    vendedores_con_nombre = df["NOMBRE"].notna().sum()
+                    diagnostico.info(f"✅ Cruce completado: {vendedores_con_nombre} registros con nombre de vendedor")
+                else:
+                    diagnostico.advertencia(f"⚠️ 'NOMBRE' no se encuentra en df después del merge. Columnas actuales: {df.columns.tolist()}")
+
+            else:
+                diagnostico.error("❌ El archivo de vendedores debe tener columnas 'VENDEDOR' y 'NOMBRE'")
+
+    except Exception as e:
+        diagnostico.advertencia(f"⚠️ Error al vincular vendedores: {str(e)}")
+        diagnostico.error(f"📄 Detalles del error:\n\n{traceback.format_exc()}")
+
+    return compactar(df, "despachos con vendedores", COLUMNAS_CATEGORICAS, COLUMNAS_DINERO), diagnostico
@@ -0,0 +1,202 @@
+"""
+Pipeline del dashboard CEO de pedidos por comercios.
+
+Limpia el Excel de pedidos (fechas, valores, estado) y lo cruza con los
+catálogos de comercios y vendedores.
+"""
+
+from ekonomodo_core import municipios, perezoso
+from ekonomodo_core.compacto import compactar
+from ekonomodo_core.diagnostico import Diagnostico
+from ekonomodo_core.instrumentacion import instrumentar
+
+np = perezoso.modulo("numpy")
+pd = perezoso.modulo("pandas")
+
+# Columnas de texto con pocos valores (filtros y agrupaciones del dashboard)
+COLUMNAS_CATEGORICAS = ('COMPROBA', 'VEND', 'NOMBRE_COMERCIO', 'NOMBRE_VENDEDOR', 'DIA_SEMANA', 'ESTADO_PEDIDO',
+                        'CIUDAD', 'DEPARTAMENTO')
+COLUMNAS_DINERO = ('VAL.PEDIDO', 'VAL.ENTREGAD')
+
+
+@instrumentar()
+def preparar_pedidos(df):
+    """Pedidos con fechas, valores y códigos limpios más columnas auxiliares: (df, diagnóstico)"""
+    diagnostico = Diagnostico("pedidos")
+    df = df.copy()
+    # Normalizar nombres de columnas
+    df.columns = [c.strip() for c in df.columns]
+
+    # Fechas - Mejor manejo de errores
+    for col in ['FECHA', 'FECHA ENT.', 'FECHA PAC']:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+            diagnostico.contar(f"fechas inválidas en {col}", int(df[col].isna().sum()))
+
+    # Valores numéricos
+    numeric_cols = ['VAL.PEDIDO', 'VAL.ENTREGAD', 'CANT.PEDIDA', 'CANT.ENTREGA', 'CANT PEND', 'CANT.PENDIENTE LOTE']
+    for col in numeric_cols:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    # Limpieza de códigos
+    if 'COMPROBA' in df.columns:
+        df['COMPROBA'] = df['COMPROBA'].astype(str).str.strip()
+
+    # Columnas auxiliares - Solo si hay fechas válidas
+    if 'FECHA' in df.columns:
+        # Crear FECHA_DATE solo donde FECHA no es nulo
+        df['FECHA_DATE'] = df['FECHA'].dt.date
+        
+        # Solo calcular columnas temporales donde hay fechas válidas
+        mask_fechas_validas = df['FECHA'].notna()
+        
+        df['MES'] = None
+        df['SEMANA'] = None
+        df['DIA_SEMANA'] = None
+        
+        if mask_fechas_validas.any():
+            df.loc[mask_fechas_validas, 'MES'] = df.loc[mask_fechas_validas, 'FECHA'].dt.to_period('M')
+            df.loc[mask_fechas_validas, 'SEMANA'] = df.loc[mask_fechas_validas, 'FECHA'].dt.isocalendar().week
+            df.loc[mask_fechas_validas, 'DIA_SEMANA'] = df.loc[mask_fechas_validas, 'FECHA'].dt.day_name()
+    
+    # Calcular eficiencia de entrega
+    if 'VAL.PEDIDO' in df.columns and 'VAL.ENTREGAD' in df.columns:
+        df['EFICIENCIA_ENTREGA'] = np.where(df['VAL.PEDIDO'] > 0, 
+                                           df['VAL.ENTREGAD'] / df['VAL.PEDIDO'], 0)
+    
+    # Ciudad y departamento del centro de costo, con el catálogo de municipios
+    if 'COS' in df.columns:
+        ubicacion = municipios.ciudad_cos(df['COS'])
+        df['CIUDAD'] = ubicacion['ciudad']
+        df['DEPARTAMENTO'] = ubicacion['departamento']
+
+    # Estado del pedido
+    if 'CANT PEND' in df.columns:
+        df['ESTADO_PEDIDO'] = np.where(df['CANT PEND'] == 0, 'Completado', 
+                              np.where(df['CANT PEND'] > 0, 'Pendiente', 'Error'))
+
+    diagnostico.contar("pedidos", len(df))
+    return df, diagnostico
+
+
+@instrumentar()
+def cruzar_comercios(df_orders, df_shops, code_col_orders='COMPROBA'):
+    """Agrega NOMBRE_COMERCIO desde el catálogo de comercios: (df, diagnóstico)"""
+    diagnostico = Diagnostico("cruce de comercios")
+    df = df_orders.copy()
+    df_shops = df_shops.copy()
+    
+    # Limpiar columnas
+    df_shops.columns = [c.strip() for c in df_shops.columns]
+    code_col_shops = df_shops.columns[0]
+    name_col = df_shops.columns[1] if len(df_shops.columns) > 1 else df_shops.columns[0]
+
+    df_shops[code_col_shops] = df_shops[code_col_shops].astype(str).str.strip()
+    df_shops[name_col] = df_shops[name_col].astype(str).str.strip()
+
+    merged = df.merge(df_shops, left_on=code_col_orders, right_on=code_col_shops, how='left')
+    merged = merged.rename(columns={name_col: 'NOMBRE_COMERCIO'})
+    diagnostico.contar("pedidos sin comercio en el catálogo", int(merged['NOMBRE_COMERCIO'].isna().sum()))
+    merged['NOMBRE_COMERCIO'] = merged['NOMBRE_COMERCIO'].fillna(merged[code_col_orders])
+    
+    return merged, diagnostico
+
+
+@instrumentar()
+def cruzar_vendedores(df_orders, df_vendors, code_col_orders='VEND'):
+    """Agrega NOMBRE_VENDEDOR desde el catálogo de vendedores: (df, diagnóstico)"""
+    diagnostico = Diagnostico("cruce de vendedores")
+    df = df_orders.copy()
+    df_vendors = df_vendors.copy()
+    
+    # Limpiar nombres de columnas - convertir todo a string primero
+    df_vendors.columns = [str(c).strip() if hasattr(c, 'strip') else str(c) for c in df_vendors.columns]
+    
+    # Eliminar filas completamente vacías
+    df_vendors = df_vendors.dropna(how='all').reset_index(drop=True)
+    
+    # Buscar las columnas por posición ya que los nombres pueden estar mal
+    # Asumir: primera columna = VENDEDOR, tercera columna = NOMBRE
+    if len(df_vendors.columns) >= 2:
+        code_col_vendors = df_vendors.columns[0]  # Primera columna
+        name_col = df_vendors.columns[1]          # Segunda columna
+    else:
+        diagnostico.error(f"El archivo de vendedores debe tener al menos 2 columnas. Encontradas: {len(df_vendors.columns)}")
+        return df, diagnostico
+    
+    # Crear copia para trabajo con las columnas identificadas
+    vendors_clean = df_vendors[[code_col_vendors, name_col]].copy()
+    
+    # Función para normalizar códigos
+    def clean_code(code):
+        try:
+            if pd.isna(code):
+                return ''
+            code_str = str(code).strip()
+            # Asegurarse de quitar ceros solo si es estrictamente necesario
+            return code_str.lstrip('0') or '0'
+        except:
+            return str(code) if code is not None else ''
+
+    
+    # Función para limpiar nombres  
+    def clean_name(name):
+        try:
+            if pd.isna(name):
+                return ''
+            return str(name).strip()
+        except:
+            return str(name) if name is not None else ''
+    
+    # Aplicar limpieza
+    vendors_clean['VENDEDOR_CLEAN'] = vendors_clean[code_col_vendors].apply(clean_code)
+    vendors_clean['NOMBRE_CLEAN'] = vendors_clean[name_col].apply(clean_name)
+    
+    # Limpiar códigos en df principal
+    df['VEND_CLEAN'] = df[code_col_orders].apply(clean_code)
+
+    # Códigos de pedidos que no aparecen en el catálogo (antes se imprimían en la página)
+    sin_catalogo = sorted(set(df['VEND_CLEAN']) - set(vendors_clean['VENDEDOR_CLEAN']))
+    if sin_catalogo:
+        diagnostico.advertencia(f"Códigos de vendedor sin nombre en el catálogo: {', '.join(sin_catalogo)}")
+    
+    # Eliminar duplicados en vendedores
+    vendors_clean = vendors_clean.drop_duplicates(subset=['VENDEDOR_CLEAN'], keep='first')
+    
+    # Hacer merge
+    merged = df.merge(
+        vendors_clean[['VENDEDOR_CLEAN', 'NOMBRE_CLEAN']],
+        left_on='VEND_CLEAN',
+        right_on='VENDEDOR_CLEAN',
+        how='left'
+    )
+    
+    # Limpiar resultado
+    merged['NOMBRE_VENDEDOR'] = merged['NOMBRE_CLEAN'].fillna(merged[code_col_orders].astype(str))
+    merged = merged.drop(['VENDEDOR_CLEAN', 'VEND_CLEAN', 'NOMBRE_CLEAN'], axis=1, errors='ignore')
+    
+    return merged, diagnostico
+
+
+@instrumentar()
+def procesar_pedidos(df_orders_raw, df_shops=None, df_vendors=None):
+    """
+    Pipeline completo: pedidos preparados y cruzados con los catálogos que
+    haya. Sin catálogo, el nombre de comercio/vendedor es el código.
+    """
+    df, diagnostico = preparar_pedidos(df_orders_raw)
+
+    if df_shops is not None:
+        df, diagnostico_comercios = cruzar_comercios(df, df_shops)
+        diagnostico.agregar(diagnostico_comercios)
+    elif 'COMPROBA' in df.columns:
+        df['NOMBRE_COMERCIO'] = df['COMPROBA']
+
+    if df_vendors is not None:
+        df, diagnostico_vendedores = cruzar_vendedores(df, df_vendors)
+        diagnostico.agregar(diagnostico_vendedores)
+    elif 'VEND' in df.columns:
+        df['NOMBRE_VENDEDOR'] = df['VEND']
+
+    return compactar(df, "pedidos", COLUMNAS_CATEGORICAS, COLUMNAS_DINERO), diagnostico
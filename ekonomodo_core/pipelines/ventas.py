@@ -0,0 +1,314 @@
+"""
+Pipeline del dashboard de Análisis de Ventas (hojas SIIGO).
+
+Cada hoja SIIGO trae en las mismas filas las ventas (columnas A-P) y las
+devoluciones (columnas R-AB). Aquí se separan, se limpian, se preparan para
+el análisis y se ingieren al almacén Parquet de ``ekonomodo_core.almacen_ventas``,
+del que leen todas las pestañas del dashboard.
+"""
+
+import pandas as pd
+
+from ekonomodo_core import almacen_ventas
+from ekonomodo_core.diagnostico import Diagnostico
+from ekonomodo_core.instrumentacion import instrumentar
+from ekonomodo_core.sheets import id_libro, url_gviz_csv
+
+URL_SIIGO = "https://docs.google.com/spreadsheets/d/1xh15BZGWNPvyoypQWtrUOgeKXY6Ihm8bNnq4JpmL0GI/edit?usp=sharing"
+
+# Hojas SIIGO por año; el último es el año abierto (se sigue actualizando)
+HOJAS_SIIGO = {2024: "SIIGO 2024", 2025: "SIIGO 2025"}
+
+# Versión de la limpieza y preparación (separar_hoja_siigo, preparar_datos_analisis):
+# subirla al cambiarlas para que el almacén vuelva a ingerir todos los años
+VERSION_PREPARACION = 1
+
+# Columnas de texto con pocos valores (filtros y agrupaciones del dashboard)
+COLUMNAS_CATEGORICAS = ('PLATAFORMA', 'VENDEDOR', 'TIPO_CLIENTE', 'VENDEDOR_NOMBRE')
+COLUMNAS_DINERO = ('VALOR NETO', 'VALOR VENTA', 'IVA', 'TOTAL', 'VALOR')
+
+
+def limpiar_columnas(df):
+    """Limpia y normaliza los nombres de las columnas (sin modificar ``df``)"""
+    return df.set_axis(df.columns.str.strip().str.upper(), axis=1)
+
+def limpiar_valores_nd(df):
+    """Reemplaza valores #N/D por NaN en columnas específicas, manteniendo las filas"""
+    columnas_texto = ['CIUDAD', 'REFERENCIA', 'DESCRIPCION', 'CLIENTE', 'VENDEDOR', 'PLATAFORMA']
+    
+    for col in columnas_texto:
+        if col in df.columns:
+            # Reemplazar #N/D, #N/A, y variantes por NaN
+            df[col] = df[col].replace(['#N/D', '#N/A', '#¡N/A', '#DIV/0!', '#REF!', '#VALUE!'], pd.NA)
+            df[col] = df[col].replace('nan', pd.NA)
+            # También limpiar si viene como string
+            df[col] = df[col].apply(lambda x: pd.NA if str(x).strip() in ['#N/D', '#N/A', '#¡N/A', 'nan', 'NaN', ''] else x)
+    
+    return df
+
+def procesar_ciudad_departamento(df):
+    """Extrae ciudad y departamento del formato 'CIUDAD-DEPARTAMENTO' y unifica Bogotá"""
+    if 'CIUDAD' in df.columns:
+        # Crear columna de ciudad limpia
+        df['CIUDAD_LIMPIA'] = df['CIUDAD'].apply(lambda x: extraer_ciudad(x) if pd.notna(x) else pd.NA)
+        df['DEPARTAMENTO'] = df['CIUDAD'].apply(lambda x: extraer_departamento(x) if pd.notna(x) else pd.NA)
+    
+    return df
+
+def extraer_ciudad(texto):
+    """Extrae el nombre de la ciudad del formato CIUDAD-DEPARTAMENTO"""
+    if pd.isna(texto):
+        return pd.NA
+    
+    texto = str(texto).strip().upper()
+    
+    # Caso especial: Unificar todas las variantes de Bogotá
+    if 'BOGOTA' in texto or 'BOGOTÁ' in texto:
+        return 'BOGOTÁ'
+    
+    # Si tiene guion, tomar la parte antes del guion
+    if '-' in texto:
+        ciudad = texto.split('-')[0].strip()
+        return ciudad
+    
+    # Si no tiene guion, devolver tal cual
+    return texto
+
+def extraer_departamento(texto):
+    """Extrae el departamento del formato CIUDAD-DEPARTAMENTO"""
+    if pd.isna(texto):
+        return pd.NA
+    
+    texto = str(texto).strip().upper()
+    
+    # Caso especial Bogotá
+    if 'BOGOTA' in texto or 'BOGOTÁ' in texto:
+        return 'BOGOTÁ D.C.'
+    
+    # Si tiene guion, tomar la parte después del guion
+    if '-' in texto:
+        departamento = texto.split('-')[1].strip()
+        return departamento
+    
+    # Si no tiene guion, devolver vacío
+    return pd.NA
+
+def unificar_vendedor(nombre):
+    """Unifica nombres de vendedores quitando apellidos y normalizando"""
+    if pd.isna(nombre):
+        return nombre
+    
+    nombre = str(nombre).strip().upper()
+    
+    # Diccionario de unificaciones específicas
+    unificaciones = {
+        '0004 KATERINE GARCES': '0004 KATERINE',
+        '0004 KATERINE GARCÉS': '0004 KATERINE',
+        # Puedes agregar más unificaciones aquí si encuentras otros casos
+    }
+    
+    # Aplicar unificaciones específicas
+    if nombre in unificaciones:
+        return unificaciones[nombre]
+    
+    return nombre
+
+@instrumentar()
+def preparar_datos_analisis(ventas, devoluciones):
+    """Prepara los datos para análisis con las columnas correctas (trabaja sobre copias)"""
+    ventas = ventas.copy()
+    if devoluciones is not None:
+        devoluciones = devoluciones.copy()
+    
+    # Convertir FECHA a datetime
+    if 'FECHA' in ventas.columns:
+        ventas['FECHA'] = pd.to_datetime(ventas['FECHA'], errors='coerce')
+        ventas['MES_NUM'] = ventas['FECHA'].dt.month
+        ventas['AÑO'] = ventas['FECHA'].dt.year
+    
+    # Limpiar y convertir VALOR NETO a numérico
+    if 'VALOR NETO' in ventas.columns:
+        # Eliminar espacios, puntos de miles y convertir comas decimales a puntos
+        ventas['VALOR NETO'] = ventas['VALOR NETO'].astype(str).str.strip()
+        ventas['VALOR NETO'] = ventas['VALOR NETO'].str.replace('.', '', regex=False)  # Quitar puntos de miles
+        ventas['VALOR NETO'] = ventas['VALOR NETO'].str.replace(',', '.', regex=False)  # Cambiar comas por puntos
+        ventas['VALOR NETO'] = ventas['VALOR NETO'].str.replace('$', '', regex=False)  # Quitar símbolo $
+        ventas['VALOR NETO'] = ventas['VALOR NETO'].str.replace(' ', '', regex=False)  # Quitar espacios
+        ventas['VALOR NETO'] = pd.to_numeric(ventas['VALOR NETO'], errors='coerce')
+    
+    # Limpiar y convertir CANT.PEDIDA a numérico
+    if 'CANT.PEDIDA' in ventas.columns:
+        ventas['CANT.PEDIDA'] = ventas['CANT.PEDIDA'].astype(str).str.strip()
+        ventas['CANT.PEDIDA'] = ventas['CANT.PEDIDA'].str.replace('.', '', regex=False)
+        ventas['CANT.PEDIDA'] = ventas['CANT.PEDIDA'].str.replace(',', '.', regex=False)
+        ventas['CANT.PEDIDA'] = pd.to_numeric(ventas['CANT.PEDIDA'], errors='coerce')
+    
+    # Limpiar otras columnas numéricas
+    columnas_numericas = ['VALOR VENTA', 'IVA', 'TOTAL']
+    for col in columnas_numericas:
+        if col in ventas.columns:
+            ventas[col] = ventas[col].astype(str).str.strip()
+            ventas[col] = ventas[col].str.replace('.', '', regex=False)
+            ventas[col] = ventas[col].str.replace(',', '.', regex=False)
+            ventas[col] = ventas[col].str.replace('$', '', regex=False)
+            ventas[col] = ventas[col].str.replace(' ', '', regex=False)
+            ventas[col] = pd.to_numeric(ventas[col], errors='coerce')
+    
+    # Clasificar tipo de cliente (Persona Natural vs Empresa)
+    if 'CLIENTE' in ventas.columns:
+        # Heurística: si el nombre tiene palabras como S.A.S, LTDA, S.A, etc., es empresa
+        ventas['TIPO_CLIENTE'] = ventas['CLIENTE'].apply(
+            lambda x: 'Empresa' if pd.notna(x) and any(term in str(x).upper() for term in 
+            ['S.A.S', 'SAS', 'S.A', 'LTDA', 'S EN C', 'E.U', 'EU', 'SOCIEDAD', 'EMPRESA', 'CIA', 'CORP']) 
+            else 'Persona Natural'
+        )
+
+    # Unificar vendedores (quitar apellidos y normalizar)
+    if 'VENDEDOR' in ventas.columns:
+        ventas['VENDEDOR'] = ventas['VENDEDOR'].apply(lambda x: unificar_vendedor(x) if pd.notna(x) else x)
+    
+    # Procesar devoluciones si existen
+    if devoluciones is not None and len(devoluciones) > 0:
+        if 'VALOR' in devoluciones.columns:
+            devoluciones['VALOR'] = devoluciones['VALOR'].astype(str).str.strip()
+            devoluciones['VALOR'] = devoluciones['VALOR'].str.replace('.', '', regex=False)
+            devoluciones['VALOR'] = devoluciones['VALOR'].str.replace(',', '.', regex=False)
+            devoluciones['VALOR'] = devoluciones['VALOR'].str.replace('$', '', regex=False)
+            devoluciones['VALOR'] = devoluciones['VALOR'].str.replace(' ', '', regex=False)
+            devoluciones['VALOR'] = pd.to_numeric(devoluciones['VALOR'], errors='coerce')
+        
+        if 'CANTIDAD' in devoluciones.columns:
+            devoluciones['CANTIDAD'] = devoluciones['CANTIDAD'].astype(str).str.strip()
+            devoluciones['CANTIDAD'] = devoluciones['CANTIDAD'].str.replace('.', '', regex=False)
+            devoluciones['CANTIDAD'] = devoluciones['CANTIDAD'].str.replace(',', '.', regex=False)
+            devoluciones['CANTIDAD'] = pd.to_numeric(devoluciones['CANTIDAD'], errors='coerce')
+
+    # Normalizar FACTURA No para que cruce con NUMERO de ventas
+    if 'FACTURA NO' in devoluciones.columns:
+        # Extraer solo los números, quitando letras y ceros a la izquierda
+        devoluciones['NUMERO_FACTURA'] = devoluciones['FACTURA NO'].astype(str).str.extract(r'(\d+)')[0]
+        devoluciones['NUMERO_FACTURA'] = pd.to_numeric(devoluciones['NUMERO_FACTURA'], errors='coerce')
+    
+    # Normalizar VENDEDOR en devoluciones para que cruce con ventas
+    if 'VENDEDOR' in devoluciones.columns:
+        # Crear columna con solo el nombre (sin código)
+        devoluciones['VENDEDOR_NOMBRE'] = devoluciones['VENDEDOR'].str.strip().str.upper()
+            
+        # Convertir MES de texto a número
+        if 'MES' in devoluciones.columns:
+            meses_map = {
+                'ENERO': 1, 'FEBRERO': 2, 'MARZO': 3, 'ABRIL': 4,
+                'MAYO': 5, 'JUNIO': 6, 'JULIO': 7, 'AGOSTO': 8,
+                'SEPTIEMBRE': 9, 'OCTUBRE': 10, 'NOVIEMBRE': 11, 'DICIEMBRE': 12,
+                'ENE': 1, 'FEB': 2, 'MAR': 3, 'ABR': 4,
+                'MAY': 5, 'JUN': 6, 'JUL': 7, 'AGO': 8,
+                'SEP': 9, 'OCT': 10, 'NOV': 11, 'DIC': 12,
+                '1': 1, '2': 2, '3': 3, '4': 4, '5': 5, '6': 6,
+                '7': 7, '8': 8, '9': 9, '10': 10, '11': 11, '12': 12
+            }
+            # Convertir a mayúsculas y limpiar espacios
+            devoluciones['MES_TEXTO'] = devoluciones['MES'].astype(str).str.strip().str.upper()
+            # Mapear a número
+            devoluciones['MES_NUM'] = devoluciones['MES_TEXTO'].map(meses_map)
+    
+    # Procesar ciudad y departamento
+    ventas = procesar_ciudad_departamento(ventas)
+    
+    return ventas, devoluciones
+
+
+def separar_hoja_siigo(df_completo):
+    """Separa una hoja SIIGO en ventas (columnas A-P, 0-15) y devoluciones (columnas R-AB, 17-27)"""
+    ventas = df_completo.iloc[:, 0:16].copy()
+    devoluciones = df_completo.iloc[:, 17:28].copy()
+    
+    # Limpiar columnas
+    ventas = limpiar_columnas(ventas)
+    devoluciones = limpiar_columnas(devoluciones)
+    
+    # Renombrar columnas duplicadas en devoluciones (quitar el .1)
+    devoluciones = devoluciones.rename(columns={
+        'VENDEDOR.1': 'VENDEDOR',
+        'NUMERO.1': 'NUMERO',
+        'PLATAFORMA.1': 'PLATAFORMA',
+        'MES.1': 'MES'
+    })
+    
+    # Limpiar valores #N/D sin eliminar filas
+    ventas = limpiar_valores_nd(ventas)
+    devoluciones = limpiar_valores_nd(devoluciones)
+    
+    # Limpiar filas vacías DESPUÉS de limpiar columnas
+    ventas = ventas.dropna(how='all')
+    ventas = ventas[ventas.iloc[:, 0].notna()].reset_index(drop=True)
+    
+    devoluciones = devoluciones.dropna(how='all')
+    devoluciones = devoluciones[devoluciones.iloc[:, 0].notna()].reset_index(drop=True)
+    
+    return ventas, devoluciones
+
+@instrumentar()
+def leer_hoja_siigo(url, hoja_nombre):
+    """Descarga una hoja SIIGO y la separa: (ventas, devoluciones, diagnóstico); None si falla"""
+    diagnostico = Diagnostico(hoja_nombre)
+    try:
+        df_completo = pd.read_csv(url_gviz_csv(id_libro(url), hoja_nombre))
+    except Exception as e:
+        diagnostico.error(f"Error al cargar datos: {e}")
+        return None, None, diagnostico
+    
+    ventas, devoluciones = separar_hoja_siigo(df_completo)
+    diagnostico.contar("filas leídas", len(df_completo))
+    diagnostico.contar("ventas", len(ventas))
+    diagnostico.contar("devoluciones", len(devoluciones))
+    return ventas, devoluciones, diagnostico
+
+@instrumentar()
+def ingerir_anio(raiz, url, año, abierto, completo=False):
+    """
+    Guarda en el almacén los meses pendientes de un año SIIGO.
+    
+    Un año cerrado ya guardado con la ``VERSION_PREPARACION`` actual no se
+    vuelve a descargar. Del año abierto solo se limpian y reescriben el
+    último mes guardado y los meses nuevos, o todo el año con ``completo``.
+    Devuelve (meses escritos, diagnóstico); los meses son None si la hoja no
+    se pudo cargar.
+    """
+    desde_mes = almacen_ventas.meses_pendientes(raiz, año, abierto, VERSION_PREPARACION, completo)
+    if desde_mes is None:
+        return [], Diagnostico(HOJAS_SIIGO[año])
+    
+    ventas, devoluciones, diagnostico = leer_hoja_siigo(url, HOJAS_SIIGO[año])
+    if ventas is None:
+        return None, diagnostico
+    
+    # Solo se preparan las filas de los meses que se van a reescribir
+    if desde_mes > 1 and 'FECHA' in ventas.columns:
+        mes_venta = pd.to_datetime(ventas['FECHA'], errors='coerce').dt.month
+        ventas = ventas[mes_venta.isna() | (mes_venta >= desde_mes)].reset_index(drop=True)
+    
+    ventas, devoluciones = preparar_datos_analisis(ventas, devoluciones)
+    
+    escritos = almacen_ventas.guardar_meses(raiz, "ventas", año, ventas, "MES_NUM", desde_mes)
+    almacen_ventas.guardar_meses(raiz, "devoluciones", año, devoluciones, "MES_NUM", desde_mes)
+    almacen_ventas.marcar_version(raiz, año, VERSION_PREPARACION)
+    if not abierto:
+        almacen_ventas.marcar_cerrado(raiz, año)
+    diagnostico.contar("meses escritos", len(escritos))
+    return escritos, diagnostico
+
+@instrumentar()
+def sincronizar_almacen(raiz, url=URL_SIIGO, completo=False):
+    """
+    Ingresa al almacén los años y meses SIIGO que falten: ({año: meses
+    escritos}, diagnóstico). Con ``completo`` el año abierto se vuelve a
+    ingerir entero (recoge correcciones en meses anteriores).
+    """
+    diagnostico = Diagnostico("almacén SIIGO")
+    año_abierto = max(HOJAS_SIIGO)
+    escritos = {}
+    for año in sorted(HOJAS_SIIGO):
+        abierto = año == año_abierto
+        escritos[año], diagnostico_año = ingerir_anio(raiz, url, año, abierto, completo and abierto)
+        diagnostico.agregar(diagnostico_año)
+    return escritos, diagnostico
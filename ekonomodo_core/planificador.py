@@ -0,0 +1,86 @@
+"""
+Precálculo en segundo plano con instantáneas compartidas.
+
+Un ``Planificador`` corre una función de pipeline (que devuelve
+``(datos, Diagnostico)``) en un hilo propio cada ``intervalo`` segundos y
+publica el resultado como una ``Instantanea`` inmutable. Las sesiones leen la
+última instantánea sin recalcular nada; mientras no haya ninguna (arranque
+del proceso) esperan a que termine el primer cálculo, que es el mismo para
+todas. Un refresco pedido a mano mientras otro está en curso espera ese en
+vez de lanzar un segundo cálculo.
+
+En un dashboard el planificador se crea dentro de una función con
+``st.cache_resource`` para que haya uno solo por proceso. El hilo no tiene
+contexto de Streamlit: la función que corre debe ser de
+``ekonomodo_core.pipelines`` (sin llamadas a ``st``). Los DataFrames de la
+instantánea son compartidos entre sesiones y no se deben modificar en sitio.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from ekonomodo_core.diagnostico import Diagnostico
+
+
+class Instantanea:
+    """Resultado publicado por el planificador; sus atributos no se pueden reasignar"""
+
+    __slots__ = ("datos", "diagnostico", "calculada", "segundos", "generacion")
+
+    def __init__(self, datos, diagnostico, calculada, segundos, generacion):
+        for nombre, valor in zip(self.__slots__, (datos, diagnostico, calculada, segundos, generacion)):
+            object.__setattr__(self, nombre, valor)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Instantanea es inmutable")
+
+    def __repr__(self):
+        return f"Instantanea(generacion={self.generacion}, calculada={self.calculada:%H:%M:%S}, segundos={self.segundos:.2f})"
+
+
+class Planificador:
+    """Recalcula ``calcular()`` cada ``intervalo`` segundos en un hilo y publica instantáneas"""
+
+    def __init__(self, nombre, calcular, intervalo):
+        self.nombre = nombre
+        self.intervalo = intervalo
+        self._calcular = calcular
+        self._instantanea = None
+        self._generacion = 0
+        self._calculando = threading.Lock()
+        self._publicada = threading.Event()
+        self._hilo = threading.Thread(target=self._ciclo, name=f"planificador-{nombre}", daemon=True)
+        self._hilo.start()
+
+    def _ciclo(self):
+        while True:
+            self.refrescar()
+            time.sleep(self.intervalo)
+
+    def refrescar(self):
+        """Calcula y publica una instantánea nueva; si ya hay un cálculo en curso, espera ese"""
+        generacion = self._generacion
+        with self._calculando:
+            if self._generacion != generacion:
+                return self._instantanea
+
+            inicio = time.perf_counter()
+            try:
+                datos, diagnostico = self._calcular()
+            except Exception as e:
+                # Se conserva lo último publicado; el error queda en el diagnóstico
+                datos = self._instantanea.datos if self._instantanea is not None else None
+                diagnostico = Diagnostico(self.nombre)
+                diagnostico.error(f"Error al recalcular {self.nombre}: {str(e)}")
+
+            self._instantanea = Instantanea(datos, diagnostico, datetime.now(),
+                                            time.perf_counter() - inicio, generacion + 1)
+            self._generacion = generacion + 1
+            self._publicada.set()
+            return self._instantanea
+
+    def actual(self, timeout=None):
+        """Última instantánea publicada; la primera vez espera a que termine el cálculo inicial"""
+        self._publicada.wait(timeout)
+        return self._instantanea
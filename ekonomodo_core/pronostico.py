@@ -0,0 +1,152 @@
+"""
+Proyección mensual de ventas netas para muchas series a la vez.
+
+``historia`` arma una matriz con una fila por serie (vendedor, plataforma,
+producto o el total) y una columna por mes (``Period``) de los años
+consecutivos que se le pasen: ventas menos devoluciones en valor absoluto,
+como en ``ekonomodo_core.kpis``.
+
+``proyectar`` ajusta a todas las filas el mismo modelo liviano con NumPy
+sobre la matriz completa, sin un ciclo por serie:
+
+- estacional ingenuo con tendencia: cada mes del año siguiente es el mismo
+  mes del último año por el factor de crecimiento de la serie (último año
+  frente al anterior en los meses que ambos tienen), acotado a
+  ``CRECIMIENTO_MINIMO``-``CRECIMIENTO_MAXIMO``; con un solo año el factor
+  es 1;
+- si el último año está incompleto (año abierto), los meses que faltan se
+  toman del año anterior por el mismo factor;
+- el intervalo sale de la dispersión de los errores estacionales
+  (``y[t] - y[t-12]``, con su media como tendencia) y ``Z_INTERVALO``; con
+  un solo año se usa la dispersión de los meses. El límite inferior no baja
+  de 0.
+"""
+
+from ekonomodo_core import perezoso
+from ekonomodo_core.instrumentacion import instrumentar
+from ekonomodo_core.kpis import dividir
+
+np = perezoso.modulo("numpy")
+pd = perezoso.modulo("pandas")
+
+MESES = range(1, 13)
+TEMPORADA = 12
+TOTAL = "TOTAL"
+
+# Factor de crecimiento anual admitido (evita proyectar x10 una serie que arrancó a mitad de año)
+CRECIMIENTO_MINIMO = 0.5
+CRECIMIENTO_MAXIMO = 2.0
+
+# Intervalo del 80 % bajo errores normales
+NIVEL_INTERVALO = 80
+Z_INTERVALO = 1.2816
+
+
+def _por_mes(df, por, columna, mes):
+    """Suma de ``columna`` por valor de ``por`` (filas) y mes 1-12 (columnas)"""
+    if por is None:
+        tabla = df.groupby(mes)[columna].sum().to_frame(TOTAL).T
+    else:
+        tabla = df.groupby([por, mes], observed=True)[columna].sum().unstack(mes)
+        tabla.index = tabla.index.astype(object)
+    return tabla.reindex(columns=MESES).fillna(0.0)
+
+
+def mensual(ventas, devoluciones=None, por=None, valor="VALOR NETO", valor_devolucion="VALOR", mes="MES_NUM"):
+    """
+    Ventas netas por mes (columnas 1-12) de cada valor de ``por`` (filas);
+    sin ``por``, una sola fila ``TOTAL``. Las devoluciones se restan si
+    traen la misma columna ``por`` (las que no cruzan con una venta se ignoran).
+    """
+    tabla = _por_mes(ventas, por, valor, mes)
+    if (devoluciones is not None and len(devoluciones) > 0
+            and {valor_devolucion, mes} <= set(devoluciones.columns)
+            and (por is None or por in devoluciones.columns)):
+        devuelto = _por_mes(devoluciones, por, valor_devolucion, mes).abs()
+        tabla = tabla - devuelto.reindex(tabla.index).fillna(0.0)
+    return tabla
+
+
+def historia(anios, por=None, **columnas):
+    """
+    Matriz de ventas netas mensuales: una fila por serie y una columna
+    ``Period`` por mes. ``anios`` es {año: (ventas, devoluciones)} de años
+    consecutivos; los años sin ventas se omiten.
+    """
+    partes = []
+    for anio, (ventas, devoluciones) in sorted(anios.items()):
+        if ventas is None or len(ventas) == 0:
+            continue
+        tabla = mensual(ventas, devoluciones, por, **columnas)
+        tabla.columns = pd.period_range(f"{anio}-01", periods=TEMPORADA, freq="M")
+        partes.append(tabla)
+    return pd.concat(partes, axis=1).fillna(0.0)
+
+
+def proyectar_matriz(y):
+    """
+    (pronóstico, sigma, crecimiento) de los 12 meses siguientes a la matriz
+    ``y`` (series x meses, años completos); pronóstico es series x 12.
+    """
+    y = np.asarray(y, dtype="float64")
+    n, t = y.shape
+    ultimo = y[:, -TEMPORADA:]
+    con_datos = np.flatnonzero(ultimo.any(axis=0))
+    # Meses ya cerrados del último año (el año abierto trae ceros al final)
+    k = con_datos[-1] + 1 if len(con_datos) else TEMPORADA
+
+    if t >= 2 * TEMPORADA:
+        anterior = y[:, -2 * TEMPORADA:-TEMPORADA]
+        crecimiento = dividir(ultimo[:, :k].sum(axis=1), anterior[:, :k].sum(axis=1))
+        crecimiento = np.where(anterior[:, :k].sum(axis=1) > 0, crecimiento, 1.0)
+        crecimiento = np.clip(crecimiento, CRECIMIENTO_MINIMO, CRECIMIENTO_MAXIMO)
+        base = np.concatenate([ultimo[:, :k], anterior[:, k:] * crecimiento[:, None]], axis=1)
+        errores = y[:, TEMPORADA:t - TEMPORADA + k] - y[:, :t - 2 * TEMPORADA + k]
+    else:
+        crecimiento = np.ones(n)
+        base = ultimo
+        errores = ultimo[:, :k]
+
+    # Un mes con más devoluciones que ventas no se proyecta negativo
+    pronostico = np.maximum(base * crecimiento[:, None], 0)
+    sigma = errores.std(axis=1, ddof=1) if errores.shape[1] > 1 else np.zeros(n)
+    return pronostico, sigma, crecimiento
+
+
+@instrumentar()
+def proyectar(historia, z=Z_INTERVALO):
+    """
+    Proyección de los 12 meses siguientes a ``historia`` para todas sus
+    series: (proyeccion, resumen).
+
+    - ``proyeccion``: una fila por serie y mes (índice de ``historia`` más
+      PERIODO) con PRONOSTICO, INFERIOR y SUPERIOR.
+    - ``resumen``: una fila por serie con ULTIMO_AÑO (lo vendido), PROYECCION,
+      INFERIOR y SUPERIOR del año y CRECIMIENTO_% (el factor aplicado, que
+      compara contra el último año completo aunque esté abierto).
+    """
+    pronostico, sigma, crecimiento = proyectar_matriz(historia.to_numpy())
+    margen = z * sigma
+    periodos = pd.period_range(historia.columns[-1] + 1, periods=TEMPORADA, freq="M")
+
+    indice = historia.index.repeat(TEMPORADA)
+    niveles = ([indice.get_level_values(nivel) for nivel in range(indice.nlevels)]
+               + [periodos.take(np.tile(np.arange(TEMPORADA), len(historia)))])
+    proyeccion = pd.DataFrame({
+        "PRONOSTICO": pronostico.ravel(),
+        "INFERIOR": np.maximum(pronostico - margen[:, None], 0).ravel(),
+        "SUPERIOR": (pronostico + margen[:, None]).ravel(),
+    }, index=pd.MultiIndex.from_arrays(niveles, names=[*historia.index.names, "PERIODO"]))
+
+    ultimo_anio = historia.iloc[:, -TEMPORADA:].to_numpy().sum(axis=1)
+    total = pronostico.sum(axis=1)
+    # Errores mensuales independientes: el margen del año crece con la raíz de los meses
+    margen_anual = margen * np.sqrt(TEMPORADA)
+    resumen = pd.DataFrame({
+        "ULTIMO_AÑO": ultimo_anio,
+        "PROYECCION": total,
+        "INFERIOR": np.maximum(total - margen_anual, 0),
+        "SUPERIOR": total + margen_anual,
+        "CRECIMIENTO_%": (crecimiento - 1) * 100,
+    }, index=historia.index)
+    return proyeccion, resumen
@@ -0,0 +1,80 @@
+"""
+Reducción de series largas para gráficos (Largest-Triangle-Three-Buckets).
+
+Un gráfico de líneas no muestra más puntos que píxeles tiene, así que
+mandar 365+ días por trazo al navegador solo lo vuelve lento. ``lttb``
+parte la serie en tantos tramos como puntos se quieren y de cada uno
+conserva el punto que forma el triángulo más grande con el anterior
+elegido y el promedio del tramo siguiente: se mantienen los picos y
+valles que dan la forma de la curva.
+
+``reducir_serie`` devuelve esos puntos con el tramo que representa cada
+uno (desde, hasta, cuántos puntos y su total exacto), para que el
+tooltip muestre la suma real aunque no se dibujen todos los puntos.
+"""
+
+from ekonomodo_core import perezoso
+
+np = perezoso.modulo("numpy")
+pd = perezoso.modulo("pandas")
+
+COLUMNAS_TRAMO = ["total_tramo", "desde", "hasta", "puntos_tramo"]
+
+
+def _coordenadas(x):
+    """Eje x como números: fechas en nanosegundos, lo que no se pueda por posición"""
+    x = pd.Series(x).reset_index(drop=True)
+    if pd.api.types.is_numeric_dtype(x):
+        return x.to_numpy(dtype=float)
+    try:
+        return pd.to_datetime(x).to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+    except (ValueError, TypeError):
+        return np.arange(len(x), dtype=float)
+
+
+def lttb(x, y, puntos):
+    """Posiciones de los ``puntos`` que LTTB conserva de la serie (ordenada por x)"""
+    n = len(y)
+    if puntos >= n or puntos < 3:
+        return np.arange(n)
+    x = _coordenadas(x)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+
+    # Primer y último punto fijos; los demás, uno por tramo
+    cortes = (np.arange(puntos - 1) * (n - 2) / (puntos - 2)).astype(np.int64) + 1
+    cortes[-1] = n - 1
+    elegidos = np.empty(puntos, dtype=np.int64)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    anterior = 0
+    for tramo in range(puntos - 2):
+        inicio, fin = cortes[tramo], cortes[tramo + 1]
+        siguiente = slice(fin, cortes[tramo + 2]) if tramo + 2 < len(cortes) else slice(n - 1, n)
+        x_c, y_c = x[siguiente].mean(), y[siguiente].mean()
+        x_a, y_a = x[anterior], y[anterior]
+        areas = np.abs((x_a - x_c) * (y[inicio:fin] - y_a) - (x_a - x[inicio:fin]) * (y_c - y_a))
+        anterior = inicio + int(areas.argmax())
+        elegidos[tramo + 1] = anterior
+    return elegidos
+
+
+def reducir_serie(df, x, y, puntos):
+    """
+    Filas de ``df`` (ordenado por ``x``) que LTTB conserva para la columna
+    ``y``, más ``COLUMNAS_TRAMO``: cada punto representa las filas hasta la
+    mitad del camino a sus vecinos elegidos, y ``total_tramo`` es la suma
+    exacta de ``y`` en ellas (los totales suman lo mismo que la serie).
+    """
+    df = df.sort_values(x, kind="stable").reset_index(drop=True)
+    if df.empty:
+        return df.assign(**{columna: [] for columna in COLUMNAS_TRAMO})
+    elegidos = lttb(df[x], df[y], puntos)
+    inicios = np.concatenate([[0], (elegidos[:-1] + elegidos[1:] + 1) // 2])
+    finales = np.append(inicios[1:], len(df)) - 1
+
+    reducido = df.iloc[elegidos].reset_index(drop=True)
+    valores = df[y].fillna(0).to_numpy(dtype=float)
+    reducido["total_tramo"] = np.add.reduceat(valores, inicios)
+    reducido["desde"] = df[x].iloc[inicios].to_numpy()
+    reducido["hasta"] = df[x].iloc[finales].to_numpy()
+    reducido["puntos_tramo"] = finales - inicios + 1
+    return reducido
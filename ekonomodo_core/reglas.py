@@ -0,0 +1,124 @@
+"""
+Motor de reglas de alerta declaradas como datos.
+
+Cada alerta es una ``Regla``: nombre, severidad, mensajes, columnas a mostrar
+y una lista de condiciones ``(columna, operador, valor)`` que se combinan con
+Y. ``evaluar_reglas`` compila todas las reglas en máscaras booleanas
+vectorizadas sobre el mismo frame y devuelve, por regla, las posiciones de
+las filas que la cumplen. Agregar una alerta es agregar una ``Regla`` a la
+lista; no hay que escribir otro filtro ni otro bloque en el dashboard.
+
+Operadores: ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``, ``en``, ``no_en``,
+``contiene`` (texto, sin distinguir mayúsculas), ``vacio`` y ``no_vacio``
+(vacío es nulo, ``''`` o ``'NAN'``, lo que deja ``astype(str).str.upper()``
+de un nulo). Un valor ``"$nombre"`` se toma de
+los ``parametros`` de la evaluación (por ejemplo la fecha actual).
+
+Para que la evaluación sea de una pasada:
+
+- cada condición distinta se evalúa una sola vez aunque la usen varias reglas;
+- en columnas categóricas (``tipar``) la condición se evalúa sobre las
+  categorías, que son pocas, y se expande a las filas con los códigos, así
+  que el trabajo de texto no crece con el número de filas.
+"""
+
+from ekonomodo_core import perezoso
+
+np = perezoso.modulo("numpy")
+pd = perezoso.modulo("pandas")
+
+SEVERIDADES = ("info", "advertencia", "error")
+VACIOS = ("", "NAN")
+
+
+class Regla:
+    """Una alerta: qué filas la cumplen y cómo se muestra"""
+
+    def __init__(self, nombre, severidad, condiciones, columnas, mensaje, mensaje_ok, semaforo=None):
+        if severidad not in SEVERIDADES:
+            raise ValueError(f"severidad debe ser una de {SEVERIDADES}: {severidad!r}")
+        self.nombre = nombre
+        self.severidad = severidad
+        self.condiciones = tuple(tuple(condicion) for condicion in condiciones)
+        # Columnas de la tabla de detalle, en orden
+        self.columnas = list(columnas)
+        # Texto con {n} para el número de filas, y el texto cuando no hay ninguna
+        self.mensaje = mensaje
+        self.mensaje_ok = mensaje_ok
+        # (columna, cortes, etiquetas) para una columna NIVEL de semáforo, opcional
+        self.semaforo = semaforo
+
+    def __repr__(self):
+        return f"Regla({self.nombre!r}, {self.severidad!r}, condiciones={len(self.condiciones)})"
+
+
+def tipar(df, categoricas):
+    """Copia superficial del frame con ``categoricas`` como columnas category"""
+    df = df.copy(deep=False)
+    for columna in categoricas:
+        df[columna] = df[columna].astype("category")
+    return df
+
+
+def _comparar(serie, operador, valor):
+    """Máscara booleana (numpy) de una condición sobre una serie"""
+    if operador == "vacio":
+        return (serie.isna() | serie.isin(VACIOS)).to_numpy()
+    if operador == "no_vacio":
+        return ~(serie.isna() | serie.isin(VACIOS)).to_numpy()
+    if operador == "en":
+        return serie.isin(valor).to_numpy()
+    if operador == "no_en":
+        return ~serie.isin(valor).to_numpy()
+    if operador == "contiene":
+        return serie.astype(str).str.contains(str(valor), case=False, regex=False).to_numpy() & serie.notna().to_numpy()
+    comparaciones = {
+        "==": serie.__eq__, "!=": serie.__ne__, "<": serie.__lt__,
+        "<=": serie.__le__, ">": serie.__gt__, ">=": serie.__ge__,
+    }
+    if operador not in comparaciones:
+        raise ValueError(f"Operador desconocido: {operador!r}")
+    # Con tipos que admiten NA (Int64, boolean) la comparación con un nulo es NA: no cumple
+    return comparaciones[operador](valor).to_numpy(dtype=bool, na_value=False)
+
+
+def _evaluar_condicion(columna, operador, valor):
+    """Máscara de una condición; en categóricas se evalúa por categoría y se expande con los códigos"""
+    if isinstance(columna.dtype, pd.CategoricalDtype):
+        # La última posición representa el nulo (código -1)
+        categorias = pd.Series(list(columna.cat.categories) + [np.nan], dtype=object)
+        por_categoria = _comparar(categorias, operador, valor)
+        return por_categoria[columna.cat.codes.to_numpy()]
+    return _comparar(columna, operador, valor)
+
+
+def filtrar(df, condiciones):
+    """Posiciones de las filas que cumplen todas las ``condiciones`` (columna, operador, valor)"""
+    mascara = np.ones(len(df), dtype=bool)
+    for columna, operador, *valor in condiciones:
+        mascara &= _evaluar_condicion(df[columna], operador, valor[0] if valor else None)
+    return np.flatnonzero(mascara)
+
+
+def evaluar_reglas(df, reglas, parametros=None):
+    """
+    Posiciones (``np.ndarray`` para ``iloc``) de las filas que cumplen cada
+    regla: {nombre: posiciones}. El conteo de una regla es ``len`` de sus
+    posiciones.
+    """
+    parametros = parametros or {}
+    mascaras = {}
+    filas = {}
+    for regla in reglas:
+        mascara = np.ones(len(df), dtype=bool)
+        for columna, operador, *valor in regla.condiciones:
+            valor = valor[0] if valor else None
+            if isinstance(valor, str) and valor.startswith("$"):
+                valor = parametros[valor[1:]]
+            # Las listas no son hashables; la clave usa su versión en tupla
+            clave = (columna, operador, tuple(valor) if isinstance(valor, list) else valor)
+            if clave not in mascaras:
+                mascaras[clave] = _evaluar_condicion(df[columna], operador, valor)
+            mascara &= mascaras[clave]
+        filas[regla.nombre] = np.flatnonzero(mascara)
+    return filas
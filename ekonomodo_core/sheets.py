@@ -0,0 +1,44 @@
+"""
+URLs de exportación de Google Sheets.
+
+Los dashboards arman las URLs de descarga con estas funciones en lugar de
+escribir ``docs.google.com`` a mano. La variable de entorno
+``EKONOMODO_SHEETS_BASE`` cambia el servidor (por ejemplo al servidor local de
+``benchmarks/servidor_sheets.py``) sin tocar los dashboards.
+"""
+
+import os
+from urllib.parse import quote
+
+BASE_POR_DEFECTO = "https://docs.google.com"
+VARIABLE_BASE = "EKONOMODO_SHEETS_BASE"
+
+
+def base_sheets():
+    """Servidor de Google Sheets (o su reemplazo local)"""
+    return os.environ.get(VARIABLE_BASE, BASE_POR_DEFECTO).rstrip("/")
+
+
+def id_libro(url):
+    """ID del libro a partir de su URL de edición"""
+    return url.split("/d/")[1].split("/")[0]
+
+
+def url_csv(sheet_id, gid=None, hoja=None):
+    """Exportación CSV de una hoja, por ``gid`` o por nombre de ``hoja``"""
+    url = f"{base_sheets()}/spreadsheets/d/{sheet_id}/export?format=csv"
+    if gid is not None:
+        url += f"&gid={gid}"
+    if hoja is not None:
+        url += f"&sheet={quote(hoja)}"
+    return url
+
+
+def url_gviz_csv(sheet_id, hoja):
+    """Consulta gviz que devuelve una hoja completa como CSV"""
+    return f"{base_sheets()}/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={quote(hoja)}"
+
+
+def url_xlsx(sheet_id):
+    """Exportación del libro completo como xlsx"""
+    return f"{base_sheets()}/spreadsheets/d/{sheet_id}/export?format=xlsx"
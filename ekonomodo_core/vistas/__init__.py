@@ -0,0 +1,11 @@
+"""Helpers de renderizado en Streamlit compartidos por los dashboards."""
+
+from ekonomodo_core.vistas.alertas import mostrar_alertas
+from ekonomodo_core.vistas.descargas import boton_descarga
+from ekonomodo_core.vistas.diagnostico import mostrar_diagnostico
+from ekonomodo_core.vistas.graficos import figura_series
+from ekonomodo_core.vistas.grilla import mostrar_grilla
+from ekonomodo_core.vistas.rendimiento import iniciar_rendimiento, mostrar_rendimiento
+from ekonomodo_core.vistas.tablas import configurar_columnas, mostrar_tabla, semaforo
+
+__all__ = ["boton_descarga", "configurar_columnas", "figura_series", "iniciar_rendimiento", "mostrar_alertas", "mostrar_diagnostico", "mostrar_grilla", "mostrar_rendimiento", "mostrar_tabla", "semaforo"]
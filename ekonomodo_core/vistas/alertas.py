@@ -0,0 +1,36 @@
+"""Muestra en Streamlit las alertas evaluadas con ``ekonomodo_core.reglas``."""
+
+import streamlit as st
+
+from ekonomodo_core.vistas.tablas import mostrar_tabla, semaforo
+
+
+def mostrar_alertas(reglas, alertas, por_fila=3):
+    """
+    Una tarjeta por regla, ``por_fila`` por fila: el mensaje con el número de
+    filas (st.error / st.warning / st.info según la severidad) y un expander
+    con la tabla de detalle, o el mensaje de todo en orden si no hay filas.
+
+    ``alertas`` es {nombre: DataFrame}; el frame no se modifica (puede venir
+    de una instantánea compartida).
+    """
+    for inicio in range(0, len(reglas), por_fila):
+        columnas = st.columns(por_fila)
+        for regla, columna in zip(reglas[inicio:inicio + por_fila], columnas):
+            filas = alertas[regla.nombre]
+            with columna:
+                if len(filas) == 0:
+                    st.success(regla.mensaje_ok)
+                    continue
+
+                escribir = {"info": st.info, "advertencia": st.warning, "error": st.error}[regla.severidad]
+                escribir(regla.mensaje.format(n=len(filas)))
+                with st.expander("Ver detalles"):
+                    detalle = filas[regla.columnas]
+                    column_config = None
+                    if regla.semaforo is not None:
+                        columna_nivel, cortes, etiquetas = regla.semaforo
+                        detalle = detalle.assign(NIVEL=semaforo(detalle[columna_nivel], cortes, etiquetas))
+                        detalle = detalle[['NIVEL'] + regla.columnas]
+                        column_config = {'NIVEL': st.column_config.Column(width='small')}
+                    mostrar_tabla(detalle, column_config=column_config, clave=regla.nombre)
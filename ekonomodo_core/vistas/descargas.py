@@ -0,0 +1,43 @@
+"""Botones de descarga que generan el archivo solo cuando alguien hace clic."""
+
+import streamlit as st
+
+from ekonomodo_core.exportar import FORMATOS, exportar, ultima
+
+
+def boton_descarga(datos, nombre, etiqueta="📥 Descargar", formatos=("csv",), clave=None,
+                   codificacion="utf-8", hoja="Datos"):
+    """
+    Un ``st.download_button`` por formato (csv, xlsx, parquet) que no
+    serializa nada en el rerun: ``data`` es una función que Streamlit llama
+    al hacer clic, y recién ahí se arma el archivo. ``datos`` es el
+    DataFrame o una función sin argumentos que lo devuelve, para diferir
+    también la selección de columnas o los cruces. ``nombre`` es el
+    archivo sin extensión. El clic no vuelve a correr el script.
+
+    Debajo de cada botón queda el tamaño y el tiempo de la última
+    descarga con la misma ``clave`` (por defecto, la etiqueta).
+    """
+    clave = clave or etiqueta
+    opciones = {"csv": {"codificacion": codificacion}, "xlsx": {"hoja": hoja}, "parquet": {}}
+    columnas = st.columns(len(formatos)) if len(formatos) > 1 else [st.container()]
+    for formato, columna in zip(formatos, columnas):
+        clave_formato = f"{clave}.{formato}"
+
+        def generar(formato=formato, clave_formato=clave_formato):
+            df = datos() if callable(datos) else datos
+            return exportar(df, formato, clave=clave_formato, **opciones[formato])
+
+        with columna:
+            st.download_button(
+                label=etiqueta if len(formatos) == 1 else f"{etiqueta} ({formato.upper()})",
+                data=generar,
+                file_name=f"{nombre}.{formato}",
+                mime=FORMATOS[formato],
+                key=f"descarga_{clave_formato}",
+                on_click="ignore",
+            )
+            anterior = ultima(clave_formato)
+            if anterior is not None:
+                st.caption(f"Última descarga: {anterior.bytes / 1e6:.2f} MB, {anterior.filas:,} filas, "
+                           f"generada en {anterior.segundos:.2f} s")
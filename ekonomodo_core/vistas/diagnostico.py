@@ -0,0 +1,17 @@
+"""Muestra en Streamlit los mensajes de un ``Diagnostico`` de pipeline."""
+
+import streamlit as st
+
+
+def mostrar_diagnostico(diagnostico, contenedor=None, niveles=("info", "advertencia", "error")):
+    """
+    Escribe los mensajes del diagnóstico con st.info / st.warning / st.error.
+
+    ``contenedor`` permite mandarlos a la barra lateral o a un expander
+    (por defecto, el cuerpo de la página); ``niveles`` filtra cuáles mostrar.
+    """
+    contenedor = contenedor or st
+    escribir = {"info": contenedor.info, "advertencia": contenedor.warning, "error": contenedor.error}
+    for nivel, texto in diagnostico.mensajes:
+        if nivel in niveles:
+            escribir[nivel](texto)
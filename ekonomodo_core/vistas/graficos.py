@@ -0,0 +1,167 @@
+"""
+Gráficos de series diarias que no mandan al navegador más puntos de los que
+caben, y cache de figuras construidas a partir de agregados.
+
+``figura_series`` arma un gráfico de líneas (un trazo por columna o por
+grupo, como ``px.line``) y reduce cada trazo con LTTB a unos
+``ancho / PIXELES_POR_PUNTO`` puntos (``ekonomodo_core.reduccion``). Los
+puntos que quedan llevan en el tooltip el total exacto del tramo que
+representan. Si aun así el gráfico pasa de ``UMBRAL_WEBGL`` puntos, los
+trazos se dibujan con WebGL (``Scattergl``).
+
+``figura`` construye una figura de Plotly Express (o cualquier función que
+devuelva una figura) sobre un agregado chico y la guarda en un registro del
+proceso, con la huella del agregado (``pd.util.hash_pandas_object``) y de la
+especificación como clave. En el rerun siguiente, si el agregado no cambió,
+devuelve la misma figura sin volver a armarla: construirla con ``px`` es lo
+caro (decenas de ms, más en treemaps); ``st.plotly_chart`` igual la
+serializa en cada rerun, pero eso toma un par de ms. Los ajustes posteriores
+(``update_traces``, ``update_layout``) van como ``trazos`` y ``diseno`` para
+que entren en la clave. La figura devuelta se comparte entre sesiones: no
+se modifica. Cada acierto o fallo se suma a los contadores de la corrida
+activa (panel de rendimiento) y a los totales de ``estado_figuras``.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from ekonomodo_core import instrumentacion, perezoso
+from ekonomodo_core.reduccion import reducir_serie
+
+go = perezoso.modulo("plotly.graph_objects")
+np = perezoso.modulo("numpy")
+pd = perezoso.modulo("pandas")
+
+# Ancho aproximado (px) de un gráfico a todo el ancho con layout="wide"
+ANCHO_COMPLETO = 1200
+PIXELES_POR_PUNTO = 4
+UMBRAL_WEBGL = 1000
+
+MAX_FIGURAS = 256
+CONTADOR_ACIERTOS = "figuras desde cache"
+CONTADOR_FALLOS = "figuras construidas"
+
+_figuras = OrderedDict()
+_estado = {"aciertos": 0, "fallos": 0}
+_candado = threading.Lock()
+
+
+def puntos_para(ancho):
+    """Puntos por trazo para un gráfico de ``ancho`` píxeles"""
+    return max(int(ancho) // PIXELES_POR_PUNTO, 3)
+
+
+def _trazos(df, x, y, color, nombres):
+    """[(nombre, columna_y, filas)] de cada trazo"""
+    columnas = [y] if isinstance(y, str) else list(y)
+    if color is not None:
+        return [(str(grupo), columnas[0], filas) for grupo, filas in df.groupby(color, sort=False)]
+    return [(nombres.get(columna, columna), columna, df) for columna in columnas]
+
+
+def figura_series(df, x, y, color=None, nombres=None, colores=None, titulo=None,
+                  ancho=ANCHO_COMPLETO, marcadores=True, formato_y=",.0f"):
+    """
+    Figura de líneas con ``x`` en el eje horizontal y una o varias columnas
+    ``y`` (o una columna partida por ``color``), con cada trazo reducido
+    para ``ancho`` píxeles. ``nombres`` renombra columnas en la leyenda y
+    ``colores`` fija el color de cada trazo en orden.
+    """
+    puntos = puntos_para(ancho)
+    trazos = [(nombre, columna, reducir_serie(filas[[x, columna]], x, columna, puntos))
+              for nombre, columna, filas in _trazos(df, x, y, color, nombres or {})]
+    Trazo = go.Scattergl if sum(len(reducido) for _, _, reducido in trazos) > UMBRAL_WEBGL else go.Scatter
+
+    figura = go.Figure()
+    for numero, (nombre, columna, reducido) in enumerate(trazos):
+        opciones = {}
+        if colores:
+            opciones["line"] = dict(color=colores[numero % len(colores)])
+        if (reducido["puntos_tramo"] > 1).any():
+            # Con puntos omitidos, el tooltip muestra el total real del tramo
+            # (numérico para que viaje como arreglo binario y no como texto)
+            opciones["customdata"] = reducido[["total_tramo", "puntos_tramo"]].to_numpy(dtype=float)
+            opciones["hovertemplate"] = (
+                f"%{{x}}: %{{y:{formato_y}}}<br>"
+                f"Total del tramo (%{{customdata[1]}} fechas): %{{customdata[0]:{formato_y}}}"
+            )
+        figura.add_trace(Trazo(
+            x=reducido[x], y=reducido[columna], name=nombre,
+            mode="lines+markers" if marcadores else "lines", **opciones,
+        ))
+
+    un_y = isinstance(y, str)
+    figura.update_layout(
+        title=titulo, xaxis_title=x, yaxis_title=y if un_y else None,
+        showlegend=len(trazos) > 1, legend_title_text=color,
+    )
+    return figura
+
+
+def _huella_datos(valor):
+    """Huella de un DataFrame, Series, Index o arreglo: valores, índice, nombres y tipos"""
+    if isinstance(valor, np.ndarray):
+        valor = pd.Series(valor.ravel())
+    elif isinstance(valor, pd.Index):
+        valor = valor.to_series(index=None)
+    columnas = list(valor.columns) if isinstance(valor, pd.DataFrame) else [valor.name]
+    tipos = list(valor.dtypes) if isinstance(valor, pd.DataFrame) else [valor.dtype]
+    huella = hashlib.blake2b(pd.util.hash_pandas_object(valor, index=True).to_numpy().tobytes(), digest_size=16)
+    huella.update(repr((valor.shape, columnas, [str(tipo) for tipo in tipos])).encode())
+    return huella.hexdigest()
+
+
+def _normalizar(valor):
+    """Versión comparable de una especificación (datos por huella, objetos por sus atributos)"""
+    if valor is None or isinstance(valor, (str, int, float, bool)):
+        return valor
+    if isinstance(valor, (pd.DataFrame, pd.Series, pd.Index, np.ndarray)):
+        return ("datos", _huella_datos(valor))
+    if isinstance(valor, dict):
+        return tuple((clave, _normalizar(v)) for clave, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return tuple(_normalizar(v) for v in valor)
+    if callable(valor):
+        return (getattr(valor, "__module__", None), getattr(valor, "__qualname__", repr(valor)))
+    if hasattr(valor, "__dict__"):
+        # Por ejemplo px.Constant: su repr trae la dirección en memoria
+        return (type(valor).__qualname__, _normalizar(vars(valor)))
+    return repr(valor)
+
+
+def figura(constructor, datos=None, trazos=None, diseno=None, **opciones):
+    """
+    ``constructor(datos, **opciones)`` (``px.bar``, ``px.pie``, ``px.treemap``...)
+    con ``update_traces(**trazos)`` y ``update_layout(**diseno)``, reutilizando
+    la figura ya construida con los mismos datos y la misma especificación.
+    La figura se comparte: no modificarla.
+    """
+    clave = repr(_normalizar((constructor, datos, opciones, trazos, diseno)))
+    with _candado:
+        existente = _figuras.get(clave)
+        if existente is not None:
+            _figuras.move_to_end(clave)
+            _estado["aciertos"] += 1
+    if existente is not None:
+        instrumentacion.contar(CONTADOR_ACIERTOS)
+        return existente
+
+    nueva = constructor(**opciones) if datos is None else constructor(datos, **opciones)
+    if trazos:
+        nueva.update_traces(**trazos)
+    if diseno:
+        nueva.update_layout(**diseno)
+    with _candado:
+        _figuras[clave] = nueva
+        _estado["fallos"] += 1
+        while len(_figuras) > MAX_FIGURAS:
+            _figuras.popitem(last=False)
+    instrumentacion.contar(CONTADOR_FALLOS)
+    return nueva
+
+
+def estado_figuras():
+    """Figuras guardadas y aciertos/fallos acumulados del cache en este proceso"""
+    with _candado:
+        return {"figuras": len(_figuras), **_estado}
@@ -0,0 +1,143 @@
+"""
+Grilla de detalle con paginación, filtro y orden del lado del servidor.
+
+``mostrar_grilla`` deja el frame en el servidor y manda al navegador solo
+la página visible (``st.dataframe`` la serializa en Arrow). Filtro y orden
+trabajan sobre posiciones de filas:
+
+- el filtro arma condiciones ``(columna, operador, valor)`` según el tipo
+  de cada columna y las evalúa con ``ekonomodo_core.reglas.filtrar`` (en
+  columnas category, por categoría);
+- el orden ordena solo la columna elegida de las filas filtradas.
+
+Ni el frame filtrado ni el ordenado se arman completos: el conteo sale del
+número de posiciones y ``iloc`` materializa solo la página.
+"""
+
+import streamlit as st
+
+from ekonomodo_core import perezoso
+from ekonomodo_core.reglas import filtrar
+
+np = perezoso.modulo("numpy")
+pd = perezoso.modulo("pandas")
+
+FILAS_POR_PAGINA = 100
+# Hasta cuántos valores distintos el filtro de texto es una lista de opciones
+MAX_OPCIONES = 30
+SIN_ORDEN = "(orden original)"
+
+
+def _filtro_numerico(serie, columna, clave):
+    valores = serie.dropna()
+    if valores.empty or valores.min() == valores.max():
+        return []
+    minimo, maximo = float(valores.min()), float(valores.max())
+    desde, hasta = st.slider(str(columna), minimo, maximo, (minimo, maximo), key=clave)
+    condiciones = []
+    if desde > minimo:
+        condiciones.append((columna, ">=", desde))
+    if hasta < maximo:
+        condiciones.append((columna, "<=", hasta))
+    return condiciones
+
+
+def _filtro_fecha(serie, columna, clave):
+    valores = serie.dropna()
+    if valores.empty:
+        return []
+    minimo, maximo = valores.min().date(), valores.max().date()
+    rango = st.date_input(str(columna), (minimo, maximo), min_value=minimo, max_value=maximo, key=clave)
+    # Mientras se elige el segundo extremo el rango tiene una sola fecha
+    if len(rango) != 2:
+        return []
+    desde, hasta = rango
+    zona = serie.dt.tz
+    condiciones = []
+    if desde > minimo:
+        condiciones.append((columna, ">=", pd.Timestamp(desde, tz=zona)))
+    if hasta < maximo:
+        condiciones.append((columna, "<", pd.Timestamp(hasta, tz=zona) + pd.Timedelta(days=1)))
+    return condiciones
+
+
+def _filtro_texto(serie, columna, clave):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        opciones = list(serie.cat.categories)
+    else:
+        opciones = list(serie.dropna().unique())
+    if len(opciones) <= MAX_OPCIONES:
+        seleccion = st.multiselect(str(columna), sorted(opciones, key=str), key=clave)
+        return [(columna, "en", seleccion)] if seleccion else []
+    texto = st.text_input(str(columna), key=clave, placeholder="contiene…").strip()
+    return [(columna, "contiene", texto)] if texto else []
+
+
+def _filtro_columna(serie, columna, clave):
+    """Widget de filtro según el tipo de la columna y las condiciones que resultan"""
+    if pd.api.types.is_bool_dtype(serie):
+        eleccion = st.selectbox(str(columna), ["Todos", "Sí", "No"], key=clave)
+        return [] if eleccion == "Todos" else [(columna, "==", eleccion == "Sí")]
+    if pd.api.types.is_numeric_dtype(serie):
+        return _filtro_numerico(serie, columna, clave)
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return _filtro_fecha(serie, columna, clave)
+    return _filtro_texto(serie, columna, clave)
+
+
+def _ordenar(df, posiciones, columna, descendente):
+    """Posiciones reordenadas por una columna (estable, nulos al final)"""
+    valores = df[columna].iloc[posiciones].reset_index(drop=True)
+    try:
+        orden = valores.sort_values(ascending=not descendente, kind="stable", na_position="last")
+    except TypeError:
+        # Columnas object con tipos mezclados: se ordenan como texto
+        orden = valores.astype(str).sort_values(ascending=not descendente, kind="stable")
+    return posiciones[orden.index.to_numpy()]
+
+
+def mostrar_grilla(df, clave, column_config=None, filtrables=None, filas_por_pagina=FILAS_POR_PAGINA, **kwargs):
+    """
+    Muestra ``df`` de a una página con controles de filtro (por columna,
+    según su tipo), orden y página. ``filtrables`` limita las columnas con
+    filtro (por defecto todas); ``clave`` identifica los controles cuando
+    hay varias grillas en la vista. El resto de argumentos va a
+    ``st.dataframe``.
+    """
+    if "use_container_width" not in kwargs:
+        kwargs.setdefault("width", "stretch")
+    kwargs.setdefault("hide_index", True)
+    filtrables = list(df.columns) if filtrables is None else [col for col in filtrables if col in df.columns]
+
+    col_filtro, col_orden, col_sentido, col_pagina = st.columns([1, 2, 1, 1], vertical_alignment="bottom")
+    condiciones = []
+    with col_filtro:
+        with st.popover("🔎 Filtrar", use_container_width=True):
+            for columna in filtrables:
+                condiciones += _filtro_columna(df[columna], columna, f"{clave}_filtro_{columna}")
+    with col_orden:
+        orden = st.selectbox("Ordenar por", [SIN_ORDEN] + list(df.columns), key=f"{clave}_orden")
+    with col_sentido:
+        descendente = st.toggle("Descendente", key=f"{clave}_descendente")
+
+    posiciones = filtrar(df, condiciones) if condiciones else np.arange(len(df))
+    if orden != SIN_ORDEN:
+        posiciones = _ordenar(df, posiciones, orden, descendente)
+
+    total = len(posiciones)
+    paginas = max((total + filas_por_pagina - 1) // filas_por_pagina, 1)
+    clave_pagina = f"{clave}_pagina"
+    # Si el filtro dejó menos páginas, la página guardada se lleva a la última
+    if st.session_state.get(clave_pagina, 1) > paginas:
+        st.session_state[clave_pagina] = paginas
+    with col_pagina:
+        pagina = st.number_input(f"Página (de {paginas:,})", min_value=1, max_value=paginas, step=1, key=clave_pagina)
+
+    inicio = (int(pagina) - 1) * filas_por_pagina
+    fin = min(inicio + filas_por_pagina, total)
+    sin_filtrar = f" ({len(df):,} sin filtrar)" if condiciones else ""
+    if total:
+        st.caption(f"Filas {inicio + 1:,}–{fin:,} de {total:,}{sin_filtrar}")
+    else:
+        st.caption(f"Ninguna fila cumple los filtros{sin_filtrar}")
+    return st.dataframe(df.iloc[posiciones[inicio:fin]], column_config=column_config, **kwargs)
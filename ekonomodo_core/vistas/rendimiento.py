@@ -0,0 +1,116 @@
+"""
+Panel "⏱ Performance" en la barra lateral.
+
+``iniciar_rendimiento`` va al principio del script: muestra el interruptor y,
+si está encendido, activa una ``Corrida`` de ``ekonomodo_core.instrumentacion``.
+``mostrar_rendimiento`` va al final: muestra lo que midieron las etapas
+instrumentadas y opcionalmente lo agrega al log JSONL. Apagado, el panel no
+mide nada. Midiendo memoria, muestra además el reporte de compactación de
+tipos (``ekonomodo_core.compacto``) de cada fuente cargada. Si la ejecución
+usó el cache de figuras (``ekonomodo_core.vistas.graficos.figura``), muestra
+cuántas salieron del cache y cuántas se construyeron.
+"""
+
+import streamlit as st
+
+from ekonomodo_core import compacto, instrumentacion
+from ekonomodo_core.vistas import graficos
+from ekonomodo_core.vistas.tablas import configurar_columnas
+
+
+def iniciar_rendimiento(dashboard):
+    """Interruptor del panel; devuelve la corrida activa o None si está apagado"""
+    # Una corrida que quedó abierta (por ejemplo tras un st.stop) no se mezcla con esta
+    instrumentacion.desactivar()
+
+    activo = st.sidebar.toggle("⏱ Performance", key="rendimiento_activo",
+                               help="Mide tiempo, filas y memoria de cada etapa de esta ejecución")
+    if not activo:
+        return None
+
+    memoria = st.sidebar.checkbox("Medir memoria (más lento)", key="rendimiento_memoria",
+                                  help="Usa tracemalloc; la ejecución puede tardar el doble")
+    return instrumentacion.activar(instrumentacion.Corrida(dashboard, memoria=memoria))
+
+
+def _mostrar_compactacion():
+    """Bytes antes y después de compactar cada fuente, y el detalle por columna de una"""
+    reportes = compacto.reportes()
+    if not reportes:
+        st.caption("Ninguna fuente se cargó con la medición de memoria activa")
+        return
+    st.markdown("**Memoria de las fuentes cargadas**")
+    st.dataframe(
+        [{"fuente": fuente,
+          "antes_mb": reporte["bytes_antes"].sum() / 1e6,
+          "despues_mb": reporte["bytes_despues"].sum() / 1e6}
+         for fuente, reporte in reportes.items()],
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "antes_mb": st.column_config.NumberColumn("antes (MB)", format="%.1f"),
+            "despues_mb": st.column_config.NumberColumn("después (MB)", format="%.1f"),
+        },
+    )
+    fuente = st.selectbox("Columnas de", list(reportes), key="rendimiento_fuente")
+    st.dataframe(reportes[fuente], hide_index=True, use_container_width=True)
+
+
+def _mostrar_figuras(corrida):
+    """Figuras del cache y construidas en esta ejecución, con los totales del proceso"""
+    aciertos = corrida.contadores.get(graficos.CONTADOR_ACIERTOS, 0)
+    fallos = corrida.contadores.get(graficos.CONTADOR_FALLOS, 0)
+    if not (aciertos or fallos):
+        return
+    st.markdown("**Cache de figuras**")
+    col1, col2 = st.columns(2)
+    col1.metric("Desde cache", aciertos)
+    col2.metric("Construidas", fallos)
+    estado = graficos.estado_figuras()
+    st.caption(f"En el proceso: {estado['figuras']} figuras guardadas, "
+               f"{estado['aciertos']:,} aciertos y {estado['fallos']:,} fallos")
+
+
+def mostrar_rendimiento():
+    """Muestra las etapas medidas en esta ejecución y cierra la corrida"""
+    corrida = instrumentacion.corrida_actual()
+    if corrida is None:
+        return
+    total = corrida.total()
+    instrumentacion.desactivar()
+
+    with st.sidebar.expander("⏱ Performance", expanded=True):
+        st.metric("Tiempo total de la ejecución", f"{total:.2f} s")
+        resumen = corrida.resumen()
+        if resumen.empty:
+            st.caption("No se ejecutó ninguna etapa instrumentada")
+            return
+
+        # Las etapas anidadas se muestran con sangría bajo la que las contiene
+        resumen["etapa"] = ["· " * nivel + etapa for nivel, etapa in zip(resumen["nivel"], resumen["etapa"])]
+        columnas = ["etapa", "segundos", "filas_entrada", "filas_salida"]
+        if corrida.memoria:
+            columnas += ["memoria_mb", "memoria_neta_mb"]
+        st.dataframe(
+            resumen[columnas],
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                **configurar_columnas(resumen, enteros=["filas_entrada", "filas_salida"]),
+                "segundos": st.column_config.NumberColumn("segundos", format="%.3f"),
+                "memoria_mb": st.column_config.NumberColumn("pico (MB)", format="%.1f"),
+                "memoria_neta_mb": st.column_config.NumberColumn("neta (MB)", format="%.1f"),
+            },
+        )
+        if corrida.memoria and resumen["memoria_mb"].isna().any():
+            st.caption("Sin pico en las etapas en que otra sesión también medía memoria")
+        _mostrar_figuras(corrida)
+        if corrida.memoria:
+            _mostrar_compactacion()
+
+        if st.checkbox("Guardar en log JSONL", key="rendimiento_log"):
+            try:
+                ruta = corrida.guardar_jsonl()
+                st.caption(f"Agregado a {ruta}")
+            except OSError as e:
+                st.warning(f"No se pudo escribir el log: {e}")
@@ -0,0 +1,144 @@
+"""
+Renderizado rápido de tablas en Streamlit.
+
+pandas Styler convierte cada celda a HTML/CSS en Python antes de enviarla al
+navegador, lo que se vuelve lento con miles de filas. Aquí el formato se
+declara con ``st.column_config`` (lo aplica el navegador), los colores se
+calculan como columnas vectorizadas y las tablas grandes se paginan para no
+serializar el frame completo en cada rerun.
+"""
+
+import streamlit as st
+
+from ekonomodo_core import perezoso
+
+np = perezoso.modulo("numpy")
+pd = perezoso.modulo("pandas")
+
+# Filas enviadas al navegador por página
+FILAS_POR_PAGINA = 1000
+
+# Formatos de st.column_config (los aplica el navegador, el valor sigue numérico)
+FORMATO_PESOS = "dollar"
+# Los pesos van sin decimales ($1,234,567, como '${:,.0f}'): con los formatos
+# predefinidos el paso fija los decimales; uno printf ("$%.0f") no separaría miles
+PASO_PESOS = 1
+FORMATO_ENTERO = "localized"
+FORMATO_PORCENTAJE = "percent"
+
+
+def semaforo(serie, cortes, etiquetas):
+    """
+    Clasifica una serie numérica en rangos de forma vectorizada.
+
+    ``cortes`` son los límites superiores (inclusive) de cada rango y
+    ``etiquetas`` tiene un elemento más que ``cortes`` para los valores por
+    encima del último límite. Los NaN quedan como NA.
+    """
+    if len(etiquetas) != len(cortes) + 1:
+        raise ValueError("etiquetas debe tener un elemento más que cortes")
+
+    valores = pd.to_numeric(serie, errors="coerce")
+    bordes = [-np.inf, *cortes, np.inf]
+    return pd.cut(valores, bins=bordes, labels=etiquetas, right=True)
+
+
+def _paso(formato):
+    """Paso de la columna: el de los pesos, o None para que Streamlit lo infiera"""
+    return PASO_PESOS if formato == FORMATO_PESOS else None
+
+
+def configurar_columnas(df, pesos=(), enteros=(), porcentajes=(), barras=(), etiquetas=None, formatos=None):
+    """
+    Construye el ``column_config`` para ``st.dataframe``.
+
+    - pesos: columnas monetarias ($1,234)
+    - enteros: conteos y cantidades (1,234)
+    - porcentajes: proporciones 0-1 mostradas como %
+    - barras: columnas mostradas como barra de progreso (reemplaza
+      ``background_gradient``); el formato sale de las listas anteriores.
+      Puede ser una lista o un dict {columna: color}, donde color es un
+      color de Streamlit ("green", "red", ...) o "auto" (verde si el valor
+      pasa de la mitad del rango, como RdYlGn) / "auto-inverse" (al revés)
+    - etiquetas: renombra encabezados sin tocar el frame {columna: etiqueta}
+    - formatos: formato printf de Streamlit para columnas que no encajan en
+      las listas anteriores {columna: formato}, p. ej. "%.1f%%" para un
+      porcentaje que ya viene en escala 0-100
+    """
+    etiquetas = etiquetas or {}
+    colores = barras if isinstance(barras, dict) else dict.fromkeys(barras)
+    explicitos = formatos or {}
+    formatos = {}
+    for col in pesos:
+        formatos[col] = FORMATO_PESOS
+    for col in enteros:
+        formatos[col] = FORMATO_ENTERO
+    for col in porcentajes:
+        formatos[col] = FORMATO_PORCENTAJE
+    formatos.update(explicitos)
+
+    config = {}
+    for col, formato in formatos.items():
+        if col not in df.columns or col in barras:
+            continue
+        config[col] = st.column_config.NumberColumn(etiquetas.get(col, col), format=formato, step=_paso(formato))
+
+    for col, color in colores.items():
+        if col not in df.columns:
+            continue
+        valores = pd.to_numeric(df[col], errors="coerce")
+        minimo = float(valores.min()) if valores.notna().any() else 0.0
+        maximo = float(valores.max()) if valores.notna().any() else 1.0
+        if col in porcentajes:
+            minimo, maximo = min(minimo, 0.0), max(maximo, 1.0)
+        if maximo <= minimo:
+            maximo = minimo + 1
+        config[col] = st.column_config.ProgressColumn(
+            etiquetas.get(col, col),
+            format=formatos.get(col, FORMATO_ENTERO),
+            min_value=minimo,
+            max_value=maximo,
+            step=_paso(formatos.get(col)),
+            color=color,
+        )
+
+    for col, etiqueta in etiquetas.items():
+        if col in df.columns and col not in config:
+            config[col] = st.column_config.Column(etiqueta)
+
+    return config
+
+
+def mostrar_tabla(df, column_config=None, filas_por_pagina=FILAS_POR_PAGINA, clave=None, **kwargs):
+    """
+    Muestra un DataFrame con ``st.dataframe`` paginando los frames grandes.
+
+    Si el frame tiene más de ``filas_por_pagina`` filas solo se serializa la
+    página seleccionada. ``clave`` identifica el selector de página cuando hay
+    varias tablas paginadas en la misma vista.
+    """
+    if "use_container_width" not in kwargs:
+        kwargs.setdefault("width", "stretch")
+    kwargs.setdefault("hide_index", True)
+
+    total = len(df)
+    pagina_df = df
+    if filas_por_pagina and total > filas_por_pagina:
+        paginas = (total + filas_por_pagina - 1) // filas_por_pagina
+        col_pag, col_info = st.columns([1, 3])
+        with col_pag:
+            pagina = st.number_input(
+                "Página",
+                min_value=1,
+                max_value=paginas,
+                value=1,
+                step=1,
+                key=f"pagina_{clave or '_'.join(map(str, df.columns))}",
+            )
+        inicio = (int(pagina) - 1) * filas_por_pagina
+        fin = min(inicio + filas_por_pagina, total)
+        with col_info:
+            st.caption(f"Mostrando filas {inicio + 1:,}–{fin:,} de {total:,} ({paginas} páginas)")
+        pagina_df = df.iloc[inicio:fin]
+
+    return st.dataframe(pagina_df, column_config=column_config, **kwargs)
@@ -0,0 +1,49 @@
+"""Percentiles de ``ekonomodo_core.cuantiles.HistogramaTiempos`` frente a NumPy."""
+
+import numpy as np
+import pandas as pd
+
+from ekonomodo_core.cuantiles import CUANTILES, HistogramaTiempos
+
+
+def _muestra_sesgada(rng):
+    """Muchos EKM rápidos con pocas entregas y unos pocos lentos con muchas"""
+    rapidos = [(f"EKM{i:03d}", dias) for i in range(40) for dias in rng.integers(1, 6, 3)]
+    lentos = [(f"EKM{i:03d}", dias) for i in range(40, 43) for dias in rng.integers(15, 60, 200)]
+    return pd.DataFrame(rapidos + lentos, columns=["EKM", "DIAS"])
+
+
+def test_general_coincide_con_quantile_de_la_muestra_completa():
+    muestra = _muestra_sesgada(np.random.default_rng(0))
+    general = HistogramaTiempos.desde(muestra["EKM"], muestra["DIAS"]).general()
+
+    assert general["cantidad"] == len(muestra)
+    assert np.isclose(general["promedio"], muestra["DIAS"].mean())
+    for q in CUANTILES:
+        assert np.isclose(general[f"p{round(q * 100)}"], np.quantile(muestra["DIAS"], q))
+
+
+def test_general_difiere_del_promedio_ponderado_de_percentiles():
+    muestra = _muestra_sesgada(np.random.default_rng(1))
+    histograma = HistogramaTiempos.desde(muestra["EKM"], muestra["DIAS"])
+    resumen = histograma.resumen("EKM")
+
+    ponderado = np.average(resumen["p90"], weights=resumen["cantidad"])
+    assert histograma.general()["p90"] > ponderado
+
+
+def test_general_sigue_las_actualizaciones():
+    rng = np.random.default_rng(2)
+    muestra = _muestra_sesgada(rng)
+    histograma = HistogramaTiempos()
+    histograma.actualizar(muestra.index, muestra["EKM"], muestra["DIAS"])
+
+    cambiada = muestra.drop(index=muestra.index[:50])
+    cambiada.loc[cambiada.index[:20], "DIAS"] = 90
+    histograma.actualizar(cambiada.index, cambiada["EKM"], cambiada["DIAS"])
+
+    assert np.isclose(histograma.general()["p90"], np.quantile(cambiada["DIAS"], 0.9))
+
+
+def test_general_sin_duraciones():
+    assert HistogramaTiempos().general() is None
@@ -0,0 +1,60 @@
+"""Pico y memoria neta por etapa de ``ekonomodo_core.instrumentacion.medir``."""
+
+import tracemalloc
+
+import pytest
+
+from ekonomodo_core import instrumentacion
+
+
+@pytest.fixture
+def corrida():
+    corrida = instrumentacion.activar(instrumentacion.Corrida("prueba", memoria=True))
+    yield corrida
+    instrumentacion.desactivar()
+
+
+def _temporal(mb):
+    """Asigna ``mb`` MB, los suelta y devuelve algo chico (como un groupby)"""
+    return len(bytearray(mb * 1_000_000))
+
+
+def test_pico_de_un_temporal_que_no_queda(corrida):
+    with instrumentacion.medir("agregar"):
+        _temporal(40)
+
+    registro = corrida.registros[0]
+    assert registro["memoria_mb"] >= 40
+    assert abs(registro["memoria_neta_mb"]) < 1
+
+
+def test_pico_de_etapas_anidadas(corrida):
+    with instrumentacion.medir("seccion"):
+        _temporal(30)
+        with instrumentacion.medir("hija"):
+            _temporal(10)
+
+    seccion, hija = corrida.registros
+    assert 10 <= hija["memoria_mb"] < 30
+    # El pico de la sección es el del temporal de antes de la hija, aunque esta reinició el pico
+    assert seccion["memoria_mb"] >= 30
+
+
+def test_sin_pico_con_otra_corrida_midiendo(corrida):
+    otra = instrumentacion.Corrida("otra sesión", memoria=True)
+    with instrumentacion.medir("compartida"):
+        instrumentacion.activar(otra)
+        instrumentacion.activar(corrida)
+        _temporal(20)
+
+    registro = corrida.registros[0]
+    assert registro["memoria_mb"] is None
+    assert registro["memoria_neta_mb"] is not None
+
+    instrumentacion.activar(otra)
+    instrumentacion.desactivar()
+    instrumentacion.activar(corrida)
+    assert tracemalloc.is_tracing()
+    with instrumentacion.medir("sola otra vez"):
+        _temporal(20)
+    assert corrida.registros[1]["memoria_mb"] >= 20
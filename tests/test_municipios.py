@@ -0,0 +1,67 @@
+"""Catálogo DIVIPOLA de ``ekonomodo_core.municipios`` y ubicación por departamento."""
+
+import pandas as pd
+import pytest
+
+from ekonomodo_core import municipios
+
+
+def test_catalogo_completo():
+    df = municipios.catalogo()
+
+    assert len(df) == 1122
+    assert df["codigo"].is_unique
+    assert (df["codigo"].str.len() == 5).all()
+    assert (df["codigo"].str[:2] == df["codigo_departamento"]).all()
+    assert df[["lat", "lon"]].notna().all().all()
+    assert df["codigo_departamento"].nunique() == 33
+
+
+@pytest.mark.parametrize("departamento, cantidad", [
+    ("SANTANDER", 87),
+    ("BOLÍVAR", 46),
+    ("CUNDINAMARCA", 116),
+    ("ANTIOQUIA", 125),
+    ("CHOCÓ", 31),
+])
+def test_municipios_por_departamento(departamento, cantidad):
+    assert (municipios.catalogo()["departamento"] == departamento).sum() == cantidad
+
+
+def test_alias_apuntan_al_catalogo():
+    claves = set(municipios.catalogo()["clave"])
+    assert set(municipios.ALIAS.values()) <= claves
+    por_departamento, _ = municipios._indices()
+    for departamento, alias in municipios.ALIAS_POR_DEPARTAMENTO.items():
+        assert set(alias.values()) <= set(por_departamento[departamento])
+
+
+def test_resolver_dentro_del_departamento():
+    ubicacion = municipios.resolver(
+        pd.Series(["La Paz", "El Peñón", "San Pablo", "Sucre", "Manaure", "Rionegro", "Mompós"]),
+        pd.Series(["Santander", "Santander", "Bolívar", "SANTANDER", "Cesar", "Antioquia", "BOLIVAR"]),
+    )
+    assert ubicacion["codigo"].tolist() == ["68397", "68250", "13670", "68773", "20443", "05615", "13468"]
+
+
+def test_resolver_no_sale_del_departamento():
+    # Ni exacta en otro departamento ni por parecido: queda en NA
+    ubicacion = municipios.resolver(
+        pd.Series(["Cúcuta", "Medellin", "Bucaramangaa", "San Pablo"]),
+        pd.Series(["Santander", "Cundinamarca", "Santander", "Santander"]),
+    )
+    assert ubicacion["codigo"].tolist()[2] == "68001"
+    assert ubicacion["municipio"].isna().tolist() == [True, True, False, True]
+
+
+def test_resolver_sin_departamento():
+    ubicacion = municipios.resolver(pd.Series(["Bogotá D.C.", "medellin.", "Cucuta", "Barranquila", "Xyz", None]))
+    assert ubicacion["municipio"].tolist()[:4] == ["BOGOTÁ", "MEDELLÍN", "SAN JOSÉ DE CÚCUTA", "BARRANQUILLA"]
+    assert ubicacion["municipio"].isna().tolist()[4:] == [True, True]
+
+
+def test_ciudad_cos():
+    ubicacion = municipios.ciudad_cos(pd.Series([1, 2, 999, 5, None, "Cali"], index=list("abcdef")))
+    assert ubicacion.index.tolist() == list("abcdef")
+    assert ubicacion["ciudad"].tolist() == ["Bogotá", "Medellín", "RTA", "Ciudad 5", "Sin ciudad", "CALI"]
+    assert ubicacion["departamento"].tolist()[:3] == ["BOGOTÁ D.C.", "ANTIOQUIA", "Sin departamento"]